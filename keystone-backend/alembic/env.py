@@ -12,7 +12,15 @@ from app.core.config import get_app_settings
 from app.users import UserModel
 from app.access_restore import AccessRestoreModel
 from app.confirmation import ConfirmationModel
-from app.habits import HabitModel
+from app.habits import (
+    HabitCompletionModel,
+    HabitCompletionRollupModel,
+    HabitDayCloseModel,
+    HabitHistorySegmentModel,
+    HabitModel,
+)
+from app.outbox import OutboxMessageModel
+from app.campaigns import CampaignModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,63 @@
+"""Create habit completions table
+
+Revision ID: 0dc75495eb79
+Revises: 084cb105875a
+Create Date: 2026-10-19 17:42:44.054606
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0dc75495eb79"
+down_revision: Union[str, Sequence[str], None] = "084cb105875a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "habit_completions",
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("completed_on", sa.Date(), nullable=False),
+        sa.Column("is_partial", sa.Boolean(), nullable=False),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("mood", sa.SmallInteger(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_habit_completions_habit_id_completed_on", "habit_completions", ["habit_id", "completed_on"], unique=False
+    )
+    op.create_index(op.f("ix_habit_completions_id"), "habit_completions", ["id"], unique=False)
+    op.create_index(op.f("ix_habit_completions_user_id"), "habit_completions", ["user_id"], unique=False)
+    op.add_column("habits", sa.Column("last_period_start", sa.Date(), nullable=True))
+    op.add_column("habits", sa.Column("period_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("habits", sa.Column("successful_periods", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("habits", sa.Column("last_success_period", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("habits", "last_success_period")
+    op.drop_column("habits", "successful_periods")
+    op.drop_column("habits", "period_count")
+    op.drop_column("habits", "last_period_start")
+    op.drop_index(op.f("ix_habit_completions_user_id"), table_name="habit_completions")
+    op.drop_index(op.f("ix_habit_completions_id"), table_name="habit_completions")
+    op.drop_index("ix_habit_completions_habit_id_completed_on", table_name="habit_completions")
+    op.drop_table("habit_completions")
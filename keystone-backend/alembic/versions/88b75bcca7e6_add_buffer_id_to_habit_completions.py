@@ -0,0 +1,41 @@
+"""Add buffer id to habit completions
+
+Revision ID: 88b75bcca7e6
+Revises: c0e5498b5363
+Create Date: 2026-10-19 18:23:45.014497
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "88b75bcca7e6"
+down_revision: Union[str, Sequence[str], None] = "c0e5498b5363"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("habit_completions", sa.Column("buffer_id", sa.UUID(), nullable=True))
+    op.create_index(
+        "uq_habit_completions_buffer_id",
+        "habit_completions",
+        ["buffer_id"],
+        unique=True,
+        postgresql_where=sa.text("buffer_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "uq_habit_completions_buffer_id",
+        table_name="habit_completions",
+        postgresql_where=sa.text("buffer_id IS NOT NULL"),
+    )
+    op.drop_column("habit_completions", "buffer_id")
@@ -0,0 +1,45 @@
+"""Add habit timestamps and sync indexes
+
+Revision ID: aa2c69a9331f
+Revises: 88b75bcca7e6
+Create Date: 2026-10-19 18:26:36.254434
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "aa2c69a9331f"
+down_revision: Union[str, Sequence[str], None] = "88b75bcca7e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "habits", sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False)
+    )
+    op.add_column(
+        "habits", sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False)
+    )
+    op.add_column("habits", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("ix_habits_user_id_updated_at", "habits", ["user_id", "updated_at"], unique=False)
+    op.create_index(
+        "ix_habit_completions_user_id_updated_at", "habit_completions", ["user_id", "updated_at"], unique=False
+    )
+    op.drop_index("ix_habit_completions_user_id", table_name="habit_completions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_habit_completions_user_id", "habit_completions", ["user_id"], unique=False)
+    op.drop_index("ix_habit_completions_user_id_updated_at", table_name="habit_completions")
+    op.drop_index("ix_habits_user_id_updated_at", table_name="habits")
+    op.drop_column("habits", "deleted_at")
+    op.drop_column("habits", "updated_at")
+    op.drop_column("habits", "created_at")
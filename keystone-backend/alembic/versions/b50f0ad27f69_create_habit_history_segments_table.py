@@ -0,0 +1,48 @@
+"""Create habit history segments table
+
+Revision ID: b50f0ad27f69
+Revises: 0dc75495eb79
+Create Date: 2026-10-19 17:52:14.088027
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b50f0ad27f69"
+down_revision: Union[str, Sequence[str], None] = "0dc75495eb79"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Сегменты существующих привычек заполняет задача rebuild_habit_stats
+    op.create_table(
+        "habit_history_segments",
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("year", sa.SmallInteger(), nullable=False),
+        sa.Column("bits", sa.LargeBinary(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["habit_id"], ["habits.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("habit_id", "year", name="uq_habit_history_segments_habit_id_year"),
+    )
+    op.create_index(op.f("ix_habit_history_segments_id"), "habit_history_segments", ["id"], unique=False)
+    op.create_index(op.f("ix_habit_history_segments_user_id"), "habit_history_segments", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_habit_history_segments_user_id"), table_name="habit_history_segments")
+    op.drop_index(op.f("ix_habit_history_segments_id"), table_name="habit_history_segments")
+    op.drop_table("habit_history_segments")
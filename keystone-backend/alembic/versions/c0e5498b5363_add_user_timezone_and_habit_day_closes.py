@@ -0,0 +1,54 @@
+"""Add user timezone and habit day closes
+
+Revision ID: c0e5498b5363
+Revises: e53c91085817
+Create Date: 2026-10-19 18:11:51.102202
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c0e5498b5363"
+down_revision: Union[str, Sequence[str], None] = "e53c91085817"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("timezone", sa.String(length=64), server_default="UTC", nullable=False))
+    op.create_index(
+        "ix_users_timezone_id",
+        "users",
+        ["timezone", "id"],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+    op.create_table(
+        "habit_day_closes",
+        sa.Column("utc_offset", sa.SmallInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("last_timezone", sa.String(length=64), nullable=True),
+        sa.Column("last_user_id", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("closed_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("utc_offset", "day", name="uq_habit_day_closes_utc_offset_day"),
+    )
+    op.create_index(op.f("ix_habit_day_closes_id"), "habit_day_closes", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_habit_day_closes_id"), table_name="habit_day_closes")
+    op.drop_table("habit_day_closes")
+    op.drop_index("ix_users_timezone_id", table_name="users", postgresql_where=sa.text("deleted_at IS NULL"))
+    op.drop_column("users", "timezone")
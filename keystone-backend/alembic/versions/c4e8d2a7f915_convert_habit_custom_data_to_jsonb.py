@@ -0,0 +1,55 @@
+"""Convert habit custom_data to JSONB
+
+Revision ID: c4e8d2a7f915
+Revises: aa2c69a9331f
+Create Date: 2026-10-19 20:41:12.518307
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8d2a7f915"
+down_revision: Union[str, Sequence[str], None] = "aa2c69a9331f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "habits",
+        "custom_data",
+        existing_type=postgresql.JSON(astext_type=sa.Text()),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="custom_data::jsonb",
+    )
+    # None сохранялся как JSON null: частичные обновления начинают документ с пустого объекта только для NULL
+    op.execute("UPDATE habits SET custom_data = NULL WHERE custom_data = 'null'::jsonb")
+    op.create_index(
+        "ix_habits_custom_data",
+        "habits",
+        ["custom_data"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"custom_data": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_habits_custom_data", table_name="habits", postgresql_using="gin")
+    op.alter_column(
+        "habits",
+        "custom_data",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=postgresql.JSON(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="custom_data::json",
+    )
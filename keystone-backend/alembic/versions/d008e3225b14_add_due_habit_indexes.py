@@ -0,0 +1,41 @@
+"""Add due habit indexes
+
+Revision ID: d008e3225b14
+Revises: b50f0ad27f69
+Create Date: 2026-10-19 17:54:01.931955
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d008e3225b14"
+down_revision: Union[str, Sequence[str], None] = "b50f0ad27f69"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_habits_days_of_week", "habits", ["days_of_week"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_habits_user_id_start_date_active",
+        "habits",
+        ["user_id", "start_date"],
+        unique=False,
+        postgresql_where=sa.text("is_active AND NOT is_archived"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_habits_user_id_start_date_active",
+        table_name="habits",
+        postgresql_where=sa.text("is_active AND NOT is_archived"),
+    )
+    op.drop_index("ix_habits_days_of_week", table_name="habits", postgresql_using="gin")
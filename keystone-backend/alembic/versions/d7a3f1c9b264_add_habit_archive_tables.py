@@ -0,0 +1,117 @@
+"""Add habit archive tables
+
+Revision ID: d7a3f1c9b264
+Revises: c4e8d2a7f915
+Create Date: 2026-10-19 22:05:37.104281
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3f1c9b264"
+down_revision: Union[str, Sequence[str], None] = "c4e8d2a7f915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Колонки, по которым downgrade возвращает строки архива
+_HABIT_COLUMNS: str = (
+    "title, description, icon, color, frequency_type, times_per_period, days_of_week, preferred_times, "
+    "target_streak, target_count, target_date, category, is_active, is_archived, start_date, end_date, "
+    "current_streak, longest_streak, total_completions, success_rate, last_period_start, period_count, "
+    "successful_periods, last_success_period, allow_partial, require_notes, require_mood, tags, custom_data, "
+    "user_id, id, created_at, updated_at, deleted_at"
+)
+_COMPLETION_COLUMNS: str = (
+    "habit_id, user_id, completed_on, is_partial, note, mood, buffer_id, id, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колонки повторяют рабочие таблицы: строки переносятся с теми же ID, без последовательностей и внешних ключей
+    op.create_table(
+        "habits_archive",
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("icon", sa.String(length=50), nullable=False),
+        sa.Column("color", sa.String(length=7), nullable=False),
+        sa.Column(
+            "frequency_type",
+            postgresql.ENUM("DAILY", "WEEKLY", "MONTHLY", "CUSTOM", name="frequencytype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("times_per_period", sa.Integer(), nullable=False),
+        sa.Column("days_of_week", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("preferred_times", postgresql.ARRAY(sa.Time()), nullable=True),
+        sa.Column("target_streak", sa.Integer(), nullable=True),
+        sa.Column("target_count", sa.Integer(), nullable=True),
+        sa.Column("target_date", sa.Date(), nullable=True),
+        sa.Column("category", sa.String(length=100), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_archived", sa.Boolean(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("longest_streak", sa.Integer(), nullable=False),
+        sa.Column("total_completions", sa.Integer(), nullable=False),
+        sa.Column("success_rate", sa.Integer(), nullable=False),
+        sa.Column("last_period_start", sa.Date(), nullable=True),
+        sa.Column("period_count", sa.Integer(), nullable=False),
+        sa.Column("successful_periods", sa.Integer(), nullable=False),
+        sa.Column("last_success_period", sa.Date(), nullable=True),
+        sa.Column("allow_partial", sa.Boolean(), nullable=False),
+        sa.Column("require_notes", sa.Boolean(), nullable=False),
+        sa.Column("require_mood", sa.Boolean(), nullable=False),
+        sa.Column("tags", postgresql.ARRAY(sa.String()), nullable=False),
+        sa.Column("custom_data", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_habits_archive_user_id_id", "habits_archive", ["user_id", "id"], unique=False)
+    op.create_table(
+        "habit_completions_archive",
+        sa.Column("habit_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("completed_on", sa.Date(), nullable=False),
+        sa.Column("is_partial", sa.Boolean(), nullable=False),
+        sa.Column("note", sa.Text(), nullable=True),
+        sa.Column("mood", sa.SmallInteger(), nullable=True),
+        sa.Column("buffer_id", sa.UUID(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_habit_completions_archive_habit_id_completed_on",
+        "habit_completions_archive",
+        ["habit_id", "completed_on"],
+        unique=False,
+    )
+    op.create_index("ix_habit_completions_archive_user_id", "habit_completions_archive", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Строки архива возвращаются в рабочие таблицы: сначала привычки, на которые ссылаются отметки.
+    # Сегменты истории возвращенных привычек строит задача rebuild_habit_stats
+    op.execute("INSERT INTO habits (" + _HABIT_COLUMNS + ") SELECT " + _HABIT_COLUMNS + " FROM habits_archive")
+    op.execute(
+        "INSERT INTO habit_completions (" + _COMPLETION_COLUMNS + ") "
+        "SELECT " + _COMPLETION_COLUMNS + " FROM habit_completions_archive"
+    )
+    op.drop_index("ix_habit_completions_archive_user_id", table_name="habit_completions_archive")
+    op.drop_index("ix_habit_completions_archive_habit_id_completed_on", table_name="habit_completions_archive")
+    op.drop_table("habit_completions_archive")
+    op.drop_index("ix_habits_archive_user_id_id", table_name="habits_archive")
+    op.drop_table("habits_archive")
@@ -0,0 +1,39 @@
+"""Add habit list indexes
+
+Revision ID: e16c98942d87
+Revises: d008e3225b14
+Create Date: 2026-10-19 17:57:35.085481
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e16c98942d87"
+down_revision: Union[str, Sequence[str], None] = "d008e3225b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_habits_tags", "habits", ["tags"], unique=False, postgresql_using="gin")
+    op.create_index("ix_habits_user_id_category", "habits", ["user_id", "category"], unique=False)
+    op.create_index(
+        "ix_habits_user_id_id_not_archived",
+        "habits",
+        ["user_id", "id"],
+        unique=False,
+        postgresql_where=sa.text("NOT is_archived"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_habits_user_id_id_not_archived", table_name="habits", postgresql_where=sa.text("NOT is_archived"))
+    op.drop_index("ix_habits_user_id_category", table_name="habits")
+    op.drop_index("ix_habits_tags", table_name="habits", postgresql_using="gin")
@@ -0,0 +1,44 @@
+"""Add habit completion rollups
+
+Revision ID: e53c91085817
+Revises: f25449049735
+Create Date: 2026-10-19 18:06:28.025628
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e53c91085817"
+down_revision: Union[str, Sequence[str], None] = "f25449049735"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Сводки по существующим отметкам заполняет задача rebuild_completion_rollups
+    op.create_table(
+        "habit_completion_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("period", postgresql.ENUM("DAY", "WEEK", "MONTH", name="rollupperiod"), nullable=False),
+        sa.Column("year", sa.SmallInteger(), nullable=False),
+        sa.Column("counts", postgresql.ARRAY(sa.Integer(), zero_indexes=True), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "period", "year", name="uq_habit_completion_rollups_user_id_period_year"),
+    )
+    op.create_index(op.f("ix_habit_completion_rollups_id"), "habit_completion_rollups", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_habit_completion_rollups_id"), table_name="habit_completion_rollups")
+    op.drop_table("habit_completion_rollups")
+    postgresql.ENUM(name="rollupperiod").drop(op.get_bind())
@@ -0,0 +1,65 @@
+"""Add trigram search indexes
+
+Revision ID: f25449049735
+Revises: e16c98942d87
+Create Date: 2026-10-19 18:02:15.953032
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f25449049735"
+down_revision: Union[str, Sequence[str], None] = "e16c98942d87"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.drop_index(op.f("ix_habits_title"), table_name="habits")
+    op.create_index(
+        "ix_habits_title_trgm",
+        "habits",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.add_column(
+        "users",
+        sa.Column(
+            "search_name",
+            sa.Text(),
+            sa.Computed("surname || ' ' || name || coalesce(' ' || patronymic, '')", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.drop_index(op.f("ix_users_name"), table_name="users")
+    op.drop_index(op.f("ix_users_patronymic"), table_name="users")
+    op.drop_index(op.f("ix_users_surname"), table_name="users")
+    op.create_index(
+        "ix_users_search_name_trgm",
+        "users",
+        ["search_name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"search_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Расширение pg_trgm не удаляется: им могут пользоваться объекты вне миграций приложения
+    op.drop_index("ix_users_search_name_trgm", table_name="users")
+    op.create_index(op.f("ix_users_surname"), "users", ["surname"], unique=False)
+    op.create_index(op.f("ix_users_patronymic"), "users", ["patronymic"], unique=False)
+    op.create_index(op.f("ix_users_name"), "users", ["name"], unique=False)
+    op.drop_column("users", "search_name")
+    op.drop_index("ix_habits_title_trgm", table_name="habits")
+    op.create_index(op.f("ix_habits_title"), "habits", ["title"], unique=False)
@@ -0,0 +1,115 @@
+"""Partition token tables by created_at
+
+Revision ID: f2bf97f0e188
+Revises: 1b4ab2f0ef88
+Create Date: 2026-10-19 10:12:31.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2bf97f0e188"
+down_revision: Union[str, Sequence[str], None] = "1b4ab2f0ef88"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Таблица -> (описание колонок, список колонок, срок хранения записей)
+TOKEN_TABLES: dict[str, tuple[str, str, str]] = {
+    "confirmations": (
+        "user_id INTEGER NOT NULL REFERENCES users (id), "
+        "used_at TIMESTAMP WITH TIME ZONE, "
+        "type confirmationtype NOT NULL",
+        "user_id, used_at, type, id, created_at, updated_at, uuid",
+        "7 days",
+    ),
+    "access_restores": (
+        "user_id INTEGER NOT NULL REFERENCES users (id), " "used_at TIMESTAMP WITH TIME ZONE",
+        "user_id, used_at, id, created_at, updated_at, uuid",
+        "6 hours",
+    ),
+}
+# На сколько суток вперед создаются секции
+PREMAKE_DAYS: int = 7
+
+
+def _rename_legacy(table: str, uuid_constraint: str) -> None:
+    """Переименовывает таблицу и ее объекты, освобождая имена для новой таблицы."""
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+    op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey")
+    op.execute(f"ALTER TABLE {table}_legacy RENAME CONSTRAINT {uuid_constraint} TO {table}_legacy_uuid_key")
+    op.execute(f"ALTER INDEX ix_{table}_id RENAME TO ix_{table}_legacy_id")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (columns, column_list, retention) in TOKEN_TABLES.items():
+        _rename_legacy(table, f"{table}_uuid_key")
+
+        op.execute(
+            f"CREATE TABLE {table} ("
+            f"{columns}, "
+            f"id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'), "
+            "created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+            "updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+            "uuid UUID NOT NULL, "
+            f"CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at), "
+            f"CONSTRAINT {table}_uuid_created_at_key UNIQUE (uuid, created_at)"
+            ") PARTITION BY RANGE (created_at)"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+        op.execute(f"""
+            DO $$
+            DECLARE
+                partition_day date;
+            BEGIN
+                FOR partition_day IN
+                    SELECT generate_series(
+                        (now() AT TIME ZONE 'UTC' - interval '{retention}')::date,
+                        (now() AT TIME ZONE 'UTC')::date + {PREMAKE_DAYS},
+                        interval '1 day'
+                    )::date
+                LOOP
+                    EXECUTE format(
+                        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        '{table}_p' || to_char(partition_day, 'YYYYMMDD'),
+                        '{table}',
+                        partition_day::timestamp AT TIME ZONE 'UTC',
+                        (partition_day + 1)::timestamp AT TIME ZONE 'UTC'
+                    );
+                END LOOP;
+            END $$
+            """)
+        # Истекшие токены не переносятся: ради их удаления таблицы и секционируются
+        op.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_legacy "
+            f"WHERE created_at >= now() - interval '{retention}'"
+        )
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f"DROP TABLE {table}_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (columns, column_list, _) in TOKEN_TABLES.items():
+        _rename_legacy(table, f"{table}_uuid_created_at_key")
+
+        op.execute(
+            f"CREATE TABLE {table} ("
+            f"{columns}, "
+            f"id INTEGER NOT NULL DEFAULT nextval('{table}_id_seq'), "
+            "created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+            "updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(), "
+            "uuid UUID NOT NULL, "
+            f"CONSTRAINT {table}_pkey PRIMARY KEY (id), "
+            f"CONSTRAINT {table}_uuid_key UNIQUE (uuid)"
+            ")"
+        )
+        op.execute(f"CREATE INDEX ix_{table}_id ON {table} (id)")
+        op.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {table}_legacy")
+        op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+        op.execute(f"DROP TABLE {table}_legacy")
@@ -2,3 +2,5 @@
 
 # Срок действия токена доступа в часах
 EXPIRED_ACCESS_RESTORE_TOKEN_HOURS: int = 6
+# Тип токена для объединения повторных запросов писем восстановления доступа
+ACCESS_RESTORE_COALESCE_SCOPE: str = "access_restore"
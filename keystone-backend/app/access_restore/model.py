@@ -6,13 +6,13 @@ from datetime import datetime
 from sqlalchemy import DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import BaseModel, TimestampMixin, UUIDMixin
+from app.core.database import BaseModel, CreatedAtPartitionMixin, TimestampMixin, UUIDMixin
 from app.users.model import User as UserModel
 
 
-class AccessRestore(BaseModel, UUIDMixin, TimestampMixin):
+class AccessRestore(CreatedAtPartitionMixin, BaseModel, UUIDMixin, TimestampMixin):
     """
-    Модель токена доступа.
+    Модель токена доступа. Таблица секционирована посуточно по created_at.
 
     Attributes:
         user_id: ID пользователя.
@@ -1,14 +1,16 @@
 """Модуль сервиса восстановления доступа."""
 
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from uuid import UUID
 
-from app.core import BaseService, ServiceOperation
+from app.core import BaseService, SendCoalescer, ServiceOperation
 from app.core.database import DataModel
+from app.outbox import OutboxRepository
 from app.users.repository import UserRepository
-from app.worker.tasks import send_access_restore_email
+from app.worker import send_access_restore_email
 
-from .consts import EXPIRED_ACCESS_RESTORE_TOKEN_HOURS
+from .consts import ACCESS_RESTORE_COALESCE_SCOPE, EXPIRED_ACCESS_RESTORE_TOKEN_HOURS
 from .exceptions import ExpiredRestoreTokenException, InvalidRestoreTokenException, TokenUsedException
 from .model import AccessRestore as AccessRestoreModel
 from .repository import AccessRestoreRepository
@@ -48,15 +50,77 @@ class AccessRestoreService(BaseService[AccessRestoreRepository, AccessRestoreDat
             raise TokenUsedException()
 
         current_time: datetime = datetime.now(UTC)
-        expired_time: datetime = current_time - timedelta(hours=EXPIRED_ACCESS_RESTORE_TOKEN_HOURS)
 
-        if token_data.created_at < expired_time:
+        if self._is_expired(token_data, current_time):
             raise ExpiredRestoreTokenException()
 
         await self._repository.update(token_data.id, {"used_at": current_time})
 
         return int(str(token_data.user_id))
 
+    async def request(self, payload: AccessRestoreData) -> bool:
+        """
+        Запрос письма восстановления доступа. Повторные запросы в пределах окна объединяются с первым,
+        пока отправленный токен действителен.
+
+        Args:
+            payload (AccessRestoreData): Данные для восстановления доступа.
+
+        Returns:
+            (bool): True, если письмо отправлено. False, если запрос объединен с предыдущим.
+
+        Examples:
+            >>> async def restore_access(ex_payload: AccessRestoreData) -> bool:
+            ...     return await AccessRestoreService().request(ex_payload)
+        """
+        return await SendCoalescer(ACCESS_RESTORE_COALESCE_SCOPE).run(
+            payload.user_id, partial(self._send_token, payload), self._is_outstanding
+        )
+
+    async def _send_token(self, payload: AccessRestoreData) -> UUID:
+        """
+        Создание токена восстановления доступа и отправка письма.
+
+        Args:
+            payload (AccessRestoreData): Данные для восстановления доступа.
+
+        Returns:
+            (UUID): Токен восстановления доступа.
+        """
+        access_restore: AccessRestoreModel = await self.create(payload)
+        return access_restore.uuid
+
+    async def _is_outstanding(self, token: UUID) -> bool:
+        """
+        Проверка, что токен восстановления доступа еще можно погасить.
+
+        Args:
+            token (UUID): Токен восстановления доступа.
+
+        Returns:
+            (bool): True, если токен существует, не использован и не истек.
+        """
+        token_data: AccessRestoreModel | None = await self._repository.get_by_uuid(token)
+
+        if token_data is None:
+            return False
+
+        return not token_data.is_used and not self._is_expired(token_data, datetime.now(UTC))
+
+    @staticmethod
+    def _is_expired(token_data: AccessRestoreModel, current_time: datetime) -> bool:
+        """
+        Проверка истечения срока действия токена восстановления доступа.
+
+        Args:
+            token_data (AccessRestoreModel): Токен восстановления доступа.
+            current_time (datetime): Текущее время.
+
+        Returns:
+            (bool): True, если срок действия токена истек.
+        """
+        return token_data.created_at < current_time - timedelta(hours=EXPIRED_ACCESS_RESTORE_TOKEN_HOURS)
+
     async def _after_operation(
         self, entity: DataModel, _: AccessRestoreData | None, operation: ServiceOperation
     ) -> None:
@@ -64,6 +128,9 @@ class AccessRestoreService(BaseService[AccessRestoreRepository, AccessRestoreDat
         match operation:
             case ServiceOperation.CREATE:
                 user_data = await UserRepository(self._db).get(entity.user_id)
-                send_access_restore_email.delay(
-                    user_full_name=user_data.full_name, user_email=user_data.email, token=entity.uuid
+                await OutboxRepository(self._db).add_task(
+                    send_access_restore_email,
+                    user_full_name=user_data.full_name,
+                    user_email=user_data.email,
+                    token=entity.uuid,
                 )
@@ -0,0 +1,5 @@
+"""Пакет для работы с email-рассылками по пользователям."""
+
+from .model import Campaign as CampaignModel
+from .schemas import CampaignData
+from .service import CampaignService
@@ -0,0 +1,47 @@
+"""
+Запуск рассылки по всем подтвержденным пользователям.
+
+Запуск:
+    python -m app.campaigns --subject "Новая версия KeyStone" --body-file announcement.html
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.core.database import database_manager
+
+from .model import Campaign as CampaignModel
+from .schemas import CampaignData
+from .service import CampaignService
+
+logger = logging.getLogger(__name__)
+
+
+async def main(payload: CampaignData) -> None:
+    """
+    Создает рассылку. Письма ставятся в очередь воркером.
+
+    Args:
+        payload (CampaignData): Данные рассылки.
+    """
+    database_manager.initialize()
+
+    try:
+        async for session in database_manager.get_session():
+            campaign: CampaignModel = await CampaignService(session).create(payload)
+            logger.info("Campaign %s created", campaign.uuid)
+    finally:
+        await database_manager.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subject", required=True, help="Тема письма")
+    parser.add_argument("--body-file", required=True, type=Path, help="Файл с HTML-текстом письма")
+    args = parser.parse_args()
+
+    asyncio.run(main(CampaignData(subject=args.subject, body=args.body_file.read_text(encoding="utf-8"))))
@@ -0,0 +1,24 @@
+"""Модуль с константами рассылок."""
+
+from enum import StrEnum, auto
+
+
+class CampaignStatus(StrEnum):
+    """
+    Статус рассылки.
+
+    Attributes:
+        PENDING: Создана, постановка писем не начата.
+        RUNNING: Письма ставятся в очередь.
+        COMPLETED: Все письма поставлены в очередь.
+    """
+
+    PENDING = auto()
+    RUNNING = auto()
+    COMPLETED = auto()
+
+
+# Количество получателей в одной задаче отправки
+CAMPAIGN_CHUNK_SIZE: int = 500
+# Количество строк, читаемых из курсора БД за раз
+CAMPAIGN_FETCH_SIZE: int = 5000
@@ -0,0 +1,35 @@
+# pylint: disable=too-few-public-methods
+"""Модуль модели рассылки."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import BaseModel, TimestampMixin, UUIDMixin
+
+from .consts import CampaignStatus
+
+
+class Campaign(BaseModel, UUIDMixin, TimestampMixin):
+    """
+    Модель рассылки по подтвержденным пользователям.
+
+    Attributes:
+        subject: Тема письма.
+        body: HTML-текст письма.
+        status: Статус рассылки.
+        last_user_id: ID последнего пользователя, письмо которому поставлено в очередь. Точка продолжения.
+        enqueued_count: Количество писем, поставленных в очередь.
+        sent_count: Количество отправленных писем.
+        finished_at: Время постановки в очередь последнего письма.
+    """
+
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(ENUM(CampaignStatus), nullable=False, default=CampaignStatus.PENDING)
+    last_user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    enqueued_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
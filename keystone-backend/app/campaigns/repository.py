@@ -0,0 +1,112 @@
+"""Модуль репозитория рассылок."""
+
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import func, select, update
+
+from app.core.database import BaseRepository
+from app.users.model import User as UserModel
+
+from .consts import CAMPAIGN_FETCH_SIZE, CampaignStatus
+from .model import Campaign as CampaignModel
+from .schemas import CampaignRecipient
+
+
+class CampaignRepository(BaseRepository[CampaignModel]):
+    """Репозиторий рассылок."""
+
+    _MODEL = CampaignModel
+
+    async def iter_recipients(
+        self, after_user_id: int, chunk_size: int, fetch_size: int = CAMPAIGN_FETCH_SIZE
+    ) -> AsyncIterator[list[CampaignRecipient]]:
+        """
+        Читает подтвержденных неудаленных пользователей по возрастанию ID через серверный курсор.
+        В памяти одновременно находится не больше fetch_size строк.
+
+        Args:
+            after_user_id (int): ID, после которого начинается чтение.
+            chunk_size (int): Количество получателей в порции.
+            fetch_size (int): Количество строк, получаемых из курсора за раз.
+
+        Yields:
+            (list[CampaignRecipient]): Порция получателей.
+
+        Examples:
+            >>> async def count_recipients(repository: CampaignRepository) -> int:
+            ...     return sum([len(chunk) async for chunk in repository.iter_recipients(0, 500)])
+        """
+        result = await self._session_db.stream(
+            select(
+                UserModel.id,
+                UserModel.email,
+                func.concat_ws(" ", UserModel.surname, UserModel.name, UserModel.patronymic),
+            )
+            .where(UserModel.id > after_user_id, UserModel.verified_at.is_not(None), UserModel.deleted_at.is_(None))
+            .order_by(UserModel.id)
+            .execution_options(yield_per=fetch_size)
+        )
+
+        async for rows in result.partitions(chunk_size):
+            yield [CampaignRecipient(user_id=user_id, email=email, full_name=name) for user_id, email, name in rows]
+
+    async def save_checkpoint(self, campaign_id: int, last_user_id: int, enqueued: int) -> None:
+        """
+        Сохраняет точку продолжения рассылки без фиксации транзакции.
+
+        Args:
+            campaign_id (int): ID рассылки.
+            last_user_id (int): ID последнего пользователя, письмо которому поставлено в очередь.
+            enqueued (int): Количество писем, поставленных в очередь с прошлой точки.
+        """
+        await self._session_db.execute(
+            update(CampaignModel)
+            .where(CampaignModel.id == campaign_id)
+            .values(
+                status=CampaignStatus.RUNNING,
+                last_user_id=last_user_id,
+                enqueued_count=CampaignModel.enqueued_count + enqueued,
+            )
+        )
+
+    async def finish(self, campaign_id: int, finished_at: datetime) -> None:
+        """
+        Отмечает постановку всех писем рассылки в очередь без фиксации транзакции.
+
+        Args:
+            campaign_id (int): ID рассылки.
+            finished_at (datetime): Время завершения.
+        """
+        await self._session_db.execute(
+            update(CampaignModel)
+            .where(CampaignModel.id == campaign_id)
+            .values(status=CampaignStatus.COMPLETED, finished_at=finished_at)
+        )
+
+    async def add_sent(self, campaign_id: int, sent: int) -> None:
+        """
+        Увеличивает счетчик отправленных писем без фиксации транзакции.
+
+        Args:
+            campaign_id (int): ID рассылки.
+            sent (int): Количество отправленных писем.
+        """
+        await self._session_db.execute(
+            update(CampaignModel)
+            .where(CampaignModel.id == campaign_id)
+            .values(sent_count=CampaignModel.sent_count + sent)
+        )
+
+    async def get_unfinished_ids(self) -> Sequence[int]:
+        """
+        Возвращает ID рассылок, письма которых поставлены в очередь не полностью.
+
+        Returns:
+            (Sequence[int]): ID рассылок.
+        """
+        result = await self._session_db.scalars(
+            select(CampaignModel.id).where(CampaignModel.status != CampaignStatus.COMPLETED)
+        )
+
+        return result.all()
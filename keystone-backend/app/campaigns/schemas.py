@@ -0,0 +1,31 @@
+"""Модуль с схемами данных рассылок."""
+
+from pydantic import BaseModel, Field
+
+
+class CampaignData(BaseModel):
+    """
+    Данные для создания рассылки.
+
+    Attributes:
+        subject: Тема письма.
+        body: HTML-текст письма.
+    """
+
+    subject: str = Field(min_length=1, max_length=255)
+    body: str = Field(min_length=1)
+
+
+class CampaignRecipient(BaseModel):
+    """
+    Получатель письма рассылки.
+
+    Attributes:
+        user_id: ID пользователя.
+        email: Email пользователя.
+        full_name: Полное имя пользователя.
+    """
+
+    user_id: int
+    email: str
+    full_name: str
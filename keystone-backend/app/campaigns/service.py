@@ -0,0 +1,22 @@
+"""Модуль сервиса рассылок."""
+
+from app.core import BaseService, ServiceOperation
+from app.core.database import DataModel
+from app.outbox import OutboxRepository
+from app.worker.tasks import run_campaign
+
+from .model import Campaign as CampaignModel
+from .repository import CampaignRepository
+from .schemas import CampaignData
+
+
+class CampaignService(BaseService[CampaignRepository, CampaignData, CampaignModel]):
+    """Сервис рассылок."""
+
+    _REPOSITORY = CampaignRepository
+
+    async def _after_operation(self, entity: DataModel, _: CampaignData | None, operation: ServiceOperation) -> None:
+        """Метод обработки после операций."""
+        match operation:
+            case ServiceOperation.CREATE:
+                await OutboxRepository(self._db).add_task(run_campaign, campaign_id=entity.id)
@@ -16,3 +16,5 @@ class ConfirmationType(StrEnum):
 
 # Дней до истечения токена подтверждения
 EXPIRED_CONFIRM_TOKEN_DAYS: int = 7
+# Префикс типа токена для объединения повторных запросов писем подтверждения
+CONFIRMATION_COALESCE_SCOPE: str = "confirmation"
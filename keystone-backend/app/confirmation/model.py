@@ -7,15 +7,15 @@ from sqlalchemy import DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import BaseModel, TimestampMixin, UUIDMixin
+from app.core.database import BaseModel, CreatedAtPartitionMixin, TimestampMixin, UUIDMixin
 from app.users.model import User as UserModel
 
 from .consts import ConfirmationType
 
 
-class Confirmation(BaseModel, TimestampMixin, UUIDMixin):
+class Confirmation(CreatedAtPartitionMixin, BaseModel, TimestampMixin, UUIDMixin):
     """
-    Модель подтверждения.
+    Модель подтверждения. Таблица секционирована посуточно по created_at.
 
     Attributes:
         user_id: ID пользователя.
@@ -1,14 +1,16 @@
 """Модуль сервиса подтверждения."""
 
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from uuid import UUID
 
-from app.core import BaseService, ServiceOperation
+from app.core import BaseService, SendCoalescer, ServiceOperation
 from app.core.database import DataModel
+from app.outbox import OutboxRepository
 from app.users.repository import UserRepository
 from app.worker import send_confirmation_email
 
-from .consts import EXPIRED_CONFIRM_TOKEN_DAYS
+from .consts import CONFIRMATION_COALESCE_SCOPE, EXPIRED_CONFIRM_TOKEN_DAYS
 from .exceptions import ExpiredConfirmationTokenException, InvalidConfirmTokenException, TokenUsedException
 from .model import Confirmation as ConfirmationModel
 from .repository import ConfirmationRepository
@@ -48,16 +50,76 @@ class ConfirmService(BaseService[ConfirmationRepository, ConfirmationData, Confi
             raise TokenUsedException()
 
         current_time: datetime = datetime.now(UTC)
-        expired_time: datetime = current_time - timedelta(days=EXPIRED_CONFIRM_TOKEN_DAYS)
 
-        if token_data.created_at < expired_time:
+        if self._is_expired(token_data, current_time):
             raise ExpiredConfirmationTokenException()
 
-        user_id: int = int(str(token_data.user_id))
+        await self._repository.update(token_data.id, {"used_at": current_time})
 
-        await self._repository.update(user_id, {"used_at": current_time})
+        return int(str(token_data.user_id))
 
-        return user_id
+    async def request(self, payload: ConfirmationData) -> bool:
+        """
+        Запрос письма подтверждения. Повторные запросы в пределах окна объединяются с первым,
+        пока отправленный токен действителен.
+
+        Args:
+            payload (ConfirmationData): Данные для подтверждения.
+
+        Returns:
+            (bool): True, если письмо отправлено. False, если запрос объединен с предыдущим.
+
+        Examples:
+            >>> async def send_confirm_email(ex_payload: ConfirmationData) -> bool:
+            ...     return await ConfirmService().request(ex_payload)
+        """
+        return await SendCoalescer(f"{CONFIRMATION_COALESCE_SCOPE}_{payload.type}").run(
+            payload.user_id, partial(self._send_token, payload), self._is_outstanding
+        )
+
+    async def _send_token(self, payload: ConfirmationData) -> UUID:
+        """
+        Создание токена подтверждения и отправка письма.
+
+        Args:
+            payload (ConfirmationData): Данные для подтверждения.
+
+        Returns:
+            (UUID): Токен подтверждения.
+        """
+        confirmation: ConfirmationModel = await self.create(payload)
+        return confirmation.uuid
+
+    async def _is_outstanding(self, token: UUID) -> bool:
+        """
+        Проверка, что токен подтверждения еще можно погасить.
+
+        Args:
+            token (UUID): Токен подтверждения.
+
+        Returns:
+            (bool): True, если токен существует, не использован и не истек.
+        """
+        token_data: ConfirmationModel | None = await self._repository.get_by_uuid(token)
+
+        if token_data is None:
+            return False
+
+        return not token_data.is_used and not self._is_expired(token_data, datetime.now(UTC))
+
+    @staticmethod
+    def _is_expired(token_data: ConfirmationModel, current_time: datetime) -> bool:
+        """
+        Проверка истечения срока действия токена подтверждения.
+
+        Args:
+            token_data (ConfirmationModel): Токен подтверждения.
+            current_time (datetime): Текущее время.
+
+        Returns:
+            (bool): True, если срок действия токена истек.
+        """
+        return token_data.created_at < current_time - timedelta(days=EXPIRED_CONFIRM_TOKEN_DAYS)
 
     async def _after_operation(
         self, entity: DataModel, _: ConfirmationData | None, operation: ServiceOperation
@@ -66,6 +128,9 @@ class ConfirmService(BaseService[ConfirmationRepository, ConfirmationData, Confi
         match operation:
             case ServiceOperation.CREATE:
                 user_data = await UserRepository(self._db).get(entity.user_id)
-                send_confirmation_email.delay(
-                    token=entity.uuid, user_full_name=user_data.full_name, user_email=user_data.email
+                await OutboxRepository(self._db).add_task(
+                    send_confirmation_email,
+                    token=entity.uuid,
+                    user_full_name=user_data.full_name,
+                    user_email=user_data.email,
                 )
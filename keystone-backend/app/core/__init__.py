@@ -1,5 +1,6 @@
 """Пакет базового функционала приложения."""
 
+from .coalescing import SendCoalescer
 from .consts import ServiceOperation
 from .exceptions import (
     AuthException,
@@ -10,7 +11,7 @@ from .exceptions import (
     NotFoundException,
     NotValidEntityException,
 )
-from .schema import BaseSchema, SoftDeleteSchemaMixin, TimeStampSchemaMixin, UUIDSchemaMixin
+from .schema import BaseSchema, SearchQuerySchema, SoftDeleteSchemaMixin, TimeStampSchemaMixin, UUIDSchemaMixin
 from .security import hash_password, verify_password
 from .service import BaseService
 from .token import create_access_token, decode_access_token
@@ -0,0 +1,144 @@
+# pylint: disable=too-few-public-methods
+"""Модуль объединения повторных запросов отправки писем с токенами."""
+
+from typing import Awaitable, Callable, cast
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from .config import AppSettings, get_app_settings
+from .consts import COALESCE_KEY_PREFIX, COALESCE_PENDING_VALUE, EMAIL_COALESCING_METRICS
+from .metrics import increment_counter
+from .redis import redis_manager
+
+app_settings: AppSettings = get_app_settings()
+
+# Занимает окно, только если его значение не изменилось с момента чтения (или ключ уже истек): иначе два запроса,
+# увидевшие один погашенный токен, оба отправили бы письмо
+_REPLACE_SCRIPT: str = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class SendCoalescer:
+    """
+    Объединение повторных запросов отправки письма с токеном.
+
+    В пределах окна для пары (пользователь, тип токена) повторный запрос не создает новый токен и не отправляет
+    письмо, пока ранее отправленный токен действителен. В Redis хранится UUID отправленного токена.
+
+    Notes:
+        - При недоступности Redis запросы не объединяются, письмо отправляется как обычно.
+        - Окно занимается атомарно: SET NX для нового окна, скрипт Lua для окна с погашенным токеном.
+        - Количество отправленных и подавленных запросов учитывается в метриках группы email_coalescing.
+
+    Attributes:
+        _scope (str): Тип токена, по которому объединяются запросы.
+        _window (int): Окно объединения в секундах.
+    """
+
+    def __init__(self, scope: str, window: int | None = None) -> None:
+        """
+        Инициализация объединения запросов.
+
+        Args:
+            scope (str): Тип токена, по которому объединяются запросы.
+            window (int | None): Окно объединения в секундах. По умолчанию из настроек приложения.
+        """
+        self._scope: str = scope
+        self._window: int = window or app_settings.EMAIL_COALESCE_WINDOW_SECONDS
+
+    async def run(
+        self,
+        user_id: int,
+        send: Callable[[], Awaitable[UUID]],
+        is_outstanding: Callable[[UUID], Awaitable[bool]],
+    ) -> bool:
+        """
+        Выполняет отправку, если в окне нет действительного токена того же типа.
+
+        Args:
+            user_id (int): ID пользователя.
+            send (Callable[[], Awaitable[UUID]]): Создание токена и постановка письма в очередь. Возвращает UUID токена.
+            is_outstanding (Callable[[UUID], Awaitable[bool]]): Проверка, что токен еще действителен.
+
+        Returns:
+            (bool): True, если письмо отправлено. False, если запрос объединен с предыдущим.
+
+        Examples:
+            >>> async def request_confirmation(service: ConfirmService, payload: ConfirmationData) -> bool:
+            ...     return await SendCoalescer("confirmation_email").run(
+            ...         payload.user_id, lambda: service.create_token(payload), service.is_outstanding
+            ...     )
+        """
+        key: str = f"{COALESCE_KEY_PREFIX}:{self._scope}:{user_id}"
+
+        try:
+            if not await self._reserve(key, is_outstanding):
+                await increment_counter(EMAIL_COALESCING_METRICS, f"{self._scope}.suppressed")
+                return False
+        except RedisError:
+            await send()
+            await increment_counter(EMAIL_COALESCING_METRICS, f"{self._scope}.sent")
+            return True
+
+        try:
+            token: UUID = await send()
+        except Exception:
+            await self._release(key)
+            raise
+
+        try:
+            await redis_manager.client.set(key, str(token), xx=True, keepttl=True)
+        except RedisError:
+            pass
+
+        await increment_counter(EMAIL_COALESCING_METRICS, f"{self._scope}.sent")
+        return True
+
+    async def _reserve(self, key: str, is_outstanding: Callable[[UUID], Awaitable[bool]]) -> bool:
+        """
+        Занимает окно под новую отправку.
+
+        Args:
+            key (str): Ключ окна в Redis.
+            is_outstanding (Callable[[UUID], Awaitable[bool]]): Проверка, что токен еще действителен.
+
+        Returns:
+            (bool): True, если окно занято под новую отправку. False, если отправка уже выполнена или выполняется.
+        """
+        if await redis_manager.client.set(key, COALESCE_PENDING_VALUE, nx=True, ex=self._window):
+            return True
+
+        # Клиент Redis создан с decode_responses=True
+        outstanding: str | None = cast(str | None, await redis_manager.client.get(key))
+
+        if outstanding == COALESCE_PENDING_VALUE:
+            return False
+
+        if outstanding and await is_outstanding(UUID(outstanding)):
+            return False
+
+        # Токен окна уже погашен или истек, новое письмо нужно отправить, если окно не занял параллельный запрос
+        replaced: int = await redis_manager.client.eval(
+            _REPLACE_SCRIPT, 1, key, outstanding or "", COALESCE_PENDING_VALUE, self._window
+        )
+        return bool(replaced)
+
+    @staticmethod
+    async def _release(key: str) -> None:
+        """
+        Освобождает окно после неудачной отправки.
+
+        Args:
+            key (str): Ключ окна в Redis.
+        """
+        try:
+            await redis_manager.client.delete(key)
+        except RedisError:
+            pass
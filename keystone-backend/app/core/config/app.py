@@ -38,11 +38,22 @@ class AppSettings(BaseSettings):
         EMAIL_PORT (int): Порт почтового сервера.
         EMAIL_USERNAME (str): Имя пользователя почтового сервера.
         EMAIL_PASSWORD (str): Пароль пользователя почтового сервера.
+        EMAIL_COALESCE_WINDOW_SECONDS (int): Окно в секундах, в котором повторные запросы писем с токенами
+            объединяются с первым.
+        EMAIL_TEMPLATE_CACHE_DIR (str | None): Каталог для кеша скомпилированных шаблонов писем.
+            Если не задан, шаблоны компилируются при каждом запуске воркера.
+        EMAIL_CAMPAIGN_RATE_PER_SECOND (float): Максимальное количество писем рассылок в секунду
+            на все процессы воркеров.
 
         REDIS_HOST (str): Хост редиса.
         REDIS_PORT (int): Порт редиса.
         REDIS_DB (int): Номер базы данных редиса.
 
+        CHECK_IN_BUFFER_ENABLED (bool): Принимать отметки привычек через буфер в Redis Stream: запрос подтверждается
+            после записи в поток, а в базу отметки пишет пакетами процесс app.worker.check_in_flusher.
+        CHECK_IN_BUFFER_WAIT_AOF (bool): Подтверждать отметку только после записи потока в AOF на диск (WAITAOF).
+            Требует Redis 7.2 с appendonly yes.
+
     Examples:
         >>> # Создание кешируемой функции получения настроек приложения
         >>> @lru_cache()
@@ -75,11 +86,17 @@ class AppSettings(BaseSettings):
     EMAIL_PORT: int = 465
     EMAIL_USERNAME: str
     EMAIL_PASSWORD: str
+    EMAIL_COALESCE_WINDOW_SECONDS: int = 120
+    EMAIL_TEMPLATE_CACHE_DIR: str | None = None
+    EMAIL_CAMPAIGN_RATE_PER_SECOND: float = 10.0
 
     REDIS_HOST: str = "127.0.0.1"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
 
+    CHECK_IN_BUFFER_ENABLED: bool = False
+    CHECK_IN_BUFFER_WAIT_AOF: bool = True
+
     @property
     def redis_url(self) -> str:
         """
@@ -19,3 +19,25 @@ class ServiceOperation(StrEnum):
     CREATE = auto()
     UPDATE = auto()
     DELETE = auto()
+
+
+# Префикс ключей Redis для счетчиков метрик
+METRICS_KEY_PREFIX: str = "metrics"
+# Количество последних наблюдений для расчета перцентилей задержек
+LATENCY_WINDOW_SIZE: int = 1024
+# Рассчитываемые перцентили задержек
+LATENCY_PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+# Префикс ключей Redis для объединения повторных отправок
+COALESCE_KEY_PREFIX: str = "coalesce"
+# Значение ключа объединения, пока токен еще создается
+COALESCE_PENDING_VALUE: str = "pending"
+# Группа метрик объединения повторных отправок писем
+EMAIL_COALESCING_METRICS: str = "email_coalescing"
+
+# Минимальная длина строки поиска: более короткие строки не содержат целых триграмм
+SEARCH_MIN_QUERY_LENGTH: int = 3
+SEARCH_MAX_QUERY_LENGTH: int = 100
+# Количество результатов поиска по умолчанию и максимальное
+SEARCH_DEFAULT_LIMIT: int = 20
+SEARCH_MAX_LIMIT: int = 100
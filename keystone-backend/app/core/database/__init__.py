@@ -3,7 +3,9 @@
 from .db_manager import DatabaseManager, database_manager
 from .dependencies import get_db
 from .exceptions import EntityNotFoundByUUIDException, EntityNotFoundException, EntityNotUUIDException
-from .mixins import SoftDeleteMixin, TimestampMixin, UUIDMixin
+from .mixins import CreatedAtPartitionMixin, SoftDeleteMixin, TimestampMixin, UUIDMixin
 from .model import BaseModel
+from .partitions import PartitionMaintenanceReport, PartitionManager, PartitionPolicy
 from .repository import BaseRepository
+from .search import escape_like, trigram_match, trigram_rank
 from .typing import DataModel
@@ -0,0 +1,13 @@
+"""Модуль констант для работы с базой данных."""
+
+# Разделитель имени родительской таблицы и даты в имени секции
+PARTITION_NAME_DELIMITER: str = "_p"
+# Формат даты в имени секции
+PARTITION_NAME_DATE_FORMAT: str = "%Y%m%d"
+# Количество суток, на которые секции создаются заранее
+PARTITION_PREMAKE_DAYS: int = 7
+
+# Класс операторов GIN-индексов по триграммам (pg_trgm)
+TRIGRAM_OPS: str = "gin_trgm_ops"
+# Символ экранирования шаблонов LIKE
+LIKE_ESCAPE_CHAR: str = "\\"
@@ -5,8 +5,8 @@ from datetime import datetime
 from uuid import UUID, uuid4
 
 from sqlalchemy import UUID as PG_UUID
-from sqlalchemy import DateTime, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
 
 
 class TimestampMixin:
@@ -49,3 +49,38 @@ class UUIDMixin:
     """
 
     uuid: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False, default=uuid4, unique=True)
+
+
+class CreatedAtPartitionMixin:
+    """
+    Mixin для моделей, таблицы которых секционированы по диапазону created_at.
+
+    Notes:
+        - Mixin должен стоять первым в списке базовых классов, чтобы переопределить поля BaseModel и миксинов.
+        - Ключ секционирования обязан входить в первичный ключ и уникальные ограничения, поэтому в БД
+          первичный ключ составной (id, created_at), а uuid уникален в паре с created_at.
+        - Для ORM идентификатором сущности остается id, значения которого выдает общая последовательность.
+
+    Attributes:
+        id (int): Идентификатор сущности.
+        created_at (datetime): Дата и время создания записи. Ключ секционирования.
+        uuid (UUID): Уникальный идентификатор записи.
+    """
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False
+    )
+    uuid: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False, default=uuid4)
+
+    @declared_attr.directive
+    @classmethod
+    def __table_args__(cls) -> tuple:
+        """Уникальность uuid в пределах ключа секционирования и параметры секционирования."""
+        return UniqueConstraint("uuid", "created_at"), {"postgresql_partition_by": "RANGE (created_at)"}
+
+    @declared_attr.directive
+    @classmethod
+    def __mapper_args__(cls) -> dict:
+        """Идентичность сущности в ORM определяется только id."""
+        return {"primary_key": ["id"]}
@@ -0,0 +1,274 @@
+# pylint: disable=too-few-public-methods
+"""Модуль обслуживания секционированных по времени таблиц."""
+
+from datetime import UTC, date, datetime, time, timedelta
+
+from pydantic import BaseModel, Field
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .consts import PARTITION_NAME_DATE_FORMAT, PARTITION_NAME_DELIMITER, PARTITION_PREMAKE_DAYS
+
+# Экранирование идентификаторов в DDL
+_identifier_preparer = postgresql.dialect().identifier_preparer
+
+
+class PartitionPolicy(BaseModel):
+    """
+    Политика обслуживания таблицы, секционированной посуточно по created_at.
+
+    Attributes:
+        table (str): Имя родительской таблицы.
+        retention (timedelta): Сколько записи остаются нужны после создания.
+        premake_days (int): На сколько суток вперед создавать секции.
+    """
+
+    table: str
+    retention: timedelta
+    premake_days: int = PARTITION_PREMAKE_DAYS
+
+
+class PartitionMaintenanceReport(BaseModel):
+    """
+    Отчет об обслуживании секционированной таблицы.
+
+    Attributes:
+        table (str): Имя родительской таблицы.
+        created (list[str]): Созданные секции.
+        dropped (list[str]): Удаленные секции.
+        reclaimed_rows (int): Количество строк в удаленных секциях.
+        reclaimed_bytes (int): Размер удаленных секций вместе с индексами.
+    """
+
+    table: str
+    created: list[str] = Field(default_factory=list)
+    dropped: list[str] = Field(default_factory=list)
+    reclaimed_rows: int = 0
+    reclaimed_bytes: int = 0
+
+
+def get_partition_name(table: str, day: date) -> str:
+    """
+    Возвращает имя суточной секции таблицы.
+
+    Args:
+        table (str): Имя родительской таблицы.
+        day (date): Сутки (UTC), которые покрывает секция.
+
+    Returns:
+        (str): Имя секции.
+
+    Examples:
+        >>> get_partition_name("confirmations", date(2026, 10, 19))
+        >>> # "confirmations_p20261019"
+    """
+    return f"{table}{PARTITION_NAME_DELIMITER}{day.strftime(PARTITION_NAME_DATE_FORMAT)}"
+
+
+def get_partition_day(table: str, partition_name: str) -> date | None:
+    """
+    Возвращает сутки, которые покрывает секция, по ее имени.
+
+    Args:
+        table (str): Имя родительской таблицы.
+        partition_name (str): Имя секции.
+
+    Returns:
+        (date | None): Сутки секции. None, если имя не относится к суточным секциям таблицы.
+
+    Examples:
+        >>> get_partition_day("confirmations", "confirmations_p20261019")
+        >>> # date(2026, 10, 19)
+        >>> get_partition_day("confirmations", "confirmations_default")
+        >>> # None
+    """
+    prefix: str = f"{table}{PARTITION_NAME_DELIMITER}"
+
+    if not partition_name.startswith(prefix):
+        return None
+
+    suffix: str = partition_name.removeprefix(prefix)
+
+    try:
+        day: date = datetime.strptime(suffix, PARTITION_NAME_DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+    # strptime допускает даты без ведущих нулей, поэтому имя сверяется с каноническим
+    return day if get_partition_name(table, day) == partition_name else None
+
+
+def get_partition_bounds(day: date) -> tuple[datetime, datetime]:
+    """
+    Возвращает границы диапазона суточной секции.
+
+    Args:
+        day (date): Сутки (UTC), которые покрывает секция.
+
+    Returns:
+        (tuple[datetime, datetime]): Нижняя (включительно) и верхняя (не включительно) границы.
+    """
+    lower_bound: datetime = datetime.combine(day, time.min, tzinfo=UTC)
+
+    return lower_bound, lower_bound + timedelta(days=1)
+
+
+def is_partition_expired(day: date, retention: timedelta, now: datetime) -> bool:
+    """
+    Проверяет, что все записи секции старше срока хранения.
+
+    Args:
+        day (date): Сутки (UTC), которые покрывает секция.
+        retention (timedelta): Срок хранения записей.
+        now (datetime): Текущее время.
+
+    Returns:
+        (bool): True, если секцию можно удалить целиком.
+    """
+    _, upper_bound = get_partition_bounds(day)
+
+    return upper_bound <= now - retention
+
+
+class PartitionManager:
+    """
+    Менеджер секций таблиц, секционированных посуточно по created_at.
+
+    Notes:
+        - Устаревшие данные удаляются отсоединением и удалением секции целиком, а не через DELETE.
+        - После каждой операции выполняется commit, чтобы не удерживать блокировку родительской таблицы.
+
+    Attributes:
+        _session (AsyncSession): Сессия базы данных.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Инициализация менеджера.
+
+        Args:
+            session (AsyncSession): Сессия базы данных.
+        """
+        self._session: AsyncSession = session
+
+    async def maintain(self, policy: PartitionPolicy, now: datetime | None = None) -> PartitionMaintenanceReport:
+        """
+        Создает секции на будущие сутки и удаляет секции с устаревшими записями.
+
+        Args:
+            policy (PartitionPolicy): Политика обслуживания таблицы.
+            now (datetime | None): Текущее время. По умолчанию текущее время UTC.
+
+        Returns:
+            (PartitionMaintenanceReport): Отчет об обслуживании.
+
+        Examples:
+            >>> async def maintain_confirmations(session: AsyncSession) -> PartitionMaintenanceReport:
+            ...     policy = PartitionPolicy(table="confirmations", retention=timedelta(days=7))
+            ...     return await PartitionManager(session).maintain(policy)
+        """
+        current_time: datetime = now or datetime.now(UTC)
+        report: PartitionMaintenanceReport = PartitionMaintenanceReport(table=policy.table)
+        partitions: set[str] = await self._get_partitions(policy.table)
+        today: date = current_time.astimezone(UTC).date()
+
+        for offset in range(policy.premake_days + 1):
+            day: date = today + timedelta(days=offset)
+            partition_name: str = get_partition_name(policy.table, day)
+
+            if partition_name not in partitions:
+                await self._create_partition(policy.table, day)
+                report.created.append(partition_name)
+
+        for partition_name in sorted(partitions):
+            partition_day: date | None = get_partition_day(policy.table, partition_name)
+
+            if partition_day is None or not is_partition_expired(partition_day, policy.retention, current_time):
+                continue
+
+            rows, size = await self._drop_partition(policy.table, partition_name)
+            report.dropped.append(partition_name)
+            report.reclaimed_rows += rows
+            report.reclaimed_bytes += size
+
+        return report
+
+    async def _get_partitions(self, table: str) -> set[str]:
+        """
+        Возвращает имена секций таблицы.
+
+        Args:
+            table (str): Имя родительской таблицы.
+
+        Returns:
+            (set[str]): Имена секций.
+        """
+        result = await self._session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :table"
+            ),
+            {"table": table},
+        )
+
+        return set(result.scalars().all())
+
+    async def _create_partition(self, table: str, day: date) -> None:
+        """
+        Создает суточную секцию таблицы.
+
+        Args:
+            table (str): Имя родительской таблицы.
+            day (date): Сутки (UTC), которые покрывает секция.
+        """
+        lower_bound, upper_bound = get_partition_bounds(day)
+
+        await self._session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {_quote(get_partition_name(table, day))} PARTITION OF {_quote(table)} "
+                f"FOR VALUES FROM ('{lower_bound.isoformat()}') TO ('{upper_bound.isoformat()}')"
+            )
+        )
+        await self._session.commit()
+
+    async def _drop_partition(self, table: str, partition_name: str) -> tuple[int, int]:
+        """
+        Отсоединяет и удаляет секцию таблицы.
+
+        Args:
+            table (str): Имя родительской таблицы.
+            partition_name (str): Имя секции.
+
+        Returns:
+            (tuple[int, int]): Количество строк и размер секции в байтах на момент удаления.
+        """
+        rows: int = int(await self._session.scalar(text(f"SELECT count(*) FROM {_quote(partition_name)}")) or 0)
+        size: int = int(
+            await self._session.scalar(
+                text("SELECT pg_total_relation_size(CAST(:partition AS regclass))"),
+                {"partition": partition_name},
+            )
+            or 0
+        )
+
+        await self._session.execute(text(f"ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(partition_name)}"))
+        await self._session.execute(text(f"DROP TABLE {_quote(partition_name)}"))
+        await self._session.commit()
+
+        return rows, size
+
+
+def _quote(identifier: str) -> str:
+    """
+    Экранирует идентификатор для подстановки в DDL.
+
+    Args:
+        identifier (str): Идентификатор.
+
+    Returns:
+        (str): Экранированный идентификатор.
+    """
+    return str(_identifier_preparer.quote(identifier))
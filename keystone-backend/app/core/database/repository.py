@@ -32,12 +32,13 @@ class BaseRepository(Generic[DataModel]):
         """
         self._session_db: AsyncSession = session_db
 
-    async def create(self, data: dict) -> DataModel:
+    async def create(self, data: dict, commit: bool = True) -> DataModel:
         """
         Создание сущности.
 
         Args:
             data (dict): Данные сущности.
+            commit (bool): Зафиксировать транзакцию. Если False, изменения только отправляются в БД (flush).
 
         Returns:
             (ModelType): Данные после создания.
@@ -50,7 +51,7 @@ class BaseRepository(Generic[DataModel]):
         """
         model: DataModel = self._MODEL()
         await self._before_create(data)
-        return await self._save_entity(model, data)
+        return await self._save_entity(model, data, commit)
 
     async def get(self, entity_id: int) -> DataModel:
         """
@@ -137,13 +138,14 @@ class BaseRepository(Generic[DataModel]):
 
         return data
 
-    async def update(self, entity_id: int, new_data: dict) -> DataModel:
+    async def update(self, entity_id: int, new_data: dict, commit: bool = True) -> DataModel:
         """
         Обновление сущности.
 
         Args:
             entity_id (int): ID сущности.
             new_data (dict): Новые данные для обновления.
+            commit (bool): Зафиксировать транзакцию. Если False, изменения только отправляются в БД (flush).
 
         Returns:
             (ModelType): Данные после обновления. None, если сущности не существует.
@@ -155,7 +157,7 @@ class BaseRepository(Generic[DataModel]):
 
         await self._before_update(entity, new_data)
 
-        return await self._save_entity(entity, new_data)
+        return await self._save_entity(entity, new_data, commit)
 
     async def delete(self, entity_id: int) -> bool:
         """
@@ -203,13 +205,14 @@ class BaseRepository(Generic[DataModel]):
         """
         ...
 
-    async def _save_entity(self, model: DataModel, data: dict) -> DataModel:
+    async def _save_entity(self, model: DataModel, data: dict, commit: bool = True) -> DataModel:
         """
         Запись сущности в базу данных.
 
         Args:
             model (ModelType): Модель сущности.
             data (dict): Данные сущности для записи
+            commit (bool): Зафиксировать транзакцию. Если False, изменения только отправляются в БД (flush).
 
         Returns:
             (ModelType): Данные после записи.
@@ -219,7 +222,12 @@ class BaseRepository(Generic[DataModel]):
                 setattr(model, key, value)
 
         self._session_db.add(model)
-        await self._session_db.commit()
+
+        if commit:
+            await self._session_db.commit()
+        else:
+            await self._session_db.flush()
+
         await self._session_db.refresh(model)
 
         return model
@@ -0,0 +1,60 @@
+"""
+Модуль поиска по подстроке и с опечатками на триграммах PostgreSQL (расширение pg_trgm).
+
+Оба условия поиска обслуживаются GIN-индексом с классом операторов gin_trgm_ops: ILIKE по подстроке
+и оператор %> (слово из запроса похоже на часть текста).
+"""
+
+from sqlalchemy import ColumnElement, Float, SQLColumnExpression, func, or_
+
+from .consts import LIKE_ESCAPE_CHAR
+
+
+def escape_like(value: str) -> str:
+    """
+    Экранирует спецсимволы шаблона LIKE, чтобы строка искалась буквально.
+
+    Args:
+        value (str): Строка поиска.
+
+    Returns:
+        (str): Экранированная строка.
+    """
+    for char in (LIKE_ESCAPE_CHAR, "%", "_"):
+        value = value.replace(char, LIKE_ESCAPE_CHAR + char)
+
+    return value
+
+
+def trigram_match(column: SQLColumnExpression[str], query: str) -> ColumnElement[bool]:
+    """
+    Условие поиска: текст содержит строку поиска или похож на нее по триграммам.
+
+    Args:
+        column (SQLColumnExpression[str]): Колонка или выражение с текстом.
+        query (str): Строка поиска.
+
+    Returns:
+        (ColumnElement[bool]): Условие.
+
+    Examples:
+        >>> select(HabitModel).where(trigram_match(HabitModel.title, "зарядк"))
+    """
+    return or_(
+        column.ilike(f"%{escape_like(query)}%", escape=LIKE_ESCAPE_CHAR),
+        column.op("%>", is_comparison=True)(query),
+    )
+
+
+def trigram_rank(column: SQLColumnExpression[str], query: str) -> ColumnElement[float]:
+    """
+    Релевантность текста строке поиска: сходство строки с самой похожей частью текста, от 0 до 1.
+
+    Args:
+        column (SQLColumnExpression[str]): Колонка или выражение с текстом.
+        query (str): Строка поиска.
+
+    Returns:
+        (ColumnElement[float]): Выражение релевантности.
+    """
+    return func.word_similarity(query, column, type_=Float)
@@ -0,0 +1,138 @@
+"""Модуль счетчиков метрик приложения."""
+
+from collections import deque
+from math import ceil
+from typing import Mapping, cast
+
+from redis.exceptions import RedisError
+
+from .consts import LATENCY_PERCENTILES, LATENCY_WINDOW_SIZE, METRICS_KEY_PREFIX
+from .redis import redis_manager
+
+
+async def increment_counter(group: str, name: str, amount: int = 1) -> None:
+    """
+    Увеличивает счетчик метрики. Счетчики хранятся в Redis и общие для всех процессов приложения.
+
+    Notes:
+        - Ошибки Redis не прерывают основную операцию: метрика в этом случае теряется.
+
+    Args:
+        group (str): Группа метрик.
+        name (str): Название счетчика.
+        amount (int): Величина увеличения.
+
+    Examples:
+        >>> async def on_email_sent() -> None:
+        ...     await increment_counter("email_coalescing", "confirmation_email.sent")
+    """
+    try:
+        await redis_manager.client.hincrby(f"{METRICS_KEY_PREFIX}:{group}", name, amount)
+    except RedisError:
+        pass
+
+
+async def set_gauges(group: str, values: Mapping[str, int]) -> None:
+    """
+    Устанавливает значения метрик-состояний группы одной командой.
+
+    Notes:
+        - Ошибки Redis не прерывают основную операцию: значения в этом случае теряются.
+
+    Args:
+        group (str): Группа метрик.
+        values (Mapping[str, int]): Значения по названию метрики.
+
+    Examples:
+        >>> await set_gauges("outbox_relay", {"latency_p99_ms": 120})
+    """
+    try:
+        await redis_manager.client.hset(f"{METRICS_KEY_PREFIX}:{group}", mapping=cast(dict, values))
+    except RedisError:
+        pass
+
+
+async def get_counters() -> dict[str, dict[str, int]]:
+    """
+    Возвращает значения всех счетчиков метрик по группам.
+
+    Returns:
+        (dict[str, dict[str, int]]): Счетчики, сгруппированные по названию группы.
+
+    Examples:
+        >>> await get_counters()
+        >>> # {"email_coalescing": {"confirmation_email.sent": 10, "confirmation_email.suppressed": 4}}
+    """
+    result: dict[str, dict[str, int]] = {}
+
+    async for key in redis_manager.client.scan_iter(match=f"{METRICS_KEY_PREFIX}:*"):
+        # Клиент создан с decode_responses=True: ключи и значения хэша приходят строками
+        counters: dict[str, str] = cast(dict[str, str], await redis_manager.client.hgetall(key))
+        result[key.removeprefix(f"{METRICS_KEY_PREFIX}:")] = {name: int(value) for name, value in counters.items()}
+
+    return result
+
+
+class LatencyStats:
+    """
+    Статистика задержек операции в пределах процесса.
+
+    Notes:
+        - Перцентили считаются по последним наблюдениям (скользящее окно), количество и максимум - за все время.
+
+    Attributes:
+        _window (deque[float]): Последние наблюдения в секундах.
+        _count (int): Количество наблюдений.
+        _total (float): Сумма наблюдений в секундах.
+        _max (float): Максимальное наблюдение в секундах.
+    """
+
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE) -> None:
+        """
+        Инициализация статистики.
+
+        Args:
+            window_size (int): Количество последних наблюдений для расчета перцентилей.
+        """
+        self._window: deque[float] = deque(maxlen=window_size)
+        self._count: int = 0
+        self._total: float = 0.0
+        self._max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Добавляет наблюдение.
+
+        Args:
+            seconds (float): Задержка в секундах.
+        """
+        self._window.append(seconds)
+        self._count += 1
+        self._total += seconds
+        self._max = max(self._max, seconds)
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Возвращает текущие значения статистики в миллисекундах.
+
+        Returns:
+            (dict[str, int]): Количество, среднее, максимум и перцентили задержки.
+
+        Examples:
+            >>> stats = LatencyStats()
+            >>> stats.observe(0.002)
+            >>> stats.snapshot()
+            >>> # {"count": 1, "avg_ms": 2, "max_ms": 2, "p50_ms": 2, "p95_ms": 2, "p99_ms": 2}
+        """
+        result: dict[str, int] = {
+            "count": self._count,
+            "avg_ms": round(self._total / self._count * 1000) if self._count else 0,
+            "max_ms": round(self._max * 1000),
+        }
+        observations: list[float] = sorted(self._window)
+
+        for percentile in LATENCY_PERCENTILES:
+            value: float = observations[max(ceil(len(observations) * percentile / 100) - 1, 0)] if observations else 0.0
+            result[f"p{percentile}_ms"] = round(value * 1000)
+
+        return result
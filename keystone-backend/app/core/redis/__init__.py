@@ -0,0 +1,4 @@
+"""Пакет для работы с Redis."""
+
+from .exceptions import RedisNotInitializedException
+from .manager import RedisManager, redis_manager
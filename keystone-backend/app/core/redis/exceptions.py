@@ -0,0 +1,9 @@
+"""Модуль исключений при работе с Redis."""
+
+from app.core.exceptions import BaseHttpException
+
+
+class RedisNotInitializedException(BaseHttpException):
+    """Исключение, возникающее при обращении к неинициализированному клиенту Redis."""
+
+    _MESSAGE = "Клиент Redis не инициализирован"
@@ -0,0 +1,72 @@
+"""Модуль для работы с подключением к Redis."""
+
+from redis.asyncio import Redis
+
+from app.core.config import AppSettings, get_app_settings
+
+from .exceptions import RedisNotInitializedException
+
+app_settings: AppSettings = get_app_settings()
+
+
+class RedisManager:
+    """
+    Менеджер подключения к Redis.
+
+    Attributes:
+        _redis_url (str): URL для подключения к Redis.
+        _client (Redis | None): Асинхронный клиент Redis.
+    """
+
+    def __init__(self, redis_url: str) -> None:
+        """
+        Инициализирует менеджер Redis.
+
+        Args:
+            redis_url (str): URL для подключения к Redis.
+        """
+        self._redis_url: str = redis_url
+        self._client: Redis | None = None
+
+    @property
+    def client(self) -> Redis:
+        """
+        Возвращает клиент Redis.
+
+        Returns:
+            (Redis): Асинхронный клиент Redis.
+
+        Raises:
+            RedisNotInitializedException: Если клиент не инициализирован.
+        """
+        if self._client is None:
+            raise RedisNotInitializedException()
+
+        return self._client
+
+    def initialize(self) -> None:
+        """
+        Создает клиент Redis с общим пулом соединений.
+
+        Examples:
+            >>> from contextlib import asynccontextmanager
+            >>> from fastapi import FastAPI
+            >>> from app.core.redis import redis_manager
+            >>>
+            >>> @asynccontextmanager
+            >>> async def lifespan(_: FastAPI) -> None:
+            ...     redis_manager.initialize()
+            ...     yield
+            ...     await redis_manager.close()
+        """
+        self._client = Redis.from_url(self._redis_url, decode_responses=True)
+
+    async def close(self) -> None:
+        """Закрывает клиент Redis и его пул соединений."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+# Глобальный менеджер Redis
+redis_manager = RedisManager(app_settings.redis_url)
@@ -3,7 +3,9 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+
+from .consts import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, SEARCH_MAX_QUERY_LENGTH, SEARCH_MIN_QUERY_LENGTH
 
 
 class BaseSchema(BaseModel):
@@ -76,3 +78,21 @@ class UUIDSchemaMixin(BaseModel):
     """
 
     uuid: UUID
+
+
+class SearchQuerySchema(BaseModel):
+    """
+    Параметры поиска по тексту.
+
+    Attributes:
+        q (str): Строка поиска.
+        limit (int): Максимальное количество результатов.
+
+    Examples:
+        >>> SearchQuerySchema(q="зарядка", limit=10)
+    """
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    q: str = Field(..., min_length=SEARCH_MIN_QUERY_LENGTH, max_length=SEARCH_MAX_QUERY_LENGTH)
+    limit: int = Field(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT)
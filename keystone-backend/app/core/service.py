@@ -15,6 +15,10 @@ class BaseService(Generic[Repository, InputData, DataModel]):
     """
     Базовый сервис. Все сервисы должны наследоваться от него.
 
+    Notes:
+        - Создание и обновление сущности фиксируются одной транзакцией вместе с действиями _after_operation,
+          поэтому записи, сделанные в обработчике (например, в outbox), не расходятся с сущностью.
+
     Attributes:
         _REPOSITORY (type[RepositoryType]): Репозиторий для работы с базой данных.
         _db (AsyncSession): Сессия подключения к базе данных.
@@ -57,8 +61,9 @@ class BaseService(Generic[Repository, InputData, DataModel]):
             ...         return await self.create(payload)
         """
         await self._validate_payload(ServiceOperation.CREATE, payload)
-        new_entity: DataModel = await self._repository.create(payload.model_dump())
+        new_entity: DataModel = await self._repository.create(payload.model_dump(), commit=False)
         await self._after_operation(new_entity, payload, ServiceOperation.CREATE)
+        await self._db.commit()
 
         return new_entity
 
@@ -79,8 +84,9 @@ class BaseService(Generic[Repository, InputData, DataModel]):
             ...         return await self.update(user_id, new_data)
         """
         await self._validate_payload(ServiceOperation.UPDATE, payload)
-        entity: DataModel = await self._repository.update(entity_id, payload.model_dump())
+        entity: DataModel = await self._repository.update(entity_id, payload.model_dump(), commit=False)
         await self._after_operation(entity, payload, ServiceOperation.UPDATE)
+        await self._db.commit()
 
         return entity
 
@@ -1,5 +1,8 @@
 """Модуль с вспомогательными функциями."""
 
+from functools import cache
+from zoneinfo import available_timezones
+
 
 def camel_case_to_snake_case(value: str) -> str:
     """
@@ -19,3 +22,18 @@ def camel_case_to_snake_case(value: str) -> str:
         return "".join(["_" + i.lower() if i.isupper() else i for i in value]).lstrip("_")
 
     return value
+
+
+@cache
+def get_timezones() -> frozenset[str]:
+    """
+    Возвращает названия часовых поясов базы IANA. Список читается с диска один раз за процесс.
+
+    Returns:
+        (frozenset[str]): Названия часовых поясов.
+
+    Examples:
+        >>> "Europe/Moscow" in get_timezones()
+        >>> # True
+    """
+    return frozenset(available_timezones())
@@ -1 +1,6 @@
 from .model import Habit as HabitModel
+from .model import HabitCompletion as HabitCompletionModel
+from .model import HabitCompletionRollup as HabitCompletionRollupModel
+from .model import HabitDayClose as HabitDayCloseModel
+from .model import HabitHistorySegment as HabitHistorySegmentModel
+from .routes import habit_routes
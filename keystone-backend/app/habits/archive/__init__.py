@@ -0,0 +1,4 @@
+"""Пакет архива привычек и отметок."""
+
+from .repository import HabitArchiveRepository
+from .service import HabitArchiveService
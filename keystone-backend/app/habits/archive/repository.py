@@ -0,0 +1,279 @@
+"""Модуль репозитория архива привычек."""
+
+from datetime import date, datetime
+from typing import Collection, Sequence, cast
+
+from sqlalchemy import ColumnElement, CursorResult, Insert, Row, Select, Table, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncResult
+
+from app.core.database import BaseRepository
+
+from ..model import Habit as HabitModel
+from ..model import HabitCompletion as HabitCompletionModel
+from ..model import habit_completions_archive, habits_archive
+from ..repository import HabitRepository
+from ..schemas import HabitListFilterData
+
+
+class HabitArchiveRepository(BaseRepository[HabitModel]):
+    """
+    Репозиторий архива привычек и отметок. Строки переносятся между рабочими таблицами и архивом одним
+    запросом: DELETE ... RETURNING в CTE и INSERT из него, поэтому строка в каждый момент видна ровно в одной таблице.
+    """
+
+    _MODEL = HabitModel
+
+    @staticmethod
+    def build_move_query(source: Table, target: Table, *conditions: ColumnElement[bool]) -> Insert:
+        """
+        Запрос переноса строк между таблицей и ее архивом с сохранением ID.
+
+        Args:
+            source (Table): Таблица, из которой строки удаляются.
+            target (Table): Таблица, в которую строки вставляются.
+            conditions (ColumnElement[bool]): Условия на строки source.
+
+        Returns:
+            (Insert): Запрос переноса.
+        """
+        moved = delete(source).where(*conditions).returning(*source.c).cte("moved")
+        names: list[str] = [target_column.name for target_column in target.c]
+
+        return insert(target).from_select(names, select(*(moved.c[name] for name in names))).add_cte(moved)
+
+    async def get_stale_habit_ids(self, habit_ids: Sequence[int], before: datetime) -> list[int]:
+        """
+        Выбирает из пакета архивные неудаленные привычки, не менявшиеся с момента before, и блокирует их
+        до конца транзакции. Привычки, заблокированные отметкой или изменением, пропускаются до следующего запуска.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек пакета.
+            before (datetime): Граница времени последнего изменения.
+
+        Returns:
+            (list[int]): ID привычек по возрастанию.
+        """
+        query = (
+            select(HabitModel.id)
+            .where(
+                HabitModel.id.in_(habit_ids),
+                HabitModel.is_archived,
+                HabitModel.deleted_at.is_(None),
+                HabitModel.updated_at < before,
+            )
+            .order_by(HabitModel.id)
+            .with_for_update(skip_locked=True)
+        )
+        return list(await self._session_db.scalars(query))
+
+    async def archive_habits(self, habit_ids: Sequence[int]) -> int:
+        """
+        Переносит привычки в архив вместе со всеми отметками. Сегменты истории привычек удаляются
+        каскадно и строятся заново при возврате. Транзакция не фиксируется.
+
+        Args:
+            habit_ids (Sequence[int]): ID заблокированных привычек (get_stale_habit_ids).
+
+        Returns:
+            (int): Количество перенесенных привычек.
+        """
+        if not habit_ids:
+            return 0
+
+        completions: Table = HabitCompletionModel.__table__
+        await self._session_db.execute(
+            self.build_move_query(completions, habit_completions_archive, completions.c.habit_id.in_(habit_ids))
+        )
+        habits: Table = HabitModel.__table__
+        query = self.build_move_query(habits, habits_archive, habits.c.id.in_(habit_ids))
+        result = cast(CursorResult, await self._session_db.execute(query))
+
+        return result.rowcount
+
+    async def archive_completions(self, habit_ids: Sequence[int], before: date) -> int:
+        """
+        Переносит в архив отметки привычек за дни раньше before. Отметки каждой привычки выбираются
+        по индексу (habit_id, completed_on). Транзакция не фиксируется.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек.
+            before (date): Первый день, отметки которого остаются в рабочей таблице.
+
+        Returns:
+            (int): Количество перенесенных отметок.
+        """
+        completions: Table = HabitCompletionModel.__table__
+        query = self.build_move_query(
+            completions,
+            habit_completions_archive,
+            completions.c.habit_id.in_(habit_ids),
+            completions.c.completed_on < before,
+        )
+        result = cast(CursorResult, await self._session_db.execute(query))
+
+        return result.rowcount
+
+    async def restore_habit(self, habit_id: int, user_id: int, since: date) -> bool:
+        """
+        Возвращает привычку из архива в рабочую таблицу вместе с отметками начиная с дня since. Более старые
+        отметки остаются в архиве. Транзакция не фиксируется.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            since (date): Первый день отметок, которые возвращаются.
+
+        Returns:
+            (bool): True, если привычка была в архиве.
+        """
+        habits: Table = HabitModel.__table__
+        archived = habits_archive.c
+        query = self.build_move_query(habits_archive, habits, archived.id == habit_id, archived.user_id == user_id)
+        result = cast(CursorResult, await self._session_db.execute(query))
+
+        if not result.rowcount:
+            return False
+
+        completions = habit_completions_archive.c
+        await self._session_db.execute(
+            self.build_move_query(
+                habit_completions_archive,
+                HabitCompletionModel.__table__,
+                completions.habit_id == habit_id,
+                completions.completed_on >= since,
+            )
+        )
+        return True
+
+    async def get_user_habit(self, habit_id: int, user_id: int) -> Row | None:
+        """
+        Получение привычки пользователя из архива.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (Row | None): Строка привычки. None, если привычки нет в архиве или она принадлежит другому пользователю.
+        """
+        query = select(habits_archive).where(habits_archive.c.id == habit_id, habits_archive.c.user_id == user_id)
+        return (await self._session_db.execute(query)).first()
+
+    async def get_user_habit_ids(self, habit_ids: Collection[int], user_id: int) -> set[int]:
+        """
+        Возвращает ID привычек пользователя, которые находятся в архиве.
+
+        Args:
+            habit_ids (Collection[int]): ID привычек.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (set[int]): ID привычек в архиве.
+        """
+        if not habit_ids:
+            return set()
+
+        query = select(habits_archive.c.id).where(
+            habits_archive.c.id.in_(habit_ids), habits_archive.c.user_id == user_id
+        )
+        return set(await self._session_db.scalars(query))
+
+    async def get_page(self, user_id: int, filters: HabitListFilterData) -> Sequence[Row]:
+        """
+        Получение страницы привычек пользователя из архива.
+
+        Args:
+            user_id (int): ID пользователя.
+            filters (HabitListFilterData): Фильтры и страница.
+
+        Returns:
+            (Sequence[Row]): Привычки по возрастанию ID, на одну больше страницы, если есть следующая.
+        """
+        return (await self._session_db.execute(HabitRepository.build_list_query(user_id, filters, archive=True))).all()
+
+    @staticmethod
+    def build_user_habits_query(user_id: int) -> Select:
+        """
+        Запрос привычек пользователя в архиве. Обслуживается индексом (user_id, id).
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            (Select): Запрос привычек по возрастанию ID.
+        """
+        return select(habits_archive).where(habits_archive.c.user_id == user_id).order_by(habits_archive.c.id)
+
+    @staticmethod
+    def build_user_completions_query(user_id: int) -> Select:
+        """
+        Запрос отметок пользователя в архиве. Отметки удаленных привычек не выбираются.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            (Select): Запрос отметок по возрастанию ID привычки и дня.
+        """
+        completions = habit_completions_archive.c
+        return (
+            select(habit_completions_archive)
+            .outerjoin(HabitModel, HabitModel.id == completions.habit_id)
+            .where(completions.user_id == user_id, HabitModel.deleted_at.is_(None))
+            .order_by(completions.habit_id, completions.completed_on)
+        )
+
+    async def get_user_habits(self, user_id: int) -> Sequence[Row]:
+        """
+        Получение привычек пользователя в архиве.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            (Sequence[Row]): Привычки по возрастанию ID.
+        """
+        return (await self._session_db.execute(self.build_user_habits_query(user_id))).all()
+
+    async def get_user_completions(self, user_id: int) -> Sequence[Row]:
+        """
+        Получение отметок пользователя в архиве: отметок привычек архива и старых отметок рабочих привычек.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            (Sequence[Row]): Отметки по возрастанию ID привычки и дня.
+        """
+        return (await self._session_db.execute(self.build_user_completions_query(user_id))).all()
+
+    async def stream_user_habits(self, user_id: int, batch_size: int) -> AsyncResult:
+        """
+        Чтение привычек пользователя в архиве серверным курсором: строки приходят порциями.
+
+        Args:
+            user_id (int): ID пользователя.
+            batch_size (int): Строк в порции.
+
+        Returns:
+            (AsyncResult): Привычки по возрастанию ID.
+        """
+        return await self._session_db.stream(
+            self.build_user_habits_query(user_id), execution_options={"yield_per": batch_size}
+        )
+
+    async def stream_user_completions(self, user_id: int, batch_size: int) -> AsyncResult:
+        """
+        Чтение отметок пользователя в архиве серверным курсором: строки приходят порциями.
+
+        Args:
+            user_id (int): ID пользователя.
+            batch_size (int): Строк в порции.
+
+        Returns:
+            (AsyncResult): Отметки по возрастанию ID привычки и дня.
+        """
+        return await self._session_db.stream(
+            self.build_user_completions_query(user_id), execution_options={"yield_per": batch_size}
+        )
@@ -0,0 +1,57 @@
+"""Модуль сервиса архива привычек."""
+
+from datetime import UTC, date, datetime, timedelta
+from typing import Sequence
+
+from app.core import BaseService
+
+from ..consts import ARCHIVE_COMPLETIONS_AFTER_DAYS, ARCHIVE_HABITS_AFTER_DAYS
+from ..model import Habit as HabitModel
+from ..schemas import HabitCreateData
+from .repository import HabitArchiveRepository
+
+
+class HabitArchiveService(BaseService[HabitArchiveRepository, HabitCreateData, HabitModel]):
+    """Сервис архива привычек."""
+
+    _REPOSITORY = HabitArchiveRepository
+
+    async def archive_batch(self, habit_ids: Sequence[int], now: datetime | None = None) -> tuple[int, int]:
+        """
+        Перенос в архив пакета привычек одной транзакцией: архивных привычек, не менявшихся дольше
+        ARCHIVE_HABITS_AFTER_DAYS, со всеми отметками и отметок остальных привычек старше
+        ARCHIVE_COMPLETIONS_AFTER_DAYS. Повторный запуск переносит только то, что еще не перенесено.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек пакета.
+            now (datetime | None): Текущее время. По умолчанию - текущее время сервера.
+
+        Returns:
+            (tuple[int, int]): Количество перенесенных привычек и отметок.
+        """
+        now = now or datetime.now(UTC)
+        stale: list[int] = await self._repository.get_stale_habit_ids(
+            habit_ids, now - timedelta(days=ARCHIVE_HABITS_AFTER_DAYS)
+        )
+        habits: int = await self._repository.archive_habits(stale)
+        completions: int = await self._repository.archive_completions(
+            habit_ids, now.date() - timedelta(days=ARCHIVE_COMPLETIONS_AFTER_DAYS)
+        )
+        await self._db.commit()
+
+        return habits, completions
+
+    async def restore(self, habit_id: int, user_id: int) -> bool:
+        """
+        Возвращает привычку из архива в рабочую таблицу с отметками за последние ARCHIVE_COMPLETIONS_AFTER_DAYS.
+        Статистика и история привычки не пересчитываются. Транзакция не фиксируется.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (bool): True, если привычка была в архиве.
+        """
+        since: date = date.today() - timedelta(days=ARCHIVE_COMPLETIONS_AFTER_DAYS)
+        return await self._repository.restore_habit(habit_id, user_id, since)
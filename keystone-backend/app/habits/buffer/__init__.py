@@ -0,0 +1,5 @@
+"""Пакет буфера отметок привычек в Redis Stream."""
+
+from .repository import CheckInBufferRepository
+from .service import CheckInBufferService
+from .stream import BufferedMessage, CheckInBuffer, get_pending_key
@@ -0,0 +1,32 @@
+"""Модуль репозитория буфера отметок привычек."""
+
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.database import BaseRepository
+
+from ..model import HabitCompletion as HabitCompletionModel
+
+
+class CheckInBufferRepository(BaseRepository[HabitCompletionModel]):
+    """Репозиторий отметок, записанных в базу из буфера."""
+
+    _MODEL = HabitCompletionModel
+
+    async def get_written_buffer_ids(self, buffer_ids: Sequence[UUID]) -> set[UUID]:
+        """
+        Возвращает ID отметок буфера, которые уже записаны в базу.
+
+        Args:
+            buffer_ids (Sequence[UUID]): ID отметок в буфере.
+
+        Returns:
+            (set[UUID]): Записанные ID.
+        """
+        if not buffer_ids:
+            return set()
+
+        query = select(HabitCompletionModel.buffer_id).where(HabitCompletionModel.buffer_id.in_(buffer_ids))
+        return {buffer_id for buffer_id in await self._session_db.scalars(query) if buffer_id is not None}
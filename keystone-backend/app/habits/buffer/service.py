@@ -0,0 +1,125 @@
+"""Модуль сервиса буфера отметок привычек."""
+
+import logging
+from datetime import date
+from typing import Sequence
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core import BaseService
+from app.core.config import AppSettings, get_app_settings
+from app.core.metrics import increment_counter
+from app.core.redis import redis_manager
+
+from .. import exceptions as exc
+from ..consts import CHECK_IN_BUFFER_METRICS
+from ..model import Habit as HabitModel
+from ..model import HabitCompletion as HabitCompletionModel
+from ..schemas import HabitCheckInEntry
+from ..streaks import apply_check_in
+from .repository import CheckInBufferRepository
+from .stream import CheckInBuffer
+
+logger = logging.getLogger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+
+class CheckInBufferService(BaseService[CheckInBufferRepository, HabitCheckInEntry, HabitCompletionModel]):
+    """Сервис буфера отметок привычек."""
+
+    _REPOSITORY = CheckInBufferRepository
+
+    async def merge_pending(self, user_id: int, habits: Sequence[HabitModel], today: date) -> bool:
+        """
+        Применяет к статистике привычек отметки пользователя, которые ждут записи в базу в буфере: чтения видят
+        свои отметки до их записи. Привычки отсоединяются от сессии, чтобы примененные отметки не попали в базу.
+
+        Args:
+            user_id (int): ID пользователя.
+            habits (Sequence[HabitModel]): Привычки пользователя, загруженные в сессию сервиса.
+            today (date): Текущий день пользователя.
+
+        Returns:
+            (bool): True, если буфер включен и доступен. False, если отметки пишутся сразу в базу.
+        """
+        if not app_settings.CHECK_IN_BUFFER_ENABLED:
+            return False
+
+        try:
+            pending: list[HabitCheckInEntry] = await CheckInBuffer(redis_manager.client).get_pending(user_id)
+        except RedisError:
+            logger.warning("Check-in buffer is unavailable, pending check-ins are not merged")
+            return False
+
+        by_id: dict[int, HabitModel] = {habit.id: habit for habit in habits}
+
+        for habit in habits:
+            if habit in self._db:
+                self._db.expunge(habit)
+
+        for entry in pending:
+            if entry.habit_id in by_id:
+                apply_check_in(by_id[entry.habit_id], entry.completed_on, today, is_partial=entry.is_partial)
+
+        return True
+
+    async def append(self, entry: HabitCheckInEntry) -> bool:
+        """
+        Добавление отметки в буфер.
+
+        Args:
+            entry (HabitCheckInEntry): Отметка.
+
+        Returns:
+            (bool): True, если Redis подтвердил запись отметки на диск. False - отметку нужно записать в базу
+                сразу, с тем же buffer_id.
+
+        Raises:
+            CheckInBufferUnavailableException: Если буфер перестал отвечать во время записи отметки.
+        """
+        buffer: CheckInBuffer = CheckInBuffer(redis_manager.client, app_settings.CHECK_IN_BUFFER_WAIT_AOF)
+
+        try:
+            durable: bool = await buffer.append(entry)
+        except RedisError as error:
+            raise exc.CheckInBufferUnavailableException() from error
+
+        if not durable:
+            logger.warning("Check-in %s is not confirmed on disk, writing it directly", entry.buffer_id)
+            await increment_counter(CHECK_IN_BUFFER_METRICS, "not_durable")
+            return False
+
+        await increment_counter(CHECK_IN_BUFFER_METRICS, "buffered")
+
+        return True
+
+    @staticmethod
+    async def remove_pending(entry: HabitCheckInEntry) -> None:
+        """
+        Удаляет отметку, записанную в базу сразу, из хэша ожидающих отметок: она не должна второй раз попасть
+        в статистику чтений. Если Redis недоступен, отметка остается в хэше до записи буфера.
+
+        Args:
+            entry (HabitCheckInEntry): Отметка.
+        """
+        try:
+            await CheckInBuffer(redis_manager.client).remove_pending(entry)
+        except RedisError:
+            logger.warning("Check-in %s stays pending until the buffer is flushed", entry.buffer_id)
+
+    async def filter_written(self, entries: Sequence[HabitCheckInEntry]) -> list[HabitCheckInEntry]:
+        """
+        Отбрасывает отметки, уже записанные в базу при прошлой доставке или сразу при добавлении в буфер.
+
+        Args:
+            entries (Sequence[HabitCheckInEntry]): Отметки в порядке буфера.
+
+        Returns:
+            (list[HabitCheckInEntry]): Незаписанные отметки в том же порядке.
+        """
+        written: set[UUID] = await self._repository.get_written_buffer_ids(
+            [entry.buffer_id for entry in entries if entry.buffer_id is not None]
+        )
+        return [entry for entry in entries if entry.buffer_id not in written]
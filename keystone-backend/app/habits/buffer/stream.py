@@ -0,0 +1,281 @@
+"""
+Модуль буфера отметок привычек в Redis Stream.
+
+Отметка попадает в поток и в хэш ожидающих отметок пользователя одной транзакцией Redis. Поток читает
+процесс записи (app.worker.check_in_flusher) через группу читателей и пишет отметки в базу пакетами, хэш
+нужен чтениям: статистика учитывает отметки, которые еще не записаны в базу.
+"""
+
+from typing import Any, Sequence, cast
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ResponseError
+
+from ..consts import (
+    CHECK_IN_AOF_TIMEOUT_MS,
+    CHECK_IN_CLAIM_IDLE_MS,
+    CHECK_IN_DEAD_LETTER_KEY,
+    CHECK_IN_PENDING_KEY_PREFIX,
+    CHECK_IN_STREAM_GROUP,
+    CHECK_IN_STREAM_KEY,
+)
+from ..schemas import HabitCheckInEntry
+
+# Сообщение потока: ID в потоке и отметка. None - сообщение, которое не удалось разобрать
+BufferedMessage = tuple[str, HabitCheckInEntry | None]
+
+# Сообщения в ответе Redis: ID и поля. Поля None - сообщение удалено из потока, но осталось в группе
+_StreamMessages = list[tuple[str, dict[str, str] | None]]
+
+# Поле сообщения потока с отметкой в JSON
+_ENTRY_FIELD: str = "entry"
+
+
+def get_pending_key(user_id: int) -> str:
+    """
+    Возвращает ключ хэша отметок пользователя, ожидающих записи в базу.
+
+    Args:
+        user_id (int): ID пользователя.
+
+    Returns:
+        (str): Ключ Redis.
+    """
+    return f"{CHECK_IN_PENDING_KEY_PREFIX}:{user_id}"
+
+
+class CheckInBuffer:
+    """
+    Буфер отметок привычек в Redis Stream.
+
+    Notes:
+        - Подтверждение записи в AOF (WAITAOF) требует Redis 7.2 с appendonly yes.
+        - Сообщение удаляется из потока и хэша только после записи отметки в базу, поэтому после падения
+          процесса записи отметки доставляются повторно. Повторы отсекаются по buffer_id отметки.
+        - Отметки, которые не удалось записать, переносятся в поток недоставленных отметок вместе с причиной.
+
+    Attributes:
+        _client (Redis): Асинхронный клиент Redis.
+        _wait_aof (bool): Ждать записи отметки в AOF перед подтверждением.
+    """
+
+    def __init__(self, client: Redis, wait_aof: bool = True) -> None:
+        """
+        Инициализация буфера.
+
+        Args:
+            client (Redis): Асинхронный клиент Redis с decode_responses=True.
+            wait_aof (bool): Ждать записи отметки в AOF перед подтверждением.
+        """
+        self._client: Redis = client
+        self._wait_aof: bool = wait_aof
+
+    async def append(self, entry: HabitCheckInEntry) -> bool:
+        """
+        Добавляет отметку в поток и в хэш ожидающих отметок пользователя одной транзакцией.
+
+        Args:
+            entry (HabitCheckInEntry): Отметка с заполненным buffer_id.
+
+        Returns:
+            (bool): True, если запись подтверждена на диске (или ожидание AOF выключено). False, если
+                отметка в памяти Redis, но AOF не записан за время ожидания.
+        """
+        payload: str = entry.model_dump_json()
+
+        async with self._client.pipeline(transaction=True) as pipeline:
+            pipeline.xadd(CHECK_IN_STREAM_KEY, {_ENTRY_FIELD: payload})
+            pipeline.hset(get_pending_key(entry.user_id), str(entry.buffer_id), payload)
+            await pipeline.execute()
+
+        if not self._wait_aof:
+            return True
+
+        # Ответ WAITAOF: количество локальных копий и реплик, записавших AOF
+        local, _ = cast(list[int], await self._client.execute_command("WAITAOF", 1, 0, CHECK_IN_AOF_TIMEOUT_MS))
+        return int(local) >= 1
+
+    async def remove_pending(self, entry: HabitCheckInEntry) -> None:
+        """
+        Удаляет отметку из хэша ожидающих отметок пользователя. Сообщение остается в потоке: процесс записи
+        пропустит его по buffer_id, если отметка уже записана в базу.
+
+        Args:
+            entry (HabitCheckInEntry): Отметка.
+        """
+        await self._client.hdel(get_pending_key(entry.user_id), str(entry.buffer_id))
+
+    async def get_pending(self, user_id: int) -> list[HabitCheckInEntry]:
+        """
+        Возвращает отметки пользователя, ожидающие записи в базу.
+
+        Args:
+            user_id (int): ID пользователя.
+
+        Returns:
+            (list[HabitCheckInEntry]): Отметки по возрастанию дня выполнения: в таком порядке их можно
+                применить к статистике привычки.
+        """
+        payloads: list[str] = cast(list[str], await self._client.hvals(get_pending_key(user_id)))
+        entries: list[HabitCheckInEntry] = [HabitCheckInEntry.model_validate_json(payload) for payload in payloads]
+
+        return sorted(entries, key=lambda entry: entry.completed_on)
+
+    async def create_group(self) -> None:
+        """Создает поток и группу читателей, если их еще нет."""
+        try:
+            await self._client.xgroup_create(CHECK_IN_STREAM_KEY, CHECK_IN_STREAM_GROUP, id="0", mkstream=True)
+        except ResponseError as error:
+            if "BUSYGROUP" not in str(error):
+                raise
+
+    async def read(
+        self, consumer: str, count: int, block_ms: int | None = None, delivered: bool = False
+    ) -> list[BufferedMessage]:
+        """
+        Читает сообщения потока от имени читателя группы.
+
+        Args:
+            consumer (str): Имя читателя.
+            count (int): Максимальное количество сообщений.
+            block_ms (int | None): Ожидание новых сообщений в миллисекундах. None - не ждать.
+            delivered (bool): Прочитать сообщения, уже доставленные читателю, но не подтвержденные.
+
+        Returns:
+            (list[BufferedMessage]): Сообщения в порядке потока.
+        """
+        # Ответ XREADGROUP: пары (поток, сообщения) или None, если сообщений нет
+        response = cast(
+            list[tuple[str, _StreamMessages]] | None,
+            await self._client.xreadgroup(
+                CHECK_IN_STREAM_GROUP,
+                consumer,
+                {CHECK_IN_STREAM_KEY: "0" if delivered else ">"},
+                count=count,
+                block=None if delivered else block_ms,
+            ),
+        )
+
+        return [self._parse(message_id, fields) for _, messages in response or () for message_id, fields in messages]
+
+    async def claim_stale(self, consumer: str, count: int) -> list[BufferedMessage]:
+        """
+        Забирает сообщения, которые другой читатель получил, но не подтвердил дольше допустимого простоя.
+
+        Args:
+            consumer (str): Имя читателя.
+            count (int): Максимальное количество сообщений.
+
+        Returns:
+            (list[BufferedMessage]): Сообщения в порядке потока.
+        """
+        # Ответ XAUTOCLAIM: ID продолжения обхода и забранные сообщения. Redis 7 добавляет третьим элементом
+        # ID сообщений, удаленных из потока
+        response = cast(
+            list[Any],
+            await self._client.xautoclaim(
+                CHECK_IN_STREAM_KEY, CHECK_IN_STREAM_GROUP, consumer, CHECK_IN_CLAIM_IDLE_MS, count=count
+            ),
+        )
+        messages: _StreamMessages = response[1]
+
+        return [self._parse(message_id, fields) for message_id, fields in messages]
+
+    async def get_delivery_counts(self, consumer: str, messages: Sequence[BufferedMessage]) -> dict[str, int]:
+        """
+        Возвращает количество доставок неподтвержденных сообщений читателя.
+
+        Args:
+            consumer (str): Имя читателя.
+            messages (Sequence[BufferedMessage]): Сообщения в порядке потока.
+
+        Returns:
+            (dict[str, int]): Количество доставок по ID сообщения. Подтвержденных сообщений в нем нет.
+        """
+        if not messages:
+            return {}
+
+        pending = await self._client.xpending_range(
+            CHECK_IN_STREAM_KEY,
+            CHECK_IN_STREAM_GROUP,
+            min=messages[0][0],
+            max=messages[-1][0],
+            count=len(messages),
+            consumername=consumer,
+        )
+
+        return {str(item["message_id"]): int(item["times_delivered"]) for item in pending}
+
+    async def acknowledge(self, messages: Sequence[BufferedMessage]) -> None:
+        """
+        Подтверждает обработку сообщений: удаляет их из группы, потока и хэшей ожидающих отметок одной транзакцией.
+
+        Args:
+            messages (Sequence[BufferedMessage]): Обработанные сообщения.
+        """
+        if not messages:
+            return
+
+        async with self._client.pipeline(transaction=True) as pipeline:
+            self._remove(pipeline, messages)
+            await pipeline.execute()
+
+    async def dead_letter(self, messages: Sequence[tuple[BufferedMessage, str]]) -> None:
+        """
+        Переносит сообщения в поток недоставленных отметок и удаляет их из буфера одной транзакцией.
+
+        Args:
+            messages (Sequence[tuple[BufferedMessage, str]]): Сообщения и причины, по которым они не записаны.
+        """
+        if not messages:
+            return
+
+        async with self._client.pipeline(transaction=True) as pipeline:
+            for (message_id, entry), reason in messages:
+                pipeline.xadd(
+                    CHECK_IN_DEAD_LETTER_KEY,
+                    {
+                        "message_id": message_id,
+                        _ENTRY_FIELD: entry.model_dump_json() if entry is not None else "",
+                        "reason": reason,
+                    },
+                )
+
+            self._remove(pipeline, [message for message, _ in messages])
+            await pipeline.execute()
+
+    @staticmethod
+    def _remove(pipeline: Pipeline, messages: Sequence[BufferedMessage]) -> None:
+        """
+        Добавляет в транзакцию удаление сообщений из группы, потока и хэшей ожидающих отметок.
+
+        Args:
+            pipeline (Pipeline): Транзакция Redis.
+            messages (Sequence[BufferedMessage]): Сообщения.
+        """
+        message_ids: list[str] = [message_id for message_id, _ in messages]
+        pipeline.xack(CHECK_IN_STREAM_KEY, CHECK_IN_STREAM_GROUP, *message_ids)
+        pipeline.xdel(CHECK_IN_STREAM_KEY, *message_ids)
+
+        for _, entry in messages:
+            if entry is not None:
+                pipeline.hdel(get_pending_key(entry.user_id), str(entry.buffer_id))
+
+    @staticmethod
+    def _parse(message_id: str, fields: dict[str, str] | None) -> BufferedMessage:
+        """
+        Разбирает сообщение потока.
+
+        Args:
+            message_id (str): ID сообщения.
+            fields (dict[str, str] | None): Поля сообщения. None - сообщение удалено из потока.
+
+        Returns:
+            (BufferedMessage): ID сообщения и отметка.
+        """
+        try:
+            return message_id, HabitCheckInEntry.model_validate_json((fields or {})[_ENTRY_FIELD])
+        except (KeyError, ValidationError):
+            return message_id, None
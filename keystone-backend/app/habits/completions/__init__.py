@@ -0,0 +1,4 @@
+"""Пакет отметок выполнения привычек."""
+
+from .repository import HabitCompletionRepository
+from .service import HabitCompletionService
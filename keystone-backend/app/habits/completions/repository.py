@@ -0,0 +1,89 @@
+"""Модуль репозитория отметок выполнения привычек."""
+
+from datetime import date, datetime
+from typing import Sequence
+
+from sqlalchemy import Select, select, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import BaseRepository
+
+from ..model import Habit as HabitModel
+from ..model import HabitCompletion as HabitCompletionModel
+from ..model import habit_completions_archive
+
+
+class HabitCompletionRepository(BaseRepository[HabitCompletionModel]):
+    """Репозиторий отметок выполнения привычек."""
+
+    _MODEL = HabitCompletionModel
+
+    async def create_many(self, completions: Sequence[dict]) -> None:
+        """
+        Создание отметок многострочными INSERT. Строки передаются параметрами одного скомпилированного
+        запроса и группируются драйвером в INSERT по нескольку сотен строк. Транзакция не фиксируется.
+
+        Args:
+            completions (Sequence[dict]): Данные отметок (HabitCompletionData).
+        """
+        if completions:
+            await self._session_db.execute(insert(HabitCompletionModel), list(completions))
+
+    @staticmethod
+    def build_changed_query(user_id: int, since: datetime | None) -> Select:
+        """
+        Запрос отметок пользователя для синхронизации. Отметки удаленных привычек не выбираются: клиент
+        удаляет их вместе с привычкой. Условие обслуживается индексом (user_id, updated_at).
+
+        Args:
+            user_id (int): ID пользователя.
+            since (datetime | None): Водяной знак. None - полная выгрузка.
+
+        Returns:
+            (Select): Запрос отметок по возрастанию ID.
+        """
+        query = (
+            select(HabitCompletionModel)
+            .join(HabitModel, HabitModel.id == HabitCompletionModel.habit_id)
+            .where(HabitCompletionModel.user_id == user_id, HabitModel.deleted_at.is_(None))
+        )
+
+        if since is not None:
+            query = query.where(HabitCompletionModel.updated_at > since)
+
+        return query.order_by(HabitCompletionModel.id)
+
+    async def get_changed(self, user_id: int, since: datetime | None) -> Sequence[HabitCompletionModel]:
+        """
+        Получение отметок пользователя для синхронизации.
+
+        Args:
+            user_id (int): ID пользователя.
+            since (datetime | None): Водяной знак. None - полная выгрузка.
+
+        Returns:
+            (Sequence[HabitCompletionModel]): Отметки по возрастанию ID.
+        """
+        return (await self._session_db.scalars(self.build_changed_query(user_id, since))).all()
+
+    async def get_days(self, habit_ids: Sequence[int]) -> Sequence[tuple[int, date, bool]]:
+        """
+        Получение дней отметок привычек одним запросом, вместе с отметками в архиве.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек.
+
+        Returns:
+            (Sequence[tuple[int, date, bool]]): Тройки (ID привычки, день отметки, частичное выполнение)
+                в произвольном порядке.
+        """
+        archived = habit_completions_archive.c
+        query = union_all(
+            select(
+                HabitCompletionModel.habit_id, HabitCompletionModel.completed_on, HabitCompletionModel.is_partial
+            ).where(HabitCompletionModel.habit_id.in_(habit_ids)),
+            select(archived.habit_id, archived.completed_on, archived.is_partial).where(
+                archived.habit_id.in_(habit_ids)
+            ),
+        )
+        return (await self._session_db.execute(query)).tuples().all()
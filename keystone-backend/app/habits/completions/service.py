@@ -0,0 +1,386 @@
+"""Модуль сервиса отметок выполнения привычек."""
+
+import logging
+from datetime import date
+from typing import Sequence
+from uuid import UUID, uuid4
+
+from app.core import BaseHttpException, BaseService
+from app.core.config import AppSettings, get_app_settings
+
+from .. import exceptions as exc
+from ..archive import HabitArchiveRepository
+from ..buffer import CheckInBufferService
+from ..history import HabitHistorySegmentRepository
+from ..model import Habit as HabitModel
+from ..model import HabitCompletion as HabitCompletionModel
+from ..repository import HabitRepository
+from ..rollups import HabitCompletionRollupRepository
+from ..schedule import HabitSchedule
+from ..schemas import (
+    HabitBulkCheckInData,
+    HabitBulkCheckInResultData,
+    HabitBulkCheckInResultItem,
+    HabitCheckInData,
+    HabitCheckInEntry,
+    HabitCompletionData,
+    HabitStatsState,
+    StreakHabitData,
+)
+from ..streaks import apply_check_in, get_habit_stats
+from .repository import HabitCompletionRepository
+
+logger = logging.getLogger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+
+class HabitCompletionService(BaseService[HabitCompletionRepository, HabitCompletionData, HabitCompletionModel]):
+    """Сервис отметок выполнения привычек."""
+
+    _REPOSITORY = HabitCompletionRepository
+
+    async def check_in(
+        self, habit_id: int, user_id: int, payload: HabitCheckInData, today: date | None = None
+    ) -> StreakHabitData:
+        """
+        Отметка выполнения привычки. Отметка и обновленная статистика привычки фиксируются одной транзакцией.
+        Если включен буфер отметок, отметка подтверждается после записи в буфер, а в базу ее пишет процесс
+        записи буфера. При недоступном буфере отметка пишется сразу.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            payload (HabitCheckInData): Данные отметки.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (StreakHabitData): Статистика привычки после отметки.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет или она принадлежит другому пользователю.
+            HabitNotActiveException: Если привычка неактивна или в архиве.
+            CheckInFutureDateException: Если день выполнения в будущем.
+            CheckInOutOfRangeException: Если день выполнения вне срока действия привычки.
+            CheckInNotScheduledDayException: Если в этот день привычка не выполняется.
+            CheckInPastPeriodException: Если день выполнения в периоде раньше последней отметки.
+            PartialCheckInNotAllowedException: Если частичное выполнение не разрешено.
+            NoteRequiredException: Если привычка требует заметку.
+            MoodRequiredException: Если привычка требует оценку настроения.
+            CheckInBufferUnavailableException: Если буфер перестал отвечать во время записи отметки.
+        """
+        today = today or date.today()
+
+        if app_settings.CHECK_IN_BUFFER_ENABLED:
+            habit: HabitModel | None = await HabitRepository(self._db).get_user_habit(habit_id, user_id)
+
+            if habit is None:
+                raise await self._get_missing_habit_error(habit_id, user_id)
+
+            if await CheckInBufferService(self._db).merge_pending(user_id, [habit], today):
+                return await self._buffer_check_in(habit, payload, today)
+
+            # Буфер недоступен: привычка перечитывается с блокировкой, и отметка пишется сразу
+            self._db.expunge(habit)
+
+        return await self._write_check_in(habit_id, user_id, payload, today)
+
+    async def _write_check_in(
+        self, habit_id: int, user_id: int, payload: HabitCheckInData, today: date, buffer_id: UUID | None = None
+    ) -> StreakHabitData:
+        """
+        Запись отметки выполнения сразу в базу одной транзакцией с обновленной статистикой привычки.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            payload (HabitCheckInData): Данные отметки.
+            today (date): Текущий день пользователя.
+            buffer_id (UUID | None): ID отметки в буфере, если она уже добавлена в буфер.
+
+        Returns:
+            (StreakHabitData): Статистика привычки после отметки.
+        """
+        habit: HabitModel | None = await HabitRepository(self._db).get_user_habit(habit_id, user_id, for_update=True)
+
+        if habit is None:
+            raise await self._get_missing_habit_error(habit_id, user_id)
+
+        day: date = payload.completed_on or today
+        schedule: HabitSchedule = HabitSchedule.from_habit(habit)
+        self._validate_check_in(habit, schedule, payload, day, today)
+
+        completion: HabitCompletionData = HabitCompletionData(
+            habit_id=habit.id,
+            user_id=user_id,
+            completed_on=day,
+            buffer_id=buffer_id,
+            **payload.model_dump(exclude={"completed_on"}),
+        )
+        await self._repository.create(completion.model_dump(), commit=False)
+        await HabitHistorySegmentRepository(self._db).mark_day(habit.id, user_id, day)
+        await HabitCompletionRollupRepository(self._db).add_completion(user_id, day)
+        apply_check_in(habit, day, today, schedule, payload.is_partial)
+        stats: StreakHabitData = get_habit_stats(habit, today, schedule)
+        await self._db.commit()
+
+        return stats
+
+    async def _get_missing_habit_error(self, habit_id: int, user_id: int) -> BaseHttpException:
+        """
+        Ошибка отметки привычки, которой нет в рабочей таблице.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (BaseHttpException): HabitNotActiveException для привычки в архиве, иначе HabitNotFoundException.
+        """
+        if await HabitArchiveRepository(self._db).get_user_habit_ids([habit_id], user_id):
+            return exc.HabitNotActiveException()
+
+        return exc.HabitNotFoundException()
+
+    async def _buffer_check_in(self, habit: HabitModel, payload: HabitCheckInData, today: date) -> StreakHabitData:
+        """
+        Отметка выполнения через буфер. Отметка проверяется по статистике привычки вместе с ожидающими
+        отметками и повторно - при записи в базу. Если Redis не подтвердил запись отметки на диск, отметка
+        с тем же buffer_id пишется сразу в базу, а процесс записи буфера пропустит ее как уже записанную.
+
+        Args:
+            habit (HabitModel): Привычка с примененными ожидающими отметками, отсоединенная от сессии.
+            payload (HabitCheckInData): Данные отметки.
+            today (date): Текущий день пользователя.
+
+        Returns:
+            (StreakHabitData): Статистика привычки после отметки.
+        """
+        day: date = payload.completed_on or today
+        schedule: HabitSchedule = HabitSchedule.from_habit(habit)
+        self._validate_check_in(habit, schedule, payload, day, today)
+
+        entry: HabitCheckInEntry = HabitCheckInEntry(
+            habit_id=habit.id,
+            user_id=habit.user_id,
+            completed_on=day,
+            today=today,
+            buffer_id=uuid4(),
+            **payload.model_dump(exclude={"completed_on"}),
+        )
+
+        buffer: CheckInBufferService = CheckInBufferService(self._db)
+
+        if not await buffer.append(entry):
+            stats: StreakHabitData = await self._write_check_in(
+                habit.id, habit.user_id, payload, today, entry.buffer_id
+            )
+            await buffer.remove_pending(entry)
+
+            return stats
+
+        apply_check_in(habit, day, today, schedule, payload.is_partial)
+
+        return get_habit_stats(habit, today, schedule)
+
+    async def bulk_check_in(
+        self, user_id: int, payload: HabitBulkCheckInData, today: date | None = None
+    ) -> HabitBulkCheckInResultData:
+        """
+        Пакетная отметка выполнения привычек. Отметки проверяются и применяются по порядку, как последовательные
+        одиночные запросы, но в базу пакет пишется постоянным числом запросов: привычки читаются и блокируются
+        одним запросом, отметки вставляются одним многострочным INSERT, статистика обновляется одним UPDATE.
+        Отклоненная отметка не отменяет остальные: ее ошибка возвращается в результате. Все принятые отметки
+        фиксируются одной транзакцией.
+
+        Args:
+            user_id (int): ID пользователя.
+            payload (HabitBulkCheckInData): Пакет отметок.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (HabitBulkCheckInResultData): Результаты отметок в порядке запроса.
+        """
+        today = today or date.today()
+        habit_ids: set[int] = {item.habit_id for item in payload.items}
+        habits: Sequence[HabitModel] = await HabitRepository(self._db).get_user_habits(
+            habit_ids, user_id, for_update=True
+        )
+        archived_ids: set[int] = await HabitArchiveRepository(self._db).get_user_habit_ids(
+            habit_ids - {habit.id for habit in habits}, user_id
+        )
+        results: list[HabitBulkCheckInResultItem] = await self._write_check_ins(
+            habits,
+            [
+                HabitCheckInEntry(
+                    **item.model_dump(exclude={"completed_on"}),
+                    user_id=user_id,
+                    completed_on=item.completed_on or today,
+                    today=today,
+                )
+                for item in payload.items
+            ],
+            archived_ids,
+        )
+        await self._db.commit()
+
+        return HabitBulkCheckInResultData(items=results)
+
+    async def write_buffered(self, entries: Sequence[HabitCheckInEntry]) -> dict[UUID, str]:
+        """
+        Запись пакета отметок из буфера одной транзакцией. Отметки, уже записанные при прошлой доставке,
+        пропускаются. Отметки, которые не прошли повторную проверку (например, две параллельные отметки
+        одного периода), не записываются.
+
+        Args:
+            entries (Sequence[HabitCheckInEntry]): Отметки в порядке буфера.
+
+        Returns:
+            (dict[UUID, str]): Причины отклонения отметок, не прошедших проверку, по buffer_id.
+        """
+        habits: Sequence[HabitModel] = await HabitRepository(self._db).get_by_ids(
+            {entry.habit_id for entry in entries}, for_update=True
+        )
+        pending: list[HabitCheckInEntry] = await CheckInBufferService(self._db).filter_written(entries)
+        results: list[HabitBulkCheckInResultItem] = await self._write_check_ins(habits, pending)
+        await self._db.commit()
+        rejected: dict[UUID, str] = {}
+
+        for entry, result in zip(pending, results):
+            if result.error is not None and entry.buffer_id is not None:
+                logger.warning("Buffered check-in of habit %s is rejected: %s", result.habit_id, result.error)
+                rejected[entry.buffer_id] = result.error
+
+        return rejected
+
+    async def _write_check_ins(
+        self, habits: Sequence[HabitModel], entries: Sequence[HabitCheckInEntry], archived_ids: set[int] | None = None
+    ) -> list[HabitBulkCheckInResultItem]:
+        """
+        Проверяет отметки по порядку и пишет принятые постоянным числом запросов: отметки - одним многострочным
+        INSERT, статистику - одним UPDATE на все привычки. Транзакция не фиксируется.
+
+        Args:
+            habits (Sequence[HabitModel]): Заблокированные привычки отметок.
+            entries (Sequence[HabitCheckInEntry]): Отметки.
+            archived_ids (set[int] | None): ID привычек отметок, которые находятся в архиве.
+
+        Returns:
+            (list[HabitBulkCheckInResultItem]): Результаты отметок в порядке entries.
+        """
+        by_id: dict[int, HabitModel] = {habit.id: habit for habit in habits}
+        schedules: dict[int, HabitSchedule] = {}
+        accepted: list[HabitCheckInEntry] = []
+        results: list[HabitBulkCheckInResultItem] = []
+
+        # Статистика считается на отсоединенных объектах и пишется одним запросом, а не по строке на привычку
+        for loaded in habits:
+            self._db.expunge(loaded)
+
+        for entry in entries:
+            try:
+                habit: HabitModel | None = by_id.get(entry.habit_id)
+
+                if habit is None and entry.habit_id in (archived_ids or ()):
+                    raise exc.HabitNotActiveException()
+
+                if habit is None or habit.user_id != entry.user_id or habit.is_deleted:
+                    raise exc.HabitNotFoundException()
+
+                schedule: HabitSchedule = schedules.setdefault(habit.id, HabitSchedule.from_habit(habit))
+                self._validate_check_in(habit, schedule, entry, entry.completed_on, entry.today)
+            except BaseHttpException as error:
+                results.append(
+                    HabitBulkCheckInResultItem(
+                        habit_id=entry.habit_id, error=error.detail, status_code=error.status_code
+                    )
+                )
+                continue
+
+            accepted.append(entry)
+            apply_check_in(habit, entry.completed_on, entry.today, schedule, entry.is_partial)
+            results.append(
+                HabitBulkCheckInResultItem(habit_id=habit.id, stats=get_habit_stats(habit, entry.today, schedule))
+            )
+
+        if accepted:
+            await self._save_check_ins(habits, accepted)
+
+        return results
+
+    async def _save_check_ins(self, habits: Sequence[HabitModel], accepted: Sequence[HabitCheckInEntry]) -> None:
+        """
+        Пишет принятые отметки, дни истории, сводки и статистику привычек. Транзакция не фиксируется.
+
+        Args:
+            habits (Sequence[HabitModel]): Отсоединенные привычки с примененными отметками.
+            accepted (Sequence[HabitCheckInEntry]): Принятые отметки.
+        """
+        await self._repository.create_many(
+            [HabitCompletionData.model_validate(entry.model_dump(exclude={"today"})).model_dump() for entry in accepted]
+        )
+        user_days: dict[int, list[tuple[int, date]]] = {}
+        day_counts: dict[tuple[int, date], int] = {}
+
+        for entry in accepted:
+            user_days.setdefault(entry.user_id, []).append((entry.habit_id, entry.completed_on))
+            day_counts[entry.user_id, entry.completed_on] = day_counts.get((entry.user_id, entry.completed_on), 0) + 1
+
+        history: HabitHistorySegmentRepository = HabitHistorySegmentRepository(self._db)
+        rollups: HabitCompletionRollupRepository = HabitCompletionRollupRepository(self._db)
+
+        for user_id, habit_days in user_days.items():
+            await history.mark_days(user_id, habit_days)
+
+        for (user_id, day), count in day_counts.items():
+            await rollups.add_completion(user_id, day, count)
+
+        checked_in: set[int] = {entry.habit_id for entry in accepted}
+        fields: list[str] = [field for field in HabitStatsState.model_fields.keys() if field != "habit_id"]
+        await HabitRepository(self._db).update_stats(
+            [
+                HabitStatsState(habit_id=habit.id, **{field: getattr(habit, field) for field in fields})
+                for habit in habits
+                if habit.id in checked_in
+            ]
+        )
+
+    @staticmethod
+    def _validate_check_in(
+        habit: HabitModel, schedule: HabitSchedule, payload: HabitCheckInData, day: date, today: date
+    ) -> None:
+        """
+        Проверка отметки по настройкам и расписанию привычки.
+
+        Args:
+            habit (HabitModel): Привычка.
+            schedule (HabitSchedule): Расписание привычки.
+            payload (HabitCheckInData): Данные отметки.
+            day (date): День выполнения.
+            today (date): Текущий день пользователя.
+        """
+        if not habit.is_active or habit.is_archived:
+            raise exc.HabitNotActiveException()
+
+        if day > today:
+            raise exc.CheckInFutureDateException()
+
+        if day < habit.start_date or (habit.end_date is not None and day > habit.end_date):
+            raise exc.CheckInOutOfRangeException()
+
+        if not schedule.is_check_in_day(day):
+            raise exc.CheckInNotScheduledDayException()
+
+        # Статистика обновляется по состоянию последнего периода, поэтому отметки за более ранние периоды
+        # не принимаются: их учет требует пересчета истории
+        if habit.last_period_start is not None and schedule.period_start(day) < habit.last_period_start:
+            raise exc.CheckInPastPeriodException()
+
+        if payload.is_partial and not habit.allow_partial:
+            raise exc.PartialCheckInNotAllowedException()
+
+        if habit.require_notes and not payload.note:
+            raise exc.NoteRequiredException()
+
+        if habit.require_mood and payload.mood is None:
+            raise exc.MoodRequiredException()
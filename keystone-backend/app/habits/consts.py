@@ -8,6 +8,47 @@ class FrequencyType(StrEnum):
     CUSTOM = "custom"
 
 
+class RollupPeriod(StrEnum):
+    """
+    Период сводки выполнений привычек.
+
+    Attributes:
+        DAY: День.
+        WEEK: Неделя (с понедельника).
+        MONTH: Календарный месяц.
+    """
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class TransferFormat(StrEnum):
+    """
+    Формат файла импорта и экспорта привычек.
+
+    Attributes:
+        NDJSON: JSON-объект на строку.
+        CSV: Таблица с разделителем-запятой.
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TransferRecordType(StrEnum):
+    """
+    Тип записи файла импорта и экспорта.
+
+    Attributes:
+        HABIT: Привычка.
+        COMPLETION: Отметка выполнения привычки.
+    """
+
+    HABIT = "habit"
+    COMPLETION = "completion"
+
+
 class WeekDay(IntEnum):
     MONDAY = 1
     TUESDAY = 2
@@ -23,3 +64,89 @@ COLOR_REGEX: str = r"^[0-9A-Fa-f]{6}$"
 COLOR_START_WITH: str = "#"
 
 DAYS_IN_WEEK: int = 7
+
+# Количество скомпилированных расписаний в кеше процесса. Различных расписаний немного:
+# тип частоты, цель и набор дней недели
+SCHEDULE_CACHE_SIZE: int = 1024
+
+# Все дни недели. Используются, если дни выполнения не выбраны
+ALL_WEEK_DAYS: frozenset[int] = frozenset(WeekDay)
+# Частоты, у которых период - один день выполнения из дней недели привычки
+DAY_FREQUENCY_TYPES: frozenset[FrequencyType] = frozenset((FrequencyType.DAILY, FrequencyType.CUSTOM))
+
+# Максимальный процент успеха
+MAX_SUCCESS_RATE: int = 100
+
+# Минимальная и максимальная оценка настроения при отметке
+MIN_MOOD: int = 1
+MAX_MOOD: int = 5
+# Максимальная длина заметки к отметке
+MAX_NOTE_LENGTH: int = 1000
+# Максимальное количество отметок в одном пакетном запросе
+HABIT_BULK_CHECK_IN_MAX_ITEMS: int = 100
+
+# Привычек в одном пакете пересчета статистики по истории
+HABIT_STATS_BATCH_SIZE: int = 1000
+
+# Байт в годовом сегменте истории привычки: по биту на каждый день високосного года
+HISTORY_SEGMENT_BYTES: int = 46
+
+# Глубина пути в частичном обновлении custom_data. SQLSTATE ошибок базы: разбор предиката jsonpath и путь,
+# не совпадающий со структурой документа (ключ вместо номера элемента массива, запись в скаляр)
+HABIT_CUSTOM_DATA_MAX_DEPTH: int = 8
+JSONPATH_SYNTAX_ERROR: str = "42601"
+CUSTOM_DATA_PATH_ERRORS: frozenset[str] = frozenset({"22P02", "22023"})
+
+# Размер страницы списка привычек по умолчанию и максимальный
+HABIT_LIST_DEFAULT_LIMIT: int = 50
+HABIT_LIST_MAX_LIMIT: int = 200
+
+# Синхронизация клиентов: водяной знак отстает от времени базы на длительность самой долгой пишущей транзакции,
+# чтобы изменения, зафиксированные после чтения, попали в следующую синхронизацию. Клиент с водяным знаком
+# старше срока получает полную выгрузку, поэтому надгробия удаленных привычек нужно хранить не меньше этого срока
+SYNC_WATERMARK_LAG_SECONDS: int = 60
+SYNC_FULL_RESYNC_DAYS: int = 30
+
+# Счетчиков в годовом ряду сводки отметок: дни високосного года, недели с понедельника (первая и последняя
+# неполные) и месяцы
+ROLLUP_SLOTS: dict[RollupPeriod, int] = {RollupPeriod.DAY: 366, RollupPeriod.WEEK: 54, RollupPeriod.MONTH: 12}
+# Пользователей в одном пакете пересчета сводок отметок
+ROLLUP_REBUILD_BATCH_SIZE: int = 200
+
+# Закрытие дня: глубина поиска незакрытых дней после простоя планировщика и количество пользователей в порции
+DAY_CLOSE_LOOKBACK_HOURS: int = 3
+DAY_CLOSE_CHUNK_SIZE: int = 1000
+
+# Буфер отметок: поток Redis, группа читателей, хэш ожидающих записи отметок пользователя, поток недоставленных
+# отметок и группа метрик
+CHECK_IN_STREAM_KEY: str = "habit_check_ins"
+CHECK_IN_STREAM_GROUP: str = "habit_check_in_flushers"
+CHECK_IN_PENDING_KEY_PREFIX: str = "habit_check_ins_pending"
+CHECK_IN_DEAD_LETTER_KEY: str = "habit_check_ins_dead_letter"
+CHECK_IN_BUFFER_METRICS: str = "habit_check_in_buffer"
+# Запись буфера в базу: максимум отметок в транзакции, время набора пакета и ожидание первой отметки пакета
+CHECK_IN_FLUSH_BATCH_SIZE: int = 500
+CHECK_IN_FLUSH_INTERVAL_MS: int = 5
+CHECK_IN_FLUSH_IDLE_MS: int = 1000
+# Доставок сообщения, после которых оно переносится в поток недоставленных отметок, и причины переноса
+CHECK_IN_FLUSH_MAX_DELIVERIES: int = 5
+CHECK_IN_BROKEN_MESSAGE_REASON: str = "Сообщение буфера не удалось разобрать"
+CHECK_IN_DELIVERIES_EXCEEDED_REASON: str = "Пакет не удалось записать за допустимое количество доставок"
+# Ожидание записи отметки в AOF и простой, после которого непринятые отметки забирает другой процесс
+CHECK_IN_AOF_TIMEOUT_MS: int = 100
+CHECK_IN_CLAIM_IDLE_MS: int = 60_000
+
+# Импорт и выгрузка: записей в пакете проверки и записи, ошибок в ответе импорта, разделитель списков в CSV
+TRANSFER_BATCH_SIZE: int = 1000
+TRANSFER_MAX_ERRORS: int = 100
+TRANSFER_LIST_SEPARATOR: str = "|"
+TRANSFER_MEDIA_TYPES: dict[TransferFormat, str] = {
+    TransferFormat.NDJSON: "application/x-ndjson",
+    TransferFormat.CSV: "text/csv",
+}
+
+# Архив: архивная привычка переносится, если не менялась столько дней, отметки - когда старше срока.
+# Привычек в одной транзакции переноса
+ARCHIVE_HABITS_AFTER_DAYS: int = 30
+ARCHIVE_COMPLETIONS_AFTER_DAYS: int = 730
+ARCHIVE_BATCH_SIZE: int = 1000
@@ -0,0 +1,3 @@
+"""Пакет данных расширений привычек (custom_data)."""
+
+from .repository import HabitCustomDataRepository
@@ -0,0 +1,133 @@
+"""Модуль репозитория данных расширений привычек."""
+
+from typing import Any, Sequence
+
+from sqlalchemy import ColumnElement, Text, Update, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+
+from app.core.database import BaseRepository
+
+from ..model import Habit as HabitModel
+
+
+class HabitCustomDataRepository(BaseRepository[HabitModel]):
+    """Репозиторий данных расширений привычек (custom_data)."""
+
+    _MODEL = HabitModel
+
+    @staticmethod
+    def build_custom_data_filter(
+        contains: dict | None = None, path: str | None = None, custom_data: ColumnElement | None = None
+    ) -> list[ColumnElement[bool]]:
+        """
+        Условия на данные расширений. Индекс GIN jsonb_path_ops отбирает строки по вложению и по предикатам
+        jsonpath на равенство ($.plugin == "pomodoro"). Сравнения (>, <) проверяются по строкам, поэтому
+        их стоит дополнять условием вложения.
+
+        Args:
+            contains (dict | None): Документ, который должен содержаться в custom_data (@>).
+            path (str | None): Предикат jsonpath, который должен быть истинным для custom_data (@@).
+            custom_data (ColumnElement | None): Колонка custom_data. По умолчанию - колонка рабочей таблицы.
+
+        Returns:
+            (list[ColumnElement[bool]]): Условия. Пусто, если фильтров нет.
+
+        Examples:
+            >>> HabitCustomDataRepository.build_custom_data_filter({"plugin": "pomodoro"}, "$.sessions > 3")
+        """
+        document: ColumnElement[Any] = HabitModel.custom_data.expression if custom_data is None else custom_data
+        conditions: list[ColumnElement[bool]] = []
+
+        if contains is not None:
+            conditions.append(document.contains(contains))
+
+        if path is not None:
+            conditions.append(document.path_match(path))
+
+        return conditions
+
+    async def find_by_custom_data(
+        self, contains: dict | None = None, path: str | None = None, after_id: int = 0, limit: int = 100
+    ) -> Sequence[HabitModel]:
+        """
+        Поиск неудаленных привычек всех пользователей по данным расширений страницами по возрастанию ID.
+        Вложение и предикаты на равенство отбираются индексом GIN по custom_data без обхода таблицы.
+
+        Args:
+            contains (dict | None): Документ, который должен содержаться в custom_data.
+            path (str | None): Предикат jsonpath, который должен быть истинным для custom_data.
+            after_id (int): ID, после которого начинается страница.
+            limit (int): Размер страницы.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки страницы.
+        """
+        query = (
+            select(HabitModel)
+            .where(*self.build_custom_data_filter(contains, path))
+            .where(HabitModel.id > after_id, HabitModel.deleted_at.is_(None))
+            .order_by(HabitModel.id)
+            .limit(limit)
+        )
+        return (await self._session_db.scalars(query)).all()
+
+    @staticmethod
+    def build_custom_data_update(
+        habit_id: int, user_id: int, path: Sequence[str], value: Any = None, remove: bool = False
+    ) -> Update:
+        """
+        Запрос частичного обновления custom_data: jsonb_set по пути или удаление значения (#-), без перезаписи
+        документа клиентом. Недостающие объекты пути создаются пустыми перед записью значения.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            path (Sequence[str]): Путь: ключи объектов и номера элементов массивов.
+            value (Any): Значение, которое сериализуется в JSON.
+            remove (bool): Удалить значение по пути.
+
+        Returns:
+            (Update): Запрос, возвращающий новый custom_data.
+        """
+        document: ColumnElement[Any] = func.coalesce(HabitModel.custom_data, literal({}, JSONB))
+
+        if remove:
+            document = document.op("#-")(literal(list(path), ARRAY(Text)))
+        else:
+            # jsonb_set не создает вложенные объекты: недостающие уровни пути добавляются по одному
+            for depth in range(1, len(path)):
+                prefix = literal(list(path[:depth]), ARRAY(Text))
+                document = func.jsonb_set(
+                    document, prefix, func.coalesce(HabitModel.custom_data.op("#>")(prefix), literal({}, JSONB))
+                )
+
+            document = func.jsonb_set(document, literal(list(path), ARRAY(Text)), literal(value, JSONB))
+
+        return (
+            update(HabitModel)
+            .where(HabitModel.id == habit_id, HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None))
+            .values(custom_data=document)
+            .returning(HabitModel.custom_data)
+        )
+
+    async def patch_custom_data(
+        self, habit_id: int, user_id: int, path: Sequence[str], value: Any = None, remove: bool = False
+    ) -> dict | None:
+        """
+        Частичное обновление custom_data привычки пользователя. Транзакция не фиксируется.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            path (Sequence[str]): Путь: ключи объектов и номера элементов массивов.
+            value (Any): Значение, которое сериализуется в JSON.
+            remove (bool): Удалить значение по пути.
+
+        Returns:
+            (dict | None): Новый custom_data. None, если привычки нет, она удалена или принадлежит другому
+                пользователю.
+        """
+        query = self.build_custom_data_update(habit_id, user_id, path, value, remove)
+        updated: dict | None = await self._session_db.scalar(query)
+
+        return updated
@@ -0,0 +1,5 @@
+"""Пакет закрытия дня по группам часовых поясов."""
+
+from .buckets import get_closed_buckets
+from .repository import HabitDayCloseRepository
+from .service import HabitDayCloseService
@@ -0,0 +1,50 @@
+"""
+Модуль закрытия дня: поиск групп часовых поясов, у которых закончился день.
+
+День закрывается не в общую полночь, а отдельно для каждой группы часовых поясов в момент окончания
+ее дня, поэтому нагрузка распределяется по суткам. Группа - часовые пояса с одним смещением от UTC
+в полночь: их день закончился одновременно.
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from ..schemas import DayCloseBucket
+
+
+def get_closed_buckets(now: datetime, lookback: timedelta, timezones: Iterable[str]) -> list[DayCloseBucket]:
+    """
+    Возвращает группы часовых поясов, день которых закончился за последние lookback.
+
+    Args:
+        now (datetime): Текущий момент с часовым поясом.
+        lookback (timedelta): Глубина поиска. Меньше суток: у каждого часового пояса учитывается последняя полночь.
+        timezones (Iterable[str]): Названия часовых поясов.
+
+    Returns:
+        (list[DayCloseBucket]): Группы по возрастанию момента окончания дня.
+
+    Examples:
+        >>> get_closed_buckets(datetime(2026, 10, 19, 21, 5, tzinfo=UTC), timedelta(hours=1), ["Europe/Moscow"])
+        >>> # [DayCloseBucket(utc_offset=180, day=date(2026, 10, 19), timezones=["Europe/Moscow"], ...)]
+    """
+    buckets: dict[tuple[int, date], DayCloseBucket] = {}
+
+    for name in sorted(timezones):
+        zone: ZoneInfo = ZoneInfo(name)
+        midnight: datetime = datetime.combine(now.astimezone(zone).date(), time(), tzinfo=zone)
+        closes_at: datetime = midnight.astimezone(UTC)
+
+        if now - closes_at > lookback:
+            continue
+
+        offset: timedelta | None = midnight.utcoffset()
+        utc_offset: int = int(offset.total_seconds()) // 60 if offset else 0
+        key: tuple[int, date] = (utc_offset, midnight.date() - timedelta(days=1))
+        bucket: DayCloseBucket = buckets.setdefault(
+            key, DayCloseBucket(utc_offset=key[0], day=key[1], closes_at=closes_at, timezones=[])
+        )
+        bucket.timezones.append(name)
+
+    return sorted(buckets.values(), key=lambda bucket: bucket.closes_at)
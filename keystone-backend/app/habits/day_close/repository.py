@@ -0,0 +1,175 @@
+"""Модуль репозитория закрытий дня."""
+
+from datetime import date, datetime, timedelta
+from typing import Sequence, cast
+
+from sqlalchemy import CursorResult, Integer, Update, and_, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import array, insert
+
+from app.core.database import BaseRepository
+from app.users.model import User as UserModel
+
+from ..consts import DAY_FREQUENCY_TYPES, FrequencyType
+from ..model import Habit as HabitModel
+from ..model import HabitDayClose as HabitDayCloseModel
+
+
+class HabitDayCloseRepository(BaseRepository[HabitDayCloseModel]):
+    """Репозиторий закрытий дня по группам часовых поясов."""
+
+    _MODEL = HabitDayCloseModel
+
+    async def start(self, utc_offset: int, day: date) -> HabitDayCloseModel:
+        """
+        Получение закрытия дня группы. Если закрытие еще не начиналось, оно создается. Транзакция не фиксируется.
+
+        Args:
+            utc_offset (int): Смещение часовых поясов группы от UTC в минутах.
+            day (date): Закрываемый день.
+
+        Returns:
+            (HabitDayCloseModel): Закрытие дня с точкой продолжения.
+        """
+        await self._session_db.execute(
+            insert(HabitDayCloseModel)
+            .values(utc_offset=utc_offset, day=day)
+            .on_conflict_do_nothing(constraint="uq_habit_day_closes_utc_offset_day")
+        )
+        query = select(HabitDayCloseModel).where(
+            HabitDayCloseModel.utc_offset == utc_offset, HabitDayCloseModel.day == day
+        )
+        return (await self._session_db.scalars(query)).one()
+
+    async def save_checkpoint(self, close_id: int, timezone: str, last_user_id: int, closed: int) -> None:
+        """
+        Сохраняет точку продолжения закрытия дня без фиксации транзакции.
+
+        Args:
+            close_id (int): ID закрытия дня.
+            timezone (str): Часовой пояс обработанной порции.
+            last_user_id (int): ID последнего пользователя обработанной порции.
+            closed (int): Количество цепочек, прерванных порцией.
+        """
+        await self._session_db.execute(
+            update(HabitDayCloseModel)
+            .where(HabitDayCloseModel.id == close_id)
+            .values(
+                last_timezone=timezone,
+                last_user_id=last_user_id,
+                closed_count=HabitDayCloseModel.closed_count + closed,
+            )
+        )
+
+    async def finish(self, close_id: int, finished_at: datetime) -> None:
+        """
+        Отмечает завершение закрытия дня без фиксации транзакции.
+
+        Args:
+            close_id (int): ID закрытия дня.
+            finished_at (datetime): Время завершения.
+        """
+        await self._session_db.execute(
+            update(HabitDayCloseModel).where(HabitDayCloseModel.id == close_id).values(finished_at=finished_at)
+        )
+
+    async def get_finished(self, keys: Sequence[tuple[int, date]]) -> set[tuple[int, date]]:
+        """
+        Возвращает завершенные закрытия дня из переданных.
+
+        Args:
+            keys (Sequence[tuple[int, date]]): Пары (смещение от UTC в минутах, день).
+
+        Returns:
+            (set[tuple[int, date]]): Пары завершенных закрытий.
+        """
+        if not keys:
+            return set()
+
+        rows = await self._session_db.execute(
+            select(HabitDayCloseModel.utc_offset, HabitDayCloseModel.day).where(
+                tuple_(HabitDayCloseModel.utc_offset, HabitDayCloseModel.day).in_(keys),
+                HabitDayCloseModel.finished_at.is_not(None),
+            )
+        )
+        return set(rows.tuples())
+
+    @staticmethod
+    def build_day_close_query(timezone: str, day: date, after_user_id: int, last_user_id: int) -> Update:
+        """
+        Запрос закрытия дня для порции пользователей часового пояса: обнуляет цепочки привычек, период
+        которых закончился в этот день без выполнения. Условия повторяют предикат частичного индекса
+        по пользователю, поэтому порция читает только привычки своих пользователей.
+
+        Args:
+            timezone (str): Часовой пояс пользователей.
+            day (date): Закончившийся день.
+            after_user_id (int): ID, после которого начинается порция пользователей.
+            last_user_id (int): ID последнего пользователя порции.
+
+        Returns:
+            (Update): Запрос.
+        """
+        missed = [
+            and_(
+                HabitModel.frequency_type.in_(DAY_FREQUENCY_TYPES),
+                or_(
+                    HabitModel.days_of_week.contains([day.isoweekday()]),
+                    HabitModel.days_of_week == array([], type_=Integer),
+                ),
+                HabitModel.last_success_period < day,
+            )
+        ]
+
+        if day.weekday() == 6:
+            missed.append(
+                and_(
+                    HabitModel.frequency_type == FrequencyType.WEEKLY,
+                    HabitModel.last_success_period < day - timedelta(days=6),
+                )
+            )
+
+        if (day + timedelta(days=1)).day == 1:
+            missed.append(
+                and_(
+                    HabitModel.frequency_type == FrequencyType.MONTHLY,
+                    HabitModel.last_success_period < day.replace(day=1),
+                )
+            )
+
+        return (
+            update(HabitModel)
+            .where(
+                HabitModel.user_id == UserModel.id,
+                UserModel.timezone == timezone,
+                UserModel.id > after_user_id,
+                UserModel.id <= last_user_id,
+                UserModel.deleted_at.is_(None),
+                HabitModel.is_active,
+                ~HabitModel.is_archived,
+                HabitModel.start_date <= day,
+                or_(HabitModel.end_date.is_(None), HabitModel.end_date >= day),
+                HabitModel.deleted_at.is_(None),
+                HabitModel.current_streak > 0,
+                or_(*missed),
+            )
+            .values(current_streak=0)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def close_day(self, timezone: str, day: date, after_user_id: int, last_user_id: int) -> int:
+        """
+        Закрытие дня для порции пользователей часового пояса. Транзакция не фиксируется.
+
+        Args:
+            timezone (str): Часовой пояс пользователей.
+            day (date): Закончившийся день.
+            after_user_id (int): ID, после которого начинается порция пользователей.
+            last_user_id (int): ID последнего пользователя порции.
+
+        Returns:
+            (int): Количество прерванных цепочек.
+        """
+        query = self.build_day_close_query(timezone, day, after_user_id, last_user_id)
+        result = cast(CursorResult, await self._session_db.execute(query))
+
+        return result.rowcount
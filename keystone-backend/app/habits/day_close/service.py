@@ -0,0 +1,66 @@
+"""Модуль сервиса закрытия дня."""
+
+from datetime import UTC, datetime
+
+from app.core import BaseService
+from app.users.repository import UserRepository
+
+from ..consts import DAY_CLOSE_CHUNK_SIZE
+from ..model import HabitDayClose as HabitDayCloseModel
+from ..schemas import DayCloseBucket
+from .repository import HabitDayCloseRepository
+
+
+class HabitDayCloseService(BaseService[HabitDayCloseRepository, DayCloseBucket, HabitDayCloseModel]):
+    """Сервис закрытия дня по группам часовых поясов."""
+
+    _REPOSITORY = HabitDayCloseRepository
+
+    async def close_day(self, bucket: DayCloseBucket, chunk_size: int = DAY_CLOSE_CHUNK_SIZE) -> int:
+        """
+        Закрытие дня группы часовых поясов: цепочки привычек, период которых закончился без выполнения,
+        обнуляются порциями пользователей. Порция и точка продолжения фиксируются одной транзакцией,
+        поэтому прерванное закрытие продолжается без повторов и пропусков.
+
+        Args:
+            bucket (DayCloseBucket): Группа часовых поясов и закончившийся день.
+            chunk_size (int): Количество пользователей в порции.
+
+        Returns:
+            (int): Количество цепочек, прерванных этим запуском. 0, если день группы уже закрыт.
+        """
+        users: UserRepository = UserRepository(self._db)
+        close = await self._repository.start(bucket.utc_offset, bucket.day)
+        close_id, last_timezone, last_user_id, finished_at = (
+            close.id,
+            close.last_timezone,
+            close.last_user_id,
+            close.finished_at,
+        )
+        await self._db.commit()
+
+        if finished_at is not None:
+            return 0
+
+        closed: int = 0
+
+        for timezone in sorted(bucket.timezones):
+            if last_timezone is not None and timezone < last_timezone:
+                continue
+
+            after_id: int = last_user_id if timezone == last_timezone else 0
+
+            while user_ids := await users.get_ids_in_timezone(timezone, after_id, chunk_size):
+                chunk_closed: int = await self._repository.close_day(timezone, bucket.day, after_id, user_ids[-1])
+                await self._repository.save_checkpoint(close_id, timezone, user_ids[-1], chunk_closed)
+                await self._db.commit()
+                closed += chunk_closed
+                after_id = user_ids[-1]
+
+                if len(user_ids) < chunk_size:
+                    break
+
+        await self._repository.finish(close_id, datetime.now(UTC))
+        await self._db.commit()
+
+        return closed
@@ -1,4 +1,6 @@
-from app.core import NotValidEntityException
+from fastapi import status
+
+from app.core import BaseHttpException, NotFoundException, NotValidEntityException
 from app.habits.consts import DAYS_IN_WEEK
 
 
@@ -42,4 +44,104 @@ class TooManyDaysOfWeekException(NotValidEntityException):
     _MESSAGE = f"Количество дней недели не может быть больше {DAYS_IN_WEEK}"
 
 
+class DateRangeInvalidException(NotValidEntityException):
+    """Исключение для диапазона дат, конец которого раньше начала."""
+
+    _MESSAGE = "Конец диапазона дат не может быть раньше его начала"
+
+
+class CustomDataPathInvalidException(NotValidEntityException):
+    """Исключение для некорректного предиката jsonpath по custom_data."""
+
+    _MESSAGE = "Некорректный предикат jsonpath для custom_data"
+
+
+class CustomDataPathConflictException(NotValidEntityException):
+    """Исключение для пути, который не совпадает со структурой custom_data."""
+
+    _MESSAGE = "Путь не совпадает со структурой custom_data"
+
+
+class HabitNotFoundException(NotFoundException):
+    """Исключение для привычки, которой нет у пользователя."""
+
+    _MESSAGE = "Привычка не найдена"
+
+
+class HabitNotActiveException(NotValidEntityException):
+    """Исключение для неактивной или архивной привычки."""
+
+    _MESSAGE = "Привычка неактивна или находится в архиве"
+
+
+class CheckInFutureDateException(NotValidEntityException):
+    """Исключение для отметки выполнения в будущем."""
+
+    _MESSAGE = "Нельзя отметить выполнение в будущем"
+
+
+class CheckInOutOfRangeException(NotValidEntityException):
+    """Исключение для отметки вне срока действия привычки."""
+
+    _MESSAGE = "День выполнения вне срока действия привычки"
+
+
+class CheckInNotScheduledDayException(NotValidEntityException):
+    """Исключение для отметки в день, когда привычка не выполняется."""
+
+    _MESSAGE = "В этот день привычка не выполняется"
+
+
+class CheckInPastPeriodException(NotValidEntityException):
+    """Исключение для отметки за период раньше последней отметки."""
+
+    _MESSAGE = "Нельзя отметить выполнение за период раньше последней отметки"
+
+
+class PartialCheckInNotAllowedException(NotValidEntityException):
+    """Исключение для частичного выполнения привычки, которая его не допускает."""
+
+    _MESSAGE = "Частичное выполнение для привычки не разрешено"
+
+
+class NoteRequiredException(NotValidEntityException):
+    """Исключение для отметки без обязательной заметки."""
+
+    _MESSAGE = "Для отметки выполнения нужна заметка"
+
+
+class MoodRequiredException(NotValidEntityException):
+    """Исключение для отметки без обязательной оценки настроения."""
+
+    _MESSAGE = "Для отметки выполнения нужна оценка настроения"
+
+
+class CheckInBufferUnavailableException(BaseHttpException):
+    """Исключение для недоступного буфера отметок выполнения."""
+
+    _STATUS_CODE = status.HTTP_503_SERVICE_UNAVAILABLE
+    _MESSAGE = "Не удалось сохранить отметку, повторите запрос позже"
+
+
+class TransferRecordInvalidException(NotValidEntityException):
+    """Исключение для строки файла переноса, которую не удалось разобрать."""
+
+    _MESSAGE = "Строку файла не удалось разобрать"
+
+
+class TransferRecordTypeException(NotValidEntityException):
+    """Исключение для неизвестного типа записи файла переноса."""
+
+    _MESSAGE = "Неизвестный тип записи"
+
+
+class TransferDuplicateRefException(NotValidEntityException):
+    """Исключение для повторной ссылки на привычку в файле переноса."""
+
+    _MESSAGE = "Привычка с такой ссылкой уже есть в файле"
+
+
+class TransferHabitRefNotFoundException(NotValidEntityException):
+    """Исключение для отметки, привычка которой не найдена среди импортированных."""
 
+    _MESSAGE = "Привычка отметки не найдена среди импортированных"
@@ -0,0 +1,5 @@
+"""Пакет компактной истории привычек по годовым сегментам."""
+
+from .repository import HabitHistorySegmentRepository
+from .segments import HabitHistory, build_segments
+from .service import HabitHistoryService
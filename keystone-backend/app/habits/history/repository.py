@@ -0,0 +1,118 @@
+"""Модуль репозитория годовых сегментов истории привычек."""
+
+from datetime import date
+from typing import Sequence
+
+from sqlalchemy import Integer, column, delete, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import BaseRepository
+
+from ..consts import HISTORY_SEGMENT_BYTES
+from ..model import HabitHistorySegment as HabitHistorySegmentModel
+from .segments import get_day_bit, set_day
+
+
+class HabitHistorySegmentRepository(BaseRepository[HabitHistorySegmentModel]):
+    """Репозиторий годовых сегментов истории привычек."""
+
+    _MODEL = HabitHistorySegmentModel
+
+    async def mark_day(self, habit_id: int, user_id: int, day: date) -> None:
+        """
+        Отмечает день в сегменте его года одним запросом, без чтения сегмента. Транзакция не фиксируется.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            day (date): День отметки.
+        """
+        query = insert(HabitHistorySegmentModel).values(
+            habit_id=habit_id, user_id=user_id, year=day.year, bits=set_day(None, day)
+        )
+        query = query.on_conflict_do_update(
+            constraint="uq_habit_history_segments_habit_id_year",
+            set_={"bits": func.set_bit(HabitHistorySegmentModel.bits, get_day_bit(day), 1)},
+        )
+        await self._session_db.execute(query)
+
+    async def mark_days(self, user_id: int, habit_days: Sequence[tuple[int, date]]) -> None:
+        """
+        Отмечает дни нескольких привычек без чтения сегментов: недостающие сегменты создаются одним запросом,
+        затем один UPDATE ... FROM (VALUES ...) устанавливает по биту в каждом сегменте. Повторные дни
+        одного сегмента устанавливаются следующими запросами. Транзакция не фиксируется.
+
+        Args:
+            user_id (int): ID пользователя.
+            habit_days (Sequence[tuple[int, date]]): Пары (ID привычки, день отметки).
+        """
+        bits: dict[tuple[int, int], set[int]] = {}
+
+        for habit_id, day in habit_days:
+            bits.setdefault((habit_id, day.year), set()).add(get_day_bit(day))
+
+        if not bits:
+            return
+
+        await self._session_db.execute(
+            insert(HabitHistorySegmentModel)
+            .values(
+                [
+                    {"habit_id": habit_id, "user_id": user_id, "year": year, "bits": bytes(HISTORY_SEGMENT_BYTES)}
+                    for habit_id, year in bits
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_habit_history_segments_habit_id_year")
+        )
+
+        pending: dict[tuple[int, int], list[int]] = {key: sorted(day_bits) for key, day_bits in bits.items()}
+
+        while pending:
+            marks = values(
+                column("habit_id", Integer), column("year", Integer), column("bit", Integer), name="marks"
+            ).data([(habit_id, year, day_bits.pop()) for (habit_id, year), day_bits in pending.items()])
+            await self._session_db.execute(
+                update(HabitHistorySegmentModel)
+                .where(
+                    HabitHistorySegmentModel.habit_id == marks.c.habit_id,
+                    HabitHistorySegmentModel.year == marks.c.year,
+                )
+                .values(bits=func.set_bit(HabitHistorySegmentModel.bits, marks.c.bit, 1))
+                .execution_options(synchronize_session=False)
+            )
+            pending = {key: day_bits for key, day_bits in pending.items() if day_bits}
+
+    async def replace(self, habit_ids: Sequence[int], segments: Sequence[dict]) -> None:
+        """
+        Заменяет сегменты привычек. Транзакция не фиксируется.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек, сегменты которых удаляются.
+            segments (Sequence[dict]): Новые сегменты (habit_id, user_id, year, bits).
+        """
+        await self._session_db.execute(
+            delete(HabitHistorySegmentModel).where(HabitHistorySegmentModel.habit_id.in_(habit_ids))
+        )
+
+        if segments:
+            await self._session_db.execute(insert(HabitHistorySegmentModel), segments)
+
+    async def get_user_segments(self, user_id: int, year: int | None = None) -> Sequence[HabitHistorySegmentModel]:
+        """
+        Получение сегментов всех привычек пользователя одним запросом.
+
+        Args:
+            user_id (int): ID пользователя.
+            year (int | None): Год. None - все годы.
+
+        Returns:
+            (Sequence[HabitHistorySegmentModel]): Сегменты по привычкам и годам.
+        """
+        query = select(HabitHistorySegmentModel).where(HabitHistorySegmentModel.user_id == user_id)
+
+        if year is not None:
+            query = query.where(HabitHistorySegmentModel.year == year)
+
+        query = query.order_by(HabitHistorySegmentModel.habit_id, HabitHistorySegmentModel.year)
+
+        return (await self._session_db.scalars(query)).all()
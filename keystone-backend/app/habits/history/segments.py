@@ -0,0 +1,262 @@
+"""
+Модуль компактной истории привычки: по биту на день, годовыми сегментами.
+
+Вся история привычки собирается в одно целое число, и подсчеты выполняются сдвигами, масками и подсчетом
+единичных бит, без перебора дней. Бит отмечает день, в который есть хотя бы одна отметка, поэтому
+подсчеты относятся к дням: статистика по периодам с целью больше одной отметки считается по самим
+отметкам (см. streaks и stats_engine).
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, Mapping
+
+from ..consts import ALL_WEEK_DAYS, DAYS_IN_WEEK, HISTORY_SEGMENT_BYTES, MAX_SUCCESS_RATE
+
+# Семь единичных бит: шаблон недели, в которой отметки принимаются каждый день
+_WEEK_MASK: int = (1 << DAYS_IN_WEEK) - 1
+
+
+def get_day_bit(day: date) -> int:
+    """
+    Возвращает номер бита дня в годовом сегменте.
+
+    Args:
+        day (date): День.
+
+    Returns:
+        (int): Номер бита (день года, начиная с нуля).
+    """
+    return day.timetuple().tm_yday - 1
+
+
+def set_day(bits: bytes | None, day: date) -> bytes:
+    """
+    Отмечает день в годовом сегменте.
+
+    Args:
+        bits (bytes | None): Сегмент. None - пустой сегмент.
+        day (date): День.
+
+    Returns:
+        (bytes): Сегмент с отмеченным днем.
+    """
+    segment: bytearray = bytearray(bits or bytes(HISTORY_SEGMENT_BYTES))
+    bit: int = get_day_bit(day)
+    segment[bit // 8] |= 1 << bit % 8
+
+    return bytes(segment)
+
+
+def build_segments(days: Iterable[date]) -> dict[int, bytes]:
+    """
+    Собирает годовые сегменты по дням отметок.
+
+    Args:
+        days (Iterable[date]): Дни отметок. Повторы допустимы.
+
+    Returns:
+        (dict[int, bytes]): Сегменты по годам.
+    """
+    segments: dict[int, bytearray] = {}
+
+    for day in days:
+        segment: bytearray = segments.setdefault(day.year, bytearray(HISTORY_SEGMENT_BYTES))
+        bit: int = get_day_bit(day)
+        segment[bit // 8] |= 1 << bit % 8
+
+    return {year: bytes(segment) for year, segment in segments.items()}
+
+
+class HabitHistory:
+    """
+    История привычки, собранная из годовых сегментов в одно целое число: бит N - день origin + N.
+
+    Attributes:
+        origin (date): Первый день первого года истории.
+        mask (int): Дни с отметками.
+    """
+
+    def __init__(self, segments: Mapping[int, bytes]) -> None:
+        """
+        Инициализация истории.
+
+        Args:
+            segments (Mapping[int, bytes]): Сегменты по годам. Может быть пустым.
+        """
+        self.origin: date = date(min(segments, default=date.today().year), 1, 1)
+        self.mask: int = 0
+
+        for year, bits in segments.items():
+            self.mask |= int.from_bytes(bits, "little") << (date(year, 1, 1) - self.origin).days
+
+    def _index(self, day: date) -> int:
+        """
+        Возвращает номер бита дня.
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (int): Номер бита. Отрицательный для дней до начала истории.
+        """
+        return (day - self.origin).days
+
+    def _window(self, first: date, last: date) -> int:
+        """
+        Возвращает маску дней отрезка.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+
+        Returns:
+            (int): Маска. 0, если отрезок пуст.
+        """
+        start: int = max(self._index(first), 0)
+        end: int = self._index(last)
+
+        return ((1 << end - start + 1) - 1) << start if end >= start else 0
+
+    def _due(self, last: date, days_of_week: Iterable[int] | None) -> int:
+        """
+        Возвращает маску дней расписания от начала истории до дня включительно: недельный шаблон
+        повторяется умножением на число из единиц через каждые семь бит.
+
+        Args:
+            last (date): Последний день.
+            days_of_week (Iterable[int] | None): Дни недели выполнения (1 - понедельник). Пусто - все дни.
+
+        Returns:
+            (int): Маска дней расписания.
+        """
+        days: frozenset[int] = frozenset(days_of_week or ()) or ALL_WEEK_DAYS
+        length: int = self._index(last) + 1
+
+        if length <= 0:
+            return 0
+
+        first_weekday: int = self.origin.weekday()
+        pattern: int = sum(1 << offset for offset in range(DAYS_IN_WEEK) if (first_weekday + offset) % 7 + 1 in days)
+        weeks: int = -(-length // DAYS_IN_WEEK)
+        repeated: int = pattern * (((1 << DAYS_IN_WEEK * weeks) - 1) // _WEEK_MASK)
+
+        return repeated & ((1 << length) - 1)
+
+    def is_done(self, day: date) -> bool:
+        """
+        Проверяет, есть ли отметка в день.
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (bool): True, если день отмечен.
+        """
+        index: int = self._index(day)
+        return index >= 0 and bool(self.mask >> index & 1)
+
+    def count(self, first: date, last: date) -> int:
+        """
+        Считает отмеченные дни отрезка.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+
+        Returns:
+            (int): Количество дней с отметками.
+        """
+        return (self.mask & self._window(first, last)).bit_count()
+
+    def success_rate(self, first: date, last: date, days_of_week: Iterable[int] | None = None) -> int:
+        """
+        Процент отмеченных дней расписания на отрезке.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+            days_of_week (Iterable[int] | None): Дни недели выполнения. Пусто - все дни.
+
+        Returns:
+            (int): Процент успеха (0-100).
+
+        Examples:
+            >>> history.success_rate(date(2026, 9, 20), date(2026, 10, 19), [1, 3, 5])
+        """
+        due: int = self._due(last, days_of_week) & self._window(first, last)
+        total: int = due.bit_count()
+
+        return round((self.mask & due).bit_count() * MAX_SUCCESS_RATE / total) if total else 0
+
+    def current_streak(self, last: date, days_of_week: Iterable[int] | None = None) -> int:
+        """
+        Считает подряд отмеченные дни расписания, заканчивающиеся днем last. Дни вне расписания
+        цепочку не прерывают и в нее не входят.
+
+        Args:
+            last (date): Последний день цепочки.
+            days_of_week (Iterable[int] | None): Дни недели выполнения. Пусто - все дни.
+
+        Returns:
+            (int): Длина цепочки.
+        """
+        if self._index(last) < 0:
+            return 0
+
+        window: int = (1 << self._index(last) + 1) - 1
+        due: int = self._due(last, days_of_week)
+        # Единицы - дни, не прерывающие цепочку; старший ноль - последний пропуск
+        missed: int = window & ~(self.mask | (window ^ due))
+        run: int = window >> missed.bit_length() << missed.bit_length()
+
+        return (self.mask & due & run).bit_count()
+
+    def longest_streak(self, last: date, days_of_week: Iterable[int] | None = None) -> int:
+        """
+        Считает самую длинную цепочку отмеченных дней расписания до дня last включительно.
+
+        Args:
+            last (date): Последний день.
+            days_of_week (Iterable[int] | None): Дни недели выполнения. Пусто - все дни.
+
+        Returns:
+            (int): Длина самой длинной цепочки.
+        """
+        if self._index(last) < 0:
+            return 0
+
+        window: int = (1 << self._index(last) + 1) - 1
+        due: int = self._due(last, days_of_week)
+        done: int = self.mask & due
+        unbroken: int = window & (self.mask | (window ^ due))
+        longest: int = 0
+
+        # Каждая итерация снимает младшую серию единиц: прибавление младшего бита обнуляет ее переносом
+        while unbroken:
+            lowest: int = unbroken & -unbroken
+            rest: int = unbroken & (unbroken + lowest)
+            longest = max(longest, (done & (unbroken ^ rest)).bit_count())
+            unbroken = rest
+
+        return longest
+
+    def days(self, first: date, last: date) -> list[date]:
+        """
+        Возвращает отмеченные дни отрезка.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+
+        Returns:
+            (list[date]): Дни с отметками по возрастанию.
+        """
+        bits: int = self.mask & self._window(first, last)
+        result: list[date] = []
+
+        while bits:
+            lowest: int = bits & -bits
+            result.append(self.origin + timedelta(days=lowest.bit_length() - 1))
+            bits ^= lowest
+
+        return result
@@ -0,0 +1,56 @@
+"""Модуль сервиса компактной истории привычек."""
+
+from datetime import date
+from typing import Iterable, Sequence
+
+from app.core import BaseService
+
+from ..model import Habit as HabitModel
+from ..model import HabitHistorySegment as HabitHistorySegmentModel
+from ..schemas import HabitHistorySegmentData
+from .repository import HabitHistorySegmentRepository
+from .segments import build_segments
+
+
+class HabitHistoryService(
+    BaseService[HabitHistorySegmentRepository, HabitHistorySegmentData, HabitHistorySegmentModel]
+):
+    """Сервис годовых сегментов истории привычек."""
+
+    _REPOSITORY = HabitHistorySegmentRepository
+
+    async def get_history(self, user_id: int, year: int | None = None) -> list[HabitHistorySegmentData]:
+        """
+        Компактная история всех привычек пользователя: несколько килобайт, читаемых одним запросом.
+
+        Args:
+            user_id (int): ID пользователя.
+            year (int | None): Год. None - все годы.
+
+        Returns:
+            (list[HabitHistorySegmentData]): Годовые сегменты истории.
+        """
+        segments = await self._repository.get_user_segments(user_id, year)
+        return [HabitHistorySegmentData.model_validate(segment) for segment in segments]
+
+    async def rebuild(self, habits: Sequence[HabitModel], habit_days: Iterable[tuple[int, date]]) -> None:
+        """
+        Заменяет сегменты привычек сегментами, собранными по всем дням отметок. Транзакция не фиксируется.
+
+        Args:
+            habits (Sequence[HabitModel]): Привычки.
+            habit_days (Iterable[tuple[int, date]]): Пары (ID привычки, день отметки). Повторы допустимы.
+        """
+        days_by_habit: dict[int, list[date]] = {}
+
+        for habit_id, day in habit_days:
+            days_by_habit.setdefault(habit_id, []).append(day)
+
+        await self._repository.replace(
+            [habit.id for habit in habits],
+            [
+                {"habit_id": habit.id, "user_id": habit.user_id, "year": year, "bits": bits}
+                for habit in habits
+                for year, bits in build_segments(days_by_habit.get(habit.id, ())).items()
+            ],
+        )
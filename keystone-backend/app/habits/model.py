@@ -1,15 +1,64 @@
-from datetime import time, date
+# pylint: disable=too-few-public-methods
+from datetime import time, date, datetime
+from uuid import UUID
 
-from sqlalchemy import String, Text, ForeignKey, Integer, Time, Date, Boolean
+from sqlalchemy import UUID as PG_UUID
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    ForeignKey,
+    Integer,
+    Time,
+    Date,
+    Boolean,
+    Index,
+    SmallInteger,
+    DateTime,
+    LargeBinary,
+    Table,
+    UniqueConstraint,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import ENUM, ARRAY, JSON
+from sqlalchemy.dialects.postgresql import ENUM, ARRAY, JSONB
 
-from app.core.database import BaseModel
-from .consts import DEFAULT_COLOR, FrequencyType, WeekDay
+from app.core.database import BaseModel, SoftDeleteMixin, TimestampMixin
+from app.core.database.consts import TRIGRAM_OPS
+from app.users.consts import TIMEZONE_MAX_LENGTH
+from .consts import DEFAULT_COLOR, FrequencyType, RollupPeriod, WeekDay
 
 
-class Habit(BaseModel):
-    title: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+class Habit(BaseModel, TimestampMixin, SoftDeleteMixin):
+    __table_args__ = (
+        # Отбор по дню недели: days_of_week @> ARRAY[день] и days_of_week = '{}'
+        Index("ix_habits_days_of_week", "days_of_week", postgresql_using="gin"),
+        # Отбор по тегам: tags && ARRAY[...] (любой) и tags @> ARRAY[...] (все)
+        Index("ix_habits_tags", "tags", postgresql_using="gin"),
+        # Поиск по названию: подстрока и опечатки
+        Index("ix_habits_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": TRIGRAM_OPS}),
+        # Запросы расширений: custom_data @> '{...}' и custom_data @@ '$.ключ == значение'
+        Index(
+            "ix_habits_custom_data",
+            "custom_data",
+            postgresql_using="gin",
+            postgresql_ops={"custom_data": "jsonb_path_ops"},
+        ),
+        Index("ix_habits_user_id_category", "user_id", "category"),
+        # Синхронизация клиентов: изменения привычек пользователя после водяного знака
+        Index("ix_habits_user_id_updated_at", "user_id", "updated_at"),
+        # Список привычек пользователя по страницам: архивные по умолчанию не показываются
+        Index("ix_habits_user_id_id_not_archived", "user_id", "id", postgresql_where=text("NOT is_archived")),
+        # Привычки пользователя на главном экране: только активные, с отсечением по дате начала
+        Index(
+            "ix_habits_user_id_start_date_active",
+            "user_id",
+            "start_date",
+            postgresql_where=text("is_active AND NOT is_archived"),
+        ),
+    )
+
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=True)
 
     icon: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -56,6 +105,12 @@ class Habit(BaseModel):
     total_completions: Mapped[int] = mapped_column(Integer, default=0)
     success_rate: Mapped[int] = mapped_column(Integer, default=0)  # процент успеха (0-100)
 
+    # Состояние для пересчета статистики при отметке без чтения истории
+    last_period_start: Mapped[date] = mapped_column(Date, nullable=True)  # начало периода последней отметки
+    period_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # отметок в этом периоде
+    successful_periods: Mapped[int] = mapped_column(Integer, default=0, server_default="0")  # выполненных периодов
+    last_success_period: Mapped[date] = mapped_column(Date, nullable=True)  # начало последнего выполненного периода
+
     # Настройки
     allow_partial: Mapped[bool] = mapped_column(Boolean, default=False)  # разрешить частичное выполнение
     require_notes: Mapped[bool] = mapped_column(Boolean, default=False)  # требовать заметки при отметке
@@ -63,6 +118,152 @@ class Habit(BaseModel):
 
     # Метаданные
     tags: Mapped[list[str]] = mapped_column(ARRAY(String), default=[])
-    custom_data: Mapped[dict] = mapped_column(JSON, nullable=True)  # для расширений
+    custom_data: Mapped[dict] = mapped_column(JSONB(none_as_null=True), nullable=True)  # для расширений
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+
+
+class HabitCompletion(BaseModel, TimestampMixin):
+    """
+    Модель отметки выполнения привычки. Одна строка - одна отметка.
+
+    Attributes:
+        habit_id (int): ID привычки.
+        user_id (int): ID пользователя.
+        completed_on (date): День выполнения.
+        is_partial (bool): Частичное выполнение.
+        note (str | None): Заметка.
+        mood (int | None): Оценка настроения.
+        buffer_id (UUID | None): ID отметки в буфере, если она записана из буфера. По нему повторно
+            доставленная отметка не записывается второй раз.
+    """
+
+    __table_args__ = (
+        Index("ix_habit_completions_habit_id_completed_on", "habit_id", "completed_on"),
+        # Синхронизация клиентов: изменения отметок пользователя после водяного знака
+        Index("ix_habit_completions_user_id_updated_at", "user_id", "updated_at"),
+        Index(
+            "uq_habit_completions_buffer_id",
+            "buffer_id",
+            unique=True,
+            postgresql_where="buffer_id IS NOT NULL",
+        ),
+    )
+
+    habit_id: Mapped[int] = mapped_column(ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    completed_on: Mapped[date] = mapped_column(Date, nullable=False)
+    is_partial: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    note: Mapped[str | None] = mapped_column(Text, nullable=True)
+    mood: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    buffer_id: Mapped[UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+
+
+class HabitHistorySegment(BaseModel):
+    """
+    Модель компактной истории привычки за год: один бит на день, бит N - день года N + 1 (младший бит байта
+    первый, как у set_bit в PostgreSQL). Производная от отметок: синхронизируется при отметке и
+    перестраивается вместе со статистикой.
+
+    Attributes:
+        habit_id (int): ID привычки.
+        user_id (int): ID пользователя.
+        year (int): Год.
+        bits (bytes): Дни года, в которые есть хотя бы одна отметка.
+    """
+
+    __table_args__ = (UniqueConstraint("habit_id", "year", name="uq_habit_history_segments_habit_id_year"),)
+
+    habit_id: Mapped[int] = mapped_column(ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    year: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    bits: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class HabitCompletionRollup(BaseModel):
+    """
+    Модель годовой сводки отметок пользователя по всем привычкам: ряд счетчиков отметок по дням, неделям
+    или месяцам года. Производная от отметок: увеличивается при отметке и перестраивается пакетно.
+
+    Attributes:
+        user_id (int): ID пользователя.
+        period (RollupPeriod): Период счетчика.
+        year (int): Год.
+        counts (list[int]): Количество отметок в каждом периоде года, начиная с первого.
+    """
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "year", name="uq_habit_completion_rollups_user_id_period_year"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    period: Mapped[RollupPeriod] = mapped_column(ENUM(RollupPeriod), nullable=False)
+    year: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    counts: Mapped[list[int]] = mapped_column(ARRAY(Integer, zero_indexes=True), nullable=False)
+
+
+class HabitDayClose(BaseModel, TimestampMixin):
+    """
+    Модель закрытия дня для группы часовых поясов: цепочки привычек, у которых день выполнения прошел
+    без отметки, обнуляются. В группе - часовые пояса, у которых день закончился в один момент. Хранит
+    точку продолжения: прерванное закрытие продолжается с нее.
+
+    Attributes:
+        utc_offset (int): Смещение часовых поясов группы от UTC в минутах.
+        day (date): Закрываемый день.
+        last_timezone (str | None): Часовой пояс последней обработанной порции.
+        last_user_id (int): ID последнего пользователя обработанной порции.
+        closed_count (int): Количество прерванных цепочек.
+        finished_at (datetime | None): Время завершения.
+    """
+
+    __table_args__ = (UniqueConstraint("utc_offset", "day", name="uq_habit_day_closes_utc_offset_day"),)
+
+    utc_offset: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    last_timezone: Mapped[str | None] = mapped_column(String(TIMEZONE_MAX_LENGTH), nullable=True)
+    last_user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    closed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+def _build_archive_table(source: Table, name: str, *indexes: Index) -> Table:
+    """
+    Строит таблицу архива с колонками таблицы source. Строки переносятся в архив с теми же ID, поэтому
+    у таблицы нет последовательности, значений по умолчанию и внешних ключей, а индексы - только для чтений архива.
+
+    Args:
+        source (Table): Рабочая таблица.
+        name (str): Имя таблицы архива.
+        indexes (Index): Индексы таблицы архива.
+
+    Returns:
+        (Table): Таблица архива.
+    """
+    columns: list[Column] = [
+        Column(
+            source_column.name,
+            source_column.type,
+            primary_key=source_column.primary_key,
+            nullable=source_column.nullable,
+            autoincrement=False,
+        )
+        for source_column in source.columns
+    ]
+    return Table(name, BaseModel.metadata, *columns, *indexes)
+
+
+# Архив привычек: архивные привычки, которые не менялись дольше ARCHIVE_HABITS_AFTER_DAYS, вместе со всеми отметками.
+# Рабочие таблицы и их индексы хранят только то, что читается каждый день
+habits_archive: Table = _build_archive_table(
+    Habit.__table__,
+    "habits_archive",
+    Index("ix_habits_archive_user_id_id", "user_id", "id"),
+)
+# Архив отметок: отметки привычек архива и отметки старше ARCHIVE_COMPLETIONS_AFTER_DAYS
+habit_completions_archive: Table = _build_archive_table(
+    HabitCompletion.__table__,
+    "habit_completions_archive",
+    Index("ix_habit_completions_archive_habit_id_completed_on", "habit_id", "completed_on"),
+    Index("ix_habit_completions_archive_user_id", "user_id"),
+)
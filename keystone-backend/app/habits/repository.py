@@ -1,7 +1,355 @@
-from app.core.database import BaseRepository
+"""Модуль репозиториев привычек."""
 
+from datetime import date, datetime
+from typing import Collection, Sequence
+
+from sqlalchemy import Integer, Row, Select, Table, Update, cast, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import array
+
+from app.core.database import BaseRepository, trigram_match, trigram_rank
+
+from .consts import FrequencyType
+from .custom_data import HabitCustomDataRepository
 from .model import Habit as HabitModel
+from .model import habits_archive
+from .schemas import HabitListFilterData, HabitSearchFilterData, HabitStatsState
 
 
 class HabitRepository(BaseRepository[HabitModel]):
+    """Репозиторий привычек."""
+
     _MODEL = HabitModel
+
+    async def get_user_habit(self, habit_id: int, user_id: int, for_update: bool = False) -> HabitModel | None:
+        """
+        Получение привычки пользователя.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            for_update (bool): Заблокировать строку до конца транзакции. Параллельные отметки одной привычки
+                выполняются по очереди, и статистика не теряет обновлений.
+
+        Returns:
+            (HabitModel | None): Привычка. None, если привычки нет, она удалена или принадлежит другому пользователю.
+        """
+        query = select(HabitModel).where(
+            HabitModel.id == habit_id, HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None)
+        )
+
+        if for_update:
+            query = query.with_for_update()
+
+        return await self._session_db.scalar(query)
+
+    async def get_user_habits(
+        self, habit_ids: Collection[int], user_id: int, for_update: bool = False
+    ) -> Sequence[HabitModel]:
+        """
+        Получение привычек пользователя по ID одним запросом.
+
+        Args:
+            habit_ids (Collection[int]): ID привычек.
+            user_id (int): ID пользователя.
+            for_update (bool): Заблокировать строки до конца транзакции. Строки блокируются по возрастанию ID,
+                поэтому параллельные пакетные отметки не блокируют друг друга взаимно.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки пользователя по возрастанию ID. Чужих, удаленных и несуществующих
+                привычек нет.
+        """
+        query = (
+            select(HabitModel)
+            .where(HabitModel.id.in_(habit_ids), HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None))
+            .order_by(HabitModel.id)
+        )
+
+        if for_update:
+            query = query.with_for_update()
+
+        return (await self._session_db.scalars(query)).all()
+
+    @staticmethod
+    def build_update_stats_query(states: Sequence[HabitStatsState]) -> Update:
+        """
+        Запрос записи статистики нескольких привычек одним UPDATE ... FROM (VALUES ...).
+
+        Args:
+            states (Sequence[HabitStatsState]): Статистика привычек. Не пустая.
+
+        Returns:
+            (Update): Запрос.
+        """
+        fields: list[str] = [field for field in HabitStatsState.model_fields.keys() if field != "habit_id"]
+        columns = HabitModel.__table__.c
+        stats = values(
+            column("habit_id", Integer), *(column(field, columns[field].type) for field in fields), name="stats"
+        ).data([(state.habit_id, *(getattr(state, field) for field in fields)) for state in states])
+
+        # Тип столбца VALUES, где все значения NULL, PostgreSQL выводит как text: значения приводятся явно
+        return (
+            update(HabitModel)
+            .where(HabitModel.id == stats.c.habit_id)
+            .values({field: cast(stats.c[field], columns[field].type) for field in fields})
+            .execution_options(synchronize_session=False)
+        )
+
+    async def update_stats(self, states: Sequence[HabitStatsState]) -> None:
+        """
+        Записывает статистику нескольких привычек одним запросом. Транзакция не фиксируется.
+
+        Args:
+            states (Sequence[HabitStatsState]): Статистика привычек.
+        """
+        if states:
+            await self._session_db.execute(self.build_update_stats_query(states))
+
+    @staticmethod
+    def build_due_query(user_id: int, today: date) -> Select:
+        """
+        Запрос привычек пользователя, по которым сегодня принимаются отметки. Условия повторяют предикаты
+        индексов: частичного по пользователю и GIN по дням недели.
+
+        Args:
+            user_id (int): ID пользователя.
+            today (date): Текущий день пользователя.
+
+        Returns:
+            (Select): Запрос.
+        """
+        return (
+            select(HabitModel)
+            .where(
+                HabitModel.user_id == user_id,
+                HabitModel.is_active,
+                ~HabitModel.is_archived,
+                HabitModel.start_date <= today,
+                or_(HabitModel.end_date.is_(None), HabitModel.end_date >= today),
+                HabitModel.deleted_at.is_(None),
+                or_(
+                    HabitModel.frequency_type == FrequencyType.MONTHLY,
+                    HabitModel.days_of_week.contains([today.isoweekday()]),
+                    HabitModel.days_of_week == array([], type_=Integer),
+                ),
+            )
+            .order_by(HabitModel.id)
+        )
+
+    async def get_due(self, user_id: int, today: date) -> Sequence[HabitModel]:
+        """
+        Получение активных привычек пользователя, по которым сегодня принимаются отметки.
+
+        Args:
+            user_id (int): ID пользователя.
+            today (date): Текущий день пользователя.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки по возрастанию ID.
+        """
+        return (await self._session_db.scalars(self.build_due_query(user_id, today))).all()
+
+    @staticmethod
+    def build_list_query(user_id: int, filters: HabitListFilterData, archive: bool = False) -> Select:
+        """
+        Запрос страницы привычек пользователя. Условия повторяют предикаты индексов: частичного
+        по неархивным привычкам, (user_id, category), GIN по тегам и GIN по custom_data.
+
+        Args:
+            user_id (int): ID пользователя.
+            filters (HabitListFilterData): Фильтры и страница. HabitSearchFilterData добавляет условия на custom_data.
+            archive (bool): Запрос к архиву привычек вместо рабочей таблицы.
+
+        Returns:
+            (Select): Запрос. Выбирает на одну привычку больше страницы, чтобы узнать, есть ли следующая.
+        """
+        table: Table = habits_archive if archive else HabitModel.__table__
+        habit = table.c
+        query = select(table if archive else HabitModel).where(habit.user_id == user_id)
+
+        if filters.is_archived is not None:
+            query = query.where(habit.is_archived if filters.is_archived else ~habit.is_archived)
+
+        if filters.is_active is not None:
+            query = query.where(habit.is_active if filters.is_active else ~habit.is_active)
+
+        if filters.category is not None:
+            query = query.where(habit.category == filters.category)
+
+        if filters.tags_any:
+            query = query.where(habit.tags.overlap(cast(array(filters.tags_any), habit.tags.type)))
+
+        if filters.tags_all:
+            query = query.where(habit.tags.contains(cast(array(filters.tags_all), habit.tags.type)))
+
+        if filters.date_from is not None:
+            query = query.where(or_(habit.end_date.is_(None), habit.end_date >= filters.date_from))
+
+        if filters.date_to is not None:
+            query = query.where(habit.start_date <= filters.date_to)
+
+        if filters.after_id is not None:
+            query = query.where(habit.id > filters.after_id)
+
+        if isinstance(filters, HabitSearchFilterData):
+            query = query.where(
+                *HabitCustomDataRepository.build_custom_data_filter(
+                    filters.custom_data_contains, filters.custom_data_path, habit.custom_data
+                )
+            )
+
+        return query.where(habit.deleted_at.is_(None)).order_by(habit.id).limit(filters.limit + 1)
+
+    async def get_page(self, user_id: int, filters: HabitListFilterData) -> Sequence[HabitModel]:
+        """
+        Получение страницы привычек пользователя.
+
+        Args:
+            user_id (int): ID пользователя.
+            filters (HabitListFilterData): Фильтры и страница.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки по возрастанию ID, на одну больше страницы, если есть следующая.
+        """
+        return (await self._session_db.scalars(self.build_list_query(user_id, filters))).all()
+
+    @staticmethod
+    def build_changed_query(user_id: int, since: datetime | None) -> Select:
+        """
+        Запрос привычек пользователя для синхронизации. Условие обслуживается индексом (user_id, updated_at).
+
+        Args:
+            user_id (int): ID пользователя.
+            since (datetime | None): Водяной знак. None - полная выгрузка.
+
+        Returns:
+            (Select): Запрос привычек, измененных после водяного знака, включая удаленные. Для полной
+                выгрузки - все неудаленные привычки.
+        """
+        query = select(HabitModel).where(HabitModel.user_id == user_id)
+        query = query.where(HabitModel.deleted_at.is_(None) if since is None else HabitModel.updated_at > since)
+
+        return query.order_by(HabitModel.id)
+
+    async def get_changed(self, user_id: int, since: datetime | None) -> Sequence[HabitModel]:
+        """
+        Получение привычек пользователя для синхронизации.
+
+        Args:
+            user_id (int): ID пользователя.
+            since (datetime | None): Водяной знак. None - полная выгрузка.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки по возрастанию ID.
+        """
+        return (await self._session_db.scalars(self.build_changed_query(user_id, since))).all()
+
+    async def get_database_time(self) -> datetime:
+        """
+        Текущее время базы: начало транзакции, то же значение, что получает updated_at.
+
+        Returns:
+            (datetime): Время с часовым поясом.
+        """
+        return (await self._session_db.execute(select(func.now()))).scalar_one()
+
+    @staticmethod
+    def build_search_query(user_id: int, query: str, limit: int) -> Select:
+        """
+        Запрос поиска привычек пользователя по названию: по подстроке и с опечатками. Условие обслуживается
+        триграммным GIN-индексом по названию.
+
+        Args:
+            user_id (int): ID пользователя.
+            query (str): Строка поиска.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            (Select): Запрос ID, названия и релевантности по убыванию релевантности.
+        """
+        rank = trigram_rank(HabitModel.title, query).label("rank")
+
+        return (
+            select(HabitModel.id, HabitModel.title, rank)
+            .where(
+                HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None), trigram_match(HabitModel.title, query)
+            )
+            .order_by(rank.desc(), HabitModel.id)
+            .limit(limit)
+        )
+
+    async def search(self, user_id: int, query: str, limit: int) -> Sequence[Row[tuple[int, str, float]]]:
+        """
+        Поиск привычек пользователя по названию.
+
+        Args:
+            user_id (int): ID пользователя.
+            query (str): Строка поиска.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            (Sequence[Row[tuple[int, str, float]]]): ID, название и релевантность по убыванию релевантности.
+        """
+        return (await self._session_db.execute(self.build_search_query(user_id, query, limit))).all()
+
+    async def get_ids_after(self, after_id: int, limit: int) -> list[int]:
+        """
+        Получение следующей страницы ID привычек по возрастанию ID.
+
+        Args:
+            after_id (int): ID, после которого начинается страница.
+            limit (int): Размер страницы.
+
+        Returns:
+            (list[int]): ID привычек.
+        """
+        query = select(HabitModel.id).where(HabitModel.id > after_id).order_by(HabitModel.id).limit(limit)
+        return list(await self._session_db.scalars(query))
+
+    async def get_user_ids_after(self, after_id: int, limit: int) -> list[int]:
+        """
+        Получение следующей страницы ID пользователей, у которых есть привычки, по возрастанию ID.
+
+        Args:
+            after_id (int): ID, после которого начинается страница.
+            limit (int): Размер страницы.
+
+        Returns:
+            (list[int]): ID пользователей.
+        """
+        query = (
+            select(HabitModel.user_id)
+            .where(HabitModel.user_id > after_id)
+            .group_by(HabitModel.user_id)
+            .order_by(HabitModel.user_id)
+            .limit(limit)
+        )
+        return list(await self._session_db.scalars(query))
+
+    async def lock_user_habits(self, user_ids: Sequence[int]) -> None:
+        """
+        Блокирует привычки пользователей до конца транзакции: отметки этих привычек ждут ее завершения.
+
+        Args:
+            user_ids (Sequence[int]): ID пользователей.
+        """
+        await self._session_db.execute(
+            select(HabitModel.id).where(HabitModel.user_id.in_(user_ids)).order_by(HabitModel.id).with_for_update()
+        )
+
+    async def get_by_ids(self, habit_ids: Collection[int], for_update: bool = False) -> Sequence[HabitModel]:
+        """
+        Получение привычек по ID.
+
+        Args:
+            habit_ids (Collection[int]): ID привычек.
+            for_update (bool): Заблокировать строки до конца транзакции.
+
+        Returns:
+            (Sequence[HabitModel]): Привычки в порядке возрастания ID.
+        """
+        query = select(HabitModel).where(HabitModel.id.in_(habit_ids)).order_by(HabitModel.id)
+
+        if for_update:
+            query = query.with_for_update()
+
+        return (await self._session_db.scalars(query)).all()
@@ -0,0 +1,5 @@
+"""Пакет годовых сводок отметок пользователей."""
+
+from .repository import HabitCompletionRollupRepository
+from .service import HabitRollupService
+from .slots import build_rollups, get_rollup_slot
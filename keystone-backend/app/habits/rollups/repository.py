@@ -0,0 +1,108 @@
+"""Модуль репозитория годовых сводок отметок."""
+
+from datetime import date
+from typing import Sequence
+
+from sqlalchemy import case, delete, func, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import BaseRepository
+
+from ..consts import ROLLUP_SLOTS, RollupPeriod
+from ..model import HabitCompletion as HabitCompletionModel
+from ..model import HabitCompletionRollup as HabitCompletionRollupModel
+from ..model import habit_completions_archive
+from .slots import get_rollup_slot
+
+
+class HabitCompletionRollupRepository(BaseRepository[HabitCompletionRollupModel]):
+    """Репозиторий годовых сводок отметок пользователей."""
+
+    _MODEL = HabitCompletionRollupModel
+
+    async def add_completion(self, user_id: int, day: date, count: int = 1) -> None:
+        """
+        Учитывает отметки дня в рядах всех периодов года: недостающие ряды создаются пустыми, затем один
+        запрос увеличивает по счетчику в каждом ряду. Транзакция не фиксируется.
+
+        Args:
+            user_id (int): ID пользователя.
+            day (date): День отметок.
+            count (int): Количество отметок.
+        """
+        await self._session_db.execute(
+            insert(HabitCompletionRollupModel)
+            .values(
+                [
+                    {"user_id": user_id, "period": period, "year": day.year, "counts": [0] * ROLLUP_SLOTS[period]}
+                    for period in RollupPeriod
+                ]
+            )
+            .on_conflict_do_nothing(constraint="uq_habit_completion_rollups_user_id_period_year")
+        )
+
+        slot = case(
+            *((HabitCompletionRollupModel.period == period, get_rollup_slot(period, day)) for period in RollupPeriod)
+        )
+        await self._session_db.execute(
+            update(HabitCompletionRollupModel)
+            .where(HabitCompletionRollupModel.user_id == user_id, HabitCompletionRollupModel.year == day.year)
+            .values({HabitCompletionRollupModel.counts[slot]: HabitCompletionRollupModel.counts[slot] + count})
+        )
+
+    async def replace(self, user_ids: Sequence[int], rollups: Sequence[dict]) -> None:
+        """
+        Заменяет сводки пользователей. Транзакция не фиксируется.
+
+        Args:
+            user_ids (Sequence[int]): ID пользователей, сводки которых удаляются.
+            rollups (Sequence[dict]): Новые сводки (user_id, period, year, counts).
+        """
+        await self._session_db.execute(
+            delete(HabitCompletionRollupModel).where(HabitCompletionRollupModel.user_id.in_(user_ids))
+        )
+
+        if rollups:
+            await self._session_db.execute(insert(HabitCompletionRollupModel), rollups)
+
+    async def get_user_rollup(self, user_id: int, period: RollupPeriod, year: int) -> HabitCompletionRollupModel | None:
+        """
+        Получение сводки пользователя за год.
+
+        Args:
+            user_id (int): ID пользователя.
+            period (RollupPeriod): Период счетчиков.
+            year (int): Год.
+
+        Returns:
+            (HabitCompletionRollupModel | None): Сводка. None, если в году нет отметок.
+        """
+        return await self._session_db.scalar(
+            select(HabitCompletionRollupModel).where(
+                HabitCompletionRollupModel.user_id == user_id,
+                HabitCompletionRollupModel.period == period,
+                HabitCompletionRollupModel.year == year,
+            )
+        )
+
+    async def count_user_days(self, user_ids: Sequence[int]) -> Sequence[tuple[int, date, int]]:
+        """
+        Подсчет отметок пользователей по дням одним запросом, вместе с отметками в архиве.
+
+        Args:
+            user_ids (Sequence[int]): ID пользователей.
+
+        Returns:
+            (Sequence[tuple[int, date, int]]): Тройки (ID пользователя, день, количество отметок).
+        """
+        archived = habit_completions_archive.c
+        completions = union_all(
+            select(HabitCompletionModel.user_id, HabitCompletionModel.completed_on).where(
+                HabitCompletionModel.user_id.in_(user_ids)
+            ),
+            select(archived.user_id, archived.completed_on).where(archived.user_id.in_(user_ids)),
+        ).subquery()
+        query = select(completions.c.user_id, completions.c.completed_on, func.count()).group_by(
+            completions.c.user_id, completions.c.completed_on
+        )
+        return (await self._session_db.execute(query)).tuples().all()
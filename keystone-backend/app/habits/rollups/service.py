@@ -0,0 +1,69 @@
+"""Модуль сервиса годовых сводок отметок."""
+
+from datetime import date
+from typing import Sequence
+
+from app.core import BaseService
+
+from ..consts import ROLLUP_SLOTS, RollupPeriod
+from ..model import HabitCompletionRollup as HabitCompletionRollupModel
+from ..repository import HabitRepository
+from ..schemas import HabitHeatmapData
+from .repository import HabitCompletionRollupRepository
+from .slots import build_rollups
+
+
+class HabitRollupService(BaseService[HabitCompletionRollupRepository, HabitHeatmapData, HabitCompletionRollupModel]):
+    """Сервис годовых сводок отметок пользователей."""
+
+    _REPOSITORY = HabitCompletionRollupRepository
+
+    async def get_heatmap(
+        self, user_id: int, year: int | None = None, period: RollupPeriod = RollupPeriod.DAY
+    ) -> HabitHeatmapData:
+        """
+        Годовая тепловая карта отметок пользователя: одна строка сводки вместо отметок всех привычек.
+
+        Args:
+            user_id (int): ID пользователя.
+            year (int | None): Год. По умолчанию - текущий год сервера.
+            period (RollupPeriod): Период счетчиков карты.
+
+        Returns:
+            (HabitHeatmapData): Количество отметок в каждом периоде года.
+        """
+        year = year or date.today().year
+        rollup = await self._repository.get_user_rollup(user_id, period, year)
+
+        if rollup is None:
+            return HabitHeatmapData(period=period, year=year, counts=[0] * ROLLUP_SLOTS[period])
+
+        return HabitHeatmapData.model_validate(rollup)
+
+    async def rebuild_rollups(self, user_ids: Sequence[int]) -> int:
+        """
+        Пересчет годовых сводок отметок пакета пользователей по всем отметкам. Нужен после импорта
+        или исправления ошибок: дальнейшие отметки продолжают пересчитанные сводки.
+
+        Args:
+            user_ids (Sequence[int]): ID пользователей.
+
+        Returns:
+            (int): Количество записанных сводок.
+        """
+        # Блокировка не дает отметкам, сделанным во время пересчета, потеряться при записи результата
+        await HabitRepository(self._db).lock_user_habits(user_ids)
+        day_counts: dict[int, list[tuple[date, int]]] = {}
+
+        for user_id, day, count in await self._repository.count_user_days(user_ids):
+            day_counts.setdefault(user_id, []).append((day, count))
+
+        rollups: list[dict] = [
+            {"user_id": user_id, "period": period, "year": year, "counts": counts}
+            for user_id, days in day_counts.items()
+            for (period, year), counts in build_rollups(days).items()
+        ]
+        await self._repository.replace(user_ids, rollups)
+        await self._db.commit()
+
+        return len(rollups)
@@ -0,0 +1,52 @@
+"""
+Модуль годовых сводок отметок пользователя: ряды счетчиков по дням, неделям и месяцам года.
+
+Номер счетчика (слот) считается от начала года, поэтому сводка года - один массив фиксированной длины,
+и тепловая карта года читается одной строкой вместо отметок всех привычек.
+"""
+
+from datetime import date
+from typing import Iterable
+
+from ..consts import DAYS_IN_WEEK, ROLLUP_SLOTS, RollupPeriod
+from ..history.segments import get_day_bit
+
+
+def get_rollup_slot(period: RollupPeriod, day: date) -> int:
+    """
+    Возвращает номер счетчика дня в годовом ряду периода.
+
+    Args:
+        period (RollupPeriod): Период ряда.
+        day (date): День.
+
+    Returns:
+        (int): Номер счетчика, начиная с нуля. Недели начинаются с понедельника, первая неделя года -
+            неделя 1 января.
+    """
+    if period == RollupPeriod.DAY:
+        return get_day_bit(day)
+
+    if period == RollupPeriod.WEEK:
+        return (get_day_bit(day) + date(day.year, 1, 1).weekday()) // DAYS_IN_WEEK
+
+    return day.month - 1
+
+
+def build_rollups(day_counts: Iterable[tuple[date, int]]) -> dict[tuple[RollupPeriod, int], list[int]]:
+    """
+    Собирает годовые ряды всех периодов по количеству отметок в дни.
+
+    Args:
+        day_counts (Iterable[tuple[date, int]]): Пары (день, количество отметок). Дни могут повторяться.
+
+    Returns:
+        (dict[tuple[RollupPeriod, int], list[int]]): Ряды по периоду и году.
+    """
+    rollups: dict[tuple[RollupPeriod, int], list[int]] = {}
+
+    for day, count in day_counts:
+        for period in RollupPeriod:
+            rollups.setdefault((period, day.year), [0] * ROLLUP_SLOTS[period])[get_rollup_slot(period, day)] += count
+
+    return rollups
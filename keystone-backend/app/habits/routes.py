@@ -0,0 +1,218 @@
+"""Модуль роутов для работы с привычками."""
+
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import SearchQuerySchema
+from app.core.database import get_db
+from app.users import UserModel, get_current_user, get_user_today
+
+from .completions import HabitCompletionService
+from .consts import TRANSFER_MEDIA_TYPES, RollupPeriod
+from .history import HabitHistoryService
+from .rollups import HabitRollupService
+from .schemas import (
+    HabitBulkCheckInData,
+    HabitBulkCheckInResultData,
+    HabitCheckInData,
+    HabitCreateData,
+    HabitCustomDataPatchData,
+    HabitData,
+    HabitDueData,
+    HabitHeatmapData,
+    HabitHistorySegmentData,
+    HabitImportResultData,
+    HabitListFilterData,
+    HabitListPageData,
+    HabitPublicData,
+    HabitSearchFilterData,
+    HabitSearchResultData,
+    HabitSyncData,
+    HabitSyncQueryData,
+    HabitTransferQueryData,
+    StreakHabitData,
+)
+from .service import HabitService
+from .transfer import HabitTransferService, stream_export
+
+habit_routes: APIRouter = APIRouter(prefix="/habit", tags=["habit"])
+
+
+@habit_routes.post("/create", description="Создание привычки", response_model=HabitPublicData)
+async def habit_create(
+    habit_data: HabitData, user: UserModel = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> HabitPublicData:
+    """Создание привычки текущего пользователя."""
+    habit = await HabitService(db).create(HabitCreateData(**habit_data.model_dump(), user_id=user.id))
+    return HabitPublicData.model_validate(habit)
+
+
+@habit_routes.get("/list", description="Список привычек", response_model=HabitListPageData)
+async def habit_list(
+    filters: Annotated[HabitListFilterData, Query()],
+    user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> HabitListPageData:
+    """Страница привычек текущего пользователя. По умолчанию без архивных."""
+    return await HabitService(db).list_habits(user.id, filters)
+
+
+@habit_routes.post("/search", description="Поиск привычек по фильтрам", response_model=HabitListPageData)
+async def habit_search(
+    filters: HabitSearchFilterData, user: UserModel = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> HabitListPageData:
+    """Страница привычек текущего пользователя по фильтрам из тела запроса, включая условия на custom_data."""
+    return await HabitService(db).list_habits(user.id, filters)
+
+
+@habit_routes.get("/find", description="Поиск привычек по названию", response_model=list[HabitSearchResultData])
+async def habit_find(
+    params: Annotated[SearchQuerySchema, Query()],
+    user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[HabitSearchResultData]:
+    """Поиск привычек текущего пользователя по названию: по подстроке и с опечатками."""
+    return await HabitService(db).search(user.id, params)
+
+
+@habit_routes.get("/due", description="Привычки на сегодня", response_model=list[HabitDueData])
+async def habit_due(
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> list[HabitDueData]:
+    """Активные привычки текущего пользователя, по которым сегодня принимаются отметки."""
+    return await HabitService(db).get_due(user.id, today)
+
+
+@habit_routes.get("/history", description="История всех привычек по дням", response_model=list[HabitHistorySegmentData])
+async def habit_history(
+    year: int | None = None, user: UserModel = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> list[HabitHistorySegmentData]:
+    """Годовые сегменты истории привычек текущего пользователя: бит на день."""
+    return await HabitHistoryService(db).get_history(user.id, year)
+
+
+@habit_routes.get("/heatmap", description="Тепловая карта отметок за год", response_model=HabitHeatmapData)
+async def habit_heatmap(
+    year: int | None = None,
+    period: RollupPeriod = RollupPeriod.DAY,
+    user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> HabitHeatmapData:
+    """Количество отметок текущего пользователя по всем привычкам в каждом дне, неделе или месяце года."""
+    return await HabitRollupService(db).get_heatmap(user.id, year, period)
+
+
+@habit_routes.get("/sync", description="Синхронизация привычек и отметок", response_model=HabitSyncData)
+async def habit_sync(
+    params: Annotated[HabitSyncQueryData, Query()],
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> HabitSyncData:
+    """Изменения привычек и отметок с прошлой синхронизации, удаленные привычки и новый водяной знак."""
+    return await HabitService(db).sync(user.id, params.since, today)
+
+
+@habit_routes.post(
+    "/import", description="Импорт привычек и отметок из NDJSON или CSV", response_model=HabitImportResultData
+)
+async def habit_import(
+    request: Request,
+    params: Annotated[HabitTransferQueryData, Query()],
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> HabitImportResultData:
+    """Импорт привычек и отметок из тела запроса. Файл разбирается по мере получения."""
+    return await HabitTransferService(db).import_records(user.id, request.stream(), params.format, today)
+
+
+@habit_routes.get("/export", description="Выгрузка привычек и отметок в NDJSON или CSV")
+async def habit_export(
+    params: Annotated[HabitTransferQueryData, Query()], user: UserModel = Depends(get_current_user)
+) -> StreamingResponse:
+    """Выгрузка привычек и отметок текущего пользователя. Файл передается по частям."""
+    return StreamingResponse(
+        stream_export(user.id, params.format),
+        media_type=TRANSFER_MEDIA_TYPES[params.format],
+        headers={"Content-Disposition": f'attachment; filename="habits.{params.format}"'},
+    )
+
+
+@habit_routes.post(
+    "/check-in/bulk", description="Пакетная отметка выполнения привычек", response_model=HabitBulkCheckInResultData
+)
+async def habit_bulk_check_in(
+    payload: HabitBulkCheckInData,
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> HabitBulkCheckInResultData:
+    """Пакетная отметка выполнения привычек. Возвращает статистику или ошибку по каждой отметке."""
+    return await HabitCompletionService(db).bulk_check_in(user.id, payload, today)
+
+
+@habit_routes.post("/{habit_id}/check-in", description="Отметка выполнения привычки", response_model=StreakHabitData)
+async def habit_check_in(
+    habit_id: int,
+    payload: HabitCheckInData,
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> StreakHabitData:
+    """Отметка выполнения привычки. Возвращает обновленную статистику."""
+    return await HabitCompletionService(db).check_in(habit_id, user.id, payload, today)
+
+
+@habit_routes.get("/{habit_id}/stats", description="Статистика привычки", response_model=StreakHabitData)
+async def habit_stats(
+    habit_id: int,
+    user: UserModel = Depends(get_current_user),
+    today: date = Depends(get_user_today),
+    db: AsyncSession = Depends(get_db),
+) -> StreakHabitData:
+    """Статистика привычки на текущий день пользователя."""
+    return await HabitService(db).get_stats(habit_id, user.id, today)
+
+
+@habit_routes.post("/{habit_id}/archive", description="Перемещение привычки в архив", response_model=HabitPublicData)
+async def habit_archive(
+    habit_id: int, user: UserModel = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> HabitPublicData:
+    """Перемещение привычки в архив: она пропадает из списка по умолчанию и не отмечается."""
+    return await HabitService(db).set_archived(habit_id, user.id, True)
+
+
+@habit_routes.post("/{habit_id}/unarchive", description="Возврат привычки из архива", response_model=HabitPublicData)
+async def habit_unarchive(
+    habit_id: int, user: UserModel = Depends(get_current_user), db: AsyncSession = Depends(get_db)
+) -> HabitPublicData:
+    """Возврат привычки из архива вместе с историей отметок."""
+    return await HabitService(db).set_archived(habit_id, user.id, False)
+
+
+@habit_routes.patch("/{habit_id}/custom-data", description="Частичное обновление данных расширений привычки")
+async def habit_patch_custom_data(
+    habit_id: int,
+    patch: HabitCustomDataPatchData,
+    user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Запись или удаление значения по пути в custom_data. Возвращает новый custom_data."""
+    return await HabitService(db).patch_custom_data(habit_id, user.id, patch)
+
+
+@habit_routes.delete("/{habit_id}", description="Удаление привычки")
+async def habit_delete(
+    habit_id: int,
+    user: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> bool:
+    """Удаление привычки."""
+    return await HabitService(db).delete_habit(habit_id, user.id)
@@ -0,0 +1,237 @@
+"""Модуль расписания привычки: деление дней на периоды, цель выполнений за период и дни отметок."""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Iterator
+
+from .consts import ALL_WEEK_DAYS, DAY_FREQUENCY_TYPES, DAYS_IN_WEEK, SCHEDULE_CACHE_SIZE, FrequencyType
+
+
+class HabitSchedule:
+    """
+    Расписание привычки. Правила компилируются при создании в таблицы по дням недели, и все операции
+    выполняются арифметикой над датами, без перебора дней.
+
+    Notes:
+        - DAILY и CUSTOM: период - один день из дней недели привычки (пустой список - каждый день).
+        - WEEKLY: период - неделя с понедельника, отметки принимаются только в дни недели привычки.
+        - MONTHLY: период - календарный месяц, отметки принимаются в любой день.
+        - Период выполнен, если за него сделано не меньше times_per_period отметок.
+
+    Attributes:
+        frequency_type (FrequencyType): Тип частоты выполнения.
+        goal (int): Количество отметок, необходимое для выполнения периода.
+        days (frozenset[int]): Дни недели, в которые принимаются отметки (1 - понедельник).
+        _check_in_weekdays (tuple[bool, ...]): Принимаются ли отметки в день недели (0 - понедельник).
+        _week_offsets (tuple[int, ...]): Смещения дней отметок от понедельника.
+        _days_back (tuple[int, ...]): Для дня недели - сколько дней назад предыдущий день отметок.
+        _days_before (tuple[int, ...]): Для дня недели - количество дней отметок в неделе до него.
+    """
+
+    def __init__(self, frequency_type: FrequencyType, times_per_period: int | None, days_of_week: list[int] | None):
+        """
+        Инициализация расписания.
+
+        Args:
+            frequency_type (FrequencyType): Тип частоты выполнения.
+            times_per_period (int | None): Количество отметок за период.
+            days_of_week (list[int] | None): Дни недели выполнения.
+        """
+        self.frequency_type: FrequencyType = FrequencyType(frequency_type)
+        self.goal: int = max(1, times_per_period or 1)
+        self.days: frozenset[int] = frozenset(days_of_week or ()) or ALL_WEEK_DAYS
+
+        self._check_in_weekdays: tuple[bool, ...] = tuple(
+            self.frequency_type == FrequencyType.MONTHLY or weekday + 1 in self.days for weekday in range(DAYS_IN_WEEK)
+        )
+        self._week_offsets: tuple[int, ...] = tuple(
+            weekday for weekday in range(DAYS_IN_WEEK) if self._check_in_weekdays[weekday]
+        )
+        self._days_back: tuple[int, ...] = tuple(
+            next(
+                (offset for offset in range(1, DAYS_IN_WEEK + 1) if (weekday - offset) % DAYS_IN_WEEK + 1 in self.days),
+                DAYS_IN_WEEK,
+            )
+            for weekday in range(DAYS_IN_WEEK)
+        )
+        self._days_before: tuple[int, ...] = tuple(
+            sum(self._check_in_weekdays[:weekday]) for weekday in range(DAYS_IN_WEEK + 1)
+        )
+
+    @classmethod
+    def from_habit(cls, habit: Any) -> "HabitSchedule":
+        """
+        Возвращает расписание по полям привычки. Расписания с одинаковыми полями компилируются один раз
+        и разделяются между привычками.
+
+        Args:
+            habit (Any): Привычка (модель или схема с полями расписания).
+
+        Returns:
+            (HabitSchedule): Расписание.
+        """
+        return compile_schedule(
+            FrequencyType(habit.frequency_type),
+            max(1, habit.times_per_period or 1),
+            tuple(sorted(frozenset(habit.days_of_week or ()))),
+        )
+
+    @property
+    def is_day_based(self) -> bool:
+        """Период расписания - один день."""
+        return self.frequency_type in DAY_FREQUENCY_TYPES
+
+    def is_check_in_day(self, day: date) -> bool:
+        """
+        Проверяет, принимаются ли отметки в этот день.
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (bool): True, если день входит в расписание.
+        """
+        return self._check_in_weekdays[day.weekday()]
+
+    def period_start(self, day: date) -> date:
+        """
+        Возвращает начало периода, в который входит день.
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (date): Первый день периода.
+
+        Examples:
+            >>> HabitSchedule(FrequencyType.WEEKLY, 3, [1, 3, 5]).period_start(date(2026, 10, 22))
+            >>> # date(2026, 10, 19)
+        """
+        if self.frequency_type == FrequencyType.WEEKLY:
+            return day - timedelta(days=day.weekday())
+
+        if self.frequency_type == FrequencyType.MONTHLY:
+            return day.replace(day=1)
+
+        return day
+
+    def open_period(self, day: date) -> date | None:
+        """
+        Возвращает начало периода, который на этот день еще можно выполнить.
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (date | None): Начало периода. None, если день не входит в расписание дневной привычки.
+        """
+        if self.is_day_based and not self.is_check_in_day(day):
+            return None
+
+        return self.period_start(day)
+
+    def previous_period_start(self, period: date) -> date:
+        """
+        Возвращает начало периода, предшествующего данному.
+
+        Args:
+            period (date): Начало периода или, для дневных привычек, любой день.
+
+        Returns:
+            (date): Начало предыдущего периода.
+        """
+        if self.frequency_type == FrequencyType.WEEKLY:
+            return period - timedelta(days=DAYS_IN_WEEK)
+
+        if self.frequency_type == FrequencyType.MONTHLY:
+            return (period.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+        return period - timedelta(days=self._days_back[period.weekday()])
+
+    def count_periods(self, first: date, last: date) -> int:
+        """
+        Считает периоды, начала которых попадают в отрезок от начала периода first до last включительно.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+
+        Returns:
+            (int): Количество периодов.
+
+        Examples:
+            >>> HabitSchedule(FrequencyType.CUSTOM, 1, [1, 3, 5]).count_periods(date(2026, 10, 1), date(2026, 10, 31))
+            >>> # 13
+        """
+        first = self.period_start(first)
+
+        if last < first:
+            return 0
+
+        if self.frequency_type == FrequencyType.WEEKLY:
+            return (self.period_start(last) - first).days // DAYS_IN_WEEK + 1
+
+        if self.frequency_type == FrequencyType.MONTHLY:
+            return (last.year - first.year) * 12 + last.month - first.month + 1
+
+        return self._days_until(last + timedelta(days=1)) - self._days_until(first)
+
+    def _days_until(self, day: date) -> int:
+        """
+        Считает дни отметок от начала календаря до дня (не включая его).
+
+        Args:
+            day (date): День.
+
+        Returns:
+            (int): Количество дней отметок.
+        """
+        weeks, weekday = divmod(day.toordinal() - 1, DAYS_IN_WEEK)
+        return weeks * self._days_before[DAYS_IN_WEEK] + self._days_before[weekday]
+
+    def iter_check_in_days(self, first: date, last: date) -> Iterator[date]:
+        """
+        Перечисляет дни отметок отрезка по возрастанию. Перебираются только дни расписания: по неделям,
+        со смещениями дней отметок от понедельника.
+
+        Args:
+            first (date): Первый день.
+            last (date): Последний день.
+
+        Returns:
+            (Iterator[date]): Дни отметок.
+
+        Examples:
+            >>> schedule = HabitSchedule(FrequencyType.CUSTOM, 1, [1, 5])
+            >>> list(schedule.iter_check_in_days(date(2026, 10, 19), date(2026, 10, 26)))
+            >>> # [date(2026, 10, 19), date(2026, 10, 23), date(2026, 10, 26)]
+        """
+        monday: date = first - timedelta(days=first.weekday())
+        offsets: list[timedelta] = [timedelta(days=offset) for offset in self._week_offsets]
+        week: timedelta = timedelta(days=DAYS_IN_WEEK)
+
+        while monday <= last:
+            for offset in offsets:
+                day: date = monday + offset
+
+                if first <= day <= last:
+                    yield day
+
+            monday += week
+
+
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def compile_schedule(frequency_type: FrequencyType, goal: int, days: tuple[int, ...]) -> HabitSchedule:
+    """
+    Компилирует расписание с кешированием по полям расписания. Расписание не изменяется после создания,
+    поэтому один объект разделяется всеми привычками с такими же полями.
+
+    Args:
+        frequency_type (FrequencyType): Тип частоты выполнения.
+        goal (int): Количество отметок за период.
+        days (tuple[int, ...]): Дни недели выполнения по возрастанию, без повторов.
+
+    Returns:
+        (HabitSchedule): Расписание.
+    """
+    return HabitSchedule(frequency_type, goal, list(days))
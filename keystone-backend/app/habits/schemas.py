@@ -1,10 +1,27 @@
-from datetime import time, date
+# pylint: disable=too-many-ancestors
+from datetime import time, date, datetime
+from typing import Any
+from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 
-from .consts import DEFAULT_COLOR, FrequencyType, WeekDay
+from .consts import (
+    DEFAULT_COLOR,
+    HABIT_BULK_CHECK_IN_MAX_ITEMS,
+    HABIT_CUSTOM_DATA_MAX_DEPTH,
+    HABIT_LIST_DEFAULT_LIMIT,
+    HABIT_LIST_MAX_LIMIT,
+    MAX_MOOD,
+    MAX_NOTE_LENGTH,
+    MAX_SUCCESS_RATE,
+    MIN_MOOD,
+    FrequencyType,
+    RollupPeriod,
+    TransferFormat,
+    WeekDay,
+)
 from .exceptions import StartDateNoFutureException, EndDateBeforeStartDateException, EndDateNoPastException, \
-    InvalidDayInWeekException, TooManyDaysOfWeekException
+    InvalidDayInWeekException, TooManyDaysOfWeekException, DateRangeInvalidException
 from .validators import validate_hex_color, validate_days_of_week
 
 
@@ -23,7 +40,7 @@ class MainHabitData(BaseModel):
 class AdditionalHabitData(BaseModel):
     is_active: bool = Field(True, description="Активна ли привычка")
     is_archived: bool = Field(False, description="Архивирована ли привычка")
-    start_date: date = Field(date.today(), description="Дата начала привычки")
+    start_date: date = Field(default_factory=date.today, description="Дата начала привычки")
     end_date: date | None = Field(None, description="Дата окончания привычки")
     tags: list[str] = Field(default_factory=list, description="Теги привычки")
 
@@ -38,9 +55,9 @@ class AdditionalHabitData(BaseModel):
 
     @field_validator("end_date")
     @classmethod
-    def validate_end_date(cls, value: date | None, values: dict) -> date | None:
+    def validate_end_date(cls, value: date | None, info: ValidationInfo) -> date | None:
         if value is not None:
-            if value < values["start_date"]:
+            if "start_date" in info.data and value < info.data["start_date"]:
                 raise EndDateBeforeStartDateException()
             if value <= date.today():
                 raise EndDateNoPastException()
@@ -69,7 +86,17 @@ class StreakHabitData(BaseModel):
     current_streak: int = Field(0, description="Текущий количество подряд идущих выполнений")
     longest_streak: int = Field(0, description="Самый большое количество подряд идущих выполнений")
     total_completions: int = Field(0, description="Общее количество выполнений привычки")
-    success_rate: int = Field(0, lt=100, description="Процент успешных выполнений привычки")
+    success_rate: int = Field(0, ge=0, le=MAX_SUCCESS_RATE, description="Процент успешных выполнений привычки")
+
+
+class HabitStatsState(StreakHabitData):
+    """Статистика привычки вместе с состоянием последнего периода, по которому она обновляется инкрементально."""
+
+    habit_id: int
+    successful_periods: int = Field(0, description="Количество выполненных периодов")
+    period_count: int = Field(0, description="Количество отметок в последнем периоде с отметками")
+    last_period_start: date | None = Field(None, description="Начало последнего периода с отметками")
+    last_success_period: date | None = Field(None, description="Начало последнего выполненного периода")
 
 
 class ServiceHabitData(BaseModel):
@@ -82,3 +109,263 @@ class SettingsHabitData(BaseModel):
     require_notes: bool = Field(False, description="Требовать заметки при отметке")
     require_mood: bool = Field(False, description="Требовать оценку настроения")
 
+
+class HabitData(MainHabitData, AdditionalHabitData, FrequencyHabitData, TargetHabitData, SettingsHabitData):
+    """Данные привычки, которые задает пользователь."""
+
+
+class HabitCreateData(HabitData, ServiceHabitData):
+    """Данные для создания привычки."""
+
+
+class HabitPublicData(HabitData, StreakHabitData):
+    """Данные привычки для ответа."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    custom_data: dict | None = Field(None, description="Дополнительные данные для расширения")
+
+    # Ограничения дат проверяются при создании: у сохраненной привычки дата окончания может пройти
+    @classmethod
+    def validate_start_date(cls, value: date) -> date:
+        return value
+
+    @classmethod
+    def validate_end_date(cls, value: date | None, info: ValidationInfo) -> date | None:
+        return value
+
+
+class HabitListFilterData(BaseModel):
+    """Фильтры и страница списка привычек. Страницы идут по возрастанию ID, следующая начинается после after_id."""
+
+    tags_any: list[str] = Field(default_factory=list, description="Есть хотя бы один из тегов")
+    tags_all: list[str] = Field(default_factory=list, description="Есть все теги")
+    category: str | None = Field(None, description="Категория")
+    is_active: bool | None = Field(None, description="Активна ли привычка. По умолчанию - любые")
+    is_archived: bool | None = Field(False, description="В архиве ли привычка. По умолчанию - только не в архиве")
+    date_from: date | None = Field(None, description="Привычка действует в этот день или позже")
+    date_to: date | None = Field(None, description="Привычка действует в этот день или раньше")
+    after_id: int | None = Field(None, ge=0, description="ID последней привычки предыдущей страницы")
+    limit: int = Field(HABIT_LIST_DEFAULT_LIMIT, ge=1, le=HABIT_LIST_MAX_LIMIT, description="Размер страницы")
+
+    @field_validator("date_to")
+    @classmethod
+    def validate_date_to(cls, value: date | None, info: ValidationInfo) -> date | None:
+        if value is not None and info.data.get("date_from") is not None and value < info.data["date_from"]:
+            raise DateRangeInvalidException()
+
+        return value
+
+
+class HabitSearchFilterData(HabitListFilterData):
+    """Фильтры поиска привычек: фильтры списка и условия на данные расширений."""
+
+    custom_data_contains: dict[str, Any] | None = Field(None, description="custom_data содержит документ")
+    custom_data_path: str | None = Field(
+        None, min_length=1, description="Предикат jsonpath, истинный для custom_data, например $.level > 2"
+    )
+
+
+class HabitCustomDataPatchData(BaseModel):
+    """Частичное обновление custom_data: значение по пути или удаление ключа."""
+
+    path: list[str] = Field(
+        ..., min_length=1, max_length=HABIT_CUSTOM_DATA_MAX_DEPTH, description="Путь: ключи объектов и номера элементов"
+    )
+    value: Any = Field(None, description="Новое значение. Недостающие объекты пути создаются")
+    remove: bool = Field(False, description="Удалить значение по пути вместо записи")
+
+
+class HabitListPageData(BaseModel):
+    """Страница списка привычек."""
+
+    items: list[HabitPublicData]
+    next_after_id: int | None = Field(
+        None, description="Значение after_id следующей страницы. None - страниц больше нет"
+    )
+
+
+class HabitSyncQueryData(BaseModel):
+    """Параметры синхронизации."""
+
+    since: datetime | None = Field(None, description="Водяной знак прошлой синхронизации. Нет - полная выгрузка")
+
+
+class HabitSyncItemData(HabitPublicData):
+    """Привычка в ответе синхронизации."""
+
+    updated_at: datetime
+
+
+class HabitCompletionSyncData(BaseModel):
+    """Отметка выполнения в ответе синхронизации."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    habit_id: int
+    completed_on: date
+    is_partial: bool
+    note: str | None = None
+    mood: int | None = None
+    updated_at: datetime
+
+
+class HabitSyncData(BaseModel):
+    """Изменения привычек и отметок пользователя после водяного знака."""
+
+    watermark: datetime = Field(..., description="Водяной знак для следующей синхронизации")
+    is_full: bool = Field(..., description="Полная выгрузка: клиент заменяет свои данные, а не дополняет их")
+    habits: list[HabitSyncItemData] = Field(..., description="Созданные и измененные привычки")
+    completions: list[HabitCompletionSyncData] = Field(..., description="Новые отметки")
+    deleted_habit_ids: list[int] = Field(..., description="Удаленные привычки вместе с их отметками")
+
+
+class HabitSearchResultData(BaseModel):
+    """Результат поиска привычки по названию."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: str
+    rank: float = Field(..., description="Релевантность от 0 до 1")
+
+
+class HabitDueData(HabitPublicData):
+    """Данные привычки, по которой сегодня принимаются отметки."""
+
+    is_done: bool = Field(False, description="Текущий период уже выполнен")
+
+
+class HabitCheckInData(BaseModel):
+    """Данные отметки выполнения привычки."""
+
+    completed_on: date | None = Field(None, description="День выполнения. По умолчанию - сегодня")
+    is_partial: bool = Field(False, description="Частичное выполнение")
+    note: str | None = Field(None, min_length=1, max_length=MAX_NOTE_LENGTH, description="Заметка")
+    mood: int | None = Field(None, ge=MIN_MOOD, le=MAX_MOOD, description="Оценка настроения")
+
+
+class HabitBulkCheckInItem(HabitCheckInData):
+    """Отметка выполнения привычки в пакетном запросе."""
+
+    habit_id: int = Field(..., description="ID привычки")
+
+
+class HabitBulkCheckInData(BaseModel):
+    """Пакет отметок выполнения привычек. Отметки применяются по порядку, как последовательные запросы."""
+
+    items: list[HabitBulkCheckInItem] = Field(..., min_length=1, max_length=HABIT_BULK_CHECK_IN_MAX_ITEMS)
+
+
+class HabitCheckInEntry(HabitBulkCheckInItem):
+    """
+    Отметка, подготовленная к записи: пользователь и дни определены. В таком виде отметки хранятся
+    в буфере до записи в базу.
+    """
+
+    user_id: int
+    completed_on: date
+    today: date = Field(..., description="Текущий день пользователя в момент отметки")
+    buffer_id: UUID | None = Field(None, description="ID отметки в буфере. Нет у отметок, записанных сразу")
+
+
+class HabitTransferQueryData(BaseModel):
+    """Параметры импорта и выгрузки привычек."""
+
+    format: TransferFormat = Field(TransferFormat.NDJSON, description="Формат файла")
+
+
+class HabitTransferData(HabitData):
+    """Привычка в файле импорта и выгрузки."""
+
+    ref: str = Field(..., min_length=1, max_length=100, description="Ссылка на привычку из отметок файла")
+
+    # Переносится история: привычка может начаться в прошлом и уже закончиться
+    @field_validator("end_date")
+    @classmethod
+    def validate_end_date(cls, value: date | None, info: ValidationInfo) -> date | None:
+        if value is not None and "start_date" in info.data and value < info.data["start_date"]:
+            raise EndDateBeforeStartDateException()
+
+        return value
+
+
+class HabitTransferCompletionData(HabitCheckInData):
+    """Отметка выполнения в файле импорта и выгрузки."""
+
+    habit_ref: str = Field(..., min_length=1, max_length=100, description="Ссылка на привычку отметки")
+    completed_on: date = Field(..., description="День выполнения")
+
+
+class HabitImportErrorData(BaseModel):
+    """Строка файла, которая не импортирована."""
+
+    line: int = Field(..., description="Номер строки файла, начиная с 1")
+    error: str
+
+
+class HabitImportResultData(BaseModel):
+    """Результат импорта привычек и отметок."""
+
+    habits: int = Field(default=0, description="Импортировано привычек")
+    completions: int = Field(default=0, description="Импортировано отметок")
+    skipped: int = Field(default=0, description="Пропущено строк с ошибками")
+    errors: list[HabitImportErrorData] = Field(default_factory=list, description="Ошибки первых пропущенных строк")
+
+
+class HabitBulkCheckInResultItem(BaseModel):
+    """Результат одной отметки пакета: статистика привычки после отметки или ошибка."""
+
+    habit_id: int
+    stats: StreakHabitData | None = Field(default=None, description="Статистика привычки после отметки")
+    error: str | None = Field(default=None, description="Сообщение об ошибке, если отметка не принята")
+    status_code: int | None = Field(default=None, description="Код статуса ошибки, который вернул бы одиночный запрос")
+
+
+class HabitBulkCheckInResultData(BaseModel):
+    """Результаты пакетной отметки в порядке отметок запроса."""
+
+    items: list[HabitBulkCheckInResultItem]
+
+
+class HabitCompletionData(BaseModel):
+    """Данные для создания отметки выполнения привычки."""
+
+    habit_id: int
+    user_id: int
+    completed_on: date
+    is_partial: bool = False
+    note: str | None = None
+    mood: int | None = None
+    buffer_id: UUID | None = None
+
+
+class HabitHistorySegmentData(BaseModel):
+    """Годовой сегмент истории привычки: бит N - день года N + 1. В JSON биты передаются в base64."""
+
+    model_config = ConfigDict(from_attributes=True, ser_json_bytes="base64")
+
+    habit_id: int
+    year: int
+    bits: bytes
+
+
+class HabitHeatmapData(BaseModel):
+    """Годовая тепловая карта отметок пользователя по всем привычкам."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    period: RollupPeriod
+    year: int
+    counts: list[int] = Field(..., description="Количество отметок в каждом периоде года, начиная с первого")
+
+
+class DayCloseBucket(BaseModel):
+    """Группа часовых поясов, у которых закончился один и тот же день в один момент."""
+
+    utc_offset: int = Field(..., description="Смещение от UTC в минутах")
+    day: date = Field(..., description="Закончившийся день")
+    closes_at: datetime = Field(..., description="Момент окончания дня")
+    timezones: list[str]
@@ -0,0 +1,388 @@
+"""Модуль сервисов привычек."""
+
+from datetime import date, datetime, timedelta
+from typing import Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.exc import DBAPIError
+
+from app.core import BaseService, SearchQuerySchema
+
+from . import exceptions as exc
+from .archive import HabitArchiveRepository, HabitArchiveService
+from .buffer import CheckInBufferService
+from .completions import HabitCompletionRepository
+from .consts import (
+    CUSTOM_DATA_PATH_ERRORS,
+    JSONPATH_SYNTAX_ERROR,
+    SYNC_FULL_RESYNC_DAYS,
+    SYNC_WATERMARK_LAG_SECONDS,
+)
+from .custom_data import HabitCustomDataRepository
+from .history import HabitHistoryService
+from .model import Habit as HabitModel
+from .model import HabitCompletion as HabitCompletionModel
+from .repository import HabitRepository
+from .schedule import HabitSchedule
+from .schemas import (
+    HabitCompletionSyncData,
+    HabitCreateData,
+    HabitCustomDataPatchData,
+    HabitDueData,
+    HabitListFilterData,
+    HabitListPageData,
+    HabitPublicData,
+    HabitSearchResultData,
+    HabitStatsState,
+    HabitSyncData,
+    HabitSyncItemData,
+    StreakHabitData,
+)
+from .stats_engine import compute_habit_stats
+from .streaks import get_habit_stats
+
+
+class HabitService(BaseService[HabitRepository, HabitCreateData, HabitModel]):
+    """Сервис привычек."""
+
+    _REPOSITORY = HabitRepository
+
+    async def get_user_habit(self, habit_id: int, user_id: int) -> HabitModel:
+        """
+        Получение привычки пользователя.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (HabitModel): Привычка.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет или она принадлежит другому пользователю.
+        """
+        habit: HabitModel | None = await self._repository.get_user_habit(habit_id, user_id)
+
+        if habit is None:
+            raise exc.HabitNotFoundException()
+
+        return habit
+
+    async def get_stats(self, habit_id: int, user_id: int, today: date | None = None) -> StreakHabitData:
+        """
+        Статистика привычки. Читается одна строка привычки, независимо от длины истории. Учитываются
+        отметки, которые еще ждут записи в буфере.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (StreakHabitData): Статистика привычки.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет ни в рабочей таблице, ни в архиве.
+        """
+        today = today or date.today()
+        habit: HabitModel | None = await self._repository.get_user_habit(habit_id, user_id)
+
+        if habit is None:
+            # Привычку в архиве нельзя отметить, поэтому ее статистика не ждет отметок из буфера
+            archived = await HabitArchiveRepository(self._db).get_user_habit(habit_id, user_id)
+
+            if archived is None:
+                raise exc.HabitNotFoundException()
+
+            return get_habit_stats(archived, today)
+
+        await CheckInBufferService(self._db).merge_pending(user_id, [habit], today)
+
+        return get_habit_stats(habit, today)
+
+    async def list_habits(self, user_id: int, filters: HabitListFilterData) -> HabitListPageData:
+        """
+        Страница привычек пользователя. Страницы выбираются по ключу (ID), поэтому стоимость запроса
+        не растет с номером страницы. Если в список попадают архивные привычки, страница собирается
+        из страниц рабочей таблицы и архива.
+
+        Args:
+            user_id (int): ID пользователя.
+            filters (HabitListFilterData): Фильтры и страница.
+
+        Returns:
+            (HabitListPageData): Привычки страницы и ключ следующей страницы.
+
+        Raises:
+            CustomDataPathInvalidException: Если предикат jsonpath фильтра не разбирается.
+        """
+        try:
+            habits: Sequence[HabitModel | Row] = await self._repository.get_page(user_id, filters)
+
+            if filters.is_archived is not False:
+                archived: Sequence[Row] = await HabitArchiveRepository(self._db).get_page(user_id, filters)
+                habits = sorted([*habits, *archived], key=lambda habit: habit.id)[: filters.limit + 1]
+        except DBAPIError as error:
+            if getattr(error.orig, "sqlstate", None) != JSONPATH_SYNTAX_ERROR:
+                raise
+
+            await self._db.rollback()
+            raise exc.CustomDataPathInvalidException() from error
+
+        items: list[HabitPublicData] = [HabitPublicData.model_validate(habit) for habit in habits[: filters.limit]]
+
+        return HabitListPageData(items=items, next_after_id=items[-1].id if len(habits) > filters.limit else None)
+
+    async def patch_custom_data(self, habit_id: int, user_id: int, patch: HabitCustomDataPatchData) -> dict:
+        """
+        Частичное обновление данных расширений привычки одним запросом в базе. Привычка из архива
+        сначала возвращается в рабочую таблицу.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            patch (HabitCustomDataPatchData): Путь и значение.
+
+        Returns:
+            (dict): Новый custom_data.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет или она принадлежит другому пользователю.
+            CustomDataPathConflictException: Если путь ведет по ключу в массив.
+        """
+        custom_data_repository: HabitCustomDataRepository = HabitCustomDataRepository(self._db)
+
+        try:
+            custom_data: dict | None = await custom_data_repository.patch_custom_data(
+                habit_id, user_id, patch.path, patch.value, patch.remove
+            )
+
+            if custom_data is None and await self._restore_habit(habit_id, user_id) is not None:
+                custom_data = await custom_data_repository.patch_custom_data(
+                    habit_id, user_id, patch.path, patch.value, patch.remove
+                )
+        except DBAPIError as error:
+            if getattr(error.orig, "sqlstate", None) not in CUSTOM_DATA_PATH_ERRORS:
+                raise
+
+            await self._db.rollback()
+            raise exc.CustomDataPathConflictException() from error
+
+        if custom_data is None:
+            raise exc.HabitNotFoundException()
+
+        await self._db.commit()
+
+        return custom_data
+
+    async def search(self, user_id: int, params: SearchQuerySchema) -> list[HabitSearchResultData]:
+        """
+        Поиск привычек пользователя по названию: по подстроке и с опечатками, по убыванию релевантности.
+
+        Args:
+            user_id (int): ID пользователя.
+            params (SearchQuerySchema): Строка поиска и максимальное количество результатов.
+
+        Returns:
+            (list[HabitSearchResultData]): Найденные привычки.
+        """
+        rows = await self._repository.search(user_id, params.q, params.limit)
+        return [HabitSearchResultData.model_validate(row) for row in rows]
+
+    async def get_due(self, user_id: int, today: date | None = None) -> list[HabitDueData]:
+        """
+        Привычки пользователя на сегодня: активные, в сроке действия и с днем отметки сегодня. Учитываются
+        отметки, которые еще ждут записи в буфере.
+
+        Args:
+            user_id (int): ID пользователя.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (list[HabitDueData]): Привычки со статистикой на сегодня и признаком выполнения текущего периода.
+        """
+        today = today or date.today()
+        habits: Sequence[HabitModel] = await self._repository.get_due(user_id, today)
+        await CheckInBufferService(self._db).merge_pending(user_id, habits, today)
+        result: list[HabitDueData] = []
+
+        for habit in habits:
+            schedule: HabitSchedule = HabitSchedule.from_habit(habit)
+            due: HabitDueData = HabitDueData.model_validate(habit)
+            result.append(
+                due.model_copy(
+                    update={
+                        **get_habit_stats(habit, today, schedule).model_dump(),
+                        "is_done": habit.last_success_period == schedule.period_start(today),
+                    }
+                )
+            )
+
+        return result
+
+    async def delete_habit(self, habit_id: int, user_id: int) -> bool:
+        """
+        Удаление привычки. Привычка помечается удаленной и остается надгробием для синхронизации клиентов.
+        Привычка из архива сначала возвращается в рабочую таблицу: надгробия хранятся только там.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+
+        Returns:
+            (bool): True, если привычка удалена.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет или она принадлежит другому пользователю.
+        """
+        habit: HabitModel | None = await self._repository.get_user_habit(habit_id, user_id)
+        habit = habit or await self._restore_habit(habit_id, user_id)
+
+        if habit is None:
+            raise exc.HabitNotFoundException()
+
+        return await self._repository.delete(habit.id)
+
+    async def set_archived(self, habit_id: int, user_id: int, is_archived: bool) -> HabitPublicData:
+        """
+        Перемещение привычки в архив или возврат из него. Архивная привычка остается в рабочей таблице,
+        пока ее не перенесет в архив фоновая задача (app.worker.tasks.habit_archive). Возврат переносит
+        привычку из архива сразу, статистика и история пересчитываются по всем ее отметкам.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            is_archived (bool): True - переместить в архив, False - вернуть.
+
+        Returns:
+            (HabitPublicData): Привычка.
+
+        Raises:
+            HabitNotFoundException: Если привычки нет или она принадлежит другому пользователю.
+        """
+        habit: HabitModel | Row | None = await self._repository.get_user_habit(habit_id, user_id, for_update=True)
+
+        if habit is not None:
+            habit.is_archived = is_archived
+            await self._db.commit()
+        elif is_archived:
+            habit = await HabitArchiveRepository(self._db).get_user_habit(habit_id, user_id)
+        else:
+            habit = await self._restore_habit(habit_id, user_id, unarchive=True)
+
+        if habit is None:
+            raise exc.HabitNotFoundException()
+
+        return HabitPublicData.model_validate(habit)
+
+    async def _restore_habit(self, habit_id: int, user_id: int, unarchive: bool = False) -> HabitModel | None:
+        """
+        Возвращает привычку из архива в рабочую таблицу с отметками за последние ARCHIVE_COMPLETIONS_AFTER_DAYS
+        и пересчитывает ее статистику и историю по всем отметкам. Транзакция фиксируется.
+
+        Args:
+            habit_id (int): ID привычки.
+            user_id (int): ID пользователя.
+            unarchive (bool): Снять с привычки признак архивной.
+
+        Returns:
+            (HabitModel | None): Привычка. None, если ее нет в архиве.
+        """
+        if not await HabitArchiveService(self._db).restore(habit_id, user_id):
+            return None
+
+        habit: HabitModel | None = await self._repository.get_user_habit(habit_id, user_id)
+
+        if habit is None:
+            return None
+
+        if unarchive:
+            habit.is_archived = False
+
+        # Сегменты истории удалены при переносе в архив: строятся заново вместе со статистикой
+        await self.rebuild_stats([habit_id])
+
+        return habit
+
+    async def sync(self, user_id: int, since: datetime | None, today: date | None = None) -> HabitSyncData:
+        """
+        Изменения привычек и отметок пользователя после водяного знака. Без водяного знака, с водяным знаком
+        старше SYNC_FULL_RESYNC_DAYS или из будущего возвращается полная выгрузка, в том числе из архива.
+        Перенос в архив и обратно не меняет данные для клиента и не попадает в изменения.
+
+        Notes:
+            - Новый водяной знак отстает от времени базы на SYNC_WATERMARK_LAG_SECONDS: изменения транзакций,
+              начатых раньше и зафиксированных позже чтения, придут в следующей синхронизации. Изменения
+              последних секунд приходят повторно, клиент применяет их как замену.
+
+        Args:
+            user_id (int): ID пользователя.
+            since (datetime | None): Водяной знак прошлой синхронизации.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (HabitSyncData): Изменения и новый водяной знак.
+        """
+        now: datetime = await self._repository.get_database_time()
+        is_full: bool = since is None or not now - timedelta(days=SYNC_FULL_RESYNC_DAYS) <= since <= now
+        changed_since: datetime | None = None if is_full else since
+
+        habits: Sequence[HabitModel] = await self._repository.get_changed(user_id, changed_since)
+        completions: Sequence[HabitCompletionModel] = await HabitCompletionRepository(self._db).get_changed(
+            user_id, changed_since
+        )
+        alive: list[HabitModel] = [habit for habit in habits if not habit.is_deleted]
+        await CheckInBufferService(self._db).merge_pending(user_id, alive, today or date.today())
+        archived_habits: Sequence[Row] = ()
+        archived_completions: Sequence[Row] = ()
+
+        if is_full:
+            archive: HabitArchiveRepository = HabitArchiveRepository(self._db)
+            archived_habits = await archive.get_user_habits(user_id)
+            archived_completions = await archive.get_user_completions(user_id)
+
+        sync_habits: list[HabitModel | Row] = [*alive, *archived_habits]
+        sync_completions: list[HabitCompletionModel | Row] = [*completions, *archived_completions]
+
+        return HabitSyncData(
+            watermark=now - timedelta(seconds=SYNC_WATERMARK_LAG_SECONDS),
+            is_full=is_full,
+            habits=[
+                HabitSyncItemData.model_validate(habit) for habit in sorted(sync_habits, key=lambda habit: habit.id)
+            ],
+            completions=[
+                HabitCompletionSyncData.model_validate(completion)
+                for completion in sorted(sync_completions, key=lambda completion: completion.id)
+            ],
+            deleted_habit_ids=[habit.id for habit in habits if habit.is_deleted],
+        )
+
+    async def rebuild_stats(self, habit_ids: Sequence[int], today: date | None = None) -> list[HabitStatsState]:
+        """
+        Пересчет статистики и компактной истории пакета привычек по всей истории отметок. Нужен после
+        импорта, изменения расписания или исправления ошибок: инкрементальное состояние строится заново,
+        и дальнейшие отметки продолжают его.
+
+        Args:
+            habit_ids (Sequence[int]): ID привычек.
+            today (date | None): Текущий день. По умолчанию - текущий день сервера.
+
+        Returns:
+            (list[HabitStatsState]): Пересчитанная статистика.
+        """
+        # Блокировка не дает отметкам, сделанным во время пересчета, потеряться при записи результата
+        habits: Sequence[HabitModel] = await self._repository.get_by_ids(habit_ids, for_update=True)
+        rows = await HabitCompletionRepository(self._db).get_days(habit_ids)
+        completion_habit_ids, completion_days, completion_partial = zip(*rows) if rows else ((), (), ())
+        states: list[HabitStatsState] = compute_habit_stats(
+            habits, completion_habit_ids, completion_days, today or date.today(), completion_partial
+        )
+
+        for habit, state in zip(habits, states):
+            for field, value in state.model_dump(exclude={"habit_id"}).items():
+                setattr(habit, field, value)
+
+        await HabitHistoryService(self._db).rebuild(habits, ((habit_id, day) for habit_id, day, _ in rows))
+        await self._db.commit()
+
+        return states
@@ -0,0 +1,449 @@
+"""
+Модуль пакетного пересчета статистики привычек по истории отметок. Используется после импорта,
+изменения расписания или исправления ошибок, когда инкрементальное состояние привычки нужно построить заново.
+
+Все операции векторные и выполняются сразу над пакетом привычек, без циклов по дням и привычкам.
+"""
+
+from datetime import date
+from typing import Any, NamedTuple, Sequence
+
+import numpy as np
+
+from .consts import DAY_FREQUENCY_TYPES, DAYS_IN_WEEK, MAX_SUCCESS_RATE, FrequencyType
+from .schedule import HabitSchedule
+from .schemas import HabitStatsState
+
+# Понедельник, от которого отсчитываются дни: номер недели и день недели получаются делением
+_EPOCH_MONDAY: np.datetime64 = np.datetime64("1970-01-05", "D")
+
+# Виды периодов
+_DAY_PERIOD: int = 0
+_WEEK_PERIOD: int = 1
+_MONTH_PERIOD: int = 2
+
+
+def to_day_numbers(days: Any) -> np.ndarray:
+    """
+    Переводит даты в номера дней от понедельника 1970-01-05.
+
+    Args:
+        days (Any): Даты (массив datetime64[D], список date).
+
+    Returns:
+        (np.ndarray): Номера дней (int64).
+    """
+    offsets: np.ndarray = np.asarray(days, dtype="datetime64[D]") - _EPOCH_MONDAY
+    return offsets.astype(np.int64)
+
+
+def _to_month_numbers(day_numbers: np.ndarray) -> np.ndarray:
+    """
+    Переводит номера дней в номера месяцев от января 1970.
+
+    Args:
+        day_numbers (np.ndarray): Номера дней.
+
+    Returns:
+        (np.ndarray): Номера месяцев.
+    """
+    days: np.ndarray = _EPOCH_MONDAY + day_numbers
+    return days.astype("datetime64[M]").astype(np.int64)
+
+
+def _month_start_day_numbers(month_numbers: np.ndarray) -> np.ndarray:
+    """
+    Возвращает номера первых дней месяцев.
+
+    Args:
+        month_numbers (np.ndarray): Номера месяцев.
+
+    Returns:
+        (np.ndarray): Номера дней.
+    """
+    return to_day_numbers(month_numbers.astype("datetime64[M]"))
+
+
+def _last_per_row(rows: np.ndarray) -> np.ndarray:
+    """
+    Находит последний элемент каждой привычки в упорядоченном по привычкам массиве: позиции, после которых
+    номер привычки меняется, и последний элемент массива.
+
+    Args:
+        rows (np.ndarray): Номера привычек в пакете по возрастанию.
+
+    Returns:
+        (np.ndarray): Позиции последних элементов привычек.
+    """
+    return np.flatnonzero(np.append(rows[1:] != rows[:-1], True)) if len(rows) else np.zeros(0, dtype=np.int64)
+
+
+def _to_dates(day_numbers: np.ndarray) -> list[date | None]:
+    """
+    Переводит номера дней в даты.
+
+    Args:
+        day_numbers (np.ndarray): Номера дней. Отрицательные - отсутствие даты.
+
+    Returns:
+        (list[date | None]): Даты.
+    """
+    dates: np.ndarray = (_EPOCH_MONDAY + day_numbers).astype(object)
+    dates[day_numbers < 0] = None
+
+    return list(dates)
+
+
+class _Schedules:
+    """
+    Расписания пакета привычек в виде массивов.
+
+    Attributes:
+        kind (np.ndarray): Вид периода каждой привычки.
+        goal (np.ndarray): Отметок, необходимых для выполнения периода.
+        due (np.ndarray): Матрица (привычки x 7): принимаются ли отметки в день недели (0 - понедельник).
+        due_before (np.ndarray): Матрица (привычки x 8): сколько дней расписания в неделе до дня недели.
+        start (np.ndarray): Номера дней начала привычек.
+        until (np.ndarray): Номера дней, на которые считается статистика (сегодня или дата окончания).
+    """
+
+    def __init__(self, habits: Sequence[Any], today: date) -> None:
+        """
+        Инициализация расписаний.
+
+        Args:
+            habits (Sequence[Any]): Привычки.
+            today (date): Текущий день.
+        """
+        schedules: list[HabitSchedule] = [HabitSchedule.from_habit(habit) for habit in habits]
+
+        self.kind: np.ndarray = np.array(
+            [
+                (
+                    _DAY_PERIOD
+                    if schedule.frequency_type in DAY_FREQUENCY_TYPES
+                    else _WEEK_PERIOD if schedule.frequency_type == FrequencyType.WEEKLY else _MONTH_PERIOD
+                )
+                for schedule in schedules
+            ],
+            dtype=np.int8,
+        ).reshape(-1)
+        self.goal: np.ndarray = np.array([schedule.goal for schedule in schedules], dtype=np.int64).reshape(-1)
+        self.due: np.ndarray = np.array(
+            [[day + 1 in schedule.days for day in range(DAYS_IN_WEEK)] for schedule in schedules], dtype=bool
+        ).reshape(-1, DAYS_IN_WEEK)
+        self.due[self.kind == _MONTH_PERIOD] = True
+        self.due_before: np.ndarray = np.zeros((len(schedules), DAYS_IN_WEEK + 1), dtype=np.int64)
+        np.cumsum(self.due, axis=1, out=self.due_before[:, 1:])
+        self.start: np.ndarray = to_day_numbers([habit.start_date for habit in habits]).reshape(-1)
+        self.until: np.ndarray = to_day_numbers(
+            [min(today, habit.end_date) if habit.end_date else today for habit in habits]
+        ).reshape(-1)
+
+    def period_index(self, rows: np.ndarray, day_numbers: np.ndarray) -> np.ndarray:
+        """
+        Возвращает порядковые номера периодов: соседние по расписанию периоды имеют соседние номера.
+        Для дневных привычек номер периода дня расписания - количество дней расписания до него.
+
+        Args:
+            rows (np.ndarray): Номера привычек в пакете.
+            day_numbers (np.ndarray): Номера дней.
+
+        Returns:
+            (np.ndarray): Номера периодов.
+        """
+        weeks, weekdays = np.divmod(day_numbers, DAYS_IN_WEEK)
+        kind: np.ndarray = self.kind[rows]
+        result: np.ndarray = weeks.copy()
+
+        # Каждый вид периода считается только по своим привычкам: перевод в месяцы дорогой
+        day_based: np.ndarray = kind == _DAY_PERIOD
+        day_rows: np.ndarray = rows[day_based]
+        result[day_based] = (
+            weeks[day_based] * self.due_before[day_rows, DAYS_IN_WEEK] + self.due_before[day_rows, weekdays[day_based]]
+        )
+        monthly: np.ndarray = kind == _MONTH_PERIOD
+        result[monthly] = _to_month_numbers(day_numbers[monthly])
+
+        return result
+
+    def period_start(self, rows: np.ndarray, day_numbers: np.ndarray) -> np.ndarray:
+        """
+        Возвращает номера первых дней периодов, в которые входят дни.
+
+        Args:
+            rows (np.ndarray): Номера привычек в пакете.
+            day_numbers (np.ndarray): Номера дней.
+
+        Returns:
+            (np.ndarray): Номера дней.
+        """
+        kind: np.ndarray = self.kind[rows]
+        result: np.ndarray = day_numbers.copy()
+
+        weekly: np.ndarray = kind == _WEEK_PERIOD
+        result[weekly] -= day_numbers[weekly] % DAYS_IN_WEEK
+        monthly: np.ndarray = kind == _MONTH_PERIOD
+        result[monthly] = _month_start_day_numbers(_to_month_numbers(day_numbers[monthly]))
+
+        return result
+
+
+class _PeriodGroups(NamedTuple):
+    """
+    Периоды с полными отметками, упорядоченные по привычкам и номерам периодов.
+
+    Attributes:
+        rows (np.ndarray): Номера привычек в пакете.
+        periods (np.ndarray): Номера периодов.
+        counts (np.ndarray): Количество отметок в периоде.
+        starts (np.ndarray): Номера первых дней периодов.
+    """
+
+    rows: np.ndarray
+    periods: np.ndarray
+    counts: np.ndarray
+    starts: np.ndarray
+
+
+class _Streaks(NamedTuple):
+    """
+    Цепочки выполненных периодов пакета привычек.
+
+    Attributes:
+        successful (np.ndarray): Количество выполненных периодов.
+        longest (np.ndarray): Самая длинная цепочка.
+        current (np.ndarray): Последняя цепочка.
+        last_success_start (np.ndarray): Номер первого дня последнего выполненного периода, -1 - нет.
+        last_success_index (np.ndarray): Номер последнего выполненного периода.
+    """
+
+    successful: np.ndarray
+    longest: np.ndarray
+    current: np.ndarray
+    last_success_start: np.ndarray
+    last_success_index: np.ndarray
+
+
+def _starts_of_runs(size: int, breaks: np.ndarray) -> np.ndarray:
+    """
+    Возвращает позиции, с которых начинаются серии: первый элемент и элементы после разрывов.
+
+    Args:
+        size (int): Длина массива.
+        breaks (np.ndarray): Признаки разрыва между соседними элементами (на один элемент короче массива).
+
+    Returns:
+        (np.ndarray): Позиции начала серий.
+    """
+    if not size:
+        return np.zeros(0, dtype=np.int64)
+
+    return np.flatnonzero(np.concatenate(([True], breaks)))
+
+
+def _match_completions(
+    schedules: _Schedules, habit_ids: np.ndarray, completion_habit_ids: Any, completion_days: Any, partial: Any
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Сопоставляет отметки привычкам пакета и отбрасывает отметки чужих привычек, вне срока действия
+    и в дни вне расписания.
+
+    Args:
+        schedules (_Schedules): Расписания пакета.
+        habit_ids (np.ndarray): ID привычек пакета.
+        completion_habit_ids (Any): ID привычек отметок.
+        completion_days (Any): Дни отметок.
+        partial (Any): Признаки частичных отметок или None.
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray, np.ndarray]): Номера привычек в пакете, номера дней и признаки
+            частичных отметок.
+    """
+    count: int = len(habit_ids)
+    order: np.ndarray = np.argsort(habit_ids)
+    completion_habit_ids = np.asarray(completion_habit_ids, dtype=np.int64).reshape(-1)
+    day_numbers: np.ndarray = to_day_numbers(completion_days).reshape(-1)
+    is_partial: np.ndarray = (
+        np.zeros(len(day_numbers), dtype=bool) if partial is None else np.asarray(partial, dtype=bool).reshape(-1)
+    )
+    positions: np.ndarray = np.minimum(np.searchsorted(habit_ids[order], completion_habit_ids), max(count - 1, 0))
+    known: np.ndarray = habit_ids[order][positions] == completion_habit_ids if count else np.zeros(0, dtype=bool)
+    rows: np.ndarray = order[positions[known]]
+    day_numbers, is_partial = day_numbers[known], is_partial[known]
+
+    valid: np.ndarray = (
+        (day_numbers >= schedules.start[rows])
+        & (day_numbers <= schedules.until[rows])
+        & schedules.due[rows, day_numbers % DAYS_IN_WEEK]
+    )
+    return rows[valid], day_numbers[valid], is_partial[valid]
+
+
+def _group_periods(schedules: _Schedules, rows: np.ndarray, day_numbers: np.ndarray) -> _PeriodGroups:
+    """
+    Группирует полные отметки по периодам привычек.
+
+    Args:
+        schedules (_Schedules): Расписания пакета.
+        rows (np.ndarray): Номера привычек в пакете.
+        day_numbers (np.ndarray): Номера дней.
+
+    Returns:
+        (_PeriodGroups): Периоды с отметками.
+    """
+    periods: np.ndarray = schedules.period_index(rows, day_numbers)
+
+    # Одна сортировка по составному ключу (привычка, период) быстрее лексикографической по двум ключам
+    first_period: int = int(periods.min()) if len(periods) else 0
+    order = np.argsort(rows * (int(periods.max()) - first_period + 1 if len(periods) else 1) + periods - first_period)
+    rows, periods, day_numbers = rows[order], periods[order], day_numbers[order]
+    starts: np.ndarray = _starts_of_runs(len(rows), (rows[1:] != rows[:-1]) | (periods[1:] != periods[:-1]))
+
+    return _PeriodGroups(
+        rows[starts],
+        periods[starts],
+        np.diff(np.append(starts, len(rows))),
+        schedules.period_start(rows[starts], day_numbers[starts]),
+    )
+
+
+def _last_periods(groups: _PeriodGroups, count: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Находит последний период с отметками каждой привычки.
+
+    Args:
+        groups (_PeriodGroups): Периоды с отметками.
+        count (int): Количество привычек в пакете.
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]): Номера первых дней последних периодов (-1 - нет) и количество отметок в них.
+    """
+    last_period_start: np.ndarray = np.full(count, -1, dtype=np.int64)
+    period_count: np.ndarray = np.zeros(count, dtype=np.int64)
+    last_groups: np.ndarray = _last_per_row(groups.rows)
+    last_period_start[groups.rows[last_groups]] = groups.starts[last_groups]
+    period_count[groups.rows[last_groups]] = groups.counts[last_groups]
+
+    return last_period_start, period_count
+
+
+def _find_streaks(schedules: _Schedules, groups: _PeriodGroups, count: int) -> _Streaks:
+    """
+    Строит цепочки - серии выполненных периодов с соседними номерами.
+
+    Args:
+        schedules (_Schedules): Расписания пакета.
+        groups (_PeriodGroups): Периоды с отметками.
+        count (int): Количество привычек в пакете.
+
+    Returns:
+        (_Streaks): Цепочки привычек.
+    """
+    done: np.ndarray = groups.counts >= schedules.goal[groups.rows]
+    rows, periods, starts = groups.rows[done], groups.periods[done], groups.starts[done]
+    run_starts: np.ndarray = _starts_of_runs(len(rows), (rows[1:] != rows[:-1]) | (periods[1:] != periods[:-1] + 1))
+    run_lengths: np.ndarray = np.diff(np.append(run_starts, len(rows)))
+
+    streaks: _Streaks = _Streaks(
+        successful=np.bincount(rows, minlength=count),
+        longest=np.zeros(count, dtype=np.int64),
+        current=np.zeros(count, dtype=np.int64),
+        last_success_start=np.full(count, -1, dtype=np.int64),
+        last_success_index=np.full(count, np.iinfo(np.int64).min, dtype=np.int64),
+    )
+    np.maximum.at(streaks.longest, rows[run_starts], run_lengths)
+    last_runs: np.ndarray = _last_per_row(rows[run_starts])
+    streaks.current[rows[run_starts[last_runs]]] = run_lengths[last_runs]
+    last_done: np.ndarray = _last_per_row(rows)
+    streaks.last_success_start[rows[last_done]] = starts[last_done]
+    streaks.last_success_index[rows[last_done]] = periods[last_done]
+
+    return streaks
+
+
+def _success_rate(schedules: _Schedules, streaks: _Streaks) -> np.ndarray:
+    """
+    Считает процент успеха: долю выполненных периодов среди завершенных с начала привычки
+    и текущего, если он уже выполнен.
+
+    Args:
+        schedules (_Schedules): Расписания пакета.
+        streaks (_Streaks): Цепочки привычек.
+
+    Returns:
+        (np.ndarray): Процент успеха привычек.
+    """
+    count: int = len(schedules.kind)
+    all_rows: np.ndarray = np.arange(count)
+    open_index: np.ndarray = schedules.period_index(all_rows, schedules.until)
+    is_open: np.ndarray = schedules.due[all_rows, schedules.until % DAYS_IN_WEEK] | (schedules.kind != _DAY_PERIOD)
+    elapsed: np.ndarray = np.maximum(open_index - schedules.period_index(all_rows, schedules.start), 0)
+    elapsed += is_open & (streaks.last_success_index == open_index)
+    rate: np.ndarray = np.divide(streaks.successful * MAX_SUCCESS_RATE, elapsed, out=np.zeros(count), where=elapsed > 0)
+
+    return np.minimum(MAX_SUCCESS_RATE, np.round(rate)).astype(np.int64)
+
+
+def compute_habit_stats(
+    habits: Sequence[Any], completion_habit_ids: Any, completion_days: Any, today: date, completion_partial: Any = None
+) -> list[HabitStatsState]:
+    """
+    Строит статистику и инкрементальное состояние пакета привычек по их отметкам.
+
+    Notes:
+        - Отметки вне срока действия привычки и в дни вне расписания не учитываются.
+        - Частичные отметки учитываются только в количестве отметок, как в apply_check_in.
+        - Результат совпадает с последовательным применением отметок (apply_check_in) в порядке дат.
+
+    Args:
+        habits (Sequence[Any]): Привычки (модели или схемы с полями расписания, id, start_date и end_date).
+        completion_habit_ids (Any): ID привычек отметок.
+        completion_days (Any): Дни отметок. Порядок отметок произвольный.
+        today (date): Текущий день.
+        completion_partial (Any): Признаки частичных отметок. По умолчанию все отметки полные.
+
+    Returns:
+        (list[HabitStatsState]): Статистика привычек в порядке habits.
+
+    Examples:
+        >>> compute_habit_stats(habits, np.array([1, 1, 2]), np.array(["2026-10-18", "2026-10-19", "2026-10-19"],
+        ...     dtype="datetime64[D]"), date(2026, 10, 19))
+    """
+    count: int = len(habits)
+    schedules: _Schedules = _Schedules(habits, today)
+    habit_ids: np.ndarray = np.array([habit.id for habit in habits], dtype=np.int64)
+
+    rows, day_numbers, partial = _match_completions(
+        schedules, habit_ids, completion_habit_ids, completion_days, completion_partial
+    )
+    # Периоды и цепочки строятся только по полным отметкам
+    groups: _PeriodGroups = _group_periods(schedules, rows[~partial], day_numbers[~partial])
+
+    last_period_start, period_count = _last_periods(groups, count)
+    streaks: _Streaks = _find_streaks(schedules, groups, count)
+
+    return [
+        HabitStatsState(
+            habit_id=habit_id,
+            current_streak=values[0],
+            longest_streak=values[1],
+            total_completions=values[2],
+            success_rate=values[3],
+            successful_periods=values[4],
+            period_count=values[5],
+            last_period_start=values[6],
+            last_success_period=values[7],
+        )
+        for habit_id, *values in zip(
+            habit_ids.tolist(),
+            streaks.current.tolist(),
+            streaks.longest.tolist(),
+            np.bincount(rows, minlength=count).tolist(),
+            _success_rate(schedules, streaks).tolist(),
+            streaks.successful.tolist(),
+            period_count.tolist(),
+            _to_dates(last_period_start),
+            _to_dates(streaks.last_success_start),
+        )
+    ]
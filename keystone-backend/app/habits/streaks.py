@@ -0,0 +1,96 @@
+"""Модуль инкрементального пересчета статистики привычки."""
+
+from datetime import date
+
+from sqlalchemy import Row
+
+from .consts import MAX_SUCCESS_RATE
+from .model import Habit as HabitModel
+from .schedule import HabitSchedule
+from .schemas import StreakHabitData
+
+
+def apply_check_in(
+    habit: HabitModel, day: date, today: date, schedule: HabitSchedule | None = None, is_partial: bool = False
+) -> None:
+    """
+    Обновляет статистику привычки после отметки за O(1): по сохраненному состоянию последнего периода,
+    без чтения истории отметок.
+
+    Notes:
+        - Отметка должна относиться к периоду последней отметки или более позднему (проверяет сервис).
+        - Цепочка продолжается, если предыдущий выполненный период - непосредственно предыдущий по расписанию.
+        - Частичная отметка учитывается только в количестве отметок: она не приближает выполнение периода
+          и не продолжает цепочку.
+
+    Args:
+        habit (HabitModel): Привычка. Изменяется на месте.
+        day (date): День выполнения.
+        today (date): Текущий день пользователя.
+        schedule (HabitSchedule | None): Расписание привычки. По умолчанию строится по ее полям.
+        is_partial (bool): Частичное выполнение.
+
+    Examples:
+        >>> apply_check_in(habit, date(2026, 10, 19), today=date(2026, 10, 19))
+    """
+    schedule = schedule or HabitSchedule.from_habit(habit)
+    habit.total_completions = (habit.total_completions or 0) + 1
+
+    if not is_partial:
+        _count_in_period(habit, schedule.period_start(day), schedule)
+
+    habit.success_rate = get_habit_stats(habit, today, schedule).success_rate
+
+
+def _count_in_period(habit: HabitModel, period: date, schedule: HabitSchedule) -> None:
+    """
+    Учитывает полную отметку в периоде и продлевает цепочку, если период выполнен.
+
+    Args:
+        habit (HabitModel): Привычка. Изменяется на месте.
+        period (date): Начало периода отметки.
+        schedule (HabitSchedule): Расписание привычки.
+    """
+    if habit.last_period_start == period:
+        habit.period_count = (habit.period_count or 0) + 1
+    else:
+        habit.last_period_start = period
+        habit.period_count = 1
+
+    if habit.period_count >= schedule.goal and habit.last_success_period != period:
+        continues: bool = habit.last_success_period == schedule.previous_period_start(period)
+        habit.current_streak = (habit.current_streak or 0) + 1 if continues else 1
+        habit.longest_streak = max(habit.longest_streak or 0, habit.current_streak)
+        habit.successful_periods = (habit.successful_periods or 0) + 1
+        habit.last_success_period = period
+
+
+def get_habit_stats(habit: HabitModel | Row, today: date, schedule: HabitSchedule | None = None) -> StreakHabitData:
+    """
+    Возвращает статистику привычки на текущий день. Читает только поля привычки: цепочка, прерванная
+    пропущенным периодом, и процент успеха с учетом прошедших без отметок периодов вычисляются арифметикой дат.
+
+    Args:
+        habit (HabitModel | Row): Привычка или строка архива.
+        today (date): Текущий день пользователя.
+        schedule (HabitSchedule | None): Расписание привычки. По умолчанию строится по ее полям.
+
+    Returns:
+        (StreakHabitData): Статистика привычки.
+    """
+    schedule = schedule or HabitSchedule.from_habit(habit)
+    day: date = min(today, habit.end_date) if habit.end_date else today
+    open_period: date | None = schedule.open_period(day)
+    closed_period: date = schedule.previous_period_start(open_period or day)
+    open_period_done: bool = open_period is not None and habit.last_success_period == open_period
+
+    periods: int = schedule.count_periods(habit.start_date, closed_period) + int(open_period_done)
+    successful: int = habit.successful_periods or 0
+    is_streak_alive: bool = open_period_done or habit.last_success_period == closed_period
+
+    return StreakHabitData(
+        current_streak=(habit.current_streak or 0) if is_streak_alive else 0,
+        longest_streak=habit.longest_streak or 0,
+        total_completions=habit.total_completions or 0,
+        success_rate=min(MAX_SUCCESS_RATE, round(successful * MAX_SUCCESS_RATE / periods)) if periods else 0,
+    )
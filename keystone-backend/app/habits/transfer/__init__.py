@@ -0,0 +1,4 @@
+"""Пакет импорта и выгрузки привычек и отметок."""
+
+from .repository import HabitTransferRepository
+from .service import HabitTransferService, stream_export
@@ -0,0 +1,229 @@
+"""
+Модуль форматов импорта и выгрузки привычек: NDJSON и CSV.
+
+Файл - последовательность записей: привычки (type = habit) со ссылкой ref и отметки (type = completion)
+со ссылкой habit_ref на привычку того же файла. Выгрузка пишет привычки раньше их отметок, и тот же файл
+принимается импортом. Разбор идет по частям тела запроса: в памяти держится только текущая строка.
+"""
+
+import codecs
+import csv
+import io
+import json
+from datetime import date, time
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
+
+from ..consts import TRANSFER_LIST_SEPARATOR, TransferFormat
+
+# Поля привычки (HabitData) и отметки в записях файла
+HABIT_FIELDS: tuple[str, ...] = (
+    "title",
+    "description",
+    "icon",
+    "color",
+    "category",
+    "is_active",
+    "is_archived",
+    "start_date",
+    "end_date",
+    "tags",
+    "frequency_type",
+    "times_per_period",
+    "days_of_week",
+    "preferred_times",
+    "target_streak",
+    "target_count",
+    "target_date",
+    "allow_partial",
+    "require_notes",
+    "require_mood",
+)
+COMPLETION_FIELDS: tuple[str, ...] = ("completed_on", "is_partial", "note", "mood")
+
+# Колонки CSV: общие для записей обоих типов, у записи заполнены только ее колонки
+CSV_COLUMNS: tuple[str, ...] = ("type", "ref", *HABIT_FIELDS, "habit_ref", *COMPLETION_FIELDS)
+# Колонки CSV со списками: значения через TRANSFER_LIST_SEPARATOR
+_CSV_LIST_COLUMNS: frozenset[str] = frozenset({"tags", "days_of_week", "preferred_times"})
+
+# Запись файла: номер первой строки записи и поля. None - строку не удалось разобрать
+TransferRecord = tuple[int, dict[str, Any] | None]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Делит поток байт в UTF-8 на строки. Символ, разрезанный границей частей, собирается декодером.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Части тела запроса.
+
+    Returns:
+        (AsyncIterator[str]): Строки без перевода строки.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    tail: str = ""
+
+    async for chunk in chunks:
+        lines: list[str] = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+
+        for line in lines:
+            yield line.removesuffix("\r")
+
+    tail += decoder.decode(b"", final=True)
+
+    if tail:
+        yield tail.removesuffix("\r")
+
+
+async def iter_records(chunks: AsyncIterable[bytes], transfer_format: TransferFormat) -> AsyncIterator[TransferRecord]:
+    """
+    Разбирает записи файла импорта. Пустые строки пропускаются.
+
+    Args:
+        chunks (AsyncIterable[bytes]): Части тела запроса.
+        transfer_format (TransferFormat): Формат файла.
+
+    Returns:
+        (AsyncIterator[TransferRecord]): Записи в порядке файла.
+    """
+    record: TransferRecord
+
+    if transfer_format == TransferFormat.CSV:
+        async for record in _iter_csv_records(iter_lines(chunks)):
+            yield record
+
+        return
+
+    number: int = 0
+
+    async for line in iter_lines(chunks):
+        number += 1
+
+        if not line.strip():
+            continue
+
+        try:
+            document: Any = json.loads(line)
+        except ValueError:
+            document = None
+
+        yield number, document if isinstance(document, dict) else None
+
+
+async def _iter_csv_records(lines: AsyncIterable[str]) -> AsyncIterator[TransferRecord]:
+    """
+    Разбирает записи CSV. Первая строка - заголовок. Запись продолжается на следующих строках, пока
+    не закрыты кавычки поля. Пустые значения опускаются: для них действуют значения по умолчанию.
+
+    Args:
+        lines (AsyncIterable[str]): Строки файла.
+
+    Returns:
+        (AsyncIterator[TransferRecord]): Записи в порядке файла.
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    quotes: int = 0
+    number: int = 0
+
+    async for line in lines:
+        number += 1
+        pending.append(line)
+        quotes += line.count('"')
+
+        if quotes % 2:
+            continue
+
+        first: int = number - len(pending) + 1
+        text: str = "\n".join(pending)
+        pending, quotes = [], 0
+
+        if not text.strip():
+            continue
+
+        row: list[str] = next(csv.reader([text]), [])
+
+        if not row:
+            continue
+
+        if header is None:
+            header = [column.strip() for column in row]
+        elif len(row) > len(header):
+            yield first, None
+        else:
+            yield first, {
+                column: value.split(TRANSFER_LIST_SEPARATOR) if column in _CSV_LIST_COLUMNS else value
+                for column, value in zip(header, row)
+                if value != ""
+            }
+
+    if pending:
+        yield number - len(pending) + 1, None
+
+
+def get_csv_header() -> str:
+    """
+    Возвращает заголовок CSV выгрузки.
+
+    Returns:
+        (str): Строка заголовка с переводом строки.
+    """
+    return _write_csv_rows([list(CSV_COLUMNS)])
+
+
+def format_records(records: Iterable[dict[str, Any]], transfer_format: TransferFormat) -> str:
+    """
+    Форматирует пакет записей выгрузки.
+
+    Args:
+        records (Iterable[dict[str, Any]]): Записи с полем type.
+        transfer_format (TransferFormat): Формат файла.
+
+    Returns:
+        (str): Строки записей с переводами строк.
+    """
+    if transfer_format == TransferFormat.CSV:
+        return _write_csv_rows([_to_csv_value(record.get(column)) for column in CSV_COLUMNS] for record in records)
+
+    return "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+
+
+def _write_csv_rows(rows: Iterable[list[str]]) -> str:
+    """
+    Записывает строки CSV.
+
+    Args:
+        rows (Iterable[list[str]]): Значения строк.
+
+    Returns:
+        (str): Строки CSV.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+
+    return buffer.getvalue()
+
+
+def _to_csv_value(value: Any) -> str:
+    """
+    Преобразует значение поля в значение CSV.
+
+    Args:
+        value (Any): Значение поля.
+
+    Returns:
+        (str): Значение колонки. Пустая строка для None.
+    """
+    if value is None:
+        return ""
+
+    if isinstance(value, bool):
+        return str(value).lower()
+
+    if isinstance(value, (list, tuple)):
+        return TRANSFER_LIST_SEPARATOR.join(_to_csv_value(item) for item in value)
+
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+
+    return str(value)
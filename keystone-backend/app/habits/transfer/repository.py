@@ -0,0 +1,82 @@
+"""Модуль репозитория импорта и выгрузки привычек."""
+
+from datetime import date
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncScalarResult
+
+from app.core.database import BaseRepository
+
+from ..model import Habit as HabitModel
+from ..model import HabitCompletion as HabitCompletionModel
+
+
+class HabitTransferRepository(BaseRepository[HabitModel]):
+    """Репозиторий импорта и выгрузки привычек и отметок."""
+
+    _MODEL = HabitModel
+
+    async def create_many(self, habits: Sequence[dict]) -> list[int]:
+        """
+        Создание привычек пакетом: строки передаются многострочными INSERT. Транзакция не фиксируется.
+
+        Args:
+            habits (Sequence[dict]): Данные привычек (HabitCreateData).
+
+        Returns:
+            (list[int]): ID созданных привычек в порядке данных.
+        """
+        if not habits:
+            return []
+
+        query = insert(HabitModel).returning(HabitModel.id, sort_by_parameter_order=True)
+        return list((await self._session_db.execute(query, list(habits))).scalars())
+
+    async def stream_user_habits(self, user_id: int, batch_size: int) -> AsyncScalarResult[HabitModel]:
+        """
+        Чтение неудаленных привычек пользователя серверным курсором: строки приходят порциями.
+
+        Args:
+            user_id (int): ID пользователя.
+            batch_size (int): Строк в порции.
+
+        Returns:
+            (AsyncScalarResult[HabitModel]): Привычки по возрастанию ID.
+        """
+        query = (
+            select(HabitModel)
+            .where(HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None))
+            .order_by(HabitModel.id)
+        )
+        return await self._session_db.stream_scalars(query, execution_options={"yield_per": batch_size})
+
+    async def stream_user_completions(
+        self, user_id: int, batch_size: int
+    ) -> AsyncResult[tuple[int, date, bool, str | None, int | None]]:
+        """
+        Чтение отметок неудаленных привычек пользователя серверным курсором: строки приходят порциями.
+        Отметки идут по привычкам, и каждая привычка читается по индексу (habit_id, completed_on) без сортировки.
+
+        Args:
+            user_id (int): ID пользователя.
+            batch_size (int): Строк в порции.
+
+        Returns:
+            (AsyncResult[tuple[int, date, bool, str | None, int | None]]): ID привычки, день, частичность,
+                заметка и настроение по возрастанию ID привычки и дня.
+        """
+        query = (
+            select(
+                HabitCompletionModel.habit_id,
+                HabitCompletionModel.completed_on,
+                HabitCompletionModel.is_partial,
+                HabitCompletionModel.note,
+                HabitCompletionModel.mood,
+            )
+            .join(HabitModel, HabitModel.id == HabitCompletionModel.habit_id)
+            .where(HabitModel.user_id == user_id, HabitModel.deleted_at.is_(None))
+            .order_by(HabitCompletionModel.habit_id, HabitCompletionModel.completed_on)
+        )
+        return await self._session_db.stream(query, execution_options={"yield_per": batch_size})
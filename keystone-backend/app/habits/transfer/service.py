@@ -0,0 +1,319 @@
+"""Модуль сервиса импорта и выгрузки привычек."""
+
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from pydantic import ValidationError
+
+from app.core import BaseHttpException, BaseService
+from app.core.database import database_manager
+
+from .. import exceptions as exc
+from ..archive import HabitArchiveRepository
+from ..completions import HabitCompletionRepository
+from ..consts import (
+    HABIT_STATS_BATCH_SIZE,
+    TRANSFER_BATCH_SIZE,
+    TRANSFER_MAX_ERRORS,
+    TransferFormat,
+    TransferRecordType,
+)
+from ..model import Habit as HabitModel
+from ..rollups import HabitRollupService
+from ..schemas import HabitImportErrorData, HabitImportResultData, HabitTransferCompletionData, HabitTransferData
+from ..service import HabitService
+from .formats import COMPLETION_FIELDS, HABIT_FIELDS, TransferRecord, format_records, get_csv_header, iter_records
+from .repository import HabitTransferRepository
+
+
+class HabitTransferService(BaseService[HabitTransferRepository, HabitTransferData, HabitModel]):
+    """Сервис импорта и выгрузки привычек и отметок."""
+
+    _REPOSITORY = HabitTransferRepository
+
+    async def import_records(
+        self,
+        user_id: int,
+        chunks: AsyncIterable[bytes],
+        transfer_format: TransferFormat,
+        today: date | None = None,
+    ) -> HabitImportResultData:
+        """
+        Импорт привычек и отметок из файла. Файл разбирается по мере получения, записи проверяются
+        и пишутся пакетами по TRANSFER_BATCH_SIZE: привычки и отметки пакета - многострочными INSERT.
+        Строки с ошибками пропускаются. Каждый пакет фиксируется своей транзакцией: транзакция не ждет
+        загрузки файла, а записи пакета получают время его записи, поэтому синхронизация клиентов
+        не пропускает их при долгой загрузке. После импорта статистика и сводки пересчитываются по истории.
+
+        Notes:
+            - Отметка ссылается на привычку файла, описанную раньше нее или в том же пакете.
+            - В памяти держатся текущий пакет и ссылки импортированных привычек.
+            - Если загрузка прервалась, зафиксированные пакеты остаются, и их статистика пересчитывается.
+
+        Args:
+            user_id (int): ID пользователя.
+            chunks (AsyncIterable[bytes]): Части тела запроса.
+            transfer_format (TransferFormat): Формат файла.
+            today (date | None): Текущий день пользователя. По умолчанию - текущий день сервера.
+
+        Returns:
+            (HabitImportResultData): Количество импортированных записей и ошибки пропущенных строк.
+        """
+        today = today or date.today()
+        result: HabitImportResultData = HabitImportResultData()
+        refs: dict[str, tuple[int, date, date | None]] = {}
+        batch: list[TransferRecord] = []
+
+        try:
+            async for record in iter_records(chunks, transfer_format):
+                batch.append(record)
+
+                if len(batch) >= TRANSFER_BATCH_SIZE:
+                    await self._import_batch(user_id, batch, refs, result, today)
+                    await self._db.commit()
+                    batch = []
+
+            await self._import_batch(user_id, batch, refs, result, today)
+            await self._db.commit()
+        finally:
+            # Незафиксированный пакет прерванной загрузки отменяется, зафиксированные пересчитываются
+            await self._db.rollback()
+
+            if result.completions:
+                habit_service: HabitService = HabitService(self._db)
+                habit_ids: list[int] = [habit_id for habit_id, _, _ in refs.values()]
+
+                for start in range(0, len(habit_ids), HABIT_STATS_BATCH_SIZE):
+                    await habit_service.rebuild_stats(habit_ids[start : start + HABIT_STATS_BATCH_SIZE], today)
+
+                await HabitRollupService(self._db).rebuild_rollups([user_id])
+
+        # Отметки пакета проверяются после его привычек: ошибки возвращаются в порядке строк файла
+        result.errors.sort(key=lambda error: error.line)
+
+        return result
+
+    async def _import_batch(
+        self,
+        user_id: int,
+        batch: Sequence[TransferRecord],
+        refs: dict[str, tuple[int, date, date | None]],
+        result: HabitImportResultData,
+        today: date,
+    ) -> None:
+        """
+        Проверяет и пишет пакет записей импорта. Транзакция не фиксируется.
+
+        Args:
+            user_id (int): ID пользователя.
+            batch (Sequence[TransferRecord]): Записи пакета.
+            refs (dict[str, tuple[int, date, date | None]]): ID, дата начала и дата окончания импортированных
+                привычек по ссылкам. Дополняется привычками пакета.
+            result (HabitImportResultData): Результат импорта. Дополняется результатами пакета.
+            today (date): Текущий день пользователя.
+        """
+        habits, completions = self._validate_records(batch, refs, result)
+        habit_ids: list[int] = await self._repository.create_many(
+            [{**habit.model_dump(exclude={"ref"}), "user_id": user_id} for habit in habits]
+        )
+        result.habits += len(habit_ids)
+
+        for habit, habit_id in zip(habits, habit_ids):
+            refs[habit.ref] = (habit_id, habit.start_date, habit.end_date)
+
+        rows: list[dict] = [
+            {
+                **completion.model_dump(exclude={"habit_ref"}),
+                "habit_id": refs[completion.habit_ref][0],
+                "user_id": user_id,
+            }
+            for completion in self._validate_completions(completions, refs, result, today)
+        ]
+        await HabitCompletionRepository(self._db).create_many(rows)
+        result.completions += len(rows)
+
+    @classmethod
+    def _validate_records(
+        cls,
+        batch: Sequence[TransferRecord],
+        refs: dict[str, tuple[int, date, date | None]],
+        result: HabitImportResultData,
+    ) -> tuple[list[HabitTransferData], list[tuple[int, HabitTransferCompletionData]]]:
+        """
+        Разбирает записи пакета в привычки и отметки. Строки с ошибками учитываются в результате и пропускаются.
+
+        Args:
+            batch (Sequence[TransferRecord]): Записи пакета.
+            refs (dict[str, tuple[int, date, date | None]]): Импортированные привычки по ссылкам.
+            result (HabitImportResultData): Результат импорта.
+
+        Returns:
+            (tuple[list[HabitTransferData], list[tuple[int, HabitTransferCompletionData]]]): Привычки пакета
+                и отметки с номерами строк.
+        """
+        habits: list[HabitTransferData] = []
+        completions: list[tuple[int, HabitTransferCompletionData]] = []
+
+        for line, record in batch:
+            try:
+                if record is None:
+                    raise exc.TransferRecordInvalidException()
+
+                if record.get("type") == TransferRecordType.HABIT:
+                    habit: HabitTransferData = HabitTransferData.model_validate(record)
+
+                    if habit.ref in refs or any(habit.ref == other.ref for other in habits):
+                        raise exc.TransferDuplicateRefException()
+
+                    habits.append(habit)
+                elif record.get("type") == TransferRecordType.COMPLETION:
+                    completions.append((line, HabitTransferCompletionData.model_validate(record)))
+                else:
+                    raise exc.TransferRecordTypeException()
+            except (BaseHttpException, ValidationError) as error:
+                cls._skip_record(result, line, error)
+
+        return habits, completions
+
+    @classmethod
+    def _validate_completions(
+        cls,
+        completions: Sequence[tuple[int, HabitTransferCompletionData]],
+        refs: dict[str, tuple[int, date, date | None]],
+        result: HabitImportResultData,
+        today: date,
+    ) -> list[HabitTransferCompletionData]:
+        """
+        Проверяет отметки пакета по импортированным привычкам. Строки с ошибками учитываются в результате
+        и пропускаются.
+
+        Args:
+            completions (Sequence[tuple[int, HabitTransferCompletionData]]): Отметки с номерами строк.
+            refs (dict[str, tuple[int, date, date | None]]): Импортированные привычки по ссылкам,
+                включая привычки пакета.
+            result (HabitImportResultData): Результат импорта.
+            today (date): Текущий день пользователя.
+
+        Returns:
+            (list[HabitTransferCompletionData]): Принятые отметки.
+        """
+        accepted: list[HabitTransferCompletionData] = []
+
+        for line, completion in completions:
+            try:
+                if completion.habit_ref not in refs:
+                    raise exc.TransferHabitRefNotFoundException()
+
+                _, start_date, end_date = refs[completion.habit_ref]
+
+                if completion.completed_on > today:
+                    raise exc.CheckInFutureDateException()
+
+                if completion.completed_on < start_date or (
+                    end_date is not None and completion.completed_on > end_date
+                ):
+                    raise exc.CheckInOutOfRangeException()
+            except BaseHttpException as error:
+                cls._skip_record(result, line, error)
+                continue
+
+            accepted.append(completion)
+
+        return accepted
+
+    @staticmethod
+    def _skip_record(result: HabitImportResultData, line: int, error: BaseHttpException | ValidationError) -> None:
+        """
+        Учитывает пропущенную строку импорта. Ошибки сохраняются только для первых TRANSFER_MAX_ERRORS строк.
+
+        Args:
+            result (HabitImportResultData): Результат импорта.
+            line (int): Номер строки.
+            error (BaseHttpException | ValidationError): Ошибка строки.
+        """
+        result.skipped += 1
+
+        if len(result.errors) >= TRANSFER_MAX_ERRORS:
+            return
+
+        if isinstance(error, ValidationError):
+            message: str = "; ".join(
+                f"{'.'.join(map(str, item['loc']))}: {item['msg']}" if item["loc"] else item["msg"]
+                for item in error.errors()
+            )
+        else:
+            message = error.detail
+
+        result.errors.append(HabitImportErrorData(line=line, error=message))
+
+    async def export_records(self, user_id: int, transfer_format: TransferFormat) -> AsyncIterator[str]:
+        """
+        Выгрузка неудаленных привычек и их отметок, включая архив. Строки читаются серверными курсорами
+        порциями по TRANSFER_BATCH_SIZE, и каждая порция отдается сразу после форматирования.
+
+        Args:
+            user_id (int): ID пользователя.
+            transfer_format (TransferFormat): Формат файла.
+
+        Returns:
+            (AsyncIterator[str]): Части файла: привычки, затем отметки.
+        """
+        # Привычки и отметки читаются из одного снимка базы: в выгрузке нет отметок без привычек
+        await self._db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        if transfer_format == TransferFormat.CSV:
+            yield get_csv_header()
+
+        archive: HabitArchiveRepository = HabitArchiveRepository(self._db)
+
+        for stream_habits in (self._repository.stream_user_habits, archive.stream_user_habits):
+            habits = await stream_habits(user_id, TRANSFER_BATCH_SIZE)
+
+            async for partition in habits.partitions():
+                yield format_records(
+                    (
+                        {
+                            "type": TransferRecordType.HABIT,
+                            "ref": str(habit.id),
+                            **{field: getattr(habit, field) for field in HABIT_FIELDS},
+                        }
+                        for habit in partition
+                    ),
+                    transfer_format,
+                )
+
+        for stream_completions in (
+            self._repository.stream_user_completions,
+            archive.stream_user_completions,
+        ):
+            completions = await stream_completions(user_id, TRANSFER_BATCH_SIZE)
+
+            async for partition in completions.partitions():
+                yield format_records(
+                    (
+                        {
+                            "type": TransferRecordType.COMPLETION,
+                            "habit_ref": str(completion.habit_id),
+                            **{field: getattr(completion, field) for field in COMPLETION_FIELDS},
+                        }
+                        for completion in partition
+                    ),
+                    transfer_format,
+                )
+
+
+async def stream_export(user_id: int, transfer_format: TransferFormat) -> AsyncIterator[str]:
+    """
+    Выгрузка привычек и отметок пользователя в своей сессии: ответ передается после выхода из обработчика
+    запроса, когда сессия запроса может быть уже закрыта.
+
+    Args:
+        user_id (int): ID пользователя.
+        transfer_format (TransferFormat): Формат файла.
+
+    Returns:
+        (AsyncIterator[str]): Части файла выгрузки.
+    """
+    async for session in database_manager.get_session():
+        async for chunk in HabitTransferService(session).export_records(user_id, transfer_format):
+            yield chunk
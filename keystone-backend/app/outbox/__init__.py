@@ -0,0 +1,4 @@
+"""Пакет для работы с исходящими сообщениями (transactional outbox)."""
+
+from .model import OutboxMessage as OutboxMessageModel
+from .repository import OutboxRepository
@@ -0,0 +1,14 @@
+"""Модуль констант исходящих сообщений."""
+
+# Максимальное количество сообщений, забираемых ретранслятором за раз
+OUTBOX_BATCH_SIZE: int = 500
+# Пауза ретранслятора в секундах, когда новых сообщений нет
+OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+# Сколько часов хранить опубликованные сообщения
+OUTBOX_RETENTION_HOURS: int = 24
+# Как часто ретранслятор удаляет старые опубликованные сообщения, в секундах
+OUTBOX_PURGE_INTERVAL_SECONDS: float = 600.0
+# Префикс идентификатора задачи Celery, опубликованной из outbox
+OUTBOX_TASK_ID_PREFIX: str = "outbox"
+# Группа метрик ретранслятора: количество опубликованных сообщений и задержка от добавления в outbox до публикации
+OUTBOX_RELAY_METRICS: str = "outbox_relay"
@@ -0,0 +1,38 @@
+# pylint: disable=too-few-public-methods, unsubscriptable-object
+"""Модуль модели исходящего сообщения."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import BaseModel, TimestampMixin
+
+
+class OutboxMessage(BaseModel, TimestampMixin):
+    """
+    Модель исходящего сообщения - задачи воркера, которая будет опубликована в брокер ретранслятором.
+
+    Attributes:
+        id: ID сообщения. Определяет порядок публикации.
+        task_name: Имя задачи Celery.
+        payload: Именованные аргументы задачи.
+        published_at: Время публикации в брокер.
+
+    Properties:
+        is_published: Сообщение опубликовано.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_unpublished", "id", postgresql_where="published_at IS NULL"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    task_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def is_published(self) -> bool:
+        """Проверяет, опубликовано ли сообщение."""
+        return self.published_at is not None
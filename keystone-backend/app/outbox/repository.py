@@ -0,0 +1,129 @@
+"""Модуль репозитория исходящих сообщений."""
+
+from datetime import datetime
+from typing import Any, Sequence, cast
+
+from celery import Task
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import CursorResult, Delete, Select, Update, delete, select, update
+
+from app.core.database import BaseRepository
+
+from .model import OutboxMessage as OutboxMessageModel
+
+
+class OutboxRepository(BaseRepository[OutboxMessageModel]):
+    """Репозиторий исходящих сообщений."""
+
+    _MODEL = OutboxMessageModel
+
+    async def add_task(self, task: Task, **kwargs: Any) -> OutboxMessageModel:
+        """
+        Добавление задачи воркера в текущую транзакцию без ее фиксации.
+        Задача будет опубликована в брокер, только если транзакция зафиксирована.
+
+        Args:
+            task (Task): Задача Celery.
+            **kwargs (Any): Именованные аргументы задачи. Должны сериализоваться в JSON.
+
+        Returns:
+            (OutboxMessageModel): Исходящее сообщение.
+
+        Examples:
+            >>> async def send_email(token: UUID, user_full_name: str, user_email: str) -> None:
+            ...     await OutboxRepository(...).add_task(
+            ...         send_confirmation_email, token=token, user_full_name=user_full_name, user_email=user_email
+            ...     )
+        """
+        return await self.create({"task_name": task.name, "payload": jsonable_encoder(kwargs)}, commit=False)
+
+    @staticmethod
+    def build_claim_query(limit: int) -> Select:
+        """
+        Строит запрос неопубликованных сообщений с блокировкой FOR UPDATE SKIP LOCKED.
+
+        Args:
+            limit (int): Максимальное количество сообщений.
+
+        Returns:
+            (Select): Запрос сообщений в порядке добавления.
+        """
+        return (
+            select(OutboxMessageModel)
+            .where(OutboxMessageModel.published_at.is_(None))
+            .order_by(OutboxMessageModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+    async def claim_batch(self, limit: int) -> Sequence[OutboxMessageModel]:
+        """
+        Блокирует неопубликованные сообщения до конца транзакции. Сообщения, заблокированные
+        другими ретрансляторами, пропускаются.
+
+        Args:
+            limit (int): Максимальное количество сообщений.
+
+        Returns:
+            (Sequence[OutboxMessageModel]): Сообщения в порядке добавления.
+        """
+        result = await self._session_db.scalars(self.build_claim_query(limit))
+
+        return result.all()
+
+    @staticmethod
+    def build_mark_published_query(message_ids: Sequence[int], published_at: datetime) -> Update:
+        """
+        Строит запрос, отмечающий сообщения опубликованными.
+
+        Args:
+            message_ids (Sequence[int]): ID сообщений.
+            published_at (datetime): Время публикации.
+
+        Returns:
+            (Update): Запрос обновления.
+        """
+        return (
+            update(OutboxMessageModel)
+            .where(OutboxMessageModel.id.in_(message_ids))
+            .values(published_at=published_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def mark_published(self, message_ids: Sequence[int], published_at: datetime) -> None:
+        """
+        Отмечает сообщения опубликованными без фиксации транзакции.
+
+        Args:
+            message_ids (Sequence[int]): ID сообщений.
+            published_at (datetime): Время публикации.
+        """
+        await self._session_db.execute(self.build_mark_published_query(message_ids, published_at))
+
+    @staticmethod
+    def build_purge_query(before: datetime) -> Delete:
+        """
+        Строит запрос удаления сообщений, опубликованных раньше заданного времени. Неопубликованные
+        сообщения не удаляются.
+
+        Args:
+            before (datetime): Граница времени публикации.
+
+        Returns:
+            (Delete): Запрос удаления.
+        """
+        return delete(OutboxMessageModel).where(OutboxMessageModel.published_at < before)
+
+    async def purge_published(self, before: datetime) -> int:
+        """
+        Удаляет сообщения, опубликованные раньше заданного времени, без фиксации транзакции.
+
+        Args:
+            before (datetime): Граница времени публикации.
+
+        Returns:
+            (int): Количество удаленных сообщений.
+        """
+        result = cast(CursorResult, await self._session_db.execute(self.build_purge_query(before)))
+
+        return result.rowcount
@@ -0,0 +1,18 @@
+import pytest
+from pydantic import ValidationError
+
+from app.campaigns.schemas import CampaignData
+
+
+def test_campaign_data_valid():
+    """Тест данных рассылки с темой и текстом."""
+    data = CampaignData(subject="Новая версия", body="<p>Привет</p>")
+
+    assert data.subject == "Новая версия"
+
+
+@pytest.mark.parametrize("subject, body", [("", "<p>Привет</p>"), ("Тема", ""), ("Т" * 256, "<p>Привет</p>")])
+def test_campaign_data_invalid(subject: str, body: str):
+    """Тест отклонения рассылки без темы, без текста или со слишком длинной темой."""
+    with pytest.raises(ValidationError):
+        CampaignData(subject=subject, body=body)
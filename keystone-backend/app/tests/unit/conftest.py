@@ -0,0 +1,15 @@
+from typing import Callable
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import ClauseElement
+
+
+@pytest.fixture(name="compile_sql")
+def compile_sql_fixture() -> Callable[..., str]:
+    """Компиляция запроса в SQL PostgreSQL. По умолчанию значения параметров подставляются в текст запроса."""
+
+    def _compile(query: ClauseElement, literal_binds: bool = True) -> str:
+        return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": literal_binds}))
+
+    return _compile
@@ -0,0 +1,126 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.core import coalescing
+from app.core.coalescing import SendCoalescer
+from app.core.consts import COALESCE_PENDING_VALUE
+
+KEY: str = "coalesce:confirmation:7"
+
+
+class FakeRedis:
+    """Ключи вместо Redis. Скрипт занятия окна выполняется как сравнение и замена значения."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    async def set(self, key: str, value: str, nx: bool = False, xx: bool = False, **_) -> bool:
+        if (nx and key in self.values) or (xx and key not in self.values):
+            return False
+
+        self.values[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.values.get(key)
+
+    async def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+    async def eval(self, _: str, __: int, key: str, expected: str, value: str, ___: int) -> int:
+        if self.values.get(key, expected) != expected:
+            return 0
+
+        self.values[key] = value
+        return 1
+
+
+@pytest.fixture(name="redis")
+def redis_fixture(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """Подмена клиента Redis и счетчиков метрик."""
+    client = FakeRedis()
+
+    async def increment(*_) -> None:
+        pass
+
+    monkeypatch.setattr(coalescing, "redis_manager", SimpleNamespace(client=client))
+    monkeypatch.setattr(coalescing, "increment_counter", increment)
+    return client
+
+
+def _run(send, is_outstanding) -> bool:
+    return asyncio.run(SendCoalescer("confirmation", window=60).run(7, send, is_outstanding))
+
+
+def test_first_send_stores_token(redis: FakeRedis):
+    """Тест первой отправки: письмо отправляется, в окне сохраняется токен."""
+    token = uuid4()
+
+    async def send() -> UUID:
+        return token
+
+    assert _run(send, None)
+    assert redis.values == {KEY: str(token)}
+
+
+def test_repeat_with_outstanding_token_is_coalesced(redis: FakeRedis):
+    """Тест повторного запроса: пока токен окна действителен, письмо не отправляется."""
+    token = uuid4()
+    redis.values[KEY] = str(token)
+    sent: list[UUID] = []
+
+    async def send() -> UUID:
+        sent.append(uuid4())
+        return sent[-1]
+
+    async def is_outstanding(checked: UUID) -> bool:
+        return checked == token
+
+    assert not _run(send, is_outstanding)
+    assert not sent
+    assert redis.values == {KEY: str(token)}
+
+
+def test_stale_token_is_resent(redis: FakeRedis):
+    """Тест повторного запроса с погашенным токеном: письмо отправляется заново с новым токеном."""
+    redis.values[KEY] = str(uuid4())
+    token = uuid4()
+
+    async def send() -> UUID:
+        return token
+
+    async def is_outstanding(_: UUID) -> bool:
+        return False
+
+    assert _run(send, is_outstanding)
+    assert redis.values == {KEY: str(token)}
+
+
+def test_stale_token_taken_by_parallel_request_is_coalesced(redis: FakeRedis):
+    """Тест гонки: окно с погашенным токеном, которое успел занять параллельный запрос, не занимается повторно."""
+    redis.values[KEY] = str(uuid4())
+
+    async def send() -> UUID:
+        raise AssertionError("Письмо не должно отправляться")
+
+    async def is_outstanding(_: UUID) -> bool:
+        redis.values[KEY] = COALESCE_PENDING_VALUE
+        return False
+
+    assert not _run(send, is_outstanding)
+    assert redis.values == {KEY: COALESCE_PENDING_VALUE}
+
+
+def test_window_is_released_on_failure(redis: FakeRedis):
+    """Тест неудачной отправки: окно освобождается, чтобы следующий запрос отправил письмо."""
+
+    async def send() -> UUID:
+        raise RuntimeError()
+
+    with pytest.raises(RuntimeError):
+        _run(send, None)
+
+    assert not redis.values
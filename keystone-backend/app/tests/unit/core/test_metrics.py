@@ -0,0 +1,36 @@
+from app.core.metrics import LatencyStats
+
+
+def test_latency_stats_snapshot():
+    """Тест расчета статистики задержек."""
+    stats = LatencyStats()
+
+    for milliseconds in range(1, 100):
+        stats.observe(milliseconds / 1000)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["count"] == 99
+    assert snapshot["avg_ms"] == 50
+    assert snapshot["max_ms"] == 99
+    assert snapshot["p50_ms"] == 50
+    assert snapshot["p95_ms"] == 95
+    assert snapshot["p99_ms"] == 99
+
+
+def test_latency_stats_window():
+    """Тест расчета перцентилей по последним наблюдениям."""
+    stats = LatencyStats(window_size=2)
+
+    for seconds in (10.0, 0.001, 0.002):
+        stats.observe(seconds)
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["max_ms"] == 10000
+    assert snapshot["p99_ms"] == 2
+
+
+def test_latency_stats_empty():
+    """Тест статистики без наблюдений."""
+    assert LatencyStats().snapshot() == {"count": 0, "avg_ms": 0, "max_ms": 0, "p50_ms": 0, "p95_ms": 0, "p99_ms": 0}
@@ -0,0 +1,53 @@
+from datetime import UTC, date, datetime, timedelta
+
+from app.core.database.partitions import (
+    get_partition_bounds,
+    get_partition_day,
+    get_partition_name,
+    is_partition_expired,
+)
+
+
+def test_get_partition_name():
+    """Тест формирования имени суточной секции."""
+    assert get_partition_name("confirmations", date(2026, 10, 19)) == "confirmations_p20261019"
+    assert get_partition_name("access_restores", date(2026, 1, 2)) == "access_restores_p20260102"
+
+
+def test_get_partition_day_roundtrip():
+    """Тест получения суток секции по ее имени."""
+    day = date(2026, 10, 19)
+    assert get_partition_day("confirmations", get_partition_name("confirmations", day)) == day
+
+
+def test_get_partition_day_foreign_names():
+    """Тест имен, не относящихся к суточным секциям таблицы."""
+    assert get_partition_day("confirmations", "confirmations_default") is None
+    assert get_partition_day("confirmations", "access_restores_p20261019") is None
+    assert get_partition_day("confirmations", "confirmations_p2026101") is None
+    assert get_partition_day("confirmations", "confirmations_pabcdefgh") is None
+
+
+def test_get_partition_bounds():
+    """Тест границ суточной секции."""
+    lower_bound, upper_bound = get_partition_bounds(date(2026, 12, 31))
+    assert lower_bound == datetime(2026, 12, 31, tzinfo=UTC)
+    assert upper_bound == datetime(2027, 1, 1, tzinfo=UTC)
+
+
+def test_is_partition_expired():
+    """Тест определения секции с устаревшими записями."""
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+
+    assert is_partition_expired(date(2026, 10, 11), timedelta(days=7), now)
+    assert not is_partition_expired(date(2026, 10, 12), timedelta(days=7), now)
+    assert is_partition_expired(date(2026, 10, 18), timedelta(hours=6), now)
+    assert not is_partition_expired(date(2026, 10, 19), timedelta(hours=6), now)
+
+
+def test_is_partition_expired_boundary():
+    """Тест секции, верхняя граница которой совпадает с границей срока хранения."""
+    now = datetime(2026, 10, 19, 6, 0, tzinfo=UTC)
+
+    assert is_partition_expired(date(2026, 10, 18), timedelta(hours=6), now)
+    assert not is_partition_expired(date(2026, 10, 18), timedelta(hours=6), now - timedelta(seconds=1))
@@ -0,0 +1,50 @@
+from typing import Callable
+
+import pytest
+from pydantic import ValidationError
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.core import SearchQuerySchema
+from app.core.database import escape_like
+from app.habits.model import Habit
+from app.habits.repository import HabitRepository
+from app.users.model import User
+from app.users.repository import UserRepository
+
+
+def test_escape_like_searches_literally():
+    """Тест экранирования шаблона LIKE: спецсимволы ищутся как обычные символы."""
+    assert escape_like("100%_done\\") == "100\\%\\_done\\\\"
+    assert escape_like("зарядка") == "зарядка"
+
+
+def test_habit_search_uses_trigram_operators_and_rank(compile_sql: Callable[..., str]):
+    """Тест поиска привычек: ILIKE и %> по названию обслуживаются триграммным индексом, порядок - по релевантности."""
+    index = next(index for index in Habit.__table__.indexes if index.name == "ix_habits_title_trgm")
+    sql = compile_sql(HabitRepository.build_search_query(1, "50%", 10))
+
+    assert index.dialect_options["postgresql"]["ops"] == {"title": "gin_trgm_ops"}
+    assert "habits.user_id = 1" in sql
+    assert "habits.title ILIKE '%%50\\%%%%' ESCAPE '\\'" in sql
+    assert "habits.title %%> '50%%'" in sql
+    assert "ORDER BY rank DESC, habits.id \n LIMIT 10" in sql
+    assert "word_similarity('50%%', habits.title) AS rank" in sql
+
+
+def test_user_search_uses_single_full_name_index(compile_sql: Callable[..., str]):
+    """Тест поиска пользователей: один триграммный индекс полного имени вместо индексов по частям имени."""
+    indexed = {column.name for index in User.__table__.indexes for column in index.columns}
+    sql = compile_sql(UserRepository.build_search_query("Иванов", 5))
+
+    assert {"name", "surname", "patronymic"}.isdisjoint(indexed)
+    assert "search_name" in indexed
+    assert "users.deleted_at IS NULL" in sql
+    assert "users.search_name %%> 'Иванов'" in sql
+
+
+def test_search_query_length_is_limited():
+    """Тест параметров поиска: строка без пробелов по краям, не короче минимальной длины."""
+    assert SearchQuerySchema(q="  бег  ").q == "бег"
+
+    with pytest.raises(ValidationError):
+        SearchQuerySchema(q=" аб ")
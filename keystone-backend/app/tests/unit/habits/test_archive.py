@@ -0,0 +1,41 @@
+from typing import Callable
+
+from sqlalchemy import CTE, Delete
+
+from app.habits.archive import HabitArchiveRepository
+from app.habits.model import Habit, HabitCompletion, habit_completions_archive, habits_archive
+from app.habits.repository import HabitRepository
+from app.habits.schemas import HabitListFilterData
+
+
+def test_archive_tables_mirror_hot_tables():
+    """Тест таблиц архива: те же колонки, что у рабочих таблиц, без внешних ключей и значений по умолчанию."""
+    for hot, archive in ((Habit.__table__, habits_archive), (HabitCompletion.__table__, habit_completions_archive)):
+        assert [column.name for column in archive.columns] == [column.name for column in hot.columns]
+        assert not archive.foreign_keys
+        assert all(column.default is None and column.server_default is None for column in archive.columns)
+
+
+def test_move_query_deletes_and_inserts_in_one_statement(compile_sql: Callable[..., str]):
+    """Тест переноса: DELETE ... RETURNING в CTE верхнего уровня и INSERT из него одним запросом."""
+    completions = HabitCompletion.__table__
+    query = HabitArchiveRepository.build_move_query(
+        completions, habit_completions_archive, completions.c.habit_id.in_([1, 2])
+    )
+    (moved,) = query.select.get_final_froms()
+
+    assert query.table is habit_completions_archive
+    assert isinstance(moved, CTE) and isinstance(moved.element, Delete)
+    assert moved.element.table is completions
+    assert [column.name for column in moved.element.exported_columns] == list(completions.c.keys())
+    assert [column.name for column in query.select.selected_columns] == list(habit_completions_archive.c.keys())
+    assert compile_sql(query).startswith("WITH moved AS")
+
+
+def test_list_query_reads_archive_table(compile_sql: Callable[..., str]):
+    """Тест страницы архива: те же фильтры по таблице архива."""
+    sql = compile_sql(HabitRepository.build_list_query(1, HabitListFilterData(is_archived=True), archive=True))
+
+    assert "FROM habits_archive" in sql
+    assert "habits_archive.is_archived" in sql
+    assert "habits." not in sql
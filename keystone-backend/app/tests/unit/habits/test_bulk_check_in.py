@@ -0,0 +1,40 @@
+from datetime import date
+from typing import Callable
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import Cast, Values
+
+from app.habits.consts import HABIT_BULK_CHECK_IN_MAX_ITEMS
+from app.habits.model import Habit
+from app.habits.repository import HabitRepository
+from app.habits.schemas import HabitBulkCheckInData, HabitStatsState
+
+
+def test_update_stats_is_one_statement_with_typed_values(compile_sql: Callable[..., str]):
+    """Тест записи статистики пакета: один UPDATE ... FROM (VALUES ...) с приведением NULL к типам столбцов."""
+    states = [
+        HabitStatsState(habit_id=1, current_streak=2, last_period_start=date(2026, 10, 19)),
+        HabitStatsState(habit_id=2),
+    ]
+    fields = [field for field in HabitStatsState.model_fields if field != "habit_id"]
+    query = HabitRepository.build_update_stats_query(states)
+    stats = query.whereclause.right.table
+    set_values = {column.name: value for column, value in query._values.items()}
+
+    assert query.table.name == Habit.__tablename__
+    assert isinstance(stats, Values) and stats.name == "stats"
+    assert query.whereclause.compare(Habit.__table__.c.id == stats.c.habit_id)
+    assert list(stats.c.keys()) == ["habit_id", *fields]
+    assert all(isinstance(set_values[field], Cast) for field in fields)
+    assert all(isinstance(set_values[field].type, type(Habit.__table__.c[field].type)) for field in fields)
+    assert compile_sql(query).count("(VALUES (") == 1
+
+
+def test_bulk_check_in_limits_items():
+    """Тест пакета отметок: пустой пакет и пакет больше предела отклоняются."""
+    with pytest.raises(ValidationError):
+        HabitBulkCheckInData(items=[])
+
+    with pytest.raises(ValidationError):
+        HabitBulkCheckInData(items=[{"habit_id": 1}] * (HABIT_BULK_CHECK_IN_MAX_ITEMS + 1))
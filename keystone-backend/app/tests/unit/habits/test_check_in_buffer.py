@@ -0,0 +1,138 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from app.habits.buffer import CheckInBuffer, get_pending_key
+from app.habits.consts import CHECK_IN_BROKEN_MESSAGE_REASON, CHECK_IN_DELIVERIES_EXCEEDED_REASON
+from app.habits.schemas import HabitCheckInEntry
+from app.worker import check_in_flusher
+from app.worker.check_in_flusher import CheckInFlusher
+
+
+class FakeRedis:
+    """Хэши вместо Redis."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    async def hvals(self, key: str) -> list[str]:
+        return list(self.hashes.get(key, {}).values())
+
+
+def _entry(day: date) -> HabitCheckInEntry:
+    return HabitCheckInEntry(habit_id=1, user_id=7, completed_on=day, today=date(2026, 10, 19), buffer_id=uuid4())
+
+
+def test_pending_check_ins_are_ordered_by_day():
+    """Тест ожидающих отметок: возвращаются по возрастанию дня, чтобы их можно было применить к статистике."""
+    client = FakeRedis()
+    entries = [_entry(date(2026, 10, 19)), _entry(date(2026, 10, 17)), _entry(date(2026, 10, 18))]
+    client.hashes[get_pending_key(7)] = {str(entry.buffer_id): entry.model_dump_json() for entry in entries}
+
+    pending = asyncio.run(CheckInBuffer(client).get_pending(7))
+
+    assert [entry.completed_on.day for entry in pending] == [17, 18, 19]
+    assert pending[0] == entries[1]
+
+
+def test_broken_stream_message_is_parsed_as_empty():
+    """Тест разбора сообщения потока: удаленное или испорченное сообщение не останавливает запись пакета."""
+    entry = _entry(date(2026, 10, 19))
+
+    assert CheckInBuffer._parse("1-0", {"entry": entry.model_dump_json()}) == ("1-0", entry)
+    assert CheckInBuffer._parse("2-0", None) == ("2-0", None)
+    assert CheckInBuffer._parse("3-0", {"entry": "{}"}) == ("3-0", None)
+
+
+class FakeBuffer:
+    """Буфер отметок в памяти: неподтвержденные сообщения и количество их доставок."""
+
+    def __init__(self, messages: list[tuple[str, HabitCheckInEntry | None]], deliveries: int) -> None:
+        self.messages = messages
+        self.deliveries = {message_id: deliveries for message_id, _ in messages}
+        self.dead: list[tuple[str, str]] = []
+        self.acknowledged: list[str] = []
+
+    async def read(self, consumer: str, count: int, block_ms: int | None = None, delivered: bool = False):
+        return self.messages[:count] if delivered else []
+
+    async def get_delivery_counts(self, consumer: str, messages):
+        return {message_id: self.deliveries[message_id] for message_id, _ in messages}
+
+    async def dead_letter(self, messages):
+        self.dead += [(message_id, reason) for (message_id, _), reason in messages]
+        self._remove([message_id for (message_id, _), _ in messages])
+
+    async def acknowledge(self, messages):
+        self.acknowledged += [message_id for message_id, _ in messages]
+        self._remove(self.acknowledged)
+
+    def _remove(self, message_ids: list[str]) -> None:
+        self.messages = [message for message in self.messages if message[0] not in message_ids]
+
+
+class FakeCompletionService:
+    """Запись отметок, которая отклоняет отметки привычки 2."""
+
+    def __init__(self, session) -> None:
+        pass
+
+    async def write_buffered(self, entries):
+        return {entry.buffer_id: "Привычка неактивна" for entry in entries if entry.habit_id == 2}
+
+
+class FakeSession:
+    """Сессия базы данных вместо фабрики сессий."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(name="metrics", autouse=True)
+def metrics_fixture(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    """Подмена счетчиков метрик и сервиса записи отметок."""
+    counters: dict[str, int] = {}
+
+    async def increment(group: str, name: str, amount: int = 1) -> None:
+        counters[name] = counters.get(name, 0) + amount
+
+    monkeypatch.setattr(check_in_flusher, "increment_counter", increment)
+    monkeypatch.setattr(check_in_flusher, "HabitCompletionService", FakeCompletionService)
+    return counters
+
+
+def test_flush_dead_letters_rejected_and_broken_messages(metrics: dict[str, int]):
+    """Тест записи пакета: отклоненные отметки и испорченные сообщения переносятся в поток недоставленных."""
+    accepted, rejected = _entry(date(2026, 10, 19)), _entry(date(2026, 10, 19)).model_copy(update={"habit_id": 2})
+    buffer = FakeBuffer([("1-0", accepted), ("2-0", rejected), ("3-0", None)], deliveries=1)
+    flusher = CheckInFlusher(FakeSession, buffer, "flusher")
+
+    assert asyncio.run(flusher.flush(buffer.messages)) == 1
+    assert buffer.dead == [("2-0", "Привычка неактивна"), ("3-0", CHECK_IN_BROKEN_MESSAGE_REASON)]
+    assert buffer.acknowledged == ["1-0"]
+    assert not buffer.messages
+    assert metrics == {"batches": 1, "flushed": 1, "dead_lettered": 2}
+
+
+def test_collect_dead_letters_batch_after_max_deliveries():
+    """Тест набора пакета: неподтвержденные сообщения после max_deliveries доставок не читаются повторно."""
+    buffer = FakeBuffer([("1-0", _entry(date(2026, 10, 19)))], deliveries=4)
+    flusher = CheckInFlusher(FakeSession, buffer, "flusher", max_deliveries=3)
+
+    assert not asyncio.run(flusher.collect())
+    assert buffer.dead == [("1-0", CHECK_IN_DELIVERIES_EXCEEDED_REASON)]
+    assert not buffer.messages
+
+
+def test_collect_returns_batch_within_max_deliveries():
+    """Тест набора пакета: неподтвержденные сообщения повторяются, пока доставок не больше max_deliveries."""
+    buffer = FakeBuffer([("1-0", _entry(date(2026, 10, 19)))], deliveries=3)
+    flusher = CheckInFlusher(FakeSession, buffer, "flusher", max_deliveries=3)
+
+    assert asyncio.run(flusher.collect()) == buffer.messages
+    assert not buffer.dead
@@ -0,0 +1,38 @@
+from typing import Callable
+
+from app.habits.custom_data import HabitCustomDataRepository
+from app.habits.model import Habit
+from app.habits.repository import HabitRepository
+from app.habits.schemas import HabitSearchFilterData
+
+
+def test_search_filters_custom_data_with_gin_operators(compile_sql: Callable[..., str]):
+    """Тест фильтра по данным расширений: операторы @> и @@ индекса GIN jsonb_path_ops."""
+    index = next(index for index in Habit.__table__.indexes if index.name == "ix_habits_custom_data")
+    filters = HabitSearchFilterData(custom_data_contains={"plugin": "pomodoro"}, custom_data_path="$.level == 2")
+    sql = compile_sql(HabitRepository.build_list_query(1, filters), literal_binds=False)
+    unfiltered = compile_sql(HabitRepository.build_list_query(1, HabitSearchFilterData()), literal_binds=False)
+
+    assert index.dialect_options["postgresql"]["ops"] == {"custom_data": "jsonb_path_ops"}
+    assert "habits.custom_data @> %(custom_data_1)s::JSONB" in sql
+    assert "habits.custom_data @@ %(custom_data_2)s" in sql
+    assert "custom_data" not in unfiltered.split("WHERE")[1]
+
+
+def test_custom_data_update_creates_missing_parents(compile_sql: Callable[..., str]):
+    """Тест частичного обновления: недостающие уровни пути создаются перед записью значения."""
+    sql = compile_sql(HabitCustomDataRepository.build_custom_data_update(1, 2, ["a", "b", "c"], 5), literal_binds=False)
+
+    assert sql.count("jsonb_set(") == 3
+    assert sql.count("habits.custom_data #>") == 2
+    assert "RETURNING habits.custom_data" in sql
+
+
+def test_custom_data_remove_uses_path_delete(compile_sql: Callable[..., str]):
+    """Тест удаления значения по пути: оператор #- без перезаписи документа."""
+    sql = compile_sql(
+        HabitCustomDataRepository.build_custom_data_update(1, 2, ["a", "b"], remove=True), literal_binds=False
+    )
+
+    assert "#-" in sql
+    assert "jsonb_set" not in sql
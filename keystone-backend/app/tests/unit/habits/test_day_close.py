@@ -0,0 +1,42 @@
+from datetime import UTC, date, datetime, timedelta
+from typing import Callable
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.habits.day_close import HabitDayCloseRepository, get_closed_buckets
+
+
+def test_buckets_group_timezones_by_day_end():
+    """Тест групп часовых поясов: день закрывается в местную полночь, пояса с одним смещением - одна группа."""
+    now = datetime(2026, 10, 19, 21, 5, tzinfo=UTC)
+    buckets = get_closed_buckets(now, timedelta(minutes=30), ["Europe/Moscow", "Europe/Istanbul", "Europe/London"])
+
+    assert len(buckets) == 1
+    assert (buckets[0].utc_offset, buckets[0].day) == (180, date(2026, 10, 19))
+    assert buckets[0].timezones == ["Europe/Istanbul", "Europe/Moscow"]
+    assert buckets[0].closes_at == datetime(2026, 10, 19, 21, tzinfo=UTC)
+
+
+def test_buckets_follow_daylight_saving_and_lookback():
+    """Тест групп: смещение берется на момент полуночи, дни, закончившиеся раньше окна, пропускаются."""
+    # Летнее время в Нью-Йорке заканчивается 1 ноября в 2:00: полночь еще по UTC-4
+    now = datetime(2026, 11, 1, 5, 0, tzinfo=UTC)
+    buckets = get_closed_buckets(now, timedelta(hours=3), ["America/New_York", "Asia/Kathmandu", "Europe/Moscow"])
+
+    assert [(bucket.utc_offset, bucket.day, bucket.timezones) for bucket in buckets] == [
+        (-240, date(2026, 10, 31), ["America/New_York"])
+    ]
+
+
+def test_day_close_query_breaks_only_periods_ending_that_day(compile_sql: Callable[..., str]):
+    """Тест запроса закрытия дня: недельные периоды закрываются в воскресенье, месячные - в последний день месяца."""
+    tuesday, sunday, month_end = (
+        compile_sql(HabitDayCloseRepository.build_day_close_query("Europe/Moscow", day, 100, 200))
+        for day in (date(2026, 10, 20), date(2026, 10, 18), date(2026, 10, 31))
+    )
+
+    assert "FROM users WHERE habits.user_id = users.id AND users.timezone = 'Europe/Moscow'" in tuesday
+    assert "users.id > 100 AND users.id <= 200" in tuesday
+    assert "habits.days_of_week @> ARRAY[2]" in tuesday
+    assert "WEEKLY" not in tuesday and "MONTHLY" not in tuesday
+    assert "habits.frequency_type = 'WEEKLY' AND habits.last_success_period < '2026-10-12'" in sunday
+    assert "habits.frequency_type = 'MONTHLY' AND habits.last_success_period < '2026-10-01'" in month_end
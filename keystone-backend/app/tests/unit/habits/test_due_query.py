@@ -0,0 +1,23 @@
+from datetime import date
+from typing import Callable
+
+from app.habits.model import Habit
+from app.habits.repository import HabitRepository
+
+
+def test_due_query_matches_partial_index_predicate(compile_sql: Callable[..., str]):
+    """Тест запроса привычек на сегодня: условие частичного индекса входит в запрос дословно."""
+    index = next(index for index in Habit.__table__.indexes if index.name == "ix_habits_user_id_start_date_active")
+    sql = compile_sql(HabitRepository.build_due_query(1, date(2026, 10, 19)))
+
+    assert str(index.dialect_options["postgresql"]["where"]) == "is_active AND NOT is_archived"
+    assert "habits.user_id = 1 AND habits.is_active AND NOT habits.is_archived" in sql
+    assert "habits.start_date <= '2026-10-19'" in sql
+
+
+def test_due_query_filters_weekday_with_gin_operators(compile_sql: Callable[..., str]):
+    """Тест отбора по дню недели операторами GIN-индекса: @> для дня и = для пустого списка дней."""
+    sql = compile_sql(HabitRepository.build_due_query(1, date(2026, 10, 25)))
+
+    assert "habits.days_of_week @> ARRAY[7]" in sql
+    assert "habits.days_of_week = ARRAY[]::INTEGER[]" in sql
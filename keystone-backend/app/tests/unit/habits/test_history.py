@@ -0,0 +1,53 @@
+import random
+from datetime import date, timedelta
+
+from app.habits.consts import HISTORY_SEGMENT_BYTES
+from app.habits.history.segments import HabitHistory, build_segments, set_day
+
+
+def _naive_streaks(done: set[date], due_days: list[date]) -> tuple[int, int]:
+    current = longest = 0
+
+    for day in due_days:
+        current = current + 1 if day in done else 0
+        longest = max(longest, current)
+
+    return current, longest
+
+
+def test_segments_store_day_of_year_bits():
+    """Тест сегментов: бит на день года, последний день високосного года помещается в сегмент."""
+    segments = build_segments([date(2024, 1, 1), date(2024, 12, 31), date(2024, 1, 1), date(2025, 1, 9)])
+
+    assert set(segments) == {2024, 2025}
+    assert all(len(bits) == HISTORY_SEGMENT_BYTES for bits in segments.values())
+    assert segments[2024][0] == 1 and segments[2024][45] == 1 << 5
+    assert set_day(None, date(2025, 1, 9)) == segments[2025]
+
+
+def test_helpers_match_day_by_day_counting():
+    """Тест подсчетов сдвигами и масками: совпадают с проходом по дням через границы лет."""
+    rnd = random.Random(38)
+    first = date(2024, 11, 20)
+
+    for _ in range(30):
+        days_of_week = rnd.sample(range(1, 8), rnd.randint(1, 7))
+        done = {first + timedelta(days=offset) for offset in range(120) if rnd.random() < 0.8}
+        history = HabitHistory(build_segments(done))
+        last = first + timedelta(days=rnd.randint(0, 130))
+        window_start = max(first, last - timedelta(days=rnd.randint(0, 60)))
+        due_days = [
+            first + timedelta(days=offset)
+            for offset in range((last - first).days + 1)
+            if (first + timedelta(days=offset)).isoweekday() in days_of_week
+        ]
+        window_due = [day for day in due_days if day >= window_start]
+
+        assert (history.current_streak(last, days_of_week), history.longest_streak(last, days_of_week)) == (
+            _naive_streaks(done, due_days)
+        )
+        assert history.count(window_start, last) == sum(1 for day in done if window_start <= day <= last)
+        assert history.success_rate(window_start, last, days_of_week) == (
+            round(sum(day in done for day in window_due) * 100 / len(window_due)) if window_due else 0
+        )
+        assert history.days(window_start, last) == sorted(day for day in done if window_start <= day <= last)
@@ -0,0 +1,46 @@
+from datetime import date, timedelta
+from typing import Callable
+
+import pytest
+
+from app.habits.exceptions import DateRangeInvalidException
+from app.habits.model import Habit
+from app.habits.repository import HabitRepository
+from app.habits.schemas import HabitListFilterData, HabitPublicData
+
+
+def test_list_excludes_archived_by_default_with_partial_index_predicate(compile_sql: Callable[..., str]):
+    """Тест списка по умолчанию: архивные исключены условием частичного индекса, страница - по ключу."""
+    index = next(index for index in Habit.__table__.indexes if index.name == "ix_habits_user_id_id_not_archived")
+    query = HabitRepository.build_list_query(1, HabitListFilterData(after_id=10, limit=20))
+    sql = compile_sql(query)
+    unfiltered = compile_sql(HabitRepository.build_list_query(1, HabitListFilterData(is_archived=None)))
+
+    assert str(index.dialect_options["postgresql"]["where"]) == "NOT is_archived"
+    assert "habits.user_id = 1 AND NOT habits.is_archived AND habits.id > 10" in sql
+    assert [clause.compare(Habit.__table__.c.id) for clause in query._order_by_clauses] == [True]
+    assert query._limit == 21
+    assert "is_archived" not in unfiltered.split("WHERE")[1]
+
+
+def test_list_filters_tags_with_gin_operators(compile_sql: Callable[..., str]):
+    """Тест фильтра по тегам операторами GIN-индекса: && для любого тега и @> для всех."""
+    filters = HabitListFilterData(tags_any=["health"], tags_all=["morning", "sport"])
+    sql = compile_sql(HabitRepository.build_list_query(1, filters))
+
+    assert "habits.tags && CAST(ARRAY['health'] AS VARCHAR[])" in sql
+    assert "habits.tags @> CAST(ARRAY['morning', 'sport'] AS VARCHAR[])" in sql
+
+
+def test_list_date_range_must_be_ordered():
+    """Тест диапазона дат фильтра: конец не может быть раньше начала."""
+    with pytest.raises(DateRangeInvalidException):
+        HabitListFilterData(date_from=date(2026, 10, 19), date_to=date(2026, 10, 1))
+
+
+def test_public_data_accepts_finished_habit():
+    """Тест данных привычки для ответа: у завершенной привычки дата окончания в прошлом."""
+    finished_on = date.today() - timedelta(days=1)
+    habit = {"id": 1, "title": "Зарядка", "icon": "star", "start_date": date(2026, 1, 1), "end_date": finished_on}
+
+    assert HabitPublicData.model_validate(habit).end_date == finished_on
@@ -0,0 +1,33 @@
+from datetime import date, timedelta
+
+from app.habits.consts import ROLLUP_SLOTS, RollupPeriod
+from app.habits.rollups import build_rollups, get_rollup_slot
+
+
+def test_rollup_slots_fit_every_day_of_year():
+    """Тест номеров счетчиков: все дни високосного года помещаются в ряд, недели меняются в понедельник."""
+    year_days = [date(2024, 1, 1) + timedelta(days=offset) for offset in range(366)]
+
+    for period in RollupPeriod:
+        slots = [get_rollup_slot(period, day) for day in year_days]
+        assert slots[0] == 0
+        assert slots == sorted(slots)
+        assert slots[-1] < ROLLUP_SLOTS[period]
+
+    # 1 января 2028 - суббота: первая неделя года неполная, вторая начинается 3 января
+    assert get_rollup_slot(RollupPeriod.WEEK, date(2028, 1, 2)) == 0
+    assert get_rollup_slot(RollupPeriod.WEEK, date(2028, 1, 3)) == 1
+    # 2012 - високосный год, начавшийся в воскресенье: последний день попадает в последний счетчик
+    assert get_rollup_slot(RollupPeriod.WEEK, date(2012, 12, 31)) == ROLLUP_SLOTS[RollupPeriod.WEEK] - 1
+
+
+def test_build_rollups_sums_counts_per_period():
+    """Тест сборки сводок: ряды всех периодов содержат одинаковое количество отметок, годы раздельны."""
+    day_counts = [(date(2026, 10, 19), 2), (date(2026, 10, 20), 1), (date(2026, 10, 19), 1), (date(2025, 12, 31), 5)]
+    rollups = build_rollups(day_counts)
+
+    assert rollups[(RollupPeriod.DAY, 2026)][get_rollup_slot(RollupPeriod.DAY, date(2026, 10, 19))] == 3
+    assert rollups[(RollupPeriod.WEEK, 2026)][get_rollup_slot(RollupPeriod.WEEK, date(2026, 10, 19))] == 4
+    assert rollups[(RollupPeriod.MONTH, 2026)][9] == 4
+    assert rollups[(RollupPeriod.MONTH, 2025)][11] == 5
+    assert {len(counts) for (period, _), counts in rollups.items() if period == RollupPeriod.DAY} == {366}
@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.habits.consts import FrequencyType
+from app.habits.schedule import HabitSchedule
+
+
+@pytest.mark.parametrize(
+    "frequency_type, days, first, last",
+    [
+        (FrequencyType.DAILY, [], date(2026, 1, 1), date(2026, 12, 31)),
+        (FrequencyType.CUSTOM, [1, 3, 5], date(2026, 10, 1), date(2026, 10, 31)),
+        (FrequencyType.CUSTOM, [6, 7], date(2026, 10, 3), date(2027, 2, 14)),
+        (FrequencyType.WEEKLY, [1, 2, 3, 4, 5], date(2026, 10, 21), date(2027, 1, 6)),
+        (FrequencyType.MONTHLY, [], date(2026, 10, 15), date(2027, 3, 1)),
+    ],
+)
+def test_count_periods_matches_day_by_day_count(
+    frequency_type: FrequencyType, days: list[int], first: date, last: date
+):
+    """Тест подсчета периодов арифметикой дат против перебора дней."""
+    schedule = HabitSchedule(frequency_type, 1, days)
+    starts = {
+        schedule.period_start(first + timedelta(days=offset))
+        for offset in range((last - first).days + 1)
+        if schedule.is_check_in_day(first + timedelta(days=offset)) or not schedule.is_day_based
+    }
+
+    assert schedule.count_periods(first, last) == len(starts)
+
+
+def test_previous_period_start_skips_days_off():
+    """Тест предыдущего периода дневной привычки: дни вне расписания пропускаются."""
+    schedule = HabitSchedule(FrequencyType.CUSTOM, 1, [1, 3, 5])
+
+    assert schedule.previous_period_start(date(2026, 10, 19)) == date(2026, 10, 16)
+    assert schedule.previous_period_start(date(2026, 10, 18)) == date(2026, 10, 16)
+
+
+def test_weekly_and_monthly_periods():
+    """Тест начала периодов недельной и месячной привычек."""
+    weekly = HabitSchedule(FrequencyType.WEEKLY, 3, [1, 3, 5])
+    monthly = HabitSchedule(FrequencyType.MONTHLY, 4, [])
+
+    assert weekly.period_start(date(2026, 10, 22)) == date(2026, 10, 19)
+    assert weekly.previous_period_start(date(2026, 10, 19)) == date(2026, 10, 12)
+    assert not weekly.is_check_in_day(date(2026, 10, 20))
+    assert monthly.previous_period_start(date(2026, 3, 1)) == date(2026, 2, 1)
+    assert monthly.is_check_in_day(date(2026, 10, 20))
+
+
+@pytest.mark.parametrize(
+    "frequency_type, days",
+    [
+        (FrequencyType.DAILY, []),
+        (FrequencyType.CUSTOM, [2, 7]),
+        (FrequencyType.WEEKLY, [1, 3, 5]),
+        (FrequencyType.MONTHLY, [6]),
+    ],
+)
+def test_check_in_days_expansion_matches_predicate(frequency_type: FrequencyType, days: list[int]):
+    """Тест перечисления дней отметок отрезка: совпадает с проверкой каждого дня."""
+    schedule = HabitSchedule(frequency_type, 1, days)
+    first, last = date(2026, 10, 15), date(2026, 12, 3)
+    expected = [
+        first + timedelta(days=offset)
+        for offset in range((last - first).days + 1)
+        if schedule.is_check_in_day(first + timedelta(days=offset))
+    ]
+
+    assert list(schedule.iter_check_in_days(first, last)) == expected
+    assert list(schedule.iter_check_in_days(last, first)) == []
+
+
+def test_previous_check_in_day_skips_days_off():
+    """Тест предыдущего дня отметок: дни вне расписания пропускаются, в том числе через выходные."""
+    schedule = HabitSchedule(FrequencyType.CUSTOM, 1, [1, 5])
+
+    assert schedule.previous_period_start(date(2026, 10, 19)) == date(2026, 10, 16)
+    assert schedule.previous_period_start(date(2026, 10, 16)) == date(2026, 10, 12)
+    assert schedule.previous_period_start(date(2026, 10, 18)) == date(2026, 10, 16)
+
+
+def test_schedules_with_same_fields_are_compiled_once():
+    """Тест кеша расписаний: привычки с одинаковыми полями получают один объект, порядок дней не важен."""
+    first = SimpleNamespace(frequency_type=FrequencyType.WEEKLY, times_per_period=2, days_of_week=[5, 1, 3])
+    second = SimpleNamespace(frequency_type="weekly", times_per_period=2, days_of_week=[1, 3, 5, 3])
+    other = SimpleNamespace(frequency_type=FrequencyType.WEEKLY, times_per_period=3, days_of_week=[1, 3, 5])
+
+    assert HabitSchedule.from_habit(first) is HabitSchedule.from_habit(second)
+    assert HabitSchedule.from_habit(first) is not HabitSchedule.from_habit(other)
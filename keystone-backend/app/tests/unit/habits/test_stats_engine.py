@@ -0,0 +1,127 @@
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.habits.consts import FrequencyType
+from app.habits.model import Habit
+from app.habits.schedule import HabitSchedule
+from app.habits.stats_engine import compute_habit_stats
+from app.habits.streaks import apply_check_in
+
+TODAY = date(2026, 10, 19)
+
+STATE_FIELDS = (
+    "current_streak",
+    "longest_streak",
+    "total_completions",
+    "success_rate",
+    "successful_periods",
+    "period_count",
+    "last_period_start",
+    "last_success_period",
+)
+
+
+def _random_habit(habit_id: int, rnd: random.Random) -> tuple[Habit, list[date]]:
+    frequency_type = rnd.choice(list(FrequencyType))
+    start_date = TODAY - timedelta(days=rnd.randint(0, 120))
+    habit = Habit(
+        id=habit_id,
+        frequency_type=frequency_type,
+        times_per_period=rnd.randint(1, 3) if frequency_type not in (FrequencyType.DAILY,) else 1,
+        days_of_week=rnd.sample(range(1, 8), rnd.randint(1, 7)) if rnd.random() < 0.7 else [],
+        start_date=start_date,
+        end_date=TODAY - timedelta(days=rnd.randint(0, 30)) if rnd.random() < 0.2 else None,
+    )
+    days = [start_date + timedelta(days=rnd.randint(-5, (TODAY - start_date).days)) for _ in range(rnd.randint(0, 80))]
+
+    return habit, days
+
+
+def _replay(habit: Habit, days: list[date]) -> Habit:
+    """Применяет отметки по порядку так, как их принимает сервис."""
+    schedule = HabitSchedule.from_habit(habit)
+    replayed = Habit(
+        frequency_type=habit.frequency_type,
+        times_per_period=habit.times_per_period,
+        days_of_week=habit.days_of_week,
+        start_date=habit.start_date,
+        end_date=habit.end_date,
+    )
+    last_day = min(TODAY, habit.end_date) if habit.end_date else TODAY
+
+    for day in sorted(days):
+        if habit.start_date <= day <= last_day and schedule.is_check_in_day(day):
+            apply_check_in(replayed, day, today=TODAY, schedule=schedule)
+
+    if replayed.total_completions is None:
+        replayed.success_rate = 0
+
+    return replayed
+
+
+def test_engine_matches_incremental_updates():
+    """Тест пакетного пересчета: результат совпадает с последовательным применением отметок."""
+    rnd = random.Random(37)
+    histories = [_random_habit(habit_id, rnd) for habit_id in range(1, 301)]
+    habits = [habit for habit, _ in histories]
+    habit_ids = [habit.id for habit, days in histories for _ in days]
+    days = np.array([day for _, habit_days in histories for day in habit_days], dtype="datetime64[D]")
+
+    states = compute_habit_stats(habits, habit_ids, days, TODAY)
+
+    for (habit, habit_days), state in zip(histories, states):
+        replayed = _replay(habit, habit_days)
+
+        assert state.habit_id == habit.id
+        assert {field: getattr(state, field) for field in STATE_FIELDS} == {
+            field: getattr(replayed, field) or (None if field.startswith("last_") else 0) for field in STATE_FIELDS
+        }
+
+
+def test_engine_ignores_unknown_habits_and_empty_history():
+    """Тест пересчета без отметок и с отметками чужих привычек."""
+    habit = Habit(id=5, frequency_type=FrequencyType.DAILY, times_per_period=1, days_of_week=[], start_date=TODAY)
+
+    (state,) = compute_habit_stats([habit], [7], np.array([TODAY], dtype="datetime64[D]"), TODAY)
+
+    assert (state.current_streak, state.total_completions, state.success_rate) == (0, 0, 0)
+    assert state.last_period_start is None
+    assert compute_habit_stats([], [], [], TODAY) == []
+
+
+def test_engine_takes_latest_run_as_current_streak():
+    """Тест текущей цепочки: берется последняя серия выполненных периодов привычки, а не первая."""
+    habits = [
+        Habit(id=habit_id, frequency_type=FrequencyType.DAILY, times_per_period=1, days_of_week=[], start_date=TODAY)
+        for habit_id in (1, 2)
+    ]
+    habits[0].start_date = habits[1].start_date = TODAY - timedelta(days=5)
+    days = [TODAY - timedelta(days=offset) for offset in (5, 4, 3, 1, 0)] + [TODAY - timedelta(days=2)]
+
+    first, second = compute_habit_stats(habits, [1] * 5 + [2], np.array(days, dtype="datetime64[D]"), TODAY)
+
+    assert (first.current_streak, first.longest_streak, first.last_success_period) == (2, 3, TODAY)
+    assert second.last_success_period == TODAY - timedelta(days=2)
+
+
+def test_engine_counts_partial_check_ins_only_in_total():
+    """Тест пересчета с частичными отметками: результат совпадает с последовательным применением отметок."""
+    habit = Habit(id=1, frequency_type=FrequencyType.WEEKLY, times_per_period=2, days_of_week=[], start_date=TODAY)
+    habit.start_date = TODAY - timedelta(days=14)
+    days = [TODAY - timedelta(days=offset) for offset in (14, 13, 7, 6, 0)]
+    partial = [False, False, False, True, False]
+    replayed = Habit(
+        frequency_type=FrequencyType.WEEKLY, times_per_period=2, days_of_week=[], start_date=habit.start_date
+    )
+
+    for day, is_partial in zip(days, partial):
+        apply_check_in(replayed, day, today=TODAY, is_partial=is_partial)
+
+    (state,) = compute_habit_stats([habit], [1] * 5, np.array(days, dtype="datetime64[D]"), TODAY, partial)
+
+    assert {field: getattr(state, field) for field in STATE_FIELDS} == {
+        field: getattr(replayed, field) for field in STATE_FIELDS
+    }
+    assert (state.total_completions, state.successful_periods) == (5, 1)
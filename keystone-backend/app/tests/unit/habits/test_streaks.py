@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+from app.habits.consts import FrequencyType
+from app.habits.model import Habit
+from app.habits.streaks import apply_check_in, get_habit_stats
+
+
+def _habit(frequency_type: FrequencyType, times_per_period: int, start_date: date, days: list[int] | None = None):
+    return Habit(
+        frequency_type=frequency_type,
+        times_per_period=times_per_period,
+        days_of_week=days or [],
+        start_date=start_date,
+    )
+
+
+def test_daily_streak_grows_and_breaks():
+    """Тест цепочки ежедневной привычки: рост, пропуск дня и новая цепочка."""
+    start = date(2026, 10, 1)
+    habit = _habit(FrequencyType.DAILY, 1, start)
+
+    for offset in (0, 1, 2, 4):
+        apply_check_in(habit, start + timedelta(days=offset), today=start + timedelta(days=offset))
+
+    stats = get_habit_stats(habit, today=start + timedelta(days=4))
+
+    assert (stats.current_streak, stats.longest_streak, stats.total_completions) == (1, 3, 4)
+    assert stats.success_rate == 80
+
+
+def test_period_counts_only_when_goal_reached():
+    """Тест выполнения периода только после нужного количества отметок."""
+    start = date(2026, 10, 19)
+    habit = _habit(FrequencyType.WEEKLY, 2, start, [1, 3, 5])
+
+    apply_check_in(habit, start, today=start)
+    assert get_habit_stats(habit, today=start).current_streak == 0
+
+    apply_check_in(habit, start + timedelta(days=2), today=start + timedelta(days=2))
+    apply_check_in(habit, start + timedelta(days=4), today=start + timedelta(days=4))
+    stats = get_habit_stats(habit, today=start + timedelta(days=4))
+
+    assert (stats.current_streak, stats.total_completions, stats.success_rate) == (1, 3, 100)
+    assert habit.successful_periods == 1
+
+
+def test_streak_survives_days_off_and_expires_after_missed_day():
+    """Тест цепочки привычки по дням недели: выходные не прерывают ее, пропущенный рабочий день прерывает."""
+    friday = date(2026, 10, 16)
+    monday = date(2026, 10, 19)
+    habit = _habit(FrequencyType.CUSTOM, 1, friday, [1, 2, 3, 4, 5])
+
+    apply_check_in(habit, friday, today=friday)
+    apply_check_in(habit, monday, today=monday)
+
+    assert get_habit_stats(habit, today=monday + timedelta(days=1)).current_streak == 2
+    assert get_habit_stats(habit, today=monday + timedelta(days=2)).current_streak == 0
+
+
+def test_partial_check_in_counts_only_in_total():
+    """Тест частичной отметки: учитывается в количестве отметок, но не выполняет период и не продлевает цепочку."""
+    start = date(2026, 10, 19)
+    habit = _habit(FrequencyType.DAILY, 1, start)
+
+    apply_check_in(habit, start, today=start)
+    apply_check_in(habit, start + timedelta(days=1), today=start + timedelta(days=1), is_partial=True)
+    stats = get_habit_stats(habit, today=start + timedelta(days=1))
+
+    assert (stats.current_streak, stats.total_completions, stats.success_rate) == (1, 2, 100)
+    assert (habit.successful_periods, habit.last_period_start) == (1, start)
+
+    apply_check_in(habit, start + timedelta(days=1), today=start + timedelta(days=1))
+
+    assert get_habit_stats(habit, today=start + timedelta(days=1)).current_streak == 2
@@ -0,0 +1,31 @@
+from datetime import UTC, datetime
+from typing import Callable
+
+from app.habits.completions import HabitCompletionRepository
+from app.habits.model import Habit, HabitCompletion
+from app.habits.repository import HabitRepository
+
+SINCE = datetime(2026, 10, 19, tzinfo=UTC)
+
+
+def test_delta_includes_tombstones_and_full_sync_excludes_them(compile_sql: Callable[..., str]):
+    """Тест выборки привычек: изменения после водяного знака вместе с удаленными, полная выгрузка - без удаленных."""
+    delta = compile_sql(HabitRepository.build_changed_query(1, SINCE))
+    full = compile_sql(HabitRepository.build_changed_query(1, None))
+
+    assert "habits.user_id = 1 AND habits.updated_at > '2026-10-19 00:00:00+00:00'" in delta
+    assert "deleted_at" not in delta.split("WHERE")[1]
+    assert "habits.user_id = 1 AND habits.deleted_at IS NULL" in full
+    assert "updated_at >" not in full
+
+
+def test_sync_queries_match_user_updated_at_indexes(compile_sql: Callable[..., str]):
+    """Тест индексов синхронизации: условия выборок совпадают с индексами (user_id, updated_at)."""
+    tables = (Habit.__table__, HabitCompletion.__table__)
+    indexes = {index.name: [column.name for column in index.columns] for table in tables for index in table.indexes}
+    completions = compile_sql(HabitCompletionRepository.build_changed_query(1, SINCE))
+
+    assert indexes["ix_habits_user_id_updated_at"] == ["user_id", "updated_at"]
+    assert indexes["ix_habit_completions_user_id_updated_at"] == ["user_id", "updated_at"]
+    assert "habit_completions.user_id = 1 AND habits.deleted_at IS NULL" in completions
+    assert "habit_completions.updated_at > '2026-10-19 00:00:00+00:00'" in completions
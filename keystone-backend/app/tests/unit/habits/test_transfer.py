@@ -0,0 +1,60 @@
+import asyncio
+from datetime import date
+from typing import AsyncIterator
+
+from app.habits.consts import TransferFormat
+from app.habits.schemas import HabitData, HabitTransferData
+from app.habits.transfer.formats import HABIT_FIELDS, format_records, get_csv_header, iter_records
+
+
+async def _chunks(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _parse(data: bytes, transfer_format: TransferFormat, size: int = 3) -> list:
+    async def collect() -> list:
+        return [record async for record in iter_records(_chunks(data, size), transfer_format)]
+
+    return asyncio.run(collect())
+
+
+def test_habit_fields_match_habit_data():
+    """Тест полей файла: привычка переносится всеми полями, которые задает пользователь."""
+    assert set(HABIT_FIELDS) == set(HabitData.model_fields)
+
+
+def test_ndjson_records_keep_line_numbers():
+    """Тест разбора NDJSON: символ на границе частей собирается, битая строка отмечается, пустые пропускаются."""
+    data = '{"type": "habit", "title": "Бег"}\n\nnot json\n[1]\n'.encode()
+
+    assert _parse(data, TransferFormat.NDJSON) == [(1, {"type": "habit", "title": "Бег"}), (3, None), (4, None)]
+
+
+def test_csv_record_spans_lines_inside_quotes():
+    """Тест разбора CSV: поле в кавычках с переводом строки, списки через разделитель, пустые поля опускаются."""
+    data = b'type,title,description,tags\r\nhabit,Run,"first\r\nsecond",a|b\r\nhabit,Walk,,\r\n'
+
+    assert _parse(data, TransferFormat.CSV) == [
+        (2, {"type": "habit", "title": "Run", "description": "first\nsecond", "tags": ["a", "b"]}),
+        (4, {"type": "habit", "title": "Walk"}),
+    ]
+
+
+def test_csv_export_is_accepted_by_import():
+    """Тест формата CSV: выгруженная привычка разбирается импортом в те же данные."""
+    habit = HabitTransferData(
+        ref="1",
+        title="Бег, утро",
+        icon="run",
+        start_date=date(2020, 1, 1),
+        end_date=date(2020, 6, 1),
+        days_of_week=[1, 3],
+        tags=["sport"],
+    )
+    data = (get_csv_header() + format_records([{"type": "habit", **habit.model_dump()}], TransferFormat.CSV)).encode()
+
+    [(line, record)] = _parse(data, TransferFormat.CSV, size=16)
+
+    assert line == 2
+    assert HabitTransferData.model_validate(record) == habit
@@ -0,0 +1,33 @@
+from datetime import UTC, datetime
+from typing import Callable
+
+from app.outbox.model import OutboxMessage
+from app.outbox.repository import OutboxRepository
+
+
+def test_claim_query_skips_locked_unpublished_messages(compile_sql: Callable[..., str]):
+    """Тест выборки пакета: неопубликованные сообщения по порядку, заблокированные строки пропускаются."""
+    index = next(index for index in OutboxMessage.__table__.indexes if index.name == "ix_outbox_unpublished")
+    query = OutboxRepository.build_claim_query(500)
+    sql = compile_sql(query)
+
+    assert str(index.dialect_options["postgresql"]["where"]) == "published_at IS NULL"
+    assert "WHERE outbox.published_at IS NULL" in sql
+    assert [clause.compare(OutboxMessage.__table__.c.id) for clause in query._order_by_clauses] == [True]
+    assert query._limit == 500
+    assert sql.endswith("FOR UPDATE SKIP LOCKED")
+
+
+def test_mark_published_query_updates_only_claimed_messages(compile_sql: Callable[..., str]):
+    """Тест отметки публикации: время публикации записывается только сообщениям пакета."""
+    sql = compile_sql(OutboxRepository.build_mark_published_query([1, 2], datetime(2026, 10, 19, 12, tzinfo=UTC)))
+
+    assert sql.startswith("UPDATE outbox SET published_at='2026-10-19 12:00:00+00:00'")
+    assert sql.endswith("WHERE outbox.id IN (1, 2)")
+
+
+def test_purge_query_keeps_unpublished_messages(compile_sql: Callable[..., str]):
+    """Тест очистки: удаляются только сообщения, опубликованные раньше границы. NULL < граница - не истина."""
+    sql = compile_sql(OutboxRepository.build_purge_query(datetime(2026, 10, 19, tzinfo=UTC)))
+
+    assert sql == "DELETE FROM outbox WHERE outbox.published_at < '2026-10-19 00:00:00+00:00'"
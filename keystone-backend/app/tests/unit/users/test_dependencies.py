@@ -0,0 +1,15 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.users import UserModel, get_user_today
+
+
+def test_user_today_follows_user_timezone():
+    """Тест текущего дня пользователя: день считается в часовом поясе пользователя, а не сервера."""
+    east = asyncio.run(get_user_today(UserModel(timezone="Pacific/Kiritimati")))
+    west = asyncio.run(get_user_today(UserModel(timezone="Pacific/Pago_Pago")))
+
+    # Между поясами UTC+14 и UTC-11 больше суток: местные дни различаются всегда
+    assert east > west
+    assert east == datetime.now(ZoneInfo("Pacific/Kiritimati")).date()
@@ -7,10 +7,12 @@ from app.users.exceptions import (
     InvalidBirthDateException,
     NotAllowedAgeException,
     NotValidEmailException,
+    NotValidTimezoneException,
 )
 from app.users.validators import (
     validate_birth_date,
     validate_email,
+    validate_timezone,
 )
 
 
@@ -108,3 +110,12 @@ def test_validate_birth_date_past_date():
     # Дата рождения 30 лет назад
     past_date = date.today().replace(year=date.today().year - 30)
     assert validate_birth_date(past_date) == past_date
+
+
+def test_validate_timezone():
+    """Тест валидации часового пояса: только названия из базы IANA."""
+    assert validate_timezone("Europe/Moscow") == "Europe/Moscow"
+
+    for timezone in ["GMT+3", "Moscow", ""]:
+        with pytest.raises(NotValidTimezoneException):
+            validate_timezone(timezone)
@@ -0,0 +1,204 @@
+import asyncio
+from datetime import UTC, datetime
+from email.message import EmailMessage
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.worker import async_mailer
+from app.worker.async_mailer import AsyncMailer, AsyncMailSender, BrokerConsumer, MailRedelivery, MailTask
+
+aiosmtplib = pytest.importorskip("aiosmtplib")
+
+
+class SMTPStandIn:
+    """Асинхронный SMTP-сервер, принимающий любые письма и считающий одновременные сессии."""
+
+    def __init__(self, reply_delay: float) -> None:
+        self.reply_delay = reply_delay
+        self.sessions = 0
+        self.max_sessions = 0
+        self.messages = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        self.max_sessions = max(self.max_sessions, self.sessions)
+        writer.write(b"220 localhost\r\n")
+
+        try:
+            while line := await reader.readline():
+                command = line[:4].upper()
+
+                if command == b"DATA":
+                    writer.write(b"354 go ahead\r\n")
+
+                    while await reader.readline() not in (b".\r\n", b""):
+                        pass
+
+                    self.messages += 1
+                    await asyncio.sleep(self.reply_delay)
+                    writer.write(b"250 queued\r\n")
+                elif command == b"QUIT":
+                    writer.write(b"221 bye\r\n")
+                    break
+                elif command == b"EHLO":
+                    writer.write(b"250-localhost\r\n250 8BITMIME\r\n")
+                else:
+                    writer.write(b"250 ok\r\n")
+
+                await writer.drain()
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+
+def _build_email(user_email: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "app@example.com"
+    message["To"] = user_email
+    message["Subject"] = "Тест"
+    message.set_content("Тест")
+    return message
+
+
+def test_sender_limits_sessions_per_host():
+    """Тест ограничения одновременных SMTP-сессий с одним сервером."""
+    stand_in = SMTPStandIn(reply_delay=0.02)
+
+    async def scenario() -> None:
+        server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def connect(host: str) -> aiosmtplib.SMTP:
+            client = aiosmtplib.SMTP(hostname=host, port=port, use_tls=False, start_tls=False)
+            await client.connect()
+            return client
+
+        sender = AsyncMailSender(connect, host_concurrency=3)
+
+        async with server:
+            await asyncio.gather(*(sender.send(_build_email(f"user{i}@example.com"), "127.0.0.1") for i in range(12)))
+            await sender.close()
+
+    asyncio.run(scenario())
+
+    assert stand_in.messages == 12
+    assert stand_in.max_sessions == 3
+
+
+class FakeRedelivery:
+    """Повторная доставка, запоминающая вызовы вместо публикации в брокер."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str, Any]] = []
+
+    def park(self, task: MailTask, countdown: float) -> bool:
+        self.calls.append(("park", task.task_id, countdown))
+        return True
+
+    def retry(self, task: MailTask, reason: str) -> bool:
+        self.calls.append(("retry", task.task_id, task.retries))
+        return True
+
+    def dead_letter(self, task: MailTask, reason: str) -> bool:
+        self.calls.append(("dead_letter", task.task_id, reason))
+        return True
+
+
+class FakeBreaker:
+    """Предохранитель с заданной задержкой, считающий успешные и ошибочные отправки."""
+
+    def __init__(self, wait: float = 0.0) -> None:
+        self.wait = wait
+        self.failures = 0
+        self.successes = 0
+
+    def retry_after(self) -> float:
+        return self.wait
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+    def record_success(self) -> None:
+        self.successes += 1
+
+
+class FailingSender:
+    """Отправитель, который не может отправить ни одно письмо."""
+
+    async def send(self, message: EmailMessage) -> None:
+        raise aiosmtplib.SMTPServerDisconnected("disconnected")
+
+
+@pytest.fixture(name="claims")
+def claims_fixture(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Фикстура, заменяющая метки идемпотентности записью событий."""
+    events: list[str] = []
+    monkeypatch.setattr(async_mailer, "claim_task", lambda task_id: events.append(f"claim:{task_id}") or True)
+    monkeypatch.setattr(async_mailer, "complete_task", lambda task_id: events.append(f"complete:{task_id}"))
+    monkeypatch.setattr(async_mailer, "release_task", lambda task_id: events.append(f"release:{task_id}"))
+    return events
+
+
+def test_mailer_retries_failed_send_through_broker(claims: list[str]):
+    """Тест повтора через брокер после ошибки отправки: метка снимается, предохранитель учитывает ошибку."""
+    redelivery, breaker = FakeRedelivery(), FakeBreaker()
+    mailer = AsyncMailer({"send": _build_email}, FailingSender(), redelivery, breaker)
+
+    assert asyncio.run(mailer.handle(MailTask("1", "send", {"user_email": "user@example.com"}, retries=2)))
+    assert redelivery.calls == [("retry", "1", 2)]
+    assert claims == ["claim:1", "release:1"]
+    assert breaker.failures == 1
+
+
+def test_mailer_parks_task_while_breaker_open(claims: list[str]):
+    """Тест откладывания задачи без отправки, пока предохранитель почтового сервера разомкнут."""
+    redelivery = FakeRedelivery()
+    mailer = AsyncMailer({"send": _build_email}, FailingSender(), redelivery, FakeBreaker(wait=30.0))
+
+    assert asyncio.run(mailer.handle(MailTask("1", "send", {"user_email": "user@example.com"})))
+    assert redelivery.calls == [("park", "1", 30.0)]
+    assert not claims
+
+
+def test_mailer_dead_letters_unknown_and_broken_tasks(claims: list[str]):
+    """Тест переноса в недоставленные неизвестной задачи и задачи, письмо которой не собирается."""
+    redelivery = FakeRedelivery()
+    mailer = AsyncMailer({"send": _build_email}, FailingSender(), redelivery, FakeBreaker())
+
+    assert asyncio.run(mailer.handle(MailTask("1", "unknown", {})))
+    assert asyncio.run(mailer.handle(MailTask("2", "send", {})))
+    assert [(action, task_id) for action, task_id, _ in redelivery.calls] == [
+        ("dead_letter", "1"),
+        ("dead_letter", "2"),
+    ]
+    assert not claims
+
+
+def test_redelivery_dead_letters_after_max_retries(monkeypatch: pytest.MonkeyPatch):
+    """Тест повтора с увеличением номера и переноса в недоставленные после последнего повтора."""
+    published: list[dict[str, Any]] = []
+    dead_letters: list[dict[str, Any]] = []
+    monkeypatch.setattr(async_mailer.celery_app, "send_task", lambda name, **options: published.append(options))
+    monkeypatch.setattr(
+        async_mailer, "get_redis", lambda: SimpleNamespace(xadd=lambda _, fields: dead_letters.append(fields))
+    )
+    monkeypatch.setattr(async_mailer, "increment_counter", lambda *_: None)
+    redelivery = MailRedelivery(max_retries=3)
+
+    assert redelivery.retry(MailTask("1", "send", {"user_email": "user@example.com"}, retries=2), "error")
+    assert redelivery.retry(MailTask("1", "send", {"user_email": "user@example.com"}, retries=3), "error")
+    assert [(options["task_id"], options["retries"]) for options in published] == [("1", 3)]
+    assert [(fields["task_id"], fields["reason"]) for fields in dead_letters] == [("1", "error")]
+
+
+def test_consumer_reads_retries_and_eta_headers():
+    """Тест разбора номера повтора и времени выполнения из заголовков сообщения задачи."""
+    tasks: list[MailTask] = []
+    consumer = BrokerConsumer("mail", 1, lambda task, _: tasks.append(task))
+    headers = {"id": "1", "task": "send", "retries": 2, "eta": "2026-01-01T00:00:00"}
+
+    consumer._on_message(((), {"user_email": "user@example.com"}, {}), SimpleNamespace(headers=headers))
+
+    assert tasks == [MailTask("1", "send", {"user_email": "user@example.com"}, 2, datetime(2026, 1, 1, tzinfo=UTC))]
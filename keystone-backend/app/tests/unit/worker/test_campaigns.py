@@ -0,0 +1,136 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Iterator
+
+import pytest
+
+from app.campaigns import repository as campaign_repository
+from app.campaigns.consts import CampaignStatus
+from app.campaigns.schemas import CampaignRecipient
+from app.worker.tasks import campaigns
+
+
+class FakeRedis:
+    """Хранилище блокировок вместо Redis."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+
+        self.values[key] = value
+        return True
+
+    def expire(self, key: str, seconds: int) -> None:
+        pass
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+class FakeCampaignStore:
+    """Состояние рассылки и получатели вместо таблиц базы данных."""
+
+    def __init__(self, recipients_count: int) -> None:
+        self.recipients: list[CampaignRecipient] = [
+            CampaignRecipient(user_id=user_id, email=f"user{user_id}@example.com", full_name=f"User {user_id}")
+            for user_id in range(1, recipients_count + 1)
+        ]
+        self.last_user_id: int = 0
+        self.status: CampaignStatus = CampaignStatus.PENDING
+
+
+class FakeCampaignRepository:
+    """Репозиторий рассылок поверх общего состояния. Точка продолжения сохраняется сразу."""
+
+    store: FakeCampaignStore
+
+    def __init__(self, session: Any) -> None:
+        self.session = session
+
+    async def get(self, campaign_id: int) -> SimpleNamespace:
+        return SimpleNamespace(id=campaign_id, status=self.store.status, last_user_id=self.store.last_user_id)
+
+    async def iter_recipients(self, after_user_id: int, chunk_size: int) -> AsyncIterator[list[CampaignRecipient]]:
+        remaining = [recipient for recipient in self.store.recipients if recipient.user_id > after_user_id]
+
+        for start in range(0, len(remaining), chunk_size):
+            yield remaining[start : start + chunk_size]
+
+    async def save_checkpoint(self, campaign_id: int, last_user_id: int, enqueued: int) -> None:
+        self.store.last_user_id = last_user_id
+
+    async def finish(self, campaign_id: int, finished_at: Any) -> None:
+        self.store.status = CampaignStatus.COMPLETED
+
+
+class FakeSession:
+    """Сессия, которая ничего не фиксирует."""
+
+    bind = None
+
+    def __init__(self, *_: Any, **__: Any) -> None:
+        pass
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+@pytest.fixture(name="published")
+def published_fixture(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Фикстура, заменяющая брокер, Redis и базу данных задачи рассылки. Возвращает опубликованные порции."""
+    published: list[str] = []
+
+    @contextmanager
+    def producer_or_acquire() -> Iterator[None]:
+        yield None
+
+    def run_with_session(func: Callable[[Any], Any]) -> Any:
+        return asyncio.run(func(FakeSession()))
+
+    monkeypatch.setattr(campaigns, "get_redis", lambda: FakeRedis())
+    monkeypatch.setattr(campaigns, "run_with_session", run_with_session)
+    monkeypatch.setattr(campaigns, "AsyncSession", FakeSession)
+    monkeypatch.setattr(campaigns.celery_app, "producer_or_acquire", producer_or_acquire)
+    monkeypatch.setattr(
+        campaigns.send_campaign_chunk, "apply_async", lambda **options: published.append(options["task_id"])
+    )
+    monkeypatch.setattr(campaign_repository, "CampaignRepository", FakeCampaignRepository)
+    monkeypatch.setattr("app.campaigns.consts.CAMPAIGN_CHUNK_SIZE", 2)
+    return published
+
+
+def test_run_campaign_resumes_after_last_checkpoint(monkeypatch: pytest.MonkeyPatch, published: list[str]):
+    """Тест продолжения рассылки с сохраненной точки: уже поставленные порции не публикуются повторно."""
+    FakeCampaignRepository.store = FakeCampaignStore(recipients_count=5)
+
+    def fail_on_second_chunk(**options: Any) -> None:
+        if published:
+            raise ConnectionError("broker is down")
+
+        published.append(options["task_id"])
+
+    monkeypatch.setattr(campaigns.send_campaign_chunk, "apply_async", fail_on_second_chunk)
+
+    with pytest.raises(ConnectionError):
+        campaigns.run_campaign(1)
+
+    assert FakeCampaignRepository.store.last_user_id == 2
+    assert FakeCampaignRepository.store.status == CampaignStatus.PENDING
+
+    monkeypatch.setattr(
+        campaigns.send_campaign_chunk, "apply_async", lambda **options: published.append(options["task_id"])
+    )
+
+    assert campaigns.run_campaign(1) == 3
+    assert published == ["campaign-1-1", "campaign-1-3", "campaign-1-5"]
+    assert FakeCampaignRepository.store.status == CampaignStatus.COMPLETED
@@ -0,0 +1,125 @@
+import pytest
+
+from app.worker import circuit_breaker, metrics
+from app.worker.circuit_breaker import CircuitBreaker
+
+
+class FakePipeline:
+    """Пакет команд, выполняемых по порядку."""
+
+    def __init__(self, client: "FakeRedis") -> None:
+        self.client: FakeRedis = client
+        self.commands: list = []
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.commands = []
+
+    def __getattr__(self, name: str):
+        def _add(*args, **kwargs) -> "FakePipeline":
+            self.commands.append((getattr(self.client, name), args, kwargs))
+            return self
+
+        return _add
+
+    def execute(self) -> list:
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Хранилище ключей вместо Redis. Время жизни ключей хранится, но не истекает."""
+
+    def __init__(self) -> None:
+        self.values: dict = {}
+        self.ttl: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def set(self, key: str, value: str, nx: bool = False, ex: int | None = None) -> bool:
+        if nx and key in self.values:
+            return False
+
+        self.values[key] = value
+        self.ttl[key] = ex
+        return True
+
+    def pttl(self, key: str) -> int:
+        return self.ttl[key] * 1000 if key in self.values else -2
+
+    def exists(self, key: str) -> int:
+        return int(key in self.values)
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def incr(self, key: str) -> int:
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def expire(self, key: str, seconds: int) -> bool:
+        self.ttl[key] = seconds
+        return True
+
+    def hincrby(self, key: str, field: str, amount: int) -> None:
+        self.values.setdefault(key, {})[field] = self.values.get(key, {}).get(field, 0) + amount
+
+    def hset(self, key: str, field: str, value: int) -> None:
+        self.values.setdefault(key, {})[field] = value
+
+
+@pytest.fixture(name="redis")
+def redis_fixture(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """Подмена клиента Redis воркера."""
+    client = FakeRedis()
+    monkeypatch.setattr(circuit_breaker, "get_redis", lambda: client)
+    monkeypatch.setattr(metrics, "get_redis", lambda: client)
+    return client
+
+
+def test_breaker_opens_after_threshold(redis: FakeRedis):
+    """Тест размыкания предохранителя после заданного количества ошибок."""
+    breaker = CircuitBreaker("smtp", failure_threshold=3, open_seconds=30)
+
+    for _ in range(2):
+        breaker.record_failure()
+
+    assert breaker.retry_after() == 0.0
+
+    breaker.record_failure()
+
+    assert breaker.retry_after() == 30.0
+    assert redis.values["metrics:circuit_breaker"] == {"smtp.trips": 1, "smtp.tripped": 1}
+
+
+def test_breaker_admits_single_probe_and_closes_on_success(redis: FakeRedis):
+    """Тест пропуска одной пробной задачи после размыкания и замыкания после ее успеха."""
+    breaker = CircuitBreaker("smtp", failure_threshold=1, open_seconds=30)
+    breaker.record_failure()
+    redis.delete("circuit:smtp:open")
+
+    assert breaker.retry_after() == 0.0
+    assert breaker.retry_after() == 30.0
+
+    breaker.record_success()
+
+    assert breaker.retry_after() == 0.0
+    assert redis.values["metrics:circuit_breaker"]["smtp.tripped"] == 0
+
+
+def test_breaker_reopens_when_probe_fails(redis: FakeRedis):
+    """Тест повторного размыкания после ошибки пробной задачи."""
+    breaker = CircuitBreaker("smtp", failure_threshold=5, open_seconds=30)
+
+    for _ in range(5):
+        breaker.record_failure()
+
+    redis.delete("circuit:smtp:open")
+    assert breaker.retry_after() == 0.0
+
+    breaker.record_failure()
+
+    assert breaker.retry_after() == 30.0
+    assert redis.values["metrics:circuit_breaker"]["smtp.trips"] == 2
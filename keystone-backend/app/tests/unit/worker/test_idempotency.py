@@ -0,0 +1,64 @@
+import pytest
+
+from app.worker import idempotency
+from app.worker.idempotency import extend_task, run_once
+
+
+class FakeRedis:
+    """Хранилище ключей вместо Redis."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, str] = {}
+
+    def set(self, key: str, value: str, nx: bool = False, xx: bool = False, ex: int | None = None) -> bool:
+        if (nx and key in self.values) or (xx and key not in self.values):
+            return False
+
+        self.values[key] = value
+        return True
+
+    def delete(self, key: str) -> None:
+        self.values.pop(key, None)
+
+
+@pytest.fixture(name="redis")
+def redis_fixture(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """Подмена клиента Redis воркера."""
+    client = FakeRedis()
+    monkeypatch.setattr(idempotency, "get_redis", lambda: client)
+    return client
+
+
+def test_run_once_skips_repeated_task(redis: FakeRedis):
+    """Тест пропуска повторно опубликованной задачи."""
+    with run_once("outbox-1") as should_run:
+        assert should_run
+
+    with run_once("outbox-1") as should_run:
+        assert not should_run
+
+    assert redis.values == {"task_once:outbox-1": "done"}
+
+
+def test_run_once_releases_key_on_error(redis: FakeRedis):
+    """Тест повторного выполнения задачи после ошибки."""
+    with pytest.raises(RuntimeError):
+        with run_once("outbox-2"):
+            raise RuntimeError()
+
+    assert not redis.values
+
+    with run_once("outbox-2") as should_run:
+        assert should_run
+
+
+def test_extend_task_keeps_only_claimed_key(redis: FakeRedis):
+    """Тест продления выполняющейся задачи без создания ключа для незанятой."""
+    with run_once("campaign-1-1") as should_run:
+        assert should_run
+        extend_task("campaign-1-1")
+        assert redis.values == {"task_once:campaign-1-1": "running"}
+
+    extend_task("campaign-1-2")
+
+    assert redis.values == {"task_once:campaign-1-1": "done"}
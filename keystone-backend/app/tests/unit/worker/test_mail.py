@@ -0,0 +1,34 @@
+from app.worker.consts import ACCESS_RESTORE_EMAIL_TEMPLATE, CONFIRMATION_EMAIL_TEMPLATE
+from app.worker.mail import MailRenderer
+
+
+def test_precompile_all_templates():
+    """Тест компиляции всех шаблонов писем, включая используемые задачами."""
+    names = MailRenderer().precompile()
+
+    assert CONFIRMATION_EMAIL_TEMPLATE in names
+    assert ACCESS_RESTORE_EMAIL_TEMPLATE in names
+
+
+def test_build_message_escapes_context():
+    """Тест сборки письма с экранированием переменных шаблона."""
+    message = MailRenderer().build_message(
+        "user@example.com",
+        "Тема",
+        CONFIRMATION_EMAIL_TEMPLATE,
+        confirm_url="https://example.com/confirm/token",
+        user_full_name="<b>Иванов</b>",
+    )
+    html = message.get_body(("html",)).get_content()
+
+    assert message["To"] == "user@example.com"
+    assert message["Subject"] == "Тема"
+    assert "https://example.com/confirm/token" in html
+    assert "&lt;b&gt;Иванов&lt;/b&gt;" in html
+
+
+def test_bytecode_cache(tmp_path):
+    """Тест сохранения скомпилированных шаблонов в кеш на диске."""
+    MailRenderer(bytecode_cache_dir=str(tmp_path)).precompile()
+
+    assert list(tmp_path.iterdir())
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Sequence
+
+import pytest
+from sqlalchemy import Update
+
+from app.outbox.consts import OUTBOX_RELAY_METRICS
+from app.worker import outbox_relay
+from app.worker.outbox_relay import OutboxRelay
+
+
+class FakeSession:
+    """Сессия базы данных: отдает сообщения outbox и записывает выполненные запросы."""
+
+    def __init__(self, messages: list[SimpleNamespace]) -> None:
+        self.messages: list[SimpleNamespace] = messages
+        self.statements: list[Any] = []
+        self.events: list[str] = []
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        pass
+
+    async def scalars(self, statement: Any) -> SimpleNamespace:
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.messages)
+
+    async def execute(self, statement: Any) -> SimpleNamespace:
+        self.statements.append(statement)
+        self.events.append("mark" if isinstance(statement, Update) else "purge")
+        return SimpleNamespace(rowcount=0)
+
+    async def commit(self) -> None:
+        self.events.append("commit")
+
+    async def rollback(self) -> None:
+        self.events.append("rollback")
+
+
+@pytest.fixture(name="metrics")
+def metrics_fixture(monkeypatch: pytest.MonkeyPatch) -> dict[str, dict[str, int]]:
+    """Подмена метрик ретранслятора."""
+    values: dict[str, dict[str, int]] = {}
+
+    async def increment(group: str, name: str, amount: int = 1) -> None:
+        values.setdefault(group, {})[name] = values.get(group, {}).get(name, 0) + amount
+
+    async def set_gauges(group: str, gauges: dict[str, int]) -> None:
+        values.setdefault(group, {}).update(gauges)
+
+    monkeypatch.setattr(outbox_relay, "increment_counter", increment)
+    monkeypatch.setattr(outbox_relay, "set_gauges", set_gauges)
+    return values
+
+
+def _message(message_id: int, age: timedelta) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=message_id, task_name="app.worker.tasks.send", payload={"id": message_id}, created_at=datetime.now(UTC) - age
+    )
+
+
+def test_relay_records_enqueue_to_publish_latency(metrics: dict[str, dict[str, int]]):
+    """Тест метрик ретранслятора: задержка считается от created_at сообщения до публикации."""
+    session = FakeSession([_message(1, timedelta(seconds=2)), _message(2, timedelta(seconds=4))])
+
+    def publish(_: Sequence[tuple[str, dict[str, Any], str]]) -> None:
+        pass
+
+    assert asyncio.run(OutboxRelay(lambda: session, publish).relay_batch()) == 2
+
+    relay_metrics = metrics[OUTBOX_RELAY_METRICS]
+    assert relay_metrics["published"] == 2
+    assert relay_metrics["latency_count"] == 2
+    assert 2000 <= relay_metrics["latency_p50_ms"] < 2500
+    assert 4000 <= relay_metrics["latency_max_ms"] < 4500
+
+
+def test_relay_marks_messages_after_publishing(metrics: dict[str, dict[str, int]]):
+    """Тест порядка: пакет публикуется одним вызовом с постоянными ID задач, затем отмечается и фиксируется."""
+    session = FakeSession([_message(1, timedelta(seconds=1)), _message(2, timedelta(seconds=1))])
+    published: list[list[tuple[str, dict[str, Any], str]]] = []
+
+    def publish(batch: Sequence[tuple[str, dict[str, Any], str]]) -> None:
+        session.events.append("publish")
+        published.append(list(batch))
+
+    asyncio.run(OutboxRelay(lambda: session, publish).relay_batch())
+
+    assert session.events == ["publish", "mark", "commit"]
+    assert published == [
+        [("app.worker.tasks.send", {"id": 1}, "outbox-1"), ("app.worker.tasks.send", {"id": 2}, "outbox-2")]
+    ]
+
+
+def test_relay_leaves_messages_unpublished_when_publish_fails(metrics: dict[str, dict[str, int]]):
+    """Тест ошибки брокера: сообщения не отмечаются, транзакция не фиксируется, метрики не пишутся."""
+    session = FakeSession([_message(1, timedelta(seconds=1))])
+
+    def publish(_: Sequence[tuple[str, dict[str, Any], str]]) -> None:
+        raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(OutboxRelay(lambda: session, publish).relay_batch())
+
+    assert not session.events
+    assert not metrics
+
+
+def test_relay_run_continues_after_failed_batch(monkeypatch: pytest.MonkeyPatch, metrics: dict[str, dict[str, int]]):
+    """Тест цикла ретранслятора: ошибка пакета логируется, следующий опрос публикует те же сообщения."""
+    monkeypatch.setattr(outbox_relay, "OUTBOX_POLL_INTERVAL_SECONDS", 0)
+    session = FakeSession([_message(1, timedelta(seconds=1))])
+    stop_event = asyncio.Event()
+    attempts: list[str] = []
+
+    def publish(batch: Sequence[tuple[str, dict[str, Any], str]]) -> None:
+        attempts.append(batch[0][2])
+
+        if len(attempts) == 1:
+            raise ConnectionError()
+
+        stop_event.set()
+
+    asyncio.run(OutboxRelay(lambda: session, publish).run(stop_event))
+
+    assert attempts == ["outbox-1", "outbox-1"]
+    assert session.events == ["mark", "commit", "purge", "commit"]
+    assert metrics[OUTBOX_RELAY_METRICS]["published"] == 1
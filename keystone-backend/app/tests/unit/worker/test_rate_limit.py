@@ -0,0 +1,48 @@
+import pytest
+from redis import RedisError
+
+from app.worker import rate_limit
+from app.worker.rate_limit import RateLimiter
+from app.worker.tasks.campaigns import get_chunk_task_id
+
+
+class FakeRedis:
+    """Redis, скрипт которого возвращает заданное время ожидания."""
+
+    def __init__(self, wait: str | None) -> None:
+        self.wait: str | None = wait
+        self.calls: list[tuple[list, list]] = []
+
+    def register_script(self, _: str):
+        def _script(keys: list, args: list) -> str:
+            if self.wait is None:
+                raise RedisError("connection refused")
+
+            self.calls.append((keys, args))
+            return self.wait
+
+        return _script
+
+
+def test_acquire_waits_for_its_turn(monkeypatch: pytest.MonkeyPatch):
+    """Тест ожидания, когда корзина токенов пуста."""
+    client = FakeRedis("0.25")
+    sleeps: list[float] = []
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: client)
+    monkeypatch.setattr(rate_limit.time, "sleep", sleeps.append)
+
+    assert RateLimiter("rate_limit:test", rate=4).acquire() == 0.25
+    assert sleeps == [0.25]
+    assert client.calls == [(["rate_limit:test"], [4, 4])]
+
+
+def test_acquire_fails_open_without_redis(monkeypatch: pytest.MonkeyPatch):
+    """Тест отправки без ограничения при недоступном Redis."""
+    monkeypatch.setattr(rate_limit, "get_redis", lambda: FakeRedis(None))
+
+    assert RateLimiter("rate_limit:test", rate=4).acquire() == 0.0
+
+
+def test_chunk_task_id_is_stable():
+    """Тест постоянного идентификатора порции рассылки."""
+    assert get_chunk_task_id(3, 1001) == get_chunk_task_id(3, 1001) == "campaign-3-1001"
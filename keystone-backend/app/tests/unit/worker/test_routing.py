@@ -0,0 +1,44 @@
+import pytest
+
+from app.worker import celery_app
+from app.worker.consts import ANALYTICS_QUEUE, BULK_MAIL_QUEUE, MAINTENANCE_QUEUE, TRANSACTIONAL_MAIL_QUEUE
+from app.worker.profiles import WORKER_PROFILES, get_worker_argv
+from app.worker.tasks import (
+    close_habit_day,
+    maintain_token_partitions,
+    rebuild_completion_rollups,
+    rebuild_habit_stats,
+    run_campaign,
+    send_access_restore_email,
+    send_campaign_chunk,
+    send_confirmation_email,
+)
+
+
+@pytest.mark.parametrize(
+    "task, queue",
+    [
+        (send_confirmation_email, TRANSACTIONAL_MAIL_QUEUE),
+        (send_access_restore_email, TRANSACTIONAL_MAIL_QUEUE),
+        (send_campaign_chunk, BULK_MAIL_QUEUE),
+        (run_campaign, MAINTENANCE_QUEUE),
+        (maintain_token_partitions, MAINTENANCE_QUEUE),
+        (rebuild_habit_stats, ANALYTICS_QUEUE),
+        (rebuild_completion_rollups, ANALYTICS_QUEUE),
+        (close_habit_day, ANALYTICS_QUEUE),
+    ],
+)
+def test_task_routed_to_own_queue(task, queue: str):
+    """Тест маршрутизации задач по очередям: транзакционные письма не попадают в очередь рассылок."""
+    assert celery_app.amqp.router.route({}, task.name)["queue"].name == queue
+    assert task.acks_late
+    assert task.ignore_result
+
+
+def test_worker_argv_uses_queue_profile():
+    """Тест аргументов запуска воркера по профилю очереди."""
+    argv = get_worker_argv(BULK_MAIL_QUEUE)
+
+    assert argv[:3] == ["worker", "--queues", BULK_MAIL_QUEUE]
+    assert argv[argv.index("--concurrency") + 1] == str(WORKER_PROFILES[BULK_MAIL_QUEUE].concurrency)
+    assert argv[argv.index("--prefetch-multiplier") + 1] == "1"
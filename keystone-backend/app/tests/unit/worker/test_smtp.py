@@ -0,0 +1,115 @@
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from app.worker.smtp import SMTPConnectionPool
+
+
+class FakeSMTP:
+    """SMTP-соединение без сети."""
+
+    def __init__(self) -> None:
+        self.sent: list[EmailMessage] = []
+        self.alive: bool = True
+        self.closed: bool = False
+
+    def send_message(self, message: EmailMessage) -> None:
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected()
+
+        self.sent.append(message)
+
+    def noop(self) -> tuple[int, bytes]:
+        if not self.alive:
+            raise smtplib.SMTPServerDisconnected()
+
+        return 250, b"OK"
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeFactory:
+    """Фабрика соединений, запоминающая открытые соединения."""
+
+    def __init__(self) -> None:
+        self.opened: list[FakeSMTP] = []
+
+    def __call__(self) -> FakeSMTP:
+        self.opened.append(FakeSMTP())
+        return self.opened[-1]
+
+
+def test_pool_reuses_connection():
+    """Тест переиспользования соединения между письмами."""
+    factory = FakeFactory()
+    pool = SMTPConnectionPool(factory)
+
+    for _ in range(3):
+        pool.send_message(EmailMessage())
+
+    assert len(factory.opened) == 1
+    assert len(factory.opened[0].sent) == 3
+
+
+def test_pool_replaces_dead_connection_on_health_check():
+    """Тест замены соединения, не ответившего на NOOP."""
+    factory = FakeFactory()
+    pool = SMTPConnectionPool(factory, health_check_after=0)
+
+    pool.send_message(EmailMessage())
+    factory.opened[0].alive = False
+    pool.send_message(EmailMessage())
+
+    assert len(factory.opened) == 2
+    assert factory.opened[0].closed
+    assert len(factory.opened[1].sent) == 1
+
+
+def test_pool_resends_when_reused_connection_dropped():
+    """Тест повторной отправки, если сервер разорвал переиспользованное соединение."""
+    factory = FakeFactory()
+    pool = SMTPConnectionPool(factory)
+
+    pool.send_message(EmailMessage())
+    factory.opened[0].alive = False
+    pool.send_message(EmailMessage())
+
+    assert len(factory.opened) == 2
+    assert len(factory.opened[1].sent) == 1
+
+
+def test_pool_closes_idle_connection():
+    """Тест закрытия соединения, простоявшего дольше допустимого."""
+    factory = FakeFactory()
+    pool = SMTPConnectionPool(factory, idle_timeout=0)
+
+    pool.send_message(EmailMessage())
+    pool.send_message(EmailMessage())
+
+    assert len(factory.opened) == 2
+    assert factory.opened[0].closed
+
+
+def test_pool_discards_connection_on_error():
+    """Тест закрытия соединения после ошибки отправки."""
+    factory = FakeFactory()
+    pool = SMTPConnectionPool(factory)
+
+    def reject(_: EmailMessage) -> None:
+        raise smtplib.SMTPDataError(554, b"rejected")
+
+    pool.send_message(EmailMessage())
+    factory.opened[0].send_message = reject
+
+    with pytest.raises(smtplib.SMTPDataError):
+        pool.send_message(EmailMessage())
+
+    pool.send_message(EmailMessage())
+
+    assert factory.opened[0].closed
+    assert len(factory.opened) == 2
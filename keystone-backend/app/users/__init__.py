@@ -1,5 +1,5 @@
 """Пакет для работы с пользователями."""
 
-from .dependencies import get_current_user
+from .dependencies import get_current_user, get_user_today
 from .model import User as UserModel
 from .routes import user_routes
@@ -3,6 +3,11 @@
 # Регулярное выражение для проверки email
 EMAIL_VALIDATION_EXP: str = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 
+# Часовой пояс пользователя по умолчанию
+DEFAULT_TIMEZONE: str = "UTC"
+# Максимальная длина названия часового пояса
+TIMEZONE_MAX_LENGTH: int = 64
+
 # Минимальный возраст пользователя
 MIN_USER_AGE: int = 18
 
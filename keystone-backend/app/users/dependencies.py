@@ -1,6 +1,8 @@
 """Модуль зависимостей для работы с пользователями."""
 
+from datetime import date, datetime
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
 import jwt
 from fastapi import Depends
@@ -64,3 +66,17 @@ async def get_current_user(
         raise DeletedUserException()
 
     return user
+
+
+async def get_user_today(user: UserModel = Depends(get_current_user)) -> date:
+    """
+    Зависимость для получения текущего дня пользователя в его часовом поясе. День отметок, статистики
+    и привычек на сегодня - местный: закрытие дня тоже идет по местной полуночи пользователя.
+
+    Args:
+        user (UserModel): Текущий пользователь.
+
+    Returns:
+        (date): Текущий день в часовом поясе пользователя.
+    """
+    return datetime.now(ZoneInfo(user.timezone)).date()
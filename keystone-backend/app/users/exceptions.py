@@ -29,6 +29,12 @@ class NotAllowedAgeException(NotValidEntityException):
     _MESSAGE = f"Возраст не подходит для регистрации. Вам должно быть не менее {MIN_USER_AGE} лет"
 
 
+class NotValidTimezoneException(NotValidEntityException):
+    """Исключение для неизвестного часового пояса."""
+
+    _MESSAGE = "Укажите часовой пояс из базы IANA, например Europe/Moscow"
+
+
 class LoginConflictException(EntityConflictException):
     """Исключение для логина, который уже занят."""
 
@@ -3,10 +3,13 @@
 
 from datetime import date
 
-from sqlalchemy import Date, String, Text
+from sqlalchemy import Computed, Date, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import BaseModel, SoftDeleteMixin, TimestampMixin, UUIDMixin
+from app.core.database.consts import TRIGRAM_OPS
+
+from .consts import DEFAULT_TIMEZONE, TIMEZONE_MAX_LENGTH
 
 
 class User(BaseModel, UUIDMixin, TimestampMixin, SoftDeleteMixin):
@@ -22,6 +25,8 @@ class User(BaseModel, UUIDMixin, TimestampMixin, SoftDeleteMixin):
         password (str): Пароль пользователя.
         email (str): Электронная почта пользователя.
         verified_at (date | None): Дата подтверждения электронной почты.
+        search_name (str): Полное имя для поиска. Вычисляется базой данных.
+        timezone (str): Часовой пояс пользователя (название из базы IANA).
 
         id (int): Идентификатор пользователя.
         uuid (str): Уникальный идентификатор пользователя.
@@ -30,9 +35,24 @@ class User(BaseModel, UUIDMixin, TimestampMixin, SoftDeleteMixin):
         deleted_at (datetime | None): Дата и время удаления пользователя.
     """
 
-    name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    surname: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
-    patronymic: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
+    # Поиск по имени - по триграммам полного имени: один индекс вместо трех на каждую часть имени
+    __table_args__ = (
+        Index(
+            "ix_users_search_name_trgm",
+            "search_name",
+            postgresql_using="gin",
+            postgresql_ops={"search_name": TRIGRAM_OPS},
+        ),
+        # Закрытие дня выбирает пользователей часовых поясов, у которых закончился день, порциями по ID
+        Index("ix_users_timezone_id", "timezone", "id", postgresql_where=text("deleted_at IS NULL")),
+    )
+
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    surname: Mapped[str] = mapped_column(String(50), nullable=False)
+    patronymic: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    search_name: Mapped[str] = mapped_column(
+        Text, Computed("surname || ' ' || name || coalesce(' ' || patronymic, '')", persisted=True)
+    )
 
     date_of_birth: Mapped[date] = mapped_column(Date, nullable=False)
 
@@ -43,6 +63,10 @@ class User(BaseModel, UUIDMixin, TimestampMixin, SoftDeleteMixin):
 
     verified_at: Mapped[date | None] = mapped_column(Date, nullable=True)
 
+    timezone: Mapped[str] = mapped_column(
+        String(TIMEZONE_MAX_LENGTH), nullable=False, default=DEFAULT_TIMEZONE, server_default=DEFAULT_TIMEZONE
+    )
+
     @property
     def full_name(self) -> str:
         """Возвращает полное имя пользователя."""
@@ -1,9 +1,11 @@
 """Модуль репозитория пользователя."""
 
-from sqlalchemy import select
+from typing import Sequence
+
+from sqlalchemy import Row, Select, select
 
 from app.core import hash_password
-from app.core.database import BaseRepository
+from app.core.database import BaseRepository, trigram_match, trigram_rank
 
 from .model import User as UserModel
 
@@ -67,6 +69,61 @@ class UserRepository(BaseRepository[UserModel]):
 
         return user_data
 
+    async def get_ids_in_timezone(self, timezone: str, after_id: int, limit: int) -> list[int]:
+        """
+        Получение следующей страницы ID неудаленных пользователей часового пояса по возрастанию ID.
+
+        Args:
+            timezone (str): Часовой пояс.
+            after_id (int): ID, после которого начинается страница.
+            limit (int): Размер страницы.
+
+        Returns:
+            (list[int]): ID пользователей.
+        """
+        query = (
+            select(UserModel.id)
+            .where(UserModel.timezone == timezone, UserModel.id > after_id, UserModel.deleted_at.is_(None))
+            .order_by(UserModel.id)
+            .limit(limit)
+        )
+        return list(await self._session_db.scalars(query))
+
+    @staticmethod
+    def build_search_query(query: str, limit: int) -> Select:
+        """
+        Запрос поиска пользователей по полному имени: по подстроке и с опечатками. Условие обслуживается
+        триграммным GIN-индексом по вычисляемой колонке search_name.
+
+        Args:
+            query (str): Строка поиска.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            (Select): Запрос UUID, логина, полного имени и релевантности по убыванию релевантности.
+        """
+        rank = trigram_rank(UserModel.search_name, query).label("rank")
+
+        return (
+            select(UserModel.uuid, UserModel.login, UserModel.search_name.label("full_name"), rank)
+            .where(UserModel.deleted_at.is_(None), trigram_match(UserModel.search_name, query))
+            .order_by(rank.desc(), UserModel.id)
+            .limit(limit)
+        )
+
+    async def search(self, query: str, limit: int) -> Sequence[Row]:
+        """
+        Поиск неудаленных пользователей по полному имени.
+
+        Args:
+            query (str): Строка поиска.
+            limit (int): Максимальное количество результатов.
+
+        Returns:
+            (Sequence[Row]): UUID, логин, полное имя и релевантность по убыванию релевантности.
+        """
+        return (await self._session_db.execute(self.build_search_query(query, limit))).all()
+
     async def _before_create(self, data: dict) -> None:
         data["password"] = hash_password(str(data.get("password")))
 
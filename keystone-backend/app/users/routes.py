@@ -1,15 +1,24 @@
 """Модуль роутов для работы с пользователями."""
 
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import SearchQuerySchema
 from app.core.database import get_db
 
 from .dependencies import get_current_user
 from .model import User as UserModel
-from .schemas import UserAccessData, UserAuthResponseData, UserPasswordData, UserPublicData, UserRegisterData
+from .schemas import (
+    UserAccessData,
+    UserAuthResponseData,
+    UserPasswordData,
+    UserPublicData,
+    UserRegisterData,
+    UserSearchResultData,
+)
 from .service import UserService
 
 user_routes: APIRouter = APIRouter(prefix="/user", tags=["user"])
@@ -78,3 +87,13 @@ async def user_update(
 async def user_me(request: Request, _: UserModel = Depends(get_current_user)) -> UserPublicData:
     """Получение данных текущего пользователя."""
     return UserPublicData(**request.state.user.to_dict())
+
+
+@user_routes.get("/search", description="Поиск пользователей по имени", response_model=list[UserSearchResultData])
+async def user_search(
+    params: Annotated[SearchQuerySchema, Query()],
+    _: UserModel = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[UserSearchResultData]:
+    """Поиск пользователей по фамилии, имени и отчеству: по подстроке и с опечатками."""
+    return await UserService(db).search(params)
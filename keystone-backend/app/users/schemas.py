@@ -3,10 +3,11 @@
 
 from datetime import date
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.core import UUIDSchemaMixin
-from app.users.validators import validate_birth_date, validate_email
+from app.users.consts import DEFAULT_TIMEZONE, TIMEZONE_MAX_LENGTH
+from app.users.validators import validate_birth_date, validate_email, validate_timezone
 
 
 class UserPersonData(BaseModel):
@@ -19,10 +20,12 @@ class UserPersonData(BaseModel):
         patronymic (str | None): Отчество пользователя.
         date_of_birth (date): Дата рождения пользователя.
         email (str): Электронная почта пользователя.
+        timezone (str): Часовой пояс пользователя.
 
     Methods:
         validate_email: Валидация электронной почты.
         validate_date_of_birth: Валидация даты рождения.
+        validate_timezone: Валидация часового пояса.
     """
 
     name: str = Field(..., min_length=2, max_length=50)
@@ -30,6 +33,7 @@ class UserPersonData(BaseModel):
     patronymic: str | None = Field(..., min_length=2, max_length=50)
     date_of_birth: date
     email: str = Field(..., min_length=6, max_length=50)
+    timezone: str = Field(DEFAULT_TIMEZONE, max_length=TIMEZONE_MAX_LENGTH)
 
     @field_validator("email")
     @classmethod
@@ -43,6 +47,12 @@ class UserPersonData(BaseModel):
         """Валидация даты рождения."""
         return validate_birth_date(value)
 
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, value: str) -> str:
+        """Валидация часового пояса."""
+        return validate_timezone(value)
+
 
 class UserPasswordData(BaseModel):
     """
@@ -78,10 +88,12 @@ class UserPublicData(UUIDSchemaMixin, UserPersonData):
         patronymic (str | None): Отчество пользователя.
         date_of_birth (date): Дата рождения пользователя.
         email (str): Электронная почта пользователя.
+        timezone (str): Часовой пояс пользователя.
 
     Methods:
         validate_email: Валидация электронной почты.
         validate_date_of_birth: Валидация даты рождения.
+        validate_timezone: Валидация часового пояса.
     """
 
     ...
@@ -97,12 +109,14 @@ class UserRegisterData(UserPersonData, UserAccessData):
         patronymic (str | None): Отчество пользователя.
         date_of_birth (date): Дата рождения пользователя.
         email (str): Электронная почта пользователя.
+        timezone (str): Часовой пояс пользователя.
         login (str): Логин пользователя.
         password (str): Пароль пользователя.
 
     Methods:
         validate_email: Валидация электронной почты.
         validate_date_of_birth: Валидация даты рождения.
+        validate_timezone: Валидация часового пояса.
     """
 
     ...
@@ -121,3 +135,21 @@ class UserAuthResponseData(BaseModel):
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
+
+
+class UserSearchResultData(UUIDSchemaMixin):
+    """
+    Схема результата поиска пользователя по имени.
+
+    Attributes:
+        uuid (str): Уникальный идентификатор пользователя.
+        login (str): Логин пользователя.
+        full_name (str): Фамилия, имя и отчество пользователя.
+        rank (float): Релевантность от 0 до 1.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    login: str
+    full_name: str
+    rank: float
@@ -12,13 +12,13 @@ from pydantic import BaseModel
 
 from app.access_restore import AccessRestoreData, AccessRestoreService
 from app.confirmation import ConfirmationData, ConfirmService
-from app.core import BaseService, ServiceOperation, create_access_token, verify_password
+from app.core import BaseService, SearchQuerySchema, ServiceOperation, create_access_token, verify_password
 
 from . import exceptions as exc
 from .consts import ACCESS_TOKEN_COOKIE_NAME, REFRESH_TOKEN_COOKIE_NAME
 from .model import User as UserModel
 from .repository import UserRepository
-from .schemas import UserAccessData, UserAuthResponseData, UserRegisterData
+from .schemas import UserAccessData, UserAuthResponseData, UserRegisterData, UserSearchResultData
 from .validators import validate_email
 
 UserInputData = TypeVar("UserInputData", bound=BaseModel)
@@ -45,7 +45,7 @@ class UserService(Generic[UserInputData], BaseService[UserRepository, UserInputD
         """
         user: UserModel = await self.create(payload)
 
-        await ConfirmService(self._db).create(ConfirmationData(user_id=user.id, user_email=str(user.email)))
+        await ConfirmService(self._db).request(ConfirmationData(user_id=user.id, user_email=str(user.email)))
 
         return user.to_dict()
 
@@ -104,7 +104,7 @@ class UserService(Generic[UserInputData], BaseService[UserRepository, UserInputD
         if not user_data:
             raise exc.EmailNotFoundException(valid_user_email)
 
-        await AccessRestoreService(self._db).create(
+        await AccessRestoreService(self._db).request(
             AccessRestoreData(user_id=user_data.id, user_deleted=user_data.is_deleted, user_email=str(user_data.email))
         )
 
@@ -148,7 +148,7 @@ class UserService(Generic[UserInputData], BaseService[UserRepository, UserInputD
         if user.verified_at:
             raise exc.UserAlreadyVerifiedException()
 
-        await ConfirmService(self._db).create(ConfirmationData(user_id=user.id, user_email=str(user.email)))
+        await ConfirmService(self._db).request(ConfirmationData(user_id=user.id, user_email=str(user.email)))
         return True
 
     async def confirm_email(self, token: UUID) -> bool:
@@ -171,6 +171,19 @@ class UserService(Generic[UserInputData], BaseService[UserRepository, UserInputD
 
         return True
 
+    async def search(self, params: SearchQuerySchema) -> list[UserSearchResultData]:
+        """
+        Поиск пользователей по полному имени: по подстроке и с опечатками, по убыванию релевантности.
+
+        Args:
+            params (SearchQuerySchema): Строка поиска и максимальное количество результатов.
+
+        Returns:
+            (list[UserSearchResultData]): Найденные пользователи.
+        """
+        rows = await self._repository.search(params.q, params.limit)
+        return [UserSearchResultData.model_validate(row) for row in rows]
+
     async def _validate_payload(
         self, operation: ServiceOperation, payload: UserRegisterData | None = None, entity: UserModel | None = None
     ) -> None:
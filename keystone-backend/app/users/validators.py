@@ -3,12 +3,15 @@
 import re
 from datetime import date
 
+from app.core.utils import get_timezones
+
 from .consts import EMAIL_VALIDATION_EXP, MIN_USER_AGE
 from .exceptions import (
     FutureBirthDateException,
     InvalidBirthDateException,
     NotAllowedAgeException,
     NotValidEmailException,
+    NotValidTimezoneException,
 )
 
 
@@ -68,3 +71,26 @@ def validate_birth_date(birth_date: date | str) -> date:
         raise NotAllowedAgeException()
 
     return birth_date
+
+
+def validate_timezone(timezone: str) -> str:
+    """
+    Валидация часового пояса.
+
+    Args:
+        timezone (str): Название часового пояса.
+
+    Returns:
+        (str): Валидированное название часового пояса.
+
+    Examples:
+        >>> validate_timezone("Europe/Moscow") # True
+        >>> validate_timezone("GMT+3") # False
+
+    Raises:
+        NotValidTimezoneException: Если часового пояса нет в базе IANA.
+    """
+    if timezone not in get_timezones():
+        raise NotValidTimezoneException()
+
+    return timezone
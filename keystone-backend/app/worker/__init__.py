@@ -1,2 +1,2 @@
 from .celery_app import celery_app
-from .tasks import send_confirmation_email
+from .tasks import send_access_restore_email, send_confirmation_email
@@ -0,0 +1,635 @@
+"""
+Модуль асинхронного отправителя писем. Альтернатива воркеру Celery для очереди транзакционных писем: читает те же задачи
+из брокера и ведет множество SMTP-сессий в одном цикле событий, а не по процессу на письмо.
+
+Требует необязательную зависимость aiosmtplib (pip install "keystone-backend[async-mail]").
+
+Запуск:
+    python -m app.worker.async_mailer
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import random
+import signal
+import socket
+import threading
+import time
+from datetime import UTC, datetime
+from email.message import EmailMessage
+from typing import Any, Awaitable, Callable, NamedTuple
+
+from celery.utils.time import get_exponential_backoff_interval
+from kombu import Connection, Consumer, Queue
+from kombu.message import Message
+
+from app.core.config import AppSettings, get_app_settings
+
+from .celery_app import celery_app
+from .circuit_breaker import CircuitBreaker
+from .consts import (
+    ASYNC_MAIL_DEAD_LETTER_KEY,
+    ASYNC_MAIL_HOST_CONCURRENCY,
+    ASYNC_MAIL_MAX_IN_FLIGHT,
+    ASYNC_MAIL_POLL_INTERVAL_SECONDS,
+    ASYNC_MAIL_RECONNECT_DELAY_SECONDS,
+    MAIL_DELIVERY_METRICS,
+    MAIL_MAX_RETRIES,
+    MAIL_PARK_JITTER_SECONDS,
+    MAIL_RETRY_BACKOFF_MAX_SECONDS,
+    MAIL_RETRY_BACKOFF_SECONDS,
+    SMTP_TIMEOUT_SECONDS,
+    TRANSACTIONAL_MAIL_QUEUE,
+)
+from .delivery import smtp_breaker
+from .idempotency import claim_task, complete_task, release_task
+from .metrics import increment_counter
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+# Функция сборки письма из именованных аргументов задачи
+MessageBuilder = Callable[..., EmailMessage]
+# Функция открытия авторизованной асинхронной SMTP-сессии с почтовым сервером
+AsyncSMTPFactory = Callable[[str], Awaitable[Any]]
+
+
+class MailTask(NamedTuple):
+    """
+    Задача отправки письма, прочитанная из брокера.
+
+    Attributes:
+        task_id (str): Идентификатор задачи Celery.
+        name (str): Имя задачи Celery.
+        kwargs (dict[str, Any]): Именованные аргументы задачи.
+        retries (int): Номер повтора (заголовок retries задачи Celery).
+        eta (datetime | None): Время, раньше которого задачу нельзя выполнять (заголовок eta).
+    """
+
+    task_id: str
+    name: str
+    kwargs: dict[str, Any]
+    retries: int = 0
+    eta: datetime | None = None
+
+
+async def create_async_smtp_connection(host: str) -> Any:
+    """
+    Открывает асинхронную SMTP-сессию с почтовым сервером и авторизуется.
+
+    Args:
+        host (str): Хост почтового сервера.
+
+    Returns:
+        (aiosmtplib.SMTP): Авторизованная сессия.
+
+    Raises:
+        RuntimeError: Не установлен aiosmtplib.
+    """
+    try:
+        import aiosmtplib  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise RuntimeError('Для асинхронной отправки писем установите "keystone-backend[async-mail]"') from exc
+
+    client = aiosmtplib.SMTP(hostname=host, port=app_settings.EMAIL_PORT, use_tls=True, timeout=SMTP_TIMEOUT_SECONDS)
+    await client.connect()
+
+    try:
+        await client.login(app_settings.EMAIL_USERNAME, app_settings.EMAIL_PASSWORD)
+    except BaseException:
+        client.close()
+        raise
+
+    return client
+
+
+class AsyncSMTPPool:
+    """
+    Пул асинхронных SMTP-сессий с одним почтовым сервером.
+
+    Notes:
+        - Количество одновременных сессий ограничено семафором, остальные отправки ждут своей очереди.
+        - Сессия, на которой произошла ошибка, закрывается и не возвращается в пул.
+
+    Attributes:
+        _connect (Callable[[], Awaitable[Any]]): Функция открытия сессии.
+        _semaphore (asyncio.Semaphore): Ограничение одновременных сессий.
+        _idle (list[Any]): Простаивающие сессии.
+    """
+
+    def __init__(self, connect: Callable[[], Awaitable[Any]], max_connections: int) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            connect (Callable[[], Awaitable[Any]]): Функция открытия сессии.
+            max_connections (int): Максимальное количество одновременных сессий.
+        """
+        self._connect: Callable[[], Awaitable[Any]] = connect
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(max_connections)
+        self._idle: list[Any] = []
+
+    async def send(self, message: EmailMessage) -> None:
+        """
+        Отправляет письмо через свободную сессию пула.
+
+        Args:
+            message (EmailMessage): Письмо.
+        """
+        async with self._semaphore:
+            client = self._idle.pop() if self._idle else await self._connect()
+
+            try:
+                await client.send_message(message)
+            except BaseException:
+                client.close()
+                raise
+
+            self._idle.append(client)
+
+    async def close(self) -> None:
+        """Завершает простаивающие сессии."""
+        while self._idle:
+            client = self._idle.pop()
+
+            try:
+                await client.quit()
+            except Exception:  # pylint: disable=broad-exception-caught
+                client.close()
+
+
+class AsyncMailSender:
+    """
+    Отправитель писем с ограничением одновременных сессий на каждый почтовый сервер.
+
+    Attributes:
+        _connect (AsyncSMTPFactory): Функция открытия сессии с сервером.
+        _host_concurrency (int): Ограничение сессий для серверов без отдельного ограничения.
+        _host_limits (dict[str, int]): Ограничения сессий по серверам.
+        _pools (dict[str, AsyncSMTPPool]): Пулы сессий по серверам.
+    """
+
+    def __init__(
+        self,
+        connect: AsyncSMTPFactory = create_async_smtp_connection,
+        host_concurrency: int = ASYNC_MAIL_HOST_CONCURRENCY,
+        host_limits: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Инициализация отправителя.
+
+        Args:
+            connect (AsyncSMTPFactory): Функция открытия сессии с сервером.
+            host_concurrency (int): Ограничение сессий для серверов без отдельного ограничения.
+            host_limits (dict[str, int] | None): Ограничения сессий по серверам.
+        """
+        self._connect: AsyncSMTPFactory = connect
+        self._host_concurrency: int = host_concurrency
+        self._host_limits: dict[str, int] = host_limits or {}
+        self._pools: dict[str, AsyncSMTPPool] = {}
+
+    async def send(self, message: EmailMessage, host: str | None = None) -> None:
+        """
+        Отправляет письмо через почтовый сервер.
+
+        Args:
+            message (EmailMessage): Письмо.
+            host (str | None): Хост почтового сервера. По умолчанию сервер из настроек.
+        """
+        host = host or app_settings.EMAIL_HOST
+
+        if host not in self._pools:
+            self._pools[host] = AsyncSMTPPool(
+                lambda: self._connect(host), self._host_limits.get(host, self._host_concurrency)
+            )
+
+        await self._pools[host].send(message)
+
+    async def close(self) -> None:
+        """Завершает сессии со всеми серверами."""
+        for pool in self._pools.values():
+            await pool.close()
+
+
+class MailRedelivery:
+    """
+    Повторная доставка задач асинхронного отправителя через брокер. Методы блокирующие: вызываются из потока.
+
+    Notes:
+        - Задача публикуется заново с тем же идентификатором и задержкой (заголовок eta), после чего исходное
+          сообщение можно подтвердить. Цикл событий не занят ожиданием повтора.
+        - Номер повтора передается в заголовке retries, как у задач Celery. После max_retries повторов задача
+          переносится в поток недоставленных писем и больше не выполняется.
+        - Методы возвращают False, если брокер или Redis недоступны: тогда сообщение возвращается в очередь.
+
+    Attributes:
+        _max_retries (int): Максимальное количество повторов задачи.
+    """
+
+    def __init__(self, max_retries: int = MAIL_MAX_RETRIES) -> None:
+        """
+        Инициализация повторной доставки.
+
+        Args:
+            max_retries (int): Максимальное количество повторов задачи.
+        """
+        self._max_retries: int = max_retries
+
+    def park(self, task: MailTask, countdown: float) -> bool:
+        """
+        Откладывает задачу без увеличения номера повтора, например пока разомкнут предохранитель почтового сервера.
+
+        Args:
+            task (MailTask): Задача.
+            countdown (float): Задержка в секундах. К ней добавляется случайный разброс.
+
+        Returns:
+            (bool): True, если задача отложена и исходное сообщение можно подтвердить.
+        """
+        if not self._publish(task, countdown + random.uniform(0, MAIL_PARK_JITTER_SECONDS), task.retries):
+            return False
+
+        increment_counter(MAIL_DELIVERY_METRICS, f"{task.name}.parked")
+        return True
+
+    def retry(self, task: MailTask, reason: str) -> bool:
+        """
+        Повторяет задачу после ошибки с экспоненциальной задержкой или переносит ее в недоставленные,
+        если повторы закончились.
+
+        Args:
+            task (MailTask): Задача.
+            reason (str): Причина ошибки.
+
+        Returns:
+            (bool): True, если задача отложена или перенесена и исходное сообщение можно подтвердить.
+        """
+        if task.retries >= self._max_retries:
+            return self.dead_letter(task, reason)
+
+        countdown: int = get_exponential_backoff_interval(
+            MAIL_RETRY_BACKOFF_SECONDS, task.retries, MAIL_RETRY_BACKOFF_MAX_SECONDS, full_jitter=True
+        )
+        return self._publish(task, countdown, task.retries + 1)
+
+    def dead_letter(self, task: MailTask, reason: str) -> bool:
+        """
+        Переносит задачу в поток недоставленных писем вместе с причиной.
+
+        Args:
+            task (MailTask): Задача.
+            reason (str): Причина, по которой задача не выполнена.
+
+        Returns:
+            (bool): True, если задача перенесена и исходное сообщение можно подтвердить.
+        """
+        try:
+            get_redis().xadd(
+                ASYNC_MAIL_DEAD_LETTER_KEY,
+                {
+                    "task_id": task.task_id,
+                    "task": task.name,
+                    "kwargs": json.dumps(task.kwargs, default=str),
+                    "retries": task.retries,
+                    "reason": reason,
+                },
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to dead-letter mail task %s (%s)", task.name, task.task_id, exc_info=True)
+            return False
+
+        logger.error("Mail task %s (%s) dead-lettered: %s", task.name, task.task_id, reason)
+        increment_counter(MAIL_DELIVERY_METRICS, f"{task.name}.dead_lettered")
+        return True
+
+    @staticmethod
+    def _publish(task: MailTask, countdown: float, retries: int) -> bool:
+        """
+        Публикует задачу заново с тем же идентификатором и задержкой.
+
+        Args:
+            task (MailTask): Задача.
+            countdown (float): Задержка в секундах.
+            retries (int): Номер повтора.
+
+        Returns:
+            (bool): True, если задача опубликована.
+        """
+        try:
+            celery_app.send_task(
+                task.name,
+                kwargs=task.kwargs,
+                task_id=task.task_id,
+                countdown=countdown,
+                retries=retries,
+                ignore_result=True,
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Failed to republish mail task %s (%s)", task.name, task.task_id, exc_info=True)
+            return False
+
+        return True
+
+
+class AsyncMailer:
+    """
+    Исполнитель задач отправки писем в цикле событий.
+
+    Notes:
+        - Письма собираются теми же функциями, что и в задачах Celery.
+        - Повторная доставка задачи (например, из outbox) распознается по идентификатору и не отправляется.
+        - Учитывает общий с задачами Celery предохранитель почтового сервера: пока он разомкнут, задачи
+          откладываются через брокер, ошибки и успешные отправки меняют его состояние.
+        - Ошибка отправки повторяется через брокер с растущей задержкой, задача, которая не собирается
+          или не отправилась за все повторы, переносится в недоставленные (см. MailRedelivery).
+
+    Attributes:
+        _builders (dict[str, MessageBuilder]): Функции сборки писем по имени задачи.
+        _sender (AsyncMailSender): Отправитель писем.
+        _redelivery (MailRedelivery): Повторная доставка задач через брокер.
+        _breaker (CircuitBreaker): Предохранитель почтового сервера.
+    """
+
+    def __init__(
+        self,
+        builders: dict[str, MessageBuilder],
+        sender: AsyncMailSender,
+        redelivery: MailRedelivery | None = None,
+        breaker: CircuitBreaker = smtp_breaker,
+    ) -> None:
+        """
+        Инициализация исполнителя.
+
+        Args:
+            builders (dict[str, MessageBuilder]): Функции сборки писем по имени задачи.
+            sender (AsyncMailSender): Отправитель писем.
+            redelivery (MailRedelivery | None): Повторная доставка задач через брокер.
+            breaker (CircuitBreaker): Предохранитель почтового сервера.
+        """
+        self._builders: dict[str, MessageBuilder] = builders
+        self._sender: AsyncMailSender = sender
+        self._redelivery: MailRedelivery = redelivery or MailRedelivery()
+        self._breaker: CircuitBreaker = breaker
+
+    async def handle(self, task: MailTask) -> bool:
+        """
+        Выполняет задачу отправки письма.
+
+        Args:
+            task (MailTask): Задача.
+
+        Returns:
+            (bool): True, если задачу можно подтвердить брокеру: она выполнена (или уже была выполнена),
+                отложена или перенесена в недоставленные. False - вернуть сообщение в очередь.
+        """
+        builder: MessageBuilder | None = self._builders.get(task.name)
+
+        if builder is None:
+            return await asyncio.to_thread(self._redelivery.dead_letter, task, "unknown task")
+
+        try:
+            message: EmailMessage = builder(**task.kwargs)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # Письмо из тех же аргументов не соберется и при повторе
+            return await asyncio.to_thread(self._redelivery.dead_letter, task, repr(error))
+
+        if wait := await asyncio.to_thread(self._breaker.retry_after):
+            return await asyncio.to_thread(self._redelivery.park, task, wait)
+
+        if not await asyncio.to_thread(claim_task, task.task_id):
+            return True
+
+        try:
+            await self._sender.send(message)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            await asyncio.to_thread(release_task, task.task_id)
+            await asyncio.to_thread(self._breaker.record_failure)
+            logger.warning("Failed to send mail task %s (%s)", task.name, task.task_id, exc_info=True)
+            return await asyncio.to_thread(self._redelivery.retry, task, repr(error))
+
+        await asyncio.to_thread(complete_task, task.task_id)
+        await asyncio.to_thread(self._breaker.record_success)
+        return True
+
+
+class BrokerConsumer(threading.Thread):
+    """
+    Поток чтения задач из очереди брокера. Соединение с брокером не потокобезопасно, поэтому
+    подтверждения из цикла событий передаются в поток через очередь и выполняются им самим.
+
+    Attributes:
+        _queue_name (str): Имя очереди брокера.
+        _prefetch (int): Максимальное количество неподтвержденных задач.
+        _on_task (Callable[[MailTask, Message], None]): Обработчик прочитанной задачи.
+        _settlements (queue.Queue[tuple[Message, bool]]): Ожидающие подтверждения и отказы.
+        _stopping (threading.Event): Признак прекращения чтения новых задач.
+        _closed (threading.Event): Признак завершения потока.
+    """
+
+    def __init__(self, queue_name: str, prefetch: int, on_task: Callable[[MailTask, Message], None]) -> None:
+        """
+        Инициализация потока.
+
+        Args:
+            queue_name (str): Имя очереди брокера.
+            prefetch (int): Максимальное количество неподтвержденных задач.
+            on_task (Callable[[MailTask, Message], None]): Обработчик прочитанной задачи. Вызывается в потоке чтения.
+        """
+        super().__init__(name="broker-consumer", daemon=True)
+        self._queue_name: str = queue_name
+        self._prefetch: int = prefetch
+        self._on_task: Callable[[MailTask, Message], None] = on_task
+        self._settlements: queue.Queue[tuple[Message, bool]] = queue.Queue()
+        self._stopping: threading.Event = threading.Event()
+        self._closed: threading.Event = threading.Event()
+
+    def settle(self, message: Message, success: bool) -> None:
+        """
+        Подтверждает задачу или возвращает ее в очередь. Можно вызывать из любого потока.
+
+        Args:
+            message (Message): Сообщение брокера.
+            success (bool): True - подтвердить, False - вернуть в очередь.
+        """
+        self._settlements.put((message, success))
+
+    def stop_consuming(self) -> None:
+        """Прекращает чтение новых задач. Подтверждения продолжают выполняться."""
+        self._stopping.set()
+
+    def close(self) -> None:
+        """Выполняет оставшиеся подтверждения и завершает поток."""
+        self._stopping.set()
+        self._closed.set()
+        self.join()
+
+    def run(self) -> None:
+        """Читает задачи, пока поток не закрыт. При обрыве соединения переподключается."""
+        while not self._closed.is_set():
+            try:
+                with celery_app.connection_for_read() as connection:
+                    self._consume(connection)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Broker connection failed, reconnecting")
+                time.sleep(ASYNC_MAIL_RECONNECT_DELAY_SECONDS)
+
+    def _consume(self, connection: Connection) -> None:
+        """
+        Читает задачи через одно соединение.
+
+        Args:
+            connection (Connection): Соединение с брокером.
+        """
+        # Очереди объявлены в настройках Celery без параметров, поэтому совпадают с Queue(имя).
+        # Заглушки типов kombu не описывают управление потребителем и чтение событий соединения
+        consumer: Any = Consumer(connection, [Queue(self._queue_name)], callbacks=[self._on_message], accept=["json"])
+        drain_events: Callable[..., None] = getattr(connection, "drain_events")
+
+        with consumer:
+            consumer.qos(prefetch_count=self._prefetch)
+            consuming: bool = True
+
+            while not self._closed.is_set():
+                self._settle_pending()
+
+                if consuming and self._stopping.is_set():
+                    consumer.cancel()
+                    consuming = False
+
+                if not consuming:
+                    time.sleep(ASYNC_MAIL_POLL_INTERVAL_SECONDS)
+                    continue
+
+                try:
+                    drain_events(timeout=ASYNC_MAIL_POLL_INTERVAL_SECONDS)
+                except socket.timeout:
+                    pass
+
+            self._settle_pending()
+
+    def _on_message(self, body: Any, message: Message) -> None:
+        """
+        Разбирает сообщение задачи Celery (протокол 2) и передает задачу обработчику.
+        Номер повтора и время выполнения берутся из заголовков retries и eta.
+
+        Args:
+            body (Any): Тело сообщения: позиционные аргументы, именованные аргументы и служебные данные.
+            message (Message): Сообщение брокера.
+        """
+        try:
+            _, kwargs, _ = body
+            eta: datetime | None = None
+
+            if message.headers.get("eta"):
+                eta = datetime.fromisoformat(message.headers["eta"])
+
+                if eta.tzinfo is None:
+                    eta = eta.replace(tzinfo=UTC)
+
+            task: MailTask = MailTask(
+                message.headers["id"], message.headers["task"], kwargs, int(message.headers.get("retries") or 0), eta
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.error("Malformed task message in %s: %r", self._queue_name, message.headers)
+            message.reject(requeue=False)
+            return
+
+        self._on_task(task, message)
+
+    def _settle_pending(self) -> None:
+        """Выполняет накопленные подтверждения и отказы."""
+        while True:
+            try:
+                message, success = self._settlements.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                if success:
+                    message.ack()
+                else:
+                    message.reject(requeue=True)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning("Failed to settle task message", exc_info=True)
+
+
+async def run_mailer(mailer: AsyncMailer, stop_event: asyncio.Event, prefetch: int = ASYNC_MAIL_MAX_IN_FLIGHT) -> None:
+    """
+    Читает задачи из очереди писем и выполняет их, пока не установлен признак остановки.
+    При остановке дожидается писем, которые уже отправляются.
+
+    Args:
+        mailer (AsyncMailer): Исполнитель задач.
+        stop_event (asyncio.Event): Признак остановки.
+        prefetch (int): Максимальное количество задач в работе.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    in_flight: set[asyncio.Task] = set()
+
+    async def _handle(task: MailTask, message: Message) -> None:
+        if task.eta is not None and (delay := (task.eta - datetime.now(UTC)).total_seconds()) > 0:
+            try:
+                await asyncio.wait_for(stop_event.wait(), delay)
+            except TimeoutError:
+                pass
+            else:
+                # Отложенная задача еще не наступила: при остановке возвращается в очередь
+                consumer.settle(message, False)
+                return
+
+        consumer.settle(message, await mailer.handle(task))
+
+    def _spawn(task: MailTask, message: Message) -> None:
+        handler: asyncio.Task = loop.create_task(_handle(task, message))
+        in_flight.add(handler)
+        handler.add_done_callback(in_flight.discard)
+
+    def _dispatch(task: MailTask, message: Message) -> None:
+        loop.call_soon_threadsafe(_spawn, task, message)
+
+    consumer: BrokerConsumer = BrokerConsumer(TRANSACTIONAL_MAIL_QUEUE, prefetch, _dispatch)
+    consumer.start()
+
+    await stop_event.wait()
+    consumer.stop_consuming()
+
+    if in_flight:
+        await asyncio.wait(set(in_flight))
+
+    await asyncio.to_thread(consumer.close)
+
+
+async def main() -> None:
+    """Запускает асинхронный отправитель писем до получения сигнала остановки процесса."""
+    # pylint: disable=import-outside-toplevel
+    from .mail import mail_renderer
+    from .tasks.access_restore_send import build_access_restore_email, send_access_restore_email
+    from .tasks.confirmation_send import build_confirmation_email, send_confirmation_email
+
+    mail_renderer.precompile()
+    sender: AsyncMailSender = AsyncMailSender()
+    mailer: AsyncMailer = AsyncMailer(
+        {
+            send_confirmation_email.name: build_confirmation_email,
+            send_access_restore_email.name: build_access_restore_email,
+        },
+        sender,
+    )
+    stop_event: asyncio.Event = asyncio.Event()
+
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(stop_signal, stop_event.set)
+
+    try:
+        await run_mailer(mailer, stop_event)
+    finally:
+        await sender.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -1,8 +1,66 @@
 from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
 
 from app.core.config import AppSettings, get_app_settings
 
+from .consts import (
+    ANALYTICS_QUEUE,
+    BROKER_VISIBILITY_TIMEOUT_SECONDS,
+    BULK_MAIL_QUEUE,
+    DAY_CLOSE_TICK_MINUTES,
+    MAINTENANCE_QUEUE,
+    TRANSACTIONAL_MAIL_QUEUE,
+)
+
 app_settings: AppSettings = get_app_settings()
 
 celery_app: Celery = Celery("keystone", broker=app_settings.redis_url, backend=app_settings.redis_url)
 celery_app.autodiscover_tasks(packages=["app.worker"])
+# Модели пакетов связаны отношениями и циклическими импортами и загружаются, начиная с пакета пользователей.
+# Воркер импортирует пакет при запуске, поэтому задачам не нужно загружать модели самим
+celery_app.conf.imports = ("app.users",)
+
+celery_app.conf.beat_schedule = {
+    "maintain-token-partitions": {
+        "task": "app.worker.tasks.token_partitions.maintain_token_partitions",
+        "schedule": crontab(minute=15),
+    },
+    "resume-campaigns": {
+        "task": "app.worker.tasks.campaigns.resume_campaigns",
+        "schedule": crontab(minute="*/5"),
+    },
+    "schedule-day-close": {
+        "task": "app.worker.tasks.habit_day_close.schedule_day_close",
+        "schedule": crontab(minute=f"*/{DAY_CLOSE_TICK_MINUTES}"),
+    },
+    "archive-habits": {
+        "task": "app.worker.tasks.habit_archive.archive_habits",
+        "schedule": crontab(hour=3, minute=30),
+    },
+}
+
+celery_app.conf.task_queues = [
+    Queue(name) for name in (TRANSACTIONAL_MAIL_QUEUE, BULK_MAIL_QUEUE, MAINTENANCE_QUEUE, ANALYTICS_QUEUE)
+]
+celery_app.conf.task_default_queue = MAINTENANCE_QUEUE
+celery_app.conf.task_routes = {
+    "app.worker.tasks.confirmation_send.send_confirmation_email": {"queue": TRANSACTIONAL_MAIL_QUEUE},
+    "app.worker.tasks.access_restore_send.send_access_restore_email": {"queue": TRANSACTIONAL_MAIL_QUEUE},
+    "app.worker.tasks.campaigns.send_campaign_chunk": {"queue": BULK_MAIL_QUEUE},
+    "app.worker.tasks.campaigns.run_campaign": {"queue": MAINTENANCE_QUEUE},
+    "app.worker.tasks.campaigns.resume_campaigns": {"queue": MAINTENANCE_QUEUE},
+    "app.worker.tasks.token_partitions.maintain_token_partitions": {"queue": MAINTENANCE_QUEUE},
+    "app.worker.tasks.habit_stats.rebuild_habit_stats": {"queue": ANALYTICS_QUEUE},
+    "app.worker.tasks.habit_rollups.rebuild_completion_rollups": {"queue": ANALYTICS_QUEUE},
+    "app.worker.tasks.habit_day_close.schedule_day_close": {"queue": MAINTENANCE_QUEUE},
+    "app.worker.tasks.habit_day_close.close_habit_day": {"queue": ANALYTICS_QUEUE},
+    "app.worker.tasks.habit_archive.archive_habits": {"queue": MAINTENANCE_QUEUE},
+}
+
+# Результаты задач никто не читает: не записываем их в Redis
+celery_app.conf.task_ignore_result = True
+# Процесс берет следующую задачу, только когда освободится: короткая задача не ждет за длинной,
+# полученной тем же процессом заранее. Профили воркеров могут поднять значение (см. app.worker.profiles)
+celery_app.conf.worker_prefetch_multiplier = 1
+celery_app.conf.broker_transport_options = {"visibility_timeout": BROKER_VISIBILITY_TIMEOUT_SECONDS}
@@ -0,0 +1,232 @@
+"""
+Модуль записи буфера отметок привычек в базу пакетами (group commit).
+
+Запуск:
+    python -m app.worker.check_in_flusher
+"""
+
+import asyncio
+import logging
+import signal
+import socket
+import time
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import AppSettings, get_app_settings
+from app.core.metrics import increment_counter
+from app.core.redis import redis_manager
+from app.habits.buffer import BufferedMessage, CheckInBuffer
+from app.habits.completions import HabitCompletionService
+from app.habits.consts import (
+    CHECK_IN_BROKEN_MESSAGE_REASON,
+    CHECK_IN_BUFFER_METRICS,
+    CHECK_IN_DELIVERIES_EXCEEDED_REASON,
+    CHECK_IN_FLUSH_BATCH_SIZE,
+    CHECK_IN_FLUSH_IDLE_MS,
+    CHECK_IN_FLUSH_INTERVAL_MS,
+    CHECK_IN_FLUSH_MAX_DELIVERIES,
+)
+from app.habits.schemas import HabitCheckInEntry
+
+logger = logging.getLogger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+
+class CheckInFlusher:
+    """
+    Процесс записи буфера отметок. Набирает пакет, пока в нем меньше batch_size отметок и с первой отметки
+    пакета прошло меньше interval_ms, и пишет его одной транзакцией: статистика каждой привычки обновляется
+    одним запросом на пакет, а не отдельной транзакцией на каждую отметку.
+
+    Notes:
+        - Отметки одной привычки пишутся в порядке буфера, поэтому поток читает один процесс записи.
+          Сообщения упавшего процесса забирает следующий, когда их простой превысит CHECK_IN_CLAIM_IDLE_MS.
+        - Сообщения подтверждаются после фиксации транзакции. Если процесс упадет между ними, пакет будет
+          записан повторно, и уже записанные отметки будут пропущены.
+        - Отметки, которые не прошли повторную проверку, и сообщения, которые не удалось разобрать, переносятся
+          в поток недоставленных отметок. Туда же переносится пакет, который не записан за max_deliveries доставок.
+
+    Attributes:
+        _session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+        _buffer (CheckInBuffer): Буфер отметок.
+        _consumer (str): Имя читателя в группе потока.
+        _batch_size (int): Максимальное количество отметок в пакете.
+        _interval_ms (int): Время набора пакета в миллисекундах.
+        _max_deliveries (int): Количество доставок сообщения, после которого оно не записывается.
+        _recover (bool): Перед следующим пакетом забрать неподтвержденные сообщения.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        buffer: CheckInBuffer,
+        consumer: str,
+        batch_size: int = CHECK_IN_FLUSH_BATCH_SIZE,
+        interval_ms: int = CHECK_IN_FLUSH_INTERVAL_MS,
+        max_deliveries: int = CHECK_IN_FLUSH_MAX_DELIVERIES,
+    ) -> None:
+        """
+        Инициализация процесса записи.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+            buffer (CheckInBuffer): Буфер отметок.
+            consumer (str): Имя читателя в группе потока.
+            batch_size (int): Максимальное количество отметок в пакете.
+            interval_ms (int): Время набора пакета в миллисекундах.
+            max_deliveries (int): Количество доставок сообщения, после которого оно не записывается.
+        """
+        self._session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self._buffer: CheckInBuffer = buffer
+        self._consumer: str = consumer
+        self._batch_size: int = batch_size
+        self._interval_ms: int = interval_ms
+        self._max_deliveries: int = max_deliveries
+        self._recover: bool = True
+
+    async def collect(self) -> list[BufferedMessage]:
+        """
+        Набирает пакет сообщений. Сначала забираются неподтвержденные сообщения (после запуска, ошибки
+        или простоя), затем новые. Неподтвержденные сообщения, доставленные больше max_deliveries раз,
+        переносятся в поток недоставленных отметок.
+
+        Returns:
+            (list[BufferedMessage]): Пакет. Пуст, если за время ожидания отметок не было.
+        """
+        if self._recover:
+            self._recover = False
+            messages: list[BufferedMessage] = await self._buffer.read(
+                self._consumer, self._batch_size, delivered=True
+            ) or await self._buffer.claim_stale(self._consumer, self._batch_size)
+
+            if messages:
+                return await self._drop_exhausted(messages)
+
+        messages = await self._buffer.read(self._consumer, self._batch_size, block_ms=CHECK_IN_FLUSH_IDLE_MS)
+
+        if not messages:
+            self._recover = True
+            return messages
+
+        deadline: float = time.monotonic() + self._interval_ms / 1000
+
+        while len(messages) < self._batch_size and (remaining := int((deadline - time.monotonic()) * 1000)) > 0:
+            messages += await self._buffer.read(self._consumer, self._batch_size - len(messages), block_ms=remaining)
+
+        return messages
+
+    async def _drop_exhausted(self, messages: list[BufferedMessage]) -> list[BufferedMessage]:
+        """
+        Переносит в поток недоставленных отметок сообщения, которые доставлены больше max_deliveries раз.
+
+        Args:
+            messages (list[BufferedMessage]): Неподтвержденные сообщения.
+
+        Returns:
+            (list[BufferedMessage]): Сообщения, которые еще можно записать.
+        """
+        deliveries: dict[str, int] = await self._buffer.get_delivery_counts(self._consumer, messages)
+        exhausted: list[BufferedMessage] = [
+            message for message in messages if deliveries.get(message[0], 0) > self._max_deliveries
+        ]
+
+        if not exhausted:
+            return messages
+
+        logger.error("%s check-ins are not written after %s deliveries", len(exhausted), self._max_deliveries)
+        await self._buffer.dead_letter([(message, CHECK_IN_DELIVERIES_EXCEEDED_REASON) for message in exhausted])
+        await increment_counter(CHECK_IN_BUFFER_METRICS, "dead_lettered", len(exhausted))
+        # За пакетом могут быть другие неподтвержденные сообщения
+        self._recover = True
+
+        return [message for message in messages if deliveries.get(message[0], 0) <= self._max_deliveries]
+
+    async def flush(self, messages: list[BufferedMessage]) -> int:
+        """
+        Пишет пакет в базу одной транзакцией и подтверждает сообщения. Отклоненные отметки и сообщения, которые
+        не удалось разобрать, переносятся в поток недоставленных отметок.
+
+        Args:
+            messages (list[BufferedMessage]): Пакет.
+
+        Returns:
+            (int): Количество записанных отметок.
+        """
+        entries: list[HabitCheckInEntry] = [entry for _, entry in messages if entry is not None]
+        rejected: dict[UUID, str] = {}
+
+        if entries:
+            async with self._session_factory() as session:
+                rejected = await HabitCompletionService(session).write_buffered(entries)
+
+        dead: list[tuple[BufferedMessage, str]] = []
+
+        for message_id, entry in messages:
+            if entry is None:
+                dead.append(((message_id, entry), CHECK_IN_BROKEN_MESSAGE_REASON))
+            elif entry.buffer_id is not None and entry.buffer_id in rejected:
+                dead.append(((message_id, entry), rejected[entry.buffer_id]))
+
+        dead_ids: set[str] = {message_id for (message_id, _), _ in dead}
+        await self._buffer.dead_letter(dead)
+        await self._buffer.acknowledge([message for message in messages if message[0] not in dead_ids])
+        written: int = len(entries) - len(rejected)
+        await increment_counter(CHECK_IN_BUFFER_METRICS, "batches")
+        await increment_counter(CHECK_IN_BUFFER_METRICS, "flushed", written)
+        await increment_counter(CHECK_IN_BUFFER_METRICS, "dead_lettered", len(dead))
+
+        return written
+
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        """
+        Пишет отметки, пока не установлен признак остановки.
+
+        Args:
+            stop_event (asyncio.Event | None): Признак остановки.
+        """
+        stop_event = stop_event or asyncio.Event()
+        await self._buffer.create_group()
+
+        while not stop_event.is_set():
+            try:
+                messages: list[BufferedMessage] = await self.collect()
+
+                if messages:
+                    await self.flush(messages)
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Check-in flush iteration failed")
+                self._recover = True
+
+                try:
+                    await asyncio.wait_for(stop_event.wait(), CHECK_IN_FLUSH_IDLE_MS / 1000)
+                except TimeoutError:
+                    pass
+
+
+async def main() -> None:
+    """Запускает процесс записи до получения сигнала остановки процесса."""
+    engine: AsyncEngine = create_async_engine(str(app_settings.DATABASE_URL), pool_pre_ping=True)
+    redis_manager.initialize()
+    flusher: CheckInFlusher = CheckInFlusher(
+        async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession),
+        CheckInBuffer(redis_manager.client),
+        socket.gethostname(),
+    )
+    stop_event: asyncio.Event = asyncio.Event()
+
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(stop_signal, stop_event.set)
+
+    try:
+        await flusher.run(stop_event)
+    finally:
+        await redis_manager.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,138 @@
+"""Модуль общего для всех процессов воркера предохранителя внешних сервисов."""
+
+from redis import RedisError
+
+from .consts import (
+    CIRCUIT_BREAKER_METRICS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_FAILURE_WINDOW_SECONDS,
+    CIRCUIT_KEY_PREFIX,
+    CIRCUIT_OPEN_SECONDS,
+    CIRCUIT_PROBE_SECONDS,
+    CIRCUIT_TRIPPED_TTL_SECONDS,
+)
+from .metrics import increment_counter, set_gauge
+from .redis import get_redis
+
+
+class CircuitBreaker:
+    """
+    Предохранитель внешнего сервиса. Состояние хранится в Redis и общее для всех процессов воркера.
+
+    Notes:
+        - После failure_threshold ошибок подряд предохранитель размыкается на open_seconds: обращения к сервису
+          не выполняются.
+        - После этого к сервису допускается одна пробная задача. Успех замыкает предохранитель,
+          ошибка снова размыкает его.
+        - При недоступности Redis предохранитель считается замкнутым.
+
+    Attributes:
+        _name (str): Название сервиса.
+        _failure_threshold (int): Количество ошибок, после которого предохранитель размыкается.
+        _failure_window (int): Окно подсчета ошибок в секундах.
+        _open_seconds (int): Время, на которое предохранитель размыкается, в секундах.
+        _probe_seconds (int): Время, на которое пробная задача получает право обратиться к сервису, в секундах.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        failure_window: int = CIRCUIT_FAILURE_WINDOW_SECONDS,
+        open_seconds: int = CIRCUIT_OPEN_SECONDS,
+        probe_seconds: int = CIRCUIT_PROBE_SECONDS,
+    ) -> None:
+        """
+        Инициализация предохранителя.
+
+        Args:
+            name (str): Название сервиса.
+            failure_threshold (int): Количество ошибок, после которого предохранитель размыкается.
+            failure_window (int): Окно подсчета ошибок в секундах.
+            open_seconds (int): Время, на которое предохранитель размыкается, в секундах.
+            probe_seconds (int): Время, на которое пробная задача получает право обратиться к сервису, в секундах.
+        """
+        self._name: str = name
+        self._failure_threshold: int = failure_threshold
+        self._failure_window: int = failure_window
+        self._open_seconds: int = open_seconds
+        self._probe_seconds: int = probe_seconds
+
+    def retry_after(self) -> float:
+        """
+        Проверяет, можно ли обратиться к сервису.
+
+        Returns:
+            (float): 0, если можно. Иначе - через сколько секунд попробовать снова.
+
+        Examples:
+            >>> if wait := smtp_breaker.retry_after():
+            ...     raise self.retry(countdown=wait)
+        """
+        try:
+            redis = get_redis()
+
+            with redis.pipeline(transaction=False) as pipeline:
+                pipeline.pttl(self._key("open"))
+                pipeline.exists(self._key("tripped"))
+                open_ms, tripped = pipeline.execute()
+
+            if open_ms > 0:
+                return float(open_ms) / 1000
+
+            if tripped and not redis.set(self._key("probe"), "1", nx=True, ex=self._probe_seconds):
+                return float(self._open_seconds)
+        except RedisError:
+            pass
+
+        return 0.0
+
+    def record_success(self) -> None:
+        """Отмечает успешное обращение к сервису и замыкает предохранитель."""
+        try:
+            with get_redis().pipeline(transaction=False) as pipeline:
+                pipeline.delete(self._key("tripped"))
+                pipeline.delete(self._key("failures"), self._key("probe"))
+                closed, _ = pipeline.execute()
+        except RedisError:
+            return
+
+        if closed:
+            set_gauge(CIRCUIT_BREAKER_METRICS, f"{self._name}.tripped", 0)
+
+    def record_failure(self) -> None:
+        """Отмечает ошибку обращения к сервису. Размыкает предохранитель, если ошибок слишком много."""
+        try:
+            with get_redis().pipeline(transaction=False) as pipeline:
+                pipeline.exists(self._key("tripped"))
+                pipeline.incr(self._key("failures"))
+                pipeline.expire(self._key("failures"), self._failure_window)
+                tripped, failures, _ = pipeline.execute()
+
+            if tripped or failures >= self._failure_threshold:
+                self._trip()
+        except RedisError:
+            pass
+
+    def _trip(self) -> None:
+        """Размыкает предохранитель."""
+        with get_redis().pipeline(transaction=False) as pipeline:
+            pipeline.set(self._key("open"), "1", ex=self._open_seconds)
+            pipeline.set(self._key("tripped"), "1", ex=CIRCUIT_TRIPPED_TTL_SECONDS)
+            pipeline.delete(self._key("failures"), self._key("probe"))
+            pipeline.execute()
+
+        increment_counter(CIRCUIT_BREAKER_METRICS, f"{self._name}.trips")
+        set_gauge(CIRCUIT_BREAKER_METRICS, f"{self._name}.tripped", 1)
+
+    def _key(self, suffix: str) -> str:
+        """
+        Возвращает ключ Redis состояния предохранителя.
+
+        Args:
+            suffix (str): Часть состояния.
+
+        Returns:
+            (str): Ключ Redis.
+        """
+        return f"{CIRCUIT_KEY_PREFIX}:{self._name}:{suffix}"
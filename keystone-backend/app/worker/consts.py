@@ -0,0 +1,100 @@
+"""Модуль констант воркера."""
+
+# Префикс ключей Redis для защиты от повторного выполнения задач
+IDEMPOTENCY_KEY_PREFIX: str = "task_once"
+# Сколько секунд задача удерживает ключ во время выполнения
+IDEMPOTENCY_LOCK_SECONDS: int = 300
+# Сколько секунд помнить выполненные задачи
+IDEMPOTENCY_TTL_SECONDS: int = 7 * 24 * 60 * 60
+# Значения ключа выполнения задачи
+IDEMPOTENCY_RUNNING_VALUE: str = "running"
+IDEMPOTENCY_DONE_VALUE: str = "done"
+
+# Максимальное количество простаивающих SMTP-соединений в процессе воркера
+SMTP_POOL_SIZE: int = 4
+# Через сколько секунд простоя SMTP-соединение закрывается, а не переиспользуется
+SMTP_IDLE_TIMEOUT_SECONDS: float = 60.0
+# После скольких секунд простоя SMTP-соединение проверяется командой NOOP перед использованием
+SMTP_HEALTH_CHECK_AFTER_SECONDS: float = 5.0
+# Таймаут подключения к SMTP-серверу и авторизации в секундах
+SMTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+# Таймаут сетевых операций SMTP в секундах
+SMTP_TIMEOUT_SECONDS: float = 30.0
+
+# Количество повторов задачи отправки письма после ошибки почтового сервера
+MAIL_MAX_RETRIES: int = 8
+# Базовая задержка повтора в секундах (удваивается с каждым повтором, к ней добавляется случайный разброс)
+MAIL_RETRY_BACKOFF_SECONDS: int = 5
+# Максимальная задержка повтора в секундах
+MAIL_RETRY_BACKOFF_MAX_SECONDS: int = 600
+# Через сколько секунд выполнения задача отправки письма прерывается и уходит на повтор
+MAIL_SOFT_TIME_LIMIT_SECONDS: int = 120
+# Максимальный случайный разброс задержки отложенной задачи в секундах, чтобы задачи не возвращались разом
+MAIL_PARK_JITTER_SECONDS: float = 5.0
+# Группа метрик доставки писем
+MAIL_DELIVERY_METRICS: str = "mail_delivery"
+
+# Префикс ключей Redis предохранителей
+CIRCUIT_KEY_PREFIX: str = "circuit"
+# Количество ошибок подряд в пределах окна, после которого предохранитель размыкается
+CIRCUIT_FAILURE_THRESHOLD: int = 5
+# Окно подсчета ошибок в секундах
+CIRCUIT_FAILURE_WINDOW_SECONDS: int = 60
+# Сколько секунд предохранитель остается разомкнутым
+CIRCUIT_OPEN_SECONDS: int = 30
+# Сколько секунд пробная задача после размыкания удерживает право проверить сервер
+CIRCUIT_PROBE_SECONDS: int = 60
+# Сколько секунд помнить о размыкании, пока пробная отправка не завершится успешно
+CIRCUIT_TRIPPED_TTL_SECONDS: int = 24 * 60 * 60
+# Группа метрик предохранителей
+CIRCUIT_BREAKER_METRICS: str = "circuit_breaker"
+# Группа метрик задач воркера
+WORKER_TASK_METRICS: str = "worker_tasks"
+
+# Шаблон письма подтверждения регистрации
+CONFIRMATION_EMAIL_TEMPLATE: str = "confirm_email.html"
+# Шаблон письма восстановления доступа
+ACCESS_RESTORE_EMAIL_TEMPLATE: str = "access_restore_email.html"
+# Шаблон письма рассылки
+CAMPAIGN_EMAIL_TEMPLATE: str = "campaign_email.html"
+
+# Очередь писем, которые пользователь ждет прямо сейчас: подтверждение регистрации, восстановление доступа
+TRANSACTIONAL_MAIL_QUEUE: str = "mail.transactional"
+# Очередь массовых писем рассылок
+BULK_MAIL_QUEUE: str = "mail.bulk"
+# Очередь служебных задач: обслуживание таблиц, постановка рассылок в очередь
+MAINTENANCE_QUEUE: str = "maintenance"
+# Очередь расчетов статистики
+ANALYTICS_QUEUE: str = "analytics"
+# Через сколько секунд брокер возвращает в очередь полученную, но не подтвержденную задачу.
+# Должно быть больше самой долгой задачи и самой большой задержки повтора
+BROKER_VISIBILITY_TIMEOUT_SECONDS: int = 60 * 60
+# Максимальное количество писем, одновременно обрабатываемых асинхронным отправителем
+ASYNC_MAIL_MAX_IN_FLIGHT: int = 200
+# Максимальное количество одновременных SMTP-сессий с одним почтовым сервером
+ASYNC_MAIL_HOST_CONCURRENCY: int = 20
+# Задержка перед переподключением асинхронного отправителя к брокеру в секундах
+ASYNC_MAIL_RECONNECT_DELAY_SECONDS: float = 1.0
+# Поток Redis задач асинхронного отправителя, которые не удалось выполнить за все повторы
+ASYNC_MAIL_DEAD_LETTER_KEY: str = "mail:dead_letter"
+# Как часто поток чтения брокера проверяет подтверждения и признак остановки, в секундах
+ASYNC_MAIL_POLL_INTERVAL_SECONDS: float = 0.1
+
+# Ключ Redis общего ограничителя скорости писем рассылок
+CAMPAIGN_RATE_LIMIT_KEY: str = "rate_limit:campaign_mail"
+# Префикс идентификаторов задач отправки порций рассылки
+CAMPAIGN_CHUNK_TASK_ID_PREFIX: str = "campaign"
+# Префикс ключей Redis, не дающих двум процессам ставить письма одной рассылки в очередь одновременно
+CAMPAIGN_LOCK_KEY_PREFIX: str = "campaign_lock"
+# Сколько секунд процесс удерживает блокировку рассылки без продления
+CAMPAIGN_LOCK_SECONDS: int = 600
+
+# Как часто планировщик ищет группы часовых поясов, у которых закончился день, в минутах.
+# Смещения часовых поясов от UTC кратны 15 минутам
+DAY_CLOSE_TICK_MINUTES: int = 15
+# Группа метрик закрытия дня привычек
+DAY_CLOSE_METRICS: str = "habit_day_close"
+# Префикс ключей Redis, не дающих двум процессам закрывать день одной группы часовых поясов одновременно
+DAY_CLOSE_LOCK_KEY_PREFIX: str = "day_close_lock"
+# Сколько секунд процесс удерживает блокировку закрытия дня. Не меньше самого долгого закрытия
+DAY_CLOSE_LOCK_SECONDS: int = 60 * 60
@@ -0,0 +1,54 @@
+"""Модуль доступа к базе данных из задач воркера."""
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import AppSettings, get_app_settings
+
+app_settings: AppSettings = get_app_settings()
+
+# Тип результата обработчика
+HandlerResult = TypeVar("HandlerResult")
+
+
+def run_with_session(handler: Callable[[AsyncSession], Awaitable[HandlerResult]]) -> HandlerResult:
+    """
+    Выполняет асинхронный обработчик с сессией базы данных внутри синхронной задачи.
+
+    Notes:
+        - Каждый вызов работает в собственном цикле событий, поэтому соединения не переиспользуются (NullPool).
+        - После успешного выполнения обработчика транзакция фиксируется, при ошибке откатывается.
+
+    Args:
+        handler (Callable[[AsyncSession], Awaitable[HandlerResult]]): Обработчик, принимающий сессию.
+
+    Returns:
+        (HandlerResult): Результат обработчика.
+
+    Examples:
+        >>> async def count_users(session: AsyncSession) -> int:
+        ...     return await session.scalar(text("SELECT count(*) FROM users"))
+        >>>
+        >>> run_with_session(count_users)
+    """
+
+    async def _run() -> HandlerResult:
+        engine: AsyncEngine = create_async_engine(str(app_settings.DATABASE_URL), poolclass=NullPool)
+
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+                try:
+                    result: HandlerResult = await handler(session)
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+
+                return result
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run())
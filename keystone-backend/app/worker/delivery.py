@@ -0,0 +1,102 @@
+"""Модуль доставки писем из задач воркера."""
+
+import random
+from email.message import EmailMessage
+from smtplib import SMTPException, SMTPRecipientsRefused
+from typing import Any, NoReturn
+
+from celery import Task
+from celery.exceptions import Ignore, SoftTimeLimitExceeded
+
+from .circuit_breaker import CircuitBreaker
+from .consts import (
+    MAIL_DELIVERY_METRICS,
+    MAIL_MAX_RETRIES,
+    MAIL_PARK_JITTER_SECONDS,
+    MAIL_RETRY_BACKOFF_MAX_SECONDS,
+    MAIL_RETRY_BACKOFF_SECONDS,
+    MAIL_SOFT_TIME_LIMIT_SECONDS,
+)
+from .metrics import increment_counter
+from .smtp import smtp_pool
+
+# Ошибки почтового сервера, после которых отправку стоит повторить
+SMTP_ERRORS: tuple[type[Exception], ...] = (SMTPException, OSError, SoftTimeLimitExceeded)
+
+# Параметры задач отправки писем: повтор с экспоненциальной задержкой и случайным разбросом.
+# Отказ в приеме адреса не исправится повтором. Задачи защищены от повторного выполнения (run_once),
+# поэтому подтверждаются брокеру после выполнения и не теряются при падении процесса
+MAIL_TASK_OPTIONS: dict[str, Any] = {
+    "bind": True,
+    "acks_late": True,
+    "autoretry_for": SMTP_ERRORS,
+    "dont_autoretry_for": (SMTPRecipientsRefused,),
+    "retry_backoff": MAIL_RETRY_BACKOFF_SECONDS,
+    "retry_backoff_max": MAIL_RETRY_BACKOFF_MAX_SECONDS,
+    "retry_jitter": True,
+    "max_retries": MAIL_MAX_RETRIES,
+    "soft_time_limit": MAIL_SOFT_TIME_LIMIT_SECONDS,
+}
+
+# Предохранитель почтового сервера
+smtp_breaker: CircuitBreaker = CircuitBreaker("smtp")
+
+
+def park_task(task: Task, countdown: float, kwargs: dict[str, Any] | None = None) -> NoReturn:
+    """
+    Откладывает задачу без занятия процесса воркера: публикует ее заново с задержкой и тем же идентификатором
+    и завершает текущее выполнение. Счетчик повторов не увеличивается.
+
+    Args:
+        task (Task): Выполняемая задача.
+        countdown (float): Задержка в секундах. К ней добавляется случайный разброс.
+        kwargs (dict[str, Any] | None): Аргументы отложенной задачи. По умолчанию - текущие.
+
+    Raises:
+        Ignore: Всегда. Текущее выполнение не считается ни успешным, ни ошибочным.
+    """
+    # Номер повтора передается через публикацию по имени: apply_async не объявляет его в сигнатуре
+    task.app.send_task(
+        task.name,
+        args=task.request.args,
+        kwargs=dict(task.request.kwargs or {}) if kwargs is None else kwargs,
+        countdown=countdown + random.uniform(0, MAIL_PARK_JITTER_SECONDS),
+        task_id=task.request.id,
+        retries=task.request.retries,
+        ignore_result=True,
+    )
+    increment_counter(MAIL_DELIVERY_METRICS, f"{task.name}.parked")
+    raise Ignore()
+
+
+def deliver(task: Task, message: EmailMessage, kwargs: dict[str, Any] | None = None) -> None:
+    """
+    Отправляет письмо через пул SMTP-соединений. Если предохранитель почтового сервера разомкнут,
+    задача откладывается до его проверки.
+
+    Args:
+        task (Task): Выполняемая задача.
+        message (EmailMessage): Письмо.
+        kwargs (dict[str, Any] | None): Аргументы задачи, если ее придется отложить. По умолчанию - текущие.
+
+    Raises:
+        Ignore: Задача отложена.
+
+    Examples:
+        >>> @shared_task(**MAIL_TASK_OPTIONS)
+        ... def send_email(self, user_email: str) -> None:
+        ...     deliver(self, build_email(user_email))
+    """
+    if wait := smtp_breaker.retry_after():
+        park_task(task, wait, kwargs)
+
+    try:
+        smtp_pool.send_message(message)
+    except SMTPRecipientsRefused:
+        smtp_breaker.record_success()
+        raise
+    except SMTP_ERRORS:
+        smtp_breaker.record_failure()
+        raise
+
+    smtp_breaker.record_success()
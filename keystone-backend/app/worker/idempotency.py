@@ -0,0 +1,133 @@
+"""Модуль защиты задач воркера от повторного выполнения."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from redis.exceptions import RedisError
+
+from .consts import (
+    IDEMPOTENCY_DONE_VALUE,
+    IDEMPOTENCY_KEY_PREFIX,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_RUNNING_VALUE,
+    IDEMPOTENCY_TTL_SECONDS,
+)
+from .redis import get_redis
+
+
+def claim_task(task_id: str | None) -> bool:
+    """
+    Занимает идентификатор задачи перед выполнением.
+
+    Notes:
+        - Ключ удерживается ограниченное время, чтобы упавший процесс не заблокировал задачу навсегда.
+        - Если Redis недоступен, задача выполняется: повторная отправка лучше потерянной.
+
+    Args:
+        task_id (str | None): Идентификатор задачи Celery.
+
+    Returns:
+        (bool): True, если задачу нужно выполнить. False, если она уже выполнена или выполняется.
+    """
+    if not task_id:
+        return True
+
+    try:
+        return bool(get_redis().set(_get_key(task_id), IDEMPOTENCY_RUNNING_VALUE, nx=True, ex=IDEMPOTENCY_LOCK_SECONDS))
+    except RedisError:
+        return True
+
+
+def complete_task(task_id: str | None) -> None:
+    """
+    Запоминает задачу выполненной.
+
+    Args:
+        task_id (str | None): Идентификатор задачи Celery.
+    """
+    if not task_id:
+        return
+
+    try:
+        get_redis().set(_get_key(task_id), IDEMPOTENCY_DONE_VALUE, ex=IDEMPOTENCY_TTL_SECONDS)
+    except RedisError:
+        pass
+
+
+def extend_task(task_id: str | None) -> None:
+    """
+    Продлевает удержание идентификатора выполняющейся задачи. Долгие задачи вызывают его по ходу работы,
+    чтобы ключ не истек раньше, чем задача завершится.
+
+    Args:
+        task_id (str | None): Идентификатор задачи Celery.
+    """
+    if not task_id:
+        return
+
+    try:
+        get_redis().set(_get_key(task_id), IDEMPOTENCY_RUNNING_VALUE, xx=True, ex=IDEMPOTENCY_LOCK_SECONDS)
+    except RedisError:
+        pass
+
+
+def release_task(task_id: str | None) -> None:
+    """
+    Освобождает идентификатор задачи после ошибки, чтобы повторная попытка могла выполниться.
+
+    Args:
+        task_id (str | None): Идентификатор задачи Celery.
+    """
+    if not task_id:
+        return
+
+    try:
+        get_redis().delete(_get_key(task_id))
+    except RedisError:
+        pass
+
+
+@contextmanager
+def run_once(task_id: str | None) -> Iterator[bool]:
+    """
+    Выполняет блок не более одного раза для идентификатора задачи. Ретранслятор outbox публикует
+    сообщение с постоянным идентификатором задачи, поэтому повторная публикация после сбоя не приводит
+    к повторной отправке письма.
+
+    Args:
+        task_id (str | None): Идентификатор задачи Celery.
+
+    Yields:
+        (bool): True, если блок нужно выполнить. False, если задача уже выполнена или выполняется.
+
+    Examples:
+        >>> @shared_task(bind=True)
+        ... def send_email(self, user_email: str) -> None:
+        ...     with run_once(self.request.id) as should_run:
+        ...         if should_run:
+        ...             ...
+    """
+    if not claim_task(task_id):
+        yield False
+        return
+
+    try:
+        yield True
+    except BaseException:
+        release_task(task_id)
+        raise
+
+    complete_task(task_id)
+
+
+def _get_key(task_id: str) -> str:
+    """
+    Возвращает ключ Redis для идентификатора задачи.
+
+    Args:
+        task_id (str): Идентификатор задачи Celery.
+
+    Returns:
+        (str): Ключ Redis.
+    """
+    return f"{IDEMPOTENCY_KEY_PREFIX}:{task_id}"
@@ -0,0 +1,117 @@
+"""Модуль подготовки писем воркера."""
+
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any
+
+from celery.signals import worker_init
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.core.config import AppSettings, get_app_settings
+
+app_settings: AppSettings = get_app_settings()
+
+# Каталог шаблонов писем. Не зависит от рабочего каталога процесса
+TEMPLATES_DIR: Path = Path(__file__).parent / "templates"
+
+
+class MailRenderer:
+    """
+    Сборщик писем из шаблонов. Шаблоны компилируются один раз на процесс и хранятся в памяти.
+
+    Notes:
+        - Шаблоны не перечитываются с диска при изменении: для обновления нужен перезапуск воркера.
+        - С кешем байткода повторный запуск воркера не компилирует шаблоны заново, а загружает их с диска.
+
+    Attributes:
+        _environment (Environment): Окружение Jinja2.
+    """
+
+    def __init__(self, templates_dir: Path = TEMPLATES_DIR, bytecode_cache_dir: str | None = None) -> None:
+        """
+        Инициализация сборщика.
+
+        Args:
+            templates_dir (Path): Каталог шаблонов.
+            bytecode_cache_dir (str | None): Каталог кеша скомпилированных шаблонов. None - без кеша на диске.
+        """
+        bytecode_cache: BytecodeCache | None = None
+
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self._environment: Environment = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            cache_size=-1,
+        )
+
+    def precompile(self) -> list[str]:
+        """
+        Загружает и компилирует все шаблоны.
+
+        Returns:
+            (list[str]): Имена скомпилированных шаблонов.
+        """
+        names: list[str] = self._environment.list_templates()
+
+        for name in names:
+            self._environment.get_template(name)
+
+        return names
+
+    def render(self, template_name: str, **context: Any) -> str:
+        """
+        Формирует текст письма по шаблону.
+
+        Args:
+            template_name (str): Имя шаблона.
+            **context (Any): Переменные шаблона. Название приложения подставляется, если не передано.
+
+        Returns:
+            (str): HTML письма.
+        """
+        return self._environment.get_template(template_name).render({"app_name": app_settings.APP_NAME, **context})
+
+    def build_message(self, to: str, subject: str, template_name: str, **context: Any) -> EmailMessage:
+        """
+        Собирает HTML-письмо от имени почтового ящика приложения.
+
+        Args:
+            to (str): Email получателя.
+            subject (str): Тема письма.
+            template_name (str): Имя шаблона.
+            **context (Any): Переменные шаблона. Название приложения подставляется, если не передано.
+
+        Returns:
+            (EmailMessage): Письмо.
+
+        Examples:
+            >>> mail_renderer.build_message(
+            ...     "user@example.com",
+            ...     "Подтверждение регистрации",
+            ...     CONFIRMATION_EMAIL_TEMPLATE,
+            ...     confirm_url="https://example.com/confirm/...",
+            ...     user_full_name="Иванов Иван",
+            ... )
+        """
+        message: EmailMessage = EmailMessage()
+        message.add_alternative(self.render(template_name, **context), subtype="html")
+        message["From"] = app_settings.EMAIL_USERNAME
+        message["To"] = to
+        message["Subject"] = subject
+
+        return message
+
+
+# Сборщик писем процесса воркера
+mail_renderer: MailRenderer = MailRenderer(bytecode_cache_dir=app_settings.EMAIL_TEMPLATE_CACHE_DIR)
+
+
+@worker_init.connect
+def _precompile_templates(**_: Any) -> None:
+    """Компилирует шаблоны в главном процессе воркера до запуска дочерних процессов, которые их унаследуют."""
+    mail_renderer.precompile()
@@ -0,0 +1,65 @@
+"""Модуль счетчиков метрик процессов воркера."""
+
+from typing import Any
+
+from celery import Task
+from celery.signals import task_failure, task_retry
+from redis import RedisError
+
+from app.core.consts import METRICS_KEY_PREFIX
+
+from .consts import WORKER_TASK_METRICS
+from .redis import get_redis
+
+
+def increment_counter(group: str, name: str, amount: int = 1) -> None:
+    """
+    Увеличивает счетчик метрики. Счетчики общие с приложением и возвращаются страницей /metrics.
+
+    Notes:
+        - Ошибки Redis не прерывают задачу: метрика в этом случае теряется.
+
+    Args:
+        group (str): Группа метрик.
+        name (str): Название счетчика.
+        amount (int): Величина увеличения.
+
+    Examples:
+        >>> increment_counter("mail_delivery", "app.worker.tasks.confirmation_send.send_confirmation_email.parked")
+    """
+    try:
+        get_redis().hincrby(f"{METRICS_KEY_PREFIX}:{group}", name, amount)
+    except RedisError:
+        pass
+
+
+def set_gauge(group: str, name: str, value: int) -> None:
+    """
+    Устанавливает значение метрики-состояния.
+
+    Args:
+        group (str): Группа метрик.
+        name (str): Название метрики.
+        value (int): Значение.
+
+    Examples:
+        >>> set_gauge("circuit_breaker", "smtp.tripped", 1)
+    """
+    try:
+        get_redis().hset(f"{METRICS_KEY_PREFIX}:{group}", name, value)
+    except RedisError:
+        pass
+
+
+@task_retry.connect
+def _count_retry(sender: Task | None = None, **_: Any) -> None:
+    """Считает повторы задач по имени задачи."""
+    if sender is not None:
+        increment_counter(WORKER_TASK_METRICS, f"{sender.name}.retried")
+
+
+@task_failure.connect
+def _count_failure(sender: Task | None = None, **_: Any) -> None:
+    """Считает задачи, завершившиеся ошибкой после всех повторов."""
+    if sender is not None:
+        increment_counter(WORKER_TASK_METRICS, f"{sender.name}.failed")
@@ -0,0 +1,197 @@
+"""
+Модуль ретранслятора исходящих сообщений (transactional outbox) в брокер задач.
+
+Запуск:
+    python -m app.worker.outbox_relay
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any, Callable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import AppSettings, get_app_settings
+from app.core.metrics import LatencyStats, increment_counter, set_gauges
+from app.core.redis import redis_manager
+from app.outbox import OutboxMessageModel, OutboxRepository
+from app.outbox.consts import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_POLL_INTERVAL_SECONDS,
+    OUTBOX_PURGE_INTERVAL_SECONDS,
+    OUTBOX_RELAY_METRICS,
+    OUTBOX_RETENTION_HOURS,
+    OUTBOX_TASK_ID_PREFIX,
+)
+
+from .publisher import publish_named_batch
+
+logger = logging.getLogger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+# Функция публикации пакета задач по имени
+NamedPublisher = Callable[[Sequence[tuple[str, dict[str, Any], str]]], None]
+
+
+def get_outbox_task_id(message_id: int) -> str:
+    """
+    Возвращает идентификатор задачи Celery для исходящего сообщения. Идентификатор постоянный,
+    поэтому повторная публикация сообщения распознается воркером.
+
+    Args:
+        message_id (int): ID исходящего сообщения.
+
+    Returns:
+        (str): Идентификатор задачи.
+
+    Examples:
+        >>> get_outbox_task_id(42)
+        >>> # "outbox-42"
+    """
+    return f"{OUTBOX_TASK_ID_PREFIX}-{message_id}"
+
+
+class OutboxRelay:
+    """
+    Ретранслятор исходящих сообщений. Забирает неопубликованные сообщения пакетами
+    с блокировкой FOR UPDATE SKIP LOCKED, публикует их в брокер одним соединением и отмечает опубликованными
+    в той же транзакции.
+
+    Notes:
+        - Несколько ретрансляторов могут работать параллельно: заблокированные строки пропускаются.
+        - Если процесс упадет между публикацией и фиксацией, пакет будет опубликован повторно
+          с теми же идентификаторами задач, и воркер не выполнит их второй раз.
+        - После каждого пакета в метрики группы outbox_relay записываются количество опубликованных
+          сообщений и задержка от добавления сообщения в outbox (created_at) до публикации.
+
+    Attributes:
+        _session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+        _publisher (NamedPublisher): Функция публикации пакета задач.
+        _batch_size (int): Максимальное количество сообщений в пакете.
+        _latency (LatencyStats): Задержки от добавления сообщений до публикации.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        publisher: NamedPublisher = publish_named_batch,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+    ) -> None:
+        """
+        Инициализация ретранслятора.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Фабрика сессий базы данных.
+            publisher (NamedPublisher): Функция публикации пакета задач.
+            batch_size (int): Максимальное количество сообщений в пакете.
+        """
+        self._session_factory: async_sessionmaker[AsyncSession] = session_factory
+        self._publisher: NamedPublisher = publisher
+        self._batch_size: int = batch_size
+        self._latency: LatencyStats = LatencyStats()
+
+    async def relay_batch(self) -> int:
+        """
+        Публикует один пакет неопубликованных сообщений.
+
+        Returns:
+            (int): Количество опубликованных сообщений.
+        """
+        async with self._session_factory() as session:
+            repository: OutboxRepository = OutboxRepository(session)
+            messages: Sequence[OutboxMessageModel] = await repository.claim_batch(self._batch_size)
+
+            if not messages:
+                await session.rollback()
+                return 0
+
+            await asyncio.to_thread(
+                self._publisher,
+                [(message.task_name, message.payload, get_outbox_task_id(message.id)) for message in messages],
+            )
+            published_at: datetime = datetime.now(UTC)
+            latencies: list[float] = [(published_at - message.created_at).total_seconds() for message in messages]
+            await repository.mark_published([message.id for message in messages], published_at)
+            await session.commit()
+
+        for latency in latencies:
+            self._latency.observe(latency)
+
+        await increment_counter(OUTBOX_RELAY_METRICS, "published", len(messages))
+        await set_gauges(
+            OUTBOX_RELAY_METRICS, {f"latency_{name}": value for name, value in self._latency.snapshot().items()}
+        )
+
+        return len(messages)
+
+    async def purge(self, now: datetime | None = None) -> int:
+        """
+        Удаляет опубликованные сообщения старше срока хранения.
+
+        Args:
+            now (datetime | None): Текущее время. По умолчанию текущее время UTC.
+
+        Returns:
+            (int): Количество удаленных сообщений.
+        """
+        before: datetime = (now or datetime.now(UTC)) - timedelta(hours=OUTBOX_RETENTION_HOURS)
+
+        async with self._session_factory() as session:
+            deleted: int = await OutboxRepository(session).purge_published(before)
+            await session.commit()
+
+        return deleted
+
+    async def run(self, stop_event: asyncio.Event | None = None) -> None:
+        """
+        Публикует сообщения, пока не установлен признак остановки. Когда сообщений меньше размера пакета,
+        ретранслятор ждет следующего опроса, иначе сразу забирает следующий пакет.
+
+        Args:
+            stop_event (asyncio.Event | None): Признак остановки.
+        """
+        stop_event = stop_event or asyncio.Event()
+        purged_at: float = 0.0
+
+        while not stop_event.is_set():
+            try:
+                published: int = await self.relay_batch()
+
+                if time.monotonic() - purged_at >= OUTBOX_PURGE_INTERVAL_SECONDS:
+                    logger.info("Purged %s published outbox messages", await self.purge())
+                    purged_at = time.monotonic()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Outbox relay iteration failed")
+                published = 0
+
+            if published < self._batch_size:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), OUTBOX_POLL_INTERVAL_SECONDS)
+                except TimeoutError:
+                    pass
+
+
+async def main() -> None:
+    """Запускает ретранслятор до получения сигнала остановки процесса."""
+    engine: AsyncEngine = create_async_engine(str(app_settings.DATABASE_URL), pool_pre_ping=True)
+    redis_manager.initialize()
+    relay: OutboxRelay = OutboxRelay(async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession))
+    stop_event: asyncio.Event = asyncio.Event()
+
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(stop_signal, stop_event.set)
+
+    try:
+        await relay.run(stop_event)
+    finally:
+        await redis_manager.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Модуль профилей процессов воркера. Каждая очередь обслуживается отдельным воркером со своими
+параллельностью и предвыборкой, поэтому письмо подтверждения не ждет за рассылкой или расчетом статистики.
+
+Запуск:
+    python -m app.worker.profiles mail.transactional
+"""
+
+import argparse
+from typing import NamedTuple
+
+from .celery_app import celery_app
+from .consts import ANALYTICS_QUEUE, BULK_MAIL_QUEUE, MAINTENANCE_QUEUE, TRANSACTIONAL_MAIL_QUEUE
+
+
+class WorkerProfile(NamedTuple):
+    """
+    Параметры воркера очереди.
+
+    Attributes:
+        concurrency (int): Количество процессов.
+        prefetch_multiplier (int): Сколько задач каждый процесс получает от брокера заранее.
+    """
+
+    concurrency: int
+    prefetch_multiplier: int
+
+
+# Профили воркеров по очередям.
+# Транзакционные письма короткие: небольшая предвыборка экономит обращения к брокеру.
+# Рассылки ограничены общей скоростью, служебные задачи и статистика долгие: задачи берутся по одной
+WORKER_PROFILES: dict[str, WorkerProfile] = {
+    TRANSACTIONAL_MAIL_QUEUE: WorkerProfile(concurrency=8, prefetch_multiplier=4),
+    BULK_MAIL_QUEUE: WorkerProfile(concurrency=4, prefetch_multiplier=1),
+    MAINTENANCE_QUEUE: WorkerProfile(concurrency=2, prefetch_multiplier=1),
+    ANALYTICS_QUEUE: WorkerProfile(concurrency=1, prefetch_multiplier=1),
+}
+
+
+def get_worker_argv(queue: str) -> list[str]:
+    """
+    Возвращает аргументы запуска воркера Celery для очереди.
+
+    Args:
+        queue (str): Имя очереди.
+
+    Returns:
+        (list[str]): Аргументы командной строки Celery.
+
+    Examples:
+        >>> get_worker_argv("mail.bulk")
+        >>> # ["worker", "--queues", "mail.bulk", "--hostname", "mail.bulk@%h", "--concurrency", "4", ...]
+    """
+    profile: WorkerProfile = WORKER_PROFILES[queue]
+
+    return [
+        "worker",
+        "--queues",
+        queue,
+        "--hostname",
+        f"{queue}@%h",
+        "--concurrency",
+        str(profile.concurrency),
+        "--prefetch-multiplier",
+        str(profile.prefetch_multiplier),
+        "-O",
+        "fair",
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queue", choices=list(WORKER_PROFILES), help="Очередь, которую обслуживает воркер")
+    args = parser.parse_args()
+
+    celery_app.worker_main(get_worker_argv(args.queue))
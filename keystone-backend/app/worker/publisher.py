@@ -0,0 +1,26 @@
+"""Модуль публикации задач в брокер."""
+
+from typing import Any, Sequence
+
+from .celery_app import celery_app
+
+
+def publish_named_batch(messages: Sequence[tuple[str, dict[str, Any], str]]) -> None:
+    """
+    Публикует пакет задач по имени с заданными идентификаторами через одно соединение.
+
+    Notes:
+        - Соединение с брокером берется из пула один раз на пакет, а не на каждую задачу, как при delay().
+        - Результаты задач не ожидаются, поэтому подписка на результат в бэкенде не выполняется.
+        - Функция блокирующая: из асинхронного кода ее нужно вызывать в отдельном потоке.
+
+    Args:
+        messages (Sequence[tuple[str, dict[str, Any], str]]): Имена задач, их именованные аргументы
+            и идентификаторы задач.
+
+    Examples:
+        >>> publish_named_batch([("app.worker.tasks.confirmation_send.send_confirmation_email", kwargs, "outbox-1")])
+    """
+    with celery_app.producer_or_acquire() as producer:
+        for task_name, kwargs, task_id in messages:
+            celery_app.send_task(task_name, kwargs=kwargs, task_id=task_id, producer=producer, ignore_result=True)
@@ -0,0 +1,82 @@
+"""Модуль общего для всех процессов воркера ограничителя скорости."""
+
+import time
+
+from redis import RedisError
+from redis.commands.core import Script
+
+from .redis import get_redis
+
+# Корзина токенов в Redis. Время берется у Redis, поэтому часы процессов воркера не влияют на результат.
+# Токен списывается сразу, даже если корзина пуста: вызывающий получает время ожидания своей очереди
+_ACQUIRE_SCRIPT: str = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class RateLimiter:
+    """
+    Ограничитель скорости по алгоритму корзины токенов, общий для всех процессов воркера.
+
+    Notes:
+        - При недоступности Redis ограничение не применяется: задержка писем хуже их потери.
+
+    Attributes:
+        _key (str): Ключ Redis корзины.
+        _rate (float): Количество токенов в секунду.
+        _burst (int): Емкость корзины.
+        _script (Script | None): Зарегистрированный скрипт Redis. Создается при первом вызове.
+    """
+
+    def __init__(self, key: str, rate: float, burst: int | None = None) -> None:
+        """
+        Инициализация ограничителя.
+
+        Args:
+            key (str): Ключ Redis корзины.
+            rate (float): Количество токенов в секунду.
+            burst (int | None): Емкость корзины. По умолчанию - количество токенов за секунду.
+        """
+        self._key: str = key
+        self._rate: float = rate
+        self._burst: int = burst or max(1, int(rate))
+        self._script: Script | None = None
+
+    def acquire(self) -> float:
+        """
+        Получает токен, при необходимости дожидаясь своей очереди.
+
+        Returns:
+            (float): Время ожидания в секундах.
+
+        Examples:
+            >>> limiter = RateLimiter("rate_limit:mail", rate=10)
+            >>> for message in messages:
+            ...     limiter.acquire()
+            ...     smtp_pool.send_message(message)
+        """
+        try:
+            if self._script is None:
+                self._script = get_redis().register_script(_ACQUIRE_SCRIPT)
+
+            wait: float = float(self._script(keys=[self._key], args=[self._rate, self._burst]))
+        except RedisError:
+            return 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return wait
@@ -0,0 +1,20 @@
+"""Модуль подключения к Redis из задач воркера."""
+
+from functools import lru_cache
+
+from redis import Redis
+
+from app.core.config import AppSettings, get_app_settings
+
+app_settings: AppSettings = get_app_settings()
+
+
+@lru_cache
+def get_redis() -> Redis:
+    """
+    Возвращает синхронный клиент Redis процесса воркера. Клиент создается при первом вызове.
+
+    Returns:
+        (Redis): Клиент Redis.
+    """
+    return Redis.from_url(app_settings.redis_url, decode_responses=True)
@@ -0,0 +1,252 @@
+"""Модуль пула SMTP-соединений процесса воркера."""
+
+import smtplib
+import time
+from email.message import EmailMessage
+from queue import Empty, Full, LifoQueue
+from typing import Any, Callable, NamedTuple
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from app.core.config import AppSettings, get_app_settings
+
+from .consts import (
+    SMTP_CONNECT_TIMEOUT_SECONDS,
+    SMTP_HEALTH_CHECK_AFTER_SECONDS,
+    SMTP_IDLE_TIMEOUT_SECONDS,
+    SMTP_POOL_SIZE,
+    SMTP_TIMEOUT_SECONDS,
+)
+
+app_settings: AppSettings = get_app_settings()
+
+# Функция открытия авторизованного SMTP-соединения
+SMTPFactory = Callable[[], smtplib.SMTP]
+
+
+def create_smtp_connection() -> smtplib.SMTP:
+    """
+    Открывает SMTP-соединение с почтовым сервером из настроек и авторизуется. Подключение и авторизация
+    ограничены коротким таймаутом, остальные команды - таймаутом сетевых операций.
+
+    Returns:
+        (smtplib.SMTP): Авторизованное соединение.
+    """
+    smtp: smtplib.SMTP = smtplib.SMTP_SSL(
+        host=app_settings.EMAIL_HOST, port=app_settings.EMAIL_PORT, timeout=SMTP_CONNECT_TIMEOUT_SECONDS
+    )
+
+    try:
+        smtp.login(app_settings.EMAIL_USERNAME, app_settings.EMAIL_PASSWORD)
+
+        if smtp.sock is not None:
+            smtp.sock.settimeout(SMTP_TIMEOUT_SECONDS)
+    except BaseException:
+        smtp.close()
+        raise
+
+    return smtp
+
+
+class IdleConnection(NamedTuple):
+    """
+    Простаивающее SMTP-соединение.
+
+    Attributes:
+        smtp (smtplib.SMTP): Соединение.
+        released_at (float): Момент возврата в пул (time.monotonic).
+    """
+
+    smtp: smtplib.SMTP
+    released_at: float
+
+
+class SMTPConnectionPool:
+    """
+    Пул авторизованных SMTP-соединений. Соединения переиспользуются между задачами, поэтому TLS-рукопожатие
+    и авторизация выполняются один раз на соединение, а не на каждое письмо.
+
+    Notes:
+        - Соединение, простоявшее дольше idle_timeout, закрывается: серверы сами рвут долго простаивающие сессии.
+        - Соединение, простоявшее дольше health_check_after, проверяется командой NOOP перед выдачей.
+        - Соединение, на котором произошла ошибка, закрывается и не возвращается в пул.
+        - Пул принадлежит процессу: после fork его нужно сбросить (см. обработчики сигналов Celery ниже).
+
+    Attributes:
+        _factory (SMTPFactory): Функция открытия соединения.
+        _idle_timeout (float): Максимальное время простоя соединения в секундах.
+        _health_check_after (float): Время простоя, после которого соединение проверяется NOOP.
+        _idle (LifoQueue[IdleConnection]): Простаивающие соединения. Последнее возвращенное выдается первым.
+    """
+
+    def __init__(
+        self,
+        factory: SMTPFactory = create_smtp_connection,
+        max_size: int = SMTP_POOL_SIZE,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS,
+        health_check_after: float = SMTP_HEALTH_CHECK_AFTER_SECONDS,
+    ) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            factory (SMTPFactory): Функция открытия соединения.
+            max_size (int): Максимальное количество простаивающих соединений.
+            idle_timeout (float): Максимальное время простоя соединения в секундах.
+            health_check_after (float): Время простоя, после которого соединение проверяется NOOP.
+        """
+        self._factory: SMTPFactory = factory
+        self._idle_timeout: float = idle_timeout
+        self._health_check_after: float = health_check_after
+        self._idle: LifoQueue[IdleConnection] = LifoQueue(maxsize=max_size)
+
+    def send_message(self, message: EmailMessage) -> None:
+        """
+        Отправляет письмо через соединение из пула. Если переиспользованное соединение оказалось
+        разорванным сервером, письмо отправляется повторно через новое соединение.
+
+        Args:
+            message (EmailMessage): Письмо.
+
+        Examples:
+            >>> smtp_pool.send_message(message)
+        """
+        smtp, reused = self._acquire()
+
+        try:
+            smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self._discard(smtp)
+
+            if not reused:
+                raise
+
+            smtp = self._factory()
+
+            try:
+                smtp.send_message(message)
+            except BaseException:
+                self._discard(smtp)
+                raise
+        except BaseException:
+            self._discard(smtp)
+            raise
+
+        self._release(smtp)
+
+    def close(self) -> None:
+        """Закрывает все простаивающие соединения."""
+        while True:
+            try:
+                self._quit(self._idle.get_nowait().smtp)
+            except Empty:
+                return
+
+    def reset(self) -> None:
+        """
+        Забывает простаивающие соединения без обмена с сервером. Используется в дочернем процессе после fork,
+        где унаследованные сокеты принадлежат родителю.
+        """
+        while True:
+            try:
+                self._idle.get_nowait()
+            except Empty:
+                return
+
+    def _acquire(self) -> tuple[smtplib.SMTP, bool]:
+        """
+        Выдает рабочее соединение: простаивающее из пула или новое.
+
+        Returns:
+            (tuple[smtplib.SMTP, bool]): Соединение и признак того, что оно взято из пула.
+        """
+        while True:
+            try:
+                idle: IdleConnection = self._idle.get_nowait()
+            except Empty:
+                return self._factory(), False
+
+            idle_for: float = time.monotonic() - idle.released_at
+
+            if idle_for >= self._idle_timeout:
+                self._quit(idle.smtp)
+                continue
+
+            if idle_for >= self._health_check_after and not self._is_alive(idle.smtp):
+                self._discard(idle.smtp)
+                continue
+
+            return idle.smtp, True
+
+    def _release(self, smtp: smtplib.SMTP) -> None:
+        """
+        Возвращает соединение в пул. Если пул заполнен, соединение закрывается.
+
+        Args:
+            smtp (smtplib.SMTP): Соединение.
+        """
+        try:
+            self._idle.put_nowait(IdleConnection(smtp, time.monotonic()))
+        except Full:
+            self._quit(smtp)
+
+    @staticmethod
+    def _is_alive(smtp: smtplib.SMTP) -> bool:
+        """
+        Проверяет соединение командой NOOP.
+
+        Args:
+            smtp (smtplib.SMTP): Соединение.
+
+        Returns:
+            (bool): True, если сервер ответил 250.
+        """
+        try:
+            code, _ = smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+
+        return code == 250
+
+    @staticmethod
+    def _quit(smtp: smtplib.SMTP) -> None:
+        """
+        Корректно завершает сессию. Ошибки игнорируются, соединение в любом случае закрывается.
+
+        Args:
+            smtp (smtplib.SMTP): Соединение.
+        """
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP) -> None:
+        """
+        Закрывает сокет соединения без обмена с сервером.
+
+        Args:
+            smtp (smtplib.SMTP): Соединение.
+        """
+        try:
+            smtp.close()
+        except OSError:
+            pass
+
+
+# Пул SMTP-соединений процесса воркера
+smtp_pool: SMTPConnectionPool = SMTPConnectionPool()
+
+
+@worker_process_init.connect
+def _reset_smtp_pool(**_: Any) -> None:
+    """Сбрасывает унаследованный от родителя пул в дочернем процессе воркера."""
+    smtp_pool.reset()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_smtp_pool(**_: Any) -> None:
+    """Закрывает соединения пула при остановке процесса воркера."""
+    smtp_pool.close()
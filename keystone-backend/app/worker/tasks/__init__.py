@@ -1,2 +1,8 @@
 from .access_restore_send import send_access_restore_email
+from .campaigns import resume_campaigns, run_campaign, send_campaign_chunk
 from .confirmation_send import send_confirmation_email
+from .habit_archive import archive_habits
+from .habit_day_close import close_habit_day, schedule_day_close
+from .habit_rollups import rebuild_completion_rollups
+from .habit_stats import rebuild_habit_stats
+from .token_partitions import maintain_token_partitions
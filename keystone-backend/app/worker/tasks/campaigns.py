@@ -0,0 +1,210 @@
+from datetime import UTC, datetime
+from email.message import EmailMessage
+from smtplib import SMTPRecipientsRefused
+
+from celery import Task, shared_task
+from celery.utils.log import get_task_logger
+from celery.utils.time import get_exponential_backoff_interval
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import AppSettings, get_app_settings
+from app.worker.celery_app import celery_app
+from app.worker.consts import (
+    CAMPAIGN_CHUNK_TASK_ID_PREFIX,
+    CAMPAIGN_EMAIL_TEMPLATE,
+    CAMPAIGN_LOCK_KEY_PREFIX,
+    CAMPAIGN_LOCK_SECONDS,
+    CAMPAIGN_RATE_LIMIT_KEY,
+    MAIL_MAX_RETRIES,
+    MAIL_RETRY_BACKOFF_MAX_SECONDS,
+    MAIL_RETRY_BACKOFF_SECONDS,
+)
+from app.worker.database import run_with_session
+from app.worker.delivery import SMTP_ERRORS, deliver
+from app.worker.idempotency import extend_task, run_once
+from app.worker.mail import mail_renderer
+from app.worker.rate_limit import RateLimiter
+from app.worker.redis import get_redis
+
+logger = get_task_logger(__name__)
+
+app_settings: AppSettings = get_app_settings()
+
+campaign_rate_limiter: RateLimiter = RateLimiter(CAMPAIGN_RATE_LIMIT_KEY, app_settings.EMAIL_CAMPAIGN_RATE_PER_SECOND)
+
+
+def get_chunk_task_id(campaign_id: int, first_user_id: int) -> str:
+    """
+    Возвращает идентификатор задачи отправки порции рассылки. Порции после точки продолжения
+    формируются заново с теми же границами, поэтому повторная постановка после сбоя не отправит письма дважды.
+
+    Args:
+        campaign_id (int): ID рассылки.
+        first_user_id (int): ID первого получателя порции.
+
+    Returns:
+        (str): Идентификатор задачи.
+
+    Examples:
+        >>> get_chunk_task_id(3, 1001)
+        >>> # "campaign-3-1001"
+    """
+    return f"{CAMPAIGN_CHUNK_TASK_ID_PREFIX}-{campaign_id}-{first_user_id}"
+
+
+def build_campaign_email(subject: str, body: str, user_full_name: str, user_email: str) -> EmailMessage:
+    """
+    Собирает письмо рассылки получателю.
+
+    Args:
+        subject (str): Тема письма.
+        body (str): Текст рассылки.
+        user_full_name (str): Полное имя получателя.
+        user_email (str): Email получателя.
+
+    Returns:
+        (EmailMessage): Письмо.
+    """
+    return mail_renderer.build_message(
+        user_email, subject, CAMPAIGN_EMAIL_TEMPLATE, title=subject, body=body, user_full_name=user_full_name
+    )
+
+
+@shared_task(acks_late=True)
+def run_campaign(campaign_id: int) -> int:
+    """
+    Ставит в очередь письма рассылки порциями. Получатели читаются серверным курсором, поэтому память
+    не зависит от количества пользователей. После каждой порции сохраняется точка продолжения,
+    и перезапущенная задача начинает с нее.
+
+    Args:
+        campaign_id (int): ID рассылки.
+
+    Returns:
+        (int): Количество писем, поставленных в очередь этим запуском.
+    """
+    # Пакет рассылок импортирует задачи воркера, поэтому загружается при вызове задачи
+    from app.campaigns.consts import CAMPAIGN_CHUNK_SIZE, CampaignStatus
+    from app.campaigns.repository import CampaignRepository
+
+    redis = get_redis()
+    lock_key: str = f"{CAMPAIGN_LOCK_KEY_PREFIX}:{campaign_id}"
+
+    if not redis.set(lock_key, "1", nx=True, ex=CAMPAIGN_LOCK_SECONDS):
+        logger.info("Campaign %s is already being enqueued", campaign_id)
+        return 0
+
+    async def _enqueue(session: AsyncSession) -> int:
+        campaign = await CampaignRepository(session).get(campaign_id)
+
+        if campaign.status == CampaignStatus.COMPLETED:
+            return 0
+
+        enqueued: int = 0
+
+        # Чтение курсором держит транзакцию открытой, поэтому точки продолжения фиксируются в отдельной сессии
+        async with AsyncSession(session.bind, expire_on_commit=False) as checkpoint_session:
+            checkpoints: CampaignRepository = CampaignRepository(checkpoint_session)
+
+            with celery_app.producer_or_acquire() as producer:
+                async for chunk in CampaignRepository(session).iter_recipients(
+                    campaign.last_user_id, CAMPAIGN_CHUNK_SIZE
+                ):
+                    send_campaign_chunk.apply_async(
+                        kwargs={"campaign_id": campaign_id, "recipients": [item.model_dump() for item in chunk]},
+                        task_id=get_chunk_task_id(campaign_id, chunk[0].user_id),
+                        producer=producer,
+                        ignore_result=True,
+                    )
+                    await checkpoints.save_checkpoint(campaign_id, chunk[-1].user_id, len(chunk))
+                    await checkpoint_session.commit()
+                    redis.expire(lock_key, CAMPAIGN_LOCK_SECONDS)
+                    enqueued += len(chunk)
+
+            await checkpoints.finish(campaign_id, datetime.now(UTC))
+            await checkpoint_session.commit()
+
+        return enqueued
+
+    try:
+        enqueued: int = run_with_session(_enqueue)
+    finally:
+        redis.delete(lock_key)
+
+    logger.info("Campaign %s: enqueued %s emails", campaign_id, enqueued)
+    return enqueued
+
+
+@shared_task(bind=True, acks_late=True, max_retries=MAIL_MAX_RETRIES)
+def send_campaign_chunk(self: Task, campaign_id: int, recipients: list[dict]) -> int:
+    """
+    Отправляет письма порции рассылки с общим для всех воркеров ограничением скорости.
+    При ошибке почтового сервера задача повторяется с экспоненциальной задержкой, а при разомкнутом
+    предохранителе откладывается - в обоих случаях только для неотправленных получателей.
+    Отправка порции ждет общий ограничитель скорости, поэтому защита от повторного выполнения
+    продлевается после каждого письма.
+
+    Args:
+        campaign_id (int): ID рассылки.
+        recipients (list[dict]): Получатели порции.
+
+    Returns:
+        (int): Количество отправленных писем.
+    """
+    from app.campaigns.repository import CampaignRepository
+
+    with run_once(self.request.id) as should_send:
+        if not should_send:
+            return 0
+
+        campaign = run_with_session(lambda session: CampaignRepository(session).get(campaign_id))
+        processed: int = 0
+        sent: int = 0
+
+        try:
+            for recipient in recipients:
+                message: EmailMessage = build_campaign_email(
+                    campaign.subject, campaign.body, recipient["full_name"], recipient["email"]
+                )
+                campaign_rate_limiter.acquire()
+
+                try:
+                    deliver(self, message, {"campaign_id": campaign_id, "recipients": recipients[processed:]})
+                    sent += 1
+                except SMTPRecipientsRefused:
+                    logger.warning("Campaign %s: recipient %s refused", campaign_id, recipient["user_id"])
+
+                processed += 1
+                extend_task(self.request.id)
+        except SMTP_ERRORS as error:
+            raise self.retry(
+                exc=error,
+                kwargs={"campaign_id": campaign_id, "recipients": recipients[processed:]},
+                countdown=get_exponential_backoff_interval(
+                    MAIL_RETRY_BACKOFF_SECONDS, self.request.retries, MAIL_RETRY_BACKOFF_MAX_SECONDS, full_jitter=True
+                ),
+            )
+        finally:
+            if sent:
+                run_with_session(lambda session: CampaignRepository(session).add_sent(campaign_id, sent))
+
+        return sent
+
+
+@shared_task
+def resume_campaigns() -> int:
+    """
+    Перезапускает постановку в очередь незавершенных рассылок, например после остановки воркера.
+    Рассылки, которые уже ставятся в очередь, пропускаются по блокировке.
+
+    Returns:
+        (int): Количество перезапущенных рассылок.
+    """
+    from app.campaigns.repository import CampaignRepository
+
+    campaign_ids = run_with_session(lambda session: CampaignRepository(session).get_unfinished_ids())
+
+    for campaign_id in campaign_ids:
+        run_campaign.apply_async(kwargs={"campaign_id": campaign_id}, ignore_result=True)
+
+    return len(campaign_ids)
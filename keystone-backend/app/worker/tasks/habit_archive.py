@@ -0,0 +1,42 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.worker.database import run_with_session
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True)
+def archive_habits() -> int:
+    """
+    Переносит в архив давно архивированные привычки и старые отметки пакетами привычек, пакет - одна
+    транзакция. Прерванный запуск не нужно продолжать: следующий перенесет то, что осталось.
+
+    Returns:
+        (int): Количество перенесенных привычек и отметок.
+    """
+    # Пакет привычек загружается при вызове задачи: модели регистрирует воркер при запуске (см. celery_app)
+    from app.habits.archive import HabitArchiveService
+    from app.habits.consts import ARCHIVE_BATCH_SIZE
+    from app.habits.repository import HabitRepository
+
+    async def _archive(session: AsyncSession) -> tuple[int, int]:
+        service: HabitArchiveService = HabitArchiveService(session)
+        repository: HabitRepository = HabitRepository(session)
+        habits: int = 0
+        completions: int = 0
+        after_id: int = 0
+
+        while batch := await repository.get_ids_after(after_id, ARCHIVE_BATCH_SIZE):
+            batch_habits, batch_completions = await service.archive_batch(batch)
+            habits += batch_habits
+            completions += batch_completions
+            after_id = batch[-1]
+
+        return habits, completions
+
+    habits, completions = run_with_session(_archive)
+    logger.info("Archived %s habits and %s completions", habits, completions)
+
+    return habits + completions
@@ -0,0 +1,99 @@
+import time
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from app.core.utils import get_timezones
+from app.worker.consts import DAY_CLOSE_LOCK_KEY_PREFIX, DAY_CLOSE_LOCK_SECONDS, DAY_CLOSE_METRICS
+from app.worker.database import run_with_session
+from app.worker.metrics import increment_counter, set_gauge
+from app.worker.redis import get_redis
+
+logger = get_task_logger(__name__)
+
+# Снимает блокировку, только если ее держит этот процесс: блокировка, истекшая во время долгого закрытия,
+# могла перейти к другому процессу
+_RELEASE_LOCK_SCRIPT: str = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@shared_task
+def schedule_day_close() -> int:
+    """
+    Ставит в очередь закрытие дня групп часовых поясов, у которых день закончился недавно. Запускается
+    планировщиком каждые DAY_CLOSE_TICK_MINUTES минут; незавершенные после простоя закрытия ставятся повторно.
+
+    Returns:
+        (int): Количество поставленных в очередь групп.
+    """
+    from app.habits.consts import DAY_CLOSE_LOOKBACK_HOURS
+    from app.habits.day_close import HabitDayCloseRepository, get_closed_buckets
+
+    buckets = get_closed_buckets(datetime.now(UTC), timedelta(hours=DAY_CLOSE_LOOKBACK_HOURS), get_timezones())
+    finished = run_with_session(
+        lambda session: HabitDayCloseRepository(session).get_finished(
+            [(bucket.utc_offset, bucket.day) for bucket in buckets]
+        )
+    )
+    pending = [bucket for bucket in buckets if (bucket.utc_offset, bucket.day) not in finished]
+
+    for bucket in pending:
+        close_habit_day.apply_async(kwargs={"bucket": bucket.model_dump(mode="json")}, ignore_result=True)
+
+    return len(pending)
+
+
+@shared_task(acks_late=True)
+def close_habit_day(bucket: dict) -> int:
+    """
+    Закрывает день группы часовых поясов: обнуляет цепочки привычек, период которых закончился без
+    выполнения. Записывает метрики: количество прерванных цепочек, скорость и задержку от окончания дня.
+
+    Args:
+        bucket (dict): Группа часовых поясов (DayCloseBucket).
+
+    Returns:
+        (int): Количество цепочек, прерванных этим запуском.
+    """
+    from app.habits.day_close import HabitDayCloseService
+    from app.habits.schemas import DayCloseBucket
+
+    day_close: DayCloseBucket = DayCloseBucket.model_validate(bucket)
+    redis = get_redis()
+    lock_key: str = f"{DAY_CLOSE_LOCK_KEY_PREFIX}:{day_close.utc_offset}:{day_close.day.isoformat()}"
+    lock_token: str = uuid4().hex
+
+    if not redis.set(lock_key, lock_token, nx=True, ex=DAY_CLOSE_LOCK_SECONDS):
+        logger.info("Day %s for UTC offset %s is already being closed", day_close.day, day_close.utc_offset)
+        return 0
+
+    lag: float = (datetime.now(UTC) - day_close.closes_at).total_seconds()
+    started_at: float = time.perf_counter()
+
+    try:
+        closed: int = run_with_session(lambda session: HabitDayCloseService(session).close_day(day_close))
+    finally:
+        redis.register_script(_RELEASE_LOCK_SCRIPT)(keys=[lock_key], args=[lock_token])
+
+    elapsed: float = time.perf_counter() - started_at
+    increment_counter(DAY_CLOSE_METRICS, "buckets")
+    increment_counter(DAY_CLOSE_METRICS, "streaks_broken", closed)
+    set_gauge(DAY_CLOSE_METRICS, "lag_seconds", round(lag))
+    set_gauge(DAY_CLOSE_METRICS, "duration_ms", round(elapsed * 1000))
+    set_gauge(DAY_CLOSE_METRICS, "streaks_per_second", round(closed / elapsed) if elapsed else closed)
+    logger.info(
+        "Closed day %s for UTC offset %s: %s streaks broken in %.3f s, %.0f s after day end",
+        day_close.day,
+        day_close.utc_offset,
+        closed,
+        elapsed,
+        lag,
+    )
+
+    return closed
@@ -0,0 +1,48 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.worker.database import run_with_session
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True)
+def rebuild_completion_rollups(user_ids: list[int] | None = None) -> int:
+    """
+    Пересчитывает годовые сводки отметок пользователей по всем отметкам пакетами.
+
+    Args:
+        user_ids (list[int] | None): ID пользователей. None - все пользователи с привычками.
+
+    Returns:
+        (int): Количество записанных сводок.
+    """
+    # Пакет привычек загружается при вызове задачи: модели регистрирует воркер при запуске (см. celery_app)
+    from app.habits.consts import ROLLUP_REBUILD_BATCH_SIZE
+    from app.habits.repository import HabitRepository
+    from app.habits.rollups import HabitRollupService
+
+    async def _rebuild(session: AsyncSession) -> int:
+        service: HabitRollupService = HabitRollupService(session)
+        rebuilt: int = 0
+
+        if user_ids is not None:
+            for offset in range(0, len(user_ids), ROLLUP_REBUILD_BATCH_SIZE):
+                rebuilt += await service.rebuild_rollups(user_ids[offset : offset + ROLLUP_REBUILD_BATCH_SIZE])
+
+            return rebuilt
+
+        repository: HabitRepository = HabitRepository(session)
+        after_id: int = 0
+
+        while batch := await repository.get_user_ids_after(after_id, ROLLUP_REBUILD_BATCH_SIZE):
+            rebuilt += await service.rebuild_rollups(batch)
+            after_id = batch[-1]
+
+        return rebuilt
+
+    rebuilt: int = run_with_session(_rebuild)
+    logger.info("Rebuilt %s completion rollups", rebuilt)
+
+    return rebuilt
@@ -0,0 +1,48 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.worker.database import run_with_session
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True)
+def rebuild_habit_stats(habit_ids: list[int] | None = None) -> int:
+    """
+    Пересчитывает статистику привычек по истории отметок пакетами.
+
+    Args:
+        habit_ids (list[int] | None): ID привычек. None - все привычки.
+
+    Returns:
+        (int): Количество пересчитанных привычек.
+    """
+    # Пакет привычек загружается при вызове задачи: модели регистрирует воркер при запуске (см. celery_app)
+    from app.habits.consts import HABIT_STATS_BATCH_SIZE
+    from app.habits.repository import HabitRepository
+    from app.habits.service import HabitService
+
+    async def _rebuild(session: AsyncSession) -> int:
+        service: HabitService = HabitService(session)
+        rebuilt: int = 0
+
+        if habit_ids is not None:
+            for offset in range(0, len(habit_ids), HABIT_STATS_BATCH_SIZE):
+                rebuilt += len(await service.rebuild_stats(habit_ids[offset : offset + HABIT_STATS_BATCH_SIZE]))
+
+            return rebuilt
+
+        repository: HabitRepository = HabitRepository(session)
+        after_id: int = 0
+
+        while batch := await repository.get_ids_after(after_id, HABIT_STATS_BATCH_SIZE):
+            rebuilt += len(await service.rebuild_stats(batch))
+            after_id = batch[-1]
+
+        return rebuilt
+
+    rebuilt: int = run_with_session(_rebuild)
+    logger.info("Rebuilt stats of %s habits", rebuilt)
+
+    return rebuilt
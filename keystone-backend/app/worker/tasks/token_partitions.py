@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import PartitionMaintenanceReport, PartitionManager, PartitionPolicy
+from app.worker.database import run_with_session
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True)
+def maintain_token_partitions() -> list[dict]:
+    """
+    Создает секции таблиц токенов на будущие сутки и удаляет секции с истекшими токенами.
+
+    Returns:
+        (list[dict]): Отчеты по каждой таблице: созданные и удаленные секции, освобожденные строки и байты.
+    """
+    # Пакеты токенов импортируют задачи воркера, поэтому загружаются при вызове задачи
+    from app.access_restore.consts import EXPIRED_ACCESS_RESTORE_TOKEN_HOURS
+    from app.access_restore.model import AccessRestore
+    from app.confirmation.consts import EXPIRED_CONFIRM_TOKEN_DAYS
+    from app.confirmation.model import Confirmation
+
+    policies: list[PartitionPolicy] = [
+        PartitionPolicy(table=Confirmation.__tablename__, retention=timedelta(days=EXPIRED_CONFIRM_TOKEN_DAYS)),
+        PartitionPolicy(
+            table=AccessRestore.__tablename__, retention=timedelta(hours=EXPIRED_ACCESS_RESTORE_TOKEN_HOURS)
+        ),
+    ]
+
+    async def _maintain(session: AsyncSession) -> list[PartitionMaintenanceReport]:
+        manager: PartitionManager = PartitionManager(session)
+        return [await manager.maintain(policy) for policy in policies]
+
+    reports: list[PartitionMaintenanceReport] = run_with_session(_maintain)
+
+    for report in reports:
+        logger.info(
+            "Partitions of %s: created %s, dropped %s, reclaimed %s rows / %s bytes",
+            report.table,
+            report.created,
+            report.dropped,
+            report.reclaimed_rows,
+            report.reclaimed_bytes,
+        )
+
+    return [report.model_dump() for report in reports]
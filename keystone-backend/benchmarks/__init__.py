@@ -0,0 +1 @@
+"""Бенчмарки бэкенда. Запускаются из каталога keystone-backend: python -m benchmarks.<имя>."""
@@ -0,0 +1,70 @@
+"""
+Бенчмарк отправки писем одним процессом: пул синхронных SMTP-соединений против асинхронного отправителя
+с несколькими одновременными сессиями. Требует aiosmtplib.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.async_mailer --messages 500 --latency-ms 5 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import smtplib
+import time
+from email.message import EmailMessage
+
+import aiosmtplib
+
+from app.worker.async_mailer import AsyncMailSender
+from app.worker.smtp import SMTPConnectionPool
+
+from .smtp_pool import _build_message
+from .smtp_server import SMTPStandIn
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500, help="Количество писем в каждом прогоне")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Задержка каждого ответа сервера")
+    parser.add_argument("--concurrency", type=int, default=20, help="Одновременных сессий асинхронного отправителя")
+    args = parser.parse_args()
+    message: EmailMessage = _build_message()
+
+    with SMTPStandIn(latency=args.latency_ms / 1000) as server:
+
+        def connect() -> smtplib.SMTP:
+            smtp: smtplib.SMTP = smtplib.SMTP("127.0.0.1", server.port)
+            smtp.login("bench", "bench")
+            return smtp
+
+        async def connect_async(host: str) -> aiosmtplib.SMTP:
+            client: aiosmtplib.SMTP = aiosmtplib.SMTP(hostname=host, port=server.port, use_tls=False, start_tls=False)
+            await client.connect()
+            await client.login("bench", "bench")
+            return client
+
+        async def send_async() -> None:
+            sender: AsyncMailSender = AsyncMailSender(connect_async, host_concurrency=args.concurrency)
+            await asyncio.gather(*(sender.send(message, "127.0.0.1") for _ in range(args.messages)))
+            await sender.close()
+
+        pool: SMTPConnectionPool = SMTPConnectionPool(connect)
+        started_at: float = time.perf_counter()
+
+        for _ in range(args.messages):
+            pool.send_message(message)
+
+        sync_rate: float = args.messages / (time.perf_counter() - started_at)
+        pool.close()
+
+        started_at = time.perf_counter()
+        asyncio.run(send_async())
+        async_rate: float = args.messages / (time.perf_counter() - started_at)
+
+    print(f"{args.messages} messages, {args.latency_ms} ms per server reply")
+    print(f"{'sync pool, one process':>36}: {sync_rate:8.1f} msg/s")
+    print(f"{f'asyncio, {args.concurrency} sessions per host':>36}: {async_rate:8.1f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Проверка плана запроса привычек на сегодня на большом синтетическом наборе: запрос должен читать
+привычки пользователя по индексам, а не сканировать таблицу. Для сравнения запрос выполняется
+и без индексов привычек.
+
+Данные создаются в транзакции, которая откатывается: база после запуска не меняется.
+Требует применённых миграций и пользователей в базе.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.due_habits --habits 200000
+"""
+
+import argparse
+import json
+from datetime import date
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.habits.repository import HabitRepository
+from app.worker.database import run_with_session
+
+# Синтетические привычки: случайные расписания, категории и теги, часть неактивных, архивных и завершенных
+_SEED_QUERY: str = """
+INSERT INTO habits (
+    title, icon, color, frequency_type, times_per_period, days_of_week, is_active, is_archived,
+    start_date, end_date, current_streak, longest_streak, total_completions, success_rate,
+    allow_partial, require_notes, require_mood, category, tags, preferred_times, user_id
+)
+SELECT
+    'habit ' || n,
+    'star',
+    '#3B82F6',
+    (ARRAY['DAILY', 'WEEKLY', 'MONTHLY', 'CUSTOM'])[1 + n % 4]::frequencytype,
+    1,
+    CASE WHEN n % 5 = 0 THEN '{}'::int[] ELSE ARRAY[1 + n % 7, 1 + (n % 7 + 1 + (n / 7) % 6) % 7] END,
+    n % 10 <> 0,
+    n % 20 = 1,
+    current_date - (n % 700),
+    CASE WHEN n % 9 = 0 THEN current_date - (n % 30) END,
+    0, 0, 0, 0, false, false, false,
+    (ARRAY['health', 'work', 'study', 'home', 'sport'])[1 + n % 5],
+    ARRAY['tag' || n % 13, 'tag' || n % 17],
+    '{}',
+    users.id
+FROM generate_series(1, :habits) AS n
+JOIN users ON users.id = 1 + n % (SELECT count(*) FROM users)
+"""
+
+# Индексы, без которых запрос выполняется для сравнения: все индексы привычек, кроме первичного ключа
+_INDEXES: tuple[str, ...] = (
+    "ix_habits_user_id_start_date_active",
+    "ix_habits_days_of_week",
+    "ix_habits_user_id_category",
+    "ix_habits_user_id_id_not_archived",
+    "ix_habits_tags",
+)
+
+
+def _collect_nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Собирает узлы плана в список.
+
+    Args:
+        plan (dict[str, Any]): Узел плана.
+
+    Returns:
+        (list[dict[str, Any]]): Узел и все вложенные узлы.
+    """
+    return [plan] + [node for child in plan.get("Plans", []) for node in _collect_nodes(child)]
+
+
+def main() -> None:
+    """Запускает проверку и печатает планы."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=200_000, help="Количество синтетических привычек")
+    parser.add_argument("--user-id", type=int, default=1, help="Пользователь, для которого выполняется запрос")
+    args = parser.parse_args()
+
+    query: str = str(
+        HabitRepository.build_due_query(args.user_id, date.today()).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    async def explain(session: AsyncSession) -> tuple[dict[str, Any], int]:
+        plan: Any = await session.scalar(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"))
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return plan[0], len((await session.execute(text(query))).all())
+
+    async def check(session: AsyncSession) -> None:
+        await session.execute(text(_SEED_QUERY), {"habits": args.habits})
+        await session.execute(text("ANALYZE habits"))
+        indexed, rows = await explain(session)
+
+        for index in _INDEXES:
+            await session.execute(text(f"DROP INDEX {index}"))
+
+        await session.execute(text("ANALYZE habits"))
+        unindexed, _ = await explain(session)
+        await session.rollback()
+
+        nodes: list[dict[str, Any]] = _collect_nodes(indexed["Plan"])
+        indexes: set[str] = {node["Index Name"] for node in nodes if "Index Name" in node}
+
+        print(f"{args.habits} synthetic habits, {rows} due today for user {args.user_id}")
+        print(f"{'with indexes':>16}: {indexed['Execution Time']:8.3f} ms, indexes: {', '.join(sorted(indexes))}")
+        print(f"{'without indexes':>16}: {unindexed['Execution Time']:8.3f} ms")
+
+        assert not any(
+            node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "habits" for node in nodes
+        ), "due habits query scans the whole habits table"
+        assert "ix_habits_user_id_start_date_active" in indexes, "partial user index is not used"
+
+    run_with_session(check)
+
+
+if __name__ == "__main__":
+    main()
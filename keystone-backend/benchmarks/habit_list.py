@@ -0,0 +1,75 @@
+"""
+Проверка планов запросов списка привычек на большом синтетическом наборе: каждая страница должна читаться
+по индексам привычек пользователя, а не сканированием таблицы, в том числе страницы в конце списка.
+
+Данные создаются в транзакции, которая откатывается: база после запуска не меняется.
+Требует применённых миграций и пользователей в базе.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.habit_list --habits 200000
+"""
+
+import argparse
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.habits.repository import HabitRepository
+from app.habits.schemas import HabitListFilterData
+from app.worker.database import run_with_session
+
+from .due_habits import _SEED_QUERY, _collect_nodes
+
+# Проверяемые фильтры
+_FILTERS: dict[str, dict[str, Any]] = {
+    "default page": {},
+    "page after id": {"after_id": 150_000},
+    "category": {"category": "work"},
+    "any of tags": {"tags_any": ["tag1", "tag2"]},
+    "all of tags": {"tags_all": ["tag1", "tag1"]},
+    "archived": {"is_archived": True},
+}
+
+
+def main() -> None:
+    """Запускает проверку и печатает время запросов."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=200_000, help="Количество синтетических привычек")
+    parser.add_argument("--user-id", type=int, default=1, help="Пользователь, для которого выполняются запросы")
+    args = parser.parse_args()
+
+    async def check(session: AsyncSession) -> None:
+        await session.execute(text(_SEED_QUERY), {"habits": args.habits})
+        await session.execute(text("ANALYZE habits"))
+        habits: int = await session.scalar(
+            text("SELECT count(*) FROM habits WHERE user_id = :user_id"), {"user_id": args.user_id}
+        )
+        print(f"{args.habits} synthetic habits, {habits} of user {args.user_id}")
+
+        for name, values in _FILTERS.items():
+            query: str = str(
+                HabitRepository.build_list_query(args.user_id, HabitListFilterData(**values)).compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+            )
+            plan: Any = await session.scalar(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"))
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+            nodes: list[dict[str, Any]] = _collect_nodes(plan["Plan"])
+            indexes: set[str] = {node["Index Name"] for node in nodes if "Index Name" in node}
+
+            print(f"{name:>16}: {plan['Execution Time']:8.3f} ms, indexes: {', '.join(sorted(indexes))}")
+            assert not any(
+                node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "habits" for node in nodes
+            ), f"{name}: habits list query scans the whole habits table"
+
+        await session.rollback()
+
+    run_with_session(check)
+
+
+if __name__ == "__main__":
+    main()
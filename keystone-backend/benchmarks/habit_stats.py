@@ -0,0 +1,153 @@
+"""
+Бенчмарк пересчета статистики привычек по истории: проход по дням каждой привычки на Python
+против векторного пересчета пакета привычек. Результаты сверяются.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.habit_stats --habits 5000 --days 730
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.habits.consts import MAX_SUCCESS_RATE, FrequencyType
+from app.habits.schedule import HabitSchedule
+from app.habits.stats_engine import compute_habit_stats
+
+
+def _generate(habits: int, days: int, today: date) -> tuple[list[SimpleNamespace], np.ndarray, np.ndarray]:
+    """
+    Формирует привычки со случайными расписаниями и историями отметок.
+
+    Args:
+        habits (int): Количество привычек.
+        days (int): Глубина истории в днях.
+        today (date): Текущий день.
+
+    Returns:
+        (tuple[list[SimpleNamespace], np.ndarray, np.ndarray]): Привычки, ID привычек отметок и дни отметок.
+    """
+    rnd: random.Random = random.Random(0)
+    result: list[SimpleNamespace] = []
+    habit_ids: list[int] = []
+    completion_days: list[date] = []
+
+    for habit_id in range(1, habits + 1):
+        frequency_type: FrequencyType = rnd.choice(list(FrequencyType))
+        start_date: date = today - timedelta(days=rnd.randint(days // 2, days))
+        result.append(
+            SimpleNamespace(
+                id=habit_id,
+                frequency_type=frequency_type,
+                times_per_period=1 if frequency_type == FrequencyType.DAILY else rnd.randint(1, 3),
+                days_of_week=rnd.sample(range(1, 8), rnd.randint(1, 7)),
+                start_date=start_date,
+                end_date=None,
+            )
+        )
+        probability: float = rnd.uniform(0.3, 0.95)
+        habit_days: list[date] = [
+            start_date + timedelta(days=offset)
+            for offset in range((today - start_date).days + 1)
+            if rnd.random() < probability
+        ]
+        habit_ids.extend([habit_id] * len(habit_days))
+        completion_days.extend(habit_days)
+
+    return result, np.array(habit_ids, dtype=np.int64), np.array(completion_days, dtype="datetime64[D]")
+
+
+def _reference_stats(habit: SimpleNamespace, days: Counter, today: date) -> tuple[int, int, int, int]:
+    """
+    Пересчитывает статистику одной привычки проходом по всем дням ее срока.
+
+    Args:
+        habit (SimpleNamespace): Привычка.
+        days (Counter): Количество отметок по дням.
+        today (date): Текущий день.
+
+    Returns:
+        (tuple[int, int, int, int]): Цепочка последнего выполненного периода, самая длинная цепочка,
+            количество учтенных отметок и процент успеха.
+    """
+    schedule: HabitSchedule = HabitSchedule.from_habit(habit)
+    streak = longest = total = successful = periods = count = 0
+    period: date | None = None
+    previous_done: bool = False
+    day: date = habit.start_date
+
+    def close(is_open: bool) -> None:
+        nonlocal streak, longest, successful, periods, previous_done
+
+        if period is None:
+            return
+
+        done: bool = count >= schedule.goal
+
+        if done:
+            streak = streak + 1 if previous_done else 1
+            longest = max(longest, streak)
+            successful += 1
+
+        periods += int(done or not is_open)
+        previous_done = done
+
+    while day <= today:
+        # Неделя и месяц начала привычки - период, даже если дней отметок в нем после начала не осталось
+        if not schedule.is_day_based or schedule.is_check_in_day(day):
+            if schedule.period_start(day) != period:
+                close(is_open=False)
+                period, count = schedule.period_start(day), 0
+
+            if schedule.is_check_in_day(day):
+                count += days[day]
+                total += days[day]
+
+        day += timedelta(days=1)
+
+    close(is_open=period == schedule.open_period(today))
+    rate: int = min(MAX_SUCCESS_RATE, round(successful * MAX_SUCCESS_RATE / periods)) if periods else 0
+
+    return streak, longest, total, rate
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=5000, help="Количество привычек")
+    parser.add_argument("--days", type=int, default=730, help="Глубина истории в днях")
+    args = parser.parse_args()
+
+    today: date = date.today()
+    habits, habit_ids, completion_days = _generate(args.habits, args.days, today)
+    by_habit: dict[int, Counter] = {habit.id: Counter() for habit in habits}
+
+    for habit_id, day in zip(habit_ids.tolist(), completion_days.tolist()):
+        by_habit[habit_id][day] += 1
+
+    started_at: float = time.perf_counter()
+    expected: list[tuple[int, int, int, int]] = [_reference_stats(habit, by_habit[habit.id], today) for habit in habits]
+    reference_seconds: float = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    states = compute_habit_stats(habits, habit_ids, completion_days, today)
+    engine_seconds: float = time.perf_counter() - started_at
+
+    actual: list[tuple[int, int, int, int]] = [
+        (state.current_streak, state.longest_streak, state.total_completions, state.success_rate) for state in states
+    ]
+    mismatches: int = sum(1 for left, right in zip(expected, actual) if left != right)
+
+    print(f"{args.habits} habits, {len(habit_ids)} completions, up to {args.days} days of history")
+    print(f"{'python, loop over days':>24}: {reference_seconds * 1000:10.1f} ms")
+    print(f"{'numpy, one batch':>24}: {engine_seconds * 1000:10.1f} ms")
+    print(f"{'speedup':>24}: {reference_seconds / engine_seconds:10.1f}x, mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
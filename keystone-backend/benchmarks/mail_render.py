@@ -0,0 +1,80 @@
+"""
+Бенчмарк подготовки писем: шаблоны, загружаемые на каждое письмо, против скомпилированных один раз,
+и время холодного старта сборщика писем с кешем байткода и без него.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.mail_render --renders 2000 --starts 50
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Callable
+
+from starlette.templating import Jinja2Templates
+
+from app.worker.consts import CONFIRMATION_EMAIL_TEMPLATE
+from app.worker.mail import TEMPLATES_DIR, MailRenderer
+
+# Переменные шаблона письма подтверждения
+_CONTEXT: dict[str, str] = {
+    "app_name": "KeyStone",
+    "confirm_url": "http://localhost:8080/confirm/00000000-0000-0000-0000-000000000000",
+    "user_full_name": "Иванов Иван Иванович",
+}
+
+
+def _measure(action: Callable[[], object], repeats: int) -> float:
+    """
+    Измеряет среднее время выполнения действия.
+
+    Args:
+        action (Callable[[], object]): Действие.
+        repeats (int): Количество повторов.
+
+    Returns:
+        (float): Среднее время в микросекундах.
+    """
+    started_at: float = time.perf_counter()
+
+    for _ in range(repeats):
+        action()
+
+    return (time.perf_counter() - started_at) / repeats * 1_000_000
+
+
+def _render_per_message() -> str:
+    """Готовит письмо так, как задачи делали это раньше: новое окружение шаблонов на каждое письмо."""
+    return Jinja2Templates(directory=TEMPLATES_DIR).get_template(CONFIRMATION_EMAIL_TEMPLATE).render(**_CONTEXT)
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=2000, help="Количество писем в прогонах рендеринга")
+    parser.add_argument("--starts", type=int, default=50, help="Количество холодных стартов сборщика")
+    args = parser.parse_args()
+
+    renderer: MailRenderer = MailRenderer()
+    renderer.precompile()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        MailRenderer(bytecode_cache_dir=cache_dir).precompile()
+
+        results: dict[str, float] = {
+            "render, environment per message": _measure(_render_per_message, args.renders),
+            "render, precompiled": _measure(
+                lambda: renderer.render(CONFIRMATION_EMAIL_TEMPLATE, **_CONTEXT), args.renders
+            ),
+            "cold start, no cache": _measure(lambda: MailRenderer().precompile(), args.starts),
+            "cold start, bytecode cache": _measure(
+                lambda: MailRenderer(bytecode_cache_dir=cache_dir).precompile(), args.starts
+            ),
+        }
+
+    for name, microseconds in results.items():
+        print(f"{name:>32}: {microseconds:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
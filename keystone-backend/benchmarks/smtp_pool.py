@@ -0,0 +1,83 @@
+"""
+Бенчмарк отправки писем одним процессом воркера: новое соединение на каждое письмо против пула соединений.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.smtp_pool --messages 200 --latency-ms 5
+"""
+
+import argparse
+import smtplib
+import time
+from email.message import EmailMessage
+from typing import Callable
+
+from app.worker.smtp import SMTPConnectionPool
+
+from .smtp_server import SMTPStandIn
+
+
+def _build_message() -> EmailMessage:
+    """Собирает тестовое письмо."""
+    message: EmailMessage = EmailMessage()
+    message["From"] = "bench@example.com"
+    message["To"] = "user@example.com"
+    message["Subject"] = "Benchmark"
+    message.add_alternative("<p>Benchmark</p>", subtype="html")
+
+    return message
+
+
+def _measure(send: Callable[[EmailMessage], None], messages: int) -> float:
+    """
+    Измеряет скорость отправки.
+
+    Args:
+        send (Callable[[EmailMessage], None]): Функция отправки письма.
+        messages (int): Количество писем.
+
+    Returns:
+        (float): Писем в секунду.
+    """
+    message: EmailMessage = _build_message()
+    started_at: float = time.perf_counter()
+
+    for _ in range(messages):
+        send(message)
+
+    return messages / (time.perf_counter() - started_at)
+
+
+def main() -> None:
+    """Запускает бенчмарк и печатает результаты."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="Количество писем в каждом прогоне")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Задержка каждого ответа сервера")
+    args = parser.parse_args()
+
+    with SMTPStandIn(latency=args.latency_ms / 1000) as server:
+
+        def connect() -> smtplib.SMTP:
+            smtp: smtplib.SMTP = smtplib.SMTP("127.0.0.1", server.port)
+            smtp.login("bench", "bench")
+            return smtp
+
+        def send_with_new_connection(message: EmailMessage) -> None:
+            with connect() as smtp:
+                smtp.send_message(message)
+
+        pool: SMTPConnectionPool = SMTPConnectionPool(connect)
+
+        results: dict[str, float] = {
+            "connection per message": _measure(send_with_new_connection, args.messages),
+            "connection pool": _measure(pool.send_message, args.messages),
+        }
+        pool.close()
+
+    print(f"{args.messages} messages, {args.latency_ms} ms per server reply")
+
+    for name, rate in results.items():
+        print(f"{name:>24}: {rate:8.1f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Локальный SMTP-сервер для бенчмарков почтовых задач. Принимает любые письма и авторизацию и ничего не отправляет.
+
+Задержка ответа имитирует время прохождения сети до почтового сервера: каждая команда клиента
+стоит одного round-trip, поэтому открытие соединения и авторизация стоят нескольких.
+"""
+
+import socketserver
+import threading
+import time
+
+# Ответы на команды, не требующие состояния
+_REPLIES: dict[str, bytes] = {
+    "HELO": b"250 localhost\r\n",
+    "EHLO": b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n",
+    "AUTH": b"235 2.7.0 Authentication successful\r\n",
+    "MAIL": b"250 2.1.0 OK\r\n",
+    "RCPT": b"250 2.1.5 OK\r\n",
+    "RSET": b"250 2.0.0 OK\r\n",
+    "NOOP": b"250 2.0.0 OK\r\n",
+}
+
+
+class SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Обработчик одной SMTP-сессии."""
+
+    def handle(self) -> None:
+        """Ведет SMTP-диалог до команды QUIT или разрыва соединения."""
+        self._reply(b"220 localhost SMTP stand-in\r\n")
+
+        while line := self.rfile.readline():
+            command: str = line[:4].decode("ascii", "replace").upper()
+
+            if command == "DATA":
+                self._reply(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+
+                self.server.messages += 1
+                self._reply(b"250 2.0.0 Queued\r\n")
+            elif command == "QUIT":
+                self._reply(b"221 2.0.0 Bye\r\n")
+                return
+            else:
+                self._reply(_REPLIES.get(command, b"502 5.5.2 Command not recognized\r\n"))
+
+    def _reply(self, reply: bytes) -> None:
+        """
+        Отправляет ответ клиенту после имитации сетевой задержки.
+
+        Args:
+            reply (bytes): Ответ сервера.
+        """
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        self.wfile.write(reply)
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """
+    Многопоточный SMTP-сервер на свободном локальном порту.
+
+    Attributes:
+        latency (float): Задержка перед каждым ответом в секундах.
+        messages (int): Количество принятых писем.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Инициализация сервера.
+
+        Args:
+            latency (float): Задержка перед каждым ответом в секундах.
+        """
+        super().__init__(("127.0.0.1", 0), SMTPStandInHandler)
+        self.latency: float = latency
+        self.messages: int = 0
+
+    @property
+    def port(self) -> int:
+        """Порт, на котором слушает сервер."""
+        return self.server_address[1]
+
+    def __enter__(self) -> "SMTPStandIn":
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Останавливает сервер."""
+        self.shutdown()
+        self.server_close()
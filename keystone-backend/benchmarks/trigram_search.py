@@ -0,0 +1,64 @@
+"""
+Проверка плана поиска привычек по названию на большом синтетическом наборе: поиск по подстроке и с опечатками
+должен читать триграммный GIN-индекс, а не сканировать таблицу. Требует расширения pg_trgm.
+
+Данные создаются в транзакции, которая откатывается: база после запуска не меняется.
+Требует применённых миграций и пользователей в базе.
+
+Запуск из каталога keystone-backend:
+    python -m benchmarks.trigram_search --habits 1000000 --query "habit 4242"
+"""
+
+import argparse
+import json
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.users  # noqa: F401  pylint: disable=unused-import
+from app.habits.repository import HabitRepository
+from app.worker.database import run_with_session
+
+from .due_habits import _SEED_QUERY, _collect_nodes
+
+
+def main() -> None:
+    """Запускает проверку и печатает план."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--habits", type=int, default=1_000_000, help="Количество синтетических привычек")
+    parser.add_argument("--user-id", type=int, default=1, help="Пользователь, для которого выполняется поиск")
+    parser.add_argument("--query", default="habit 4242", help="Строка поиска")
+    parser.add_argument("--limit", type=int, default=20, help="Максимальное количество результатов")
+    args = parser.parse_args()
+
+    query: str = str(
+        HabitRepository.build_search_query(args.user_id, args.query, args.limit).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    async def check(session: AsyncSession) -> None:
+        await session.execute(text(_SEED_QUERY), {"habits": args.habits})
+        await session.execute(text("ANALYZE habits"))
+        plan: Any = await session.scalar(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}"))
+        plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+        rows: int = len((await session.execute(text(query))).all())
+        await session.rollback()
+
+        nodes: list[dict[str, Any]] = _collect_nodes(plan["Plan"])
+        indexes: set[str] = {node["Index Name"] for node in nodes if "Index Name" in node}
+
+        print(f"{args.habits} synthetic habits, {rows} found for {args.query!r} (user {args.user_id})")
+        print(f"{'search':>16}: {plan['Execution Time']:8.3f} ms, indexes: {', '.join(sorted(indexes))}")
+
+        assert not any(
+            node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "habits" for node in nodes
+        ), "habit search scans the whole habits table"
+
+    run_with_session(check)
+
+
+if __name__ == "__main__":
+    main()
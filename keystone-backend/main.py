@@ -8,6 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import AppSettings, get_app_settings
 from app.core.database import database_manager, get_db
+from app.core.metrics import get_counters
+from app.core.redis import redis_manager
+from app.habits import habit_routes
 from app.users import user_routes, UserModel, get_current_user
 
 app_settings: AppSettings = get_app_settings()
@@ -16,7 +19,9 @@ app_settings: AppSettings = get_app_settings()
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> None:
     database_manager.initialize()
+    redis_manager.initialize()
     yield
+    await redis_manager.close()
     await database_manager.close()
 
 
@@ -66,4 +71,11 @@ async def status_page(db_session: AsyncSession = Depends(get_db)):
 
     return result
 
+
+@app.get("/metrics", tags=["status"])
+async def metrics_page() -> dict[str, dict[str, int]]:
+    """Счетчики метрик приложения."""
+    return await get_counters()
+
 app.include_router(user_routes)
+app.include_router(habit_routes)